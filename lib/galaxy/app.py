@@ -49,6 +49,7 @@ from galaxy.files.plugins import (
 from galaxy.files.templates import ConfiguredFileSourceTemplates
 from galaxy.job_metrics import JobMetrics
 from galaxy.jobs.manager import JobManager
+from galaxy.jobs.resource_prediction import JobResourcePredictor
 from galaxy.managers.api_keys import ApiKeyManager
 from galaxy.managers.citations import CitationsManager
 from galaxy.managers.collections import DatasetCollectionManager
@@ -118,6 +119,7 @@ from galaxy.queue_worker import (
     send_local_control_task,
 )
 from galaxy.quota import (
+    DatabaseQuotaAgent,
     get_quota_agent,
     QuotaAgent,
 )
@@ -162,6 +164,7 @@ from galaxy.util import (
     StructuredExecutionTimer,
 )
 from galaxy.util.task import IntervalTask
+from galaxy.util.template import compiled_template_cache
 from galaxy.util.tool_shed import tool_shed_registry
 from galaxy.visualization.data_providers.registry import DataProviderRegistry
 from galaxy.visualization.genomes import Genomes
@@ -591,6 +594,22 @@ class GalaxyManagerApplication(MinimalManagerApp, MinimalGalaxyApplication, Inst
         )
         # Initialize the job management configuration
         self.job_config = self._register_singleton(jobs.JobConfiguration)
+        self.job_resource_predictor = self._register_singleton(
+            JobResourcePredictor,
+            JobResourcePredictor(
+                self.model.context,
+                cache_time=self.config.job_resource_prediction_cache_time,
+                training_jobs=self.config.job_resource_prediction_training_jobs,
+            ),
+        )
+        compiled_template_cache.configure(
+            self.config.cheetah_template_cache_size,
+            (
+                os.path.join(self.config.template_cache_path, "cheetah")
+                if self.config.persist_cheetah_templates
+                else None
+            ),
+        )
 
         # Setup infrastructure for short term storage manager.
         short_term_storage_config_kwds: Dict[str, Any] = {}
@@ -601,9 +620,15 @@ class GalaxyManagerApplication(MinimalManagerApp, MinimalGalaxyApplication, Inst
             short_term_storage_config_kwds["default_storage_duration"] = short_term_storage_default_duration
         if short_term_storage_maximum_duration:
             short_term_storage_config_kwds["maximum_storage_duration"] = short_term_storage_maximum_duration
+        if self.config.short_term_storage_maximum_size:
+            short_term_storage_config_kwds["maximum_storage_size"] = self.config.short_term_storage_maximum_size
+        if self.config.short_term_storage_maximum_user_size:
+            short_term_storage_config_kwds["maximum_user_storage_size"] = (
+                self.config.short_term_storage_maximum_user_size
+            )
 
         short_term_storage_config = ShortTermStorageConfiguration(**short_term_storage_config_kwds)
-        short_term_storage_manager = ShortTermStorageManager(config=short_term_storage_config)
+        short_term_storage_manager = ShortTermStorageManager(config=short_term_storage_config, engine=self.model.engine)
         self._register_singleton(ShortTermStorageAllocator, short_term_storage_manager)  # type: ignore[type-abstract]
         self._register_singleton(ShortTermStorageMonitor, short_term_storage_manager)  # type: ignore[type-abstract]
 
@@ -742,6 +767,15 @@ class UniverseApplication(StructuredApp, GalaxyManagerApplication):
         # queue_worker *can* be initialized with a queue, but here we don't
         # want to and we'll allow postfork to bind and start it.
         self.queue_worker = self._register_singleton(GalaxyQueueWorker, GalaxyQueueWorker(self))
+        if isinstance(self.quota_agent, DatabaseQuotaAgent):
+            # Quotas are cached per process, tell the other processes when they change.
+            self.quota_agent.on_invalidate = lambda user_ids: self.queue_worker.send_control_task(
+                "invalidate_quota_cache", noop_self=True, kwargs={"user_ids": user_ids}
+            )
+        # Effective roles are cached per process as well.
+        self.security_agent.effective_roles.on_invalidate = lambda user_ids: self.queue_worker.send_control_task(
+            "invalidate_role_cache", noop_self=True, kwargs={"user_ids": user_ids}
+        )
 
         self.dependency_resolvers_view = self._register_singleton(
             DependencyResolversView, DependencyResolversView(self)
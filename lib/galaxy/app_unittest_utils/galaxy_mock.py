@@ -128,7 +128,7 @@ class MockApp(di.Container, GalaxyDataTestApp):
         self[SharedModelMapping] = self.model
         self[GalaxyModelMapping] = self.model
         sts_config = ShortTermStorageConfiguration(short_term_storage_directory=os.path.join(config.data_dir, "sts"))
-        sts_manager = ShortTermStorageManager(sts_config)
+        sts_manager = ShortTermStorageManager(sts_config, self.model.engine)
         self[ShortTermStorageAllocator] = sts_manager  # type: ignore[type-abstract]
         self[ShortTermStorageMonitor] = sts_manager  # type: ignore[type-abstract]
         self[galaxy_scoped_session] = self.model.context
@@ -210,6 +210,8 @@ class MockAppConfig(GalaxyDataTestConfig, CommonConfigurationMixin):
         self.schema = self.MockSchema()
         self.use_remote_user = kwargs.get("use_remote_user", False)
         self.enable_celery_tasks = False
+        self.celery_task_batch_size = 100
+        self.celery_bulk_task_queue = None
         self.tool_data_path = os.path.join(self.root, "tool-data")
         self.galaxy_data_manager_data_path = self.tool_data_path
         self.tool_dependency_dir = None
@@ -264,6 +266,12 @@ class MockAppConfig(GalaxyDataTestConfig, CommonConfigurationMixin):
         self.check_job_script_integrity = False
         self.check_job_script_integrity_count = 0
         self.check_job_script_integrity_sleep = 0
+        self.job_lifecycle_tracing = False
+        self.enable_job_metric_rollups = False
+        self.job_resource_prediction_cache_time = 3600
+        self.job_resource_prediction_training_jobs = 1000
+        self.cheetah_template_cache_size = 1000
+        self.persist_cheetah_templates = False
 
         self.default_panel_view = "default"
         self.panel_views_dir = ""
@@ -1,7 +1,21 @@
 import datetime
+import hashlib
+import json
+import threading
+import time
 from abc import abstractmethod
+from collections import OrderedDict
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
 
 from celery import Task
+from celery.canvas import Signature
+from celery.result import AsyncResult
 from sqlalchemy import (
     bindparam,
     insert,
@@ -15,6 +29,11 @@ from sqlalchemy.exc import IntegrityError
 from galaxy.model import CeleryUserRateLimit
 from galaxy.model.base import transaction
 from galaxy.model.scoped_session import galaxy_scoped_session
+from ._serialization import SchemaEncoder
+
+DEFAULT_TASK_BATCH_SIZE = 100
+DEFAULT_PENDING_TASK_TTL = 300
+DEFAULT_PENDING_TASK_MAX_ENTRIES = 10000
 
 
 class GalaxyTaskBeforeStart:
@@ -153,3 +172,118 @@ class GalaxyTaskBeforeStartUserRateLimitStandard(GalaxyTaskBeforeStartUserRateLi
                         raise Exception(f"Failed to update a celery_user_rate_limit row for user id {user_id}")
                     sa_session.commit()
         return sched_time
+
+
+def task_fingerprint(signature: Signature) -> str:
+    """
+    Return a stable identifier for a task signature built from the task name,
+    its arguments and the queue it is routed to.
+    """
+    key = [signature.task, signature.args, signature.kwargs, signature.options.get("queue")]
+    encoded = json.dumps(key, cls=SchemaEncoder, sort_keys=True)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class PendingTaskRegistry:
+    """
+    Remember recently submitted tasks by fingerprint so an identical task
+    (same name, arguments and queue) is not enqueued again while the first
+    one is still pending. The result of the pending task is returned instead.
+
+    Entries are dropped as soon as the result backend reports the task as
+    finished, or after ``ttl`` seconds for tasks whose results are ignored
+    or when no result backend is configured.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_PENDING_TASK_TTL, max_entries: int = DEFAULT_PENDING_TASK_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._pending: OrderedDict[str, Tuple[float, AsyncResult]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, signature: Signature, **options) -> AsyncResult:
+        key = task_fingerprint(signature)
+        with self._lock:
+            now = time.monotonic()
+            self._expire(now)
+            entry = self._pending.get(key)
+            if entry is not None and not _is_finished(entry[1]):
+                return entry[1]
+            result = signature.apply_async(**options)
+            self._pending[key] = (now, result)
+            self._pending.move_to_end(key)
+            while len(self._pending) > self.max_entries:
+                self._pending.popitem(last=False)
+            return result
+
+    def _expire(self, now: float):
+        while self._pending:
+            submitted, _ = next(iter(self._pending.values()))
+            if now - submitted < self.ttl:
+                break
+            self._pending.popitem(last=False)
+
+
+def _is_finished(result: AsyncResult) -> bool:
+    try:
+        return result.ready()
+    except NotImplementedError:
+        # no result backend configured, rely on the ttl
+        return False
+
+
+pending_tasks = PendingTaskRegistry()
+
+
+class DatasetTaskBatcher:
+    """
+    Collect per-dataset task invocations and coalesce them into batch tasks
+    that take a list of ``dataset_ids``.
+
+    Invocations of the same batch task with the same remaining keyword
+    arguments are grouped together, duplicate ids are dropped and each group
+    is split into tasks of at most ``batch_size`` ids. Batch tasks are routed
+    to ``queue`` if set, which allows bulk work to run in a separate lane from
+    interactive tasks.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = DEFAULT_TASK_BATCH_SIZE,
+        queue: Optional[str] = None,
+        registry: Optional[PendingTaskRegistry] = None,
+    ):
+        self.batch_size = max(batch_size, 1)
+        self.queue = queue
+        self.registry = registry or pending_tasks
+        self._groups: Dict[Tuple[Any, ...], Dict[int, None]] = {}
+        self._tasks: Dict[Tuple[Any, ...], Tuple[Task, Dict[str, Any]]] = {}
+
+    def add(self, batch_task: Task, dataset_id: int, **kwds):
+        key = (batch_task.name, *sorted(kwds.items()))
+        if key not in self._groups:
+            self._groups[key] = {}
+            self._tasks[key] = (batch_task, kwds)
+        self._groups[key][dataset_id] = None
+
+    def __len__(self) -> int:
+        return sum(len(dataset_ids) for dataset_ids in self._groups.values())
+
+    def signatures(self) -> List[Signature]:
+        signatures = []
+        for key, dataset_ids in self._groups.items():
+            batch_task, kwds = self._tasks[key]
+            ids = list(dataset_ids)
+            for start in range(0, len(ids), self.batch_size):
+                signature = batch_task.si(dataset_ids=ids[start : start + self.batch_size], **kwds)
+                if self.queue:
+                    signature.set(queue=self.queue)
+                signatures.append(signature)
+        return signatures
+
+    def submit(self) -> List[AsyncResult]:
+        """Enqueue all collected batches and reset the batcher."""
+        results = [self.registry.submit(signature) for signature in self.signatures()]
+        self._groups.clear()
+        self._tasks.clear()
+        return results
@@ -5,6 +5,7 @@ from pathlib import Path
 from typing import (
     Any,
     Callable,
+    List,
     Optional,
 )
 
@@ -99,6 +100,16 @@ def purge_hda(hda_manager: HDAManager, hda_id: int, task_user_id: Optional[int]
     hda_manager._purge(hda)
 
 
+@galaxy_task(ignore_result=True, action="purge a batch of history datasets")
+def purge_hda_batch(hda_manager: HDAManager, dataset_ids: List[int], task_user_id: Optional[int] = None):
+    for hda_id in dataset_ids:
+        try:
+            hda_manager._purge(hda_manager.by_id(hda_id))
+        except Exception:
+            log.exception(f"Purging history dataset {hda_id} failed")
+            hda_manager.session().rollback()
+
+
 @galaxy_task(ignore_result=True, action="completely removes a set of datasets from the object_store")
 def purge_datasets(
     dataset_manager: DatasetManager, request: PurgeDatasetsTaskRequest, task_user_id: Optional[int] = None
@@ -143,6 +154,39 @@ def change_datatype(
     datatype: str,
     model_class: str = "HistoryDatasetAssociation",
     task_user_id: Optional[int] = None,
+):
+    _change_datatype(hda_manager, ldda_manager, datatypes_registry, sa_session, dataset_id, datatype, model_class)
+
+
+@galaxy_task(action="set or detect datatype and update metadata for a batch of datasets")
+def change_datatype_batch(
+    hda_manager: HDAManager,
+    ldda_manager: LDDAManager,
+    datatypes_registry: DatatypesRegistry,
+    sa_session: galaxy_scoped_session,
+    dataset_ids: List[int],
+    datatype: str,
+    model_class: str = "HistoryDatasetAssociation",
+    task_user_id: Optional[int] = None,
+):
+    for dataset_id in dataset_ids:
+        try:
+            _change_datatype(
+                hda_manager, ldda_manager, datatypes_registry, sa_session, dataset_id, datatype, model_class
+            )
+        except Exception:
+            log.exception(f"Changing datatype failed on {model_class} {dataset_id}")
+            sa_session.rollback()
+
+
+def _change_datatype(
+    hda_manager: HDAManager,
+    ldda_manager: LDDAManager,
+    datatypes_registry: DatatypesRegistry,
+    sa_session: galaxy_scoped_session,
+    dataset_id: int,
+    datatype: str,
+    model_class: str,
 ):
     manager = _get_dataset_manager(hda_manager, ldda_manager, model_class)
     dataset_instance = manager.by_id(dataset_id)
@@ -156,7 +200,7 @@ def change_datatype(
     datatypes_registry.change_datatype(dataset_instance, datatype)
     with transaction(sa_session):
         sa_session.commit()
-    set_metadata(hda_manager, ldda_manager, sa_session, dataset_id, model_class)
+    _set_metadata(hda_manager, ldda_manager, sa_session, dataset_id, model_class)
 
 
 @galaxy_task(action="touch update_time of object")
@@ -189,6 +233,18 @@ def set_metadata(
     """
     ensure_can_set_metadata can be bypassed for new outputs.
     """
+    _set_metadata(hda_manager, ldda_manager, sa_session, dataset_id, model_class, overwrite, ensure_can_set_metadata)
+
+
+def _set_metadata(
+    hda_manager: HDAManager,
+    ldda_manager: LDDAManager,
+    sa_session: galaxy_scoped_session,
+    dataset_id: int,
+    model_class: str = "HistoryDatasetAssociation",
+    overwrite: bool = True,
+    ensure_can_set_metadata: bool = True,
+):
     manager = _get_dataset_manager(hda_manager, ldda_manager, model_class)
     dataset_instance = manager.by_id(dataset_id)
     if ensure_can_set_metadata:
@@ -346,10 +402,11 @@ def export_history(
 def prepare_dataset_collection_download(
     request: PrepareDatasetCollectionDownload,
     collection_manager: DatasetCollectionManager,
+    config: GalaxyAppConfiguration,
     task_user_id: Optional[int] = None,
 ):
     """Create a short term storage file tracked and available for download of target collection."""
-    collection_manager.write_dataset_collection(request)
+    collection_manager.write_dataset_collection(request, prefetch_workers=config.collection_download_prefetch_workers)
 
 
 @galaxy_task(action="preparing Galaxy Markdown PDF for download")
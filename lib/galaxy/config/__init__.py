@@ -46,6 +46,7 @@ from galaxy.util.config_parsers import parse_allowlist_ips
 from galaxy.util.custom_logging import LOGLV_TRACE
 from galaxy.util.dynamic import HasDynamicProperties
 from galaxy.util.facts import get_facts
+from galaxy.util.hash_util import HashFunctionNameEnum
 from galaxy.util.properties import (
     read_properties_from_file,
     running_from_source,
@@ -966,6 +967,9 @@ class GalaxyAppConfiguration(BaseAppConfiguration, CommonConfigurationMixin):
         self.allow_library_path_paste = string_as_bool(kwargs.get("allow_library_path_paste", self.allow_path_paste))
         self.disable_library_comptypes = kwargs.get("disable_library_comptypes", "").lower().split(",")
         self.check_upload_content = string_as_bool(kwargs.get("check_upload_content", True))
+        self.upload_hash_functions = [
+            HashFunctionNameEnum(name) for name in listify(self.upload_hash_functions, do_strip=True)
+        ]
         # On can mildly speed up Galaxy startup time by disabling index of help,
         # not needed on production systems but useful if running many functional tests.
         self.index_tool_help = string_as_bool(kwargs.get("index_tool_help", True))
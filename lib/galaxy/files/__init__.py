@@ -252,6 +252,11 @@ class ConfiguredFileSources:
         else:
             return False
 
+    @property
+    def transfer_connections(self) -> int:
+        """Maximum number of concurrent connections used for transfers from these file sources."""
+        return self._file_sources_config.transfer_connections
+
     def plugins_to_dict(
         self,
         for_serialization: bool = False,
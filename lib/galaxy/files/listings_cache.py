@@ -0,0 +1,74 @@
+"""Process wide cache of file source directory listings."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import (
+    Any,
+    Hashable,
+    List,
+    Optional,
+    Tuple,
+)
+
+DEFAULT_LISTINGS_CACHE_MAX_ENTRIES = 500000
+
+ListingT = Tuple[List[Any], int]
+
+
+class ListingsCache:
+    """Cache listings of file source directories for a limited time.
+
+    Keys are tuples starting with a key identifying the file source, followed
+    by the user and the parameters the listing was made for, so users never
+    see listings made with the credentials of other users. At most
+    ``max_entries`` directory entries are kept in total, the least recently
+    used listings are evicted first.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_LISTINGS_CACHE_MAX_ENTRIES):
+        self._max_entries = max_entries
+        self._listings: OrderedDict[Tuple[Hashable, ...], Tuple[float, List[Any], int]] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[Hashable, ...]) -> Optional[ListingT]:
+        with self._lock:
+            cached = self._listings.get(key)
+            if cached is None:
+                return None
+            expires, entries, count = cached
+            if expires <= time.monotonic():
+                self._remove(key)
+                return None
+            self._listings.move_to_end(key)
+            return list(entries), count
+
+    def set(self, key: Tuple[Hashable, ...], entries: List[Any], count: int, ttl: float) -> None:
+        if ttl <= 0 or len(entries) > self._max_entries:
+            return
+        with self._lock:
+            if key in self._listings:
+                self._remove(key)
+            self._listings[key] = (time.monotonic() + ttl, list(entries), count)
+            self._size += len(entries)
+            while self._size > self._max_entries:
+                self._remove(next(iter(self._listings)))
+
+    def invalidate(self, source_key: Hashable) -> None:
+        """Drop all listings of the file source identified by ``source_key``."""
+        with self._lock:
+            for key in [key for key in self._listings if key[0] == source_key]:
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._listings.clear()
+            self._size = 0
+
+    def _remove(self, key: Tuple[Hashable, ...]) -> None:
+        _, entries, _ = self._listings.pop(key)
+        self._size -= len(entries)
+
+
+listings_cache = ListingsCache()
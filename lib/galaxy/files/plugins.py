@@ -6,6 +6,10 @@ from typing import (
     TYPE_CHECKING,
 )
 
+from galaxy.files.transfer import (
+    DEFAULT_TRANSFER_CONNECTIONS,
+    DEFAULT_TRANSFER_PART_SIZE,
+)
 from galaxy.util.config_parsers import parse_allowlist_ips
 from galaxy.util.plugin_config import (
     load_plugins,
@@ -27,6 +31,8 @@ class FileSourcePluginsConfig:
     tmp_dir: Optional[str]
     webdav_use_temp_files: Optional[bool]
     listings_expiry_time: Optional[int]
+    transfer_connections: int
+    transfer_part_size: int
 
     def __init__(
         self,
@@ -39,6 +45,8 @@ class FileSourcePluginsConfig:
         tmp_dir=None,
         webdav_use_temp_files=None,
         listings_expiry_time=None,
+        transfer_connections=DEFAULT_TRANSFER_CONNECTIONS,
+        transfer_part_size=DEFAULT_TRANSFER_PART_SIZE,
     ):
         symlink_allowlist = symlink_allowlist or []
         fetch_url_allowlist = fetch_url_allowlist or []
@@ -51,6 +59,8 @@ class FileSourcePluginsConfig:
         self.tmp_dir = tmp_dir
         self.webdav_use_temp_files = webdav_use_temp_files
         self.listings_expiry_time = listings_expiry_time
+        self.transfer_connections = transfer_connections
+        self.transfer_part_size = transfer_part_size
 
     @staticmethod
     def from_app_config(config):
@@ -66,6 +76,8 @@ class FileSourcePluginsConfig:
         kwds["tmp_dir"] = config.file_source_temp_dir
         kwds["webdav_use_temp_files"] = config.file_source_webdav_use_temp_files
         kwds["listings_expiry_time"] = config.file_source_listings_expiry_time
+        kwds["transfer_connections"] = config.file_source_transfer_connections
+        kwds["transfer_part_size"] = config.file_source_transfer_part_size
 
         return FileSourcePluginsConfig(**kwds)
 
@@ -80,6 +92,8 @@ class FileSourcePluginsConfig:
             "tmp_dir": self.tmp_dir,
             "webdav_use_temp_files": self.webdav_use_temp_files,
             "listings_expiry_time": self.listings_expiry_time,
+            "transfer_connections": self.transfer_connections,
+            "transfer_part_size": self.transfer_part_size,
         }
 
     @staticmethod
@@ -95,6 +109,8 @@ class FileSourcePluginsConfig:
             tmp_dir=as_dict.get("tmp_dir"),
             webdav_use_temp_files=as_dict.get("webdav_use_temp_files"),
             listings_expiry_time=as_dict.get("listings_expiry_time"),
+            transfer_connections=as_dict.get("transfer_connections", DEFAULT_TRANSFER_CONNECTIONS),
+            transfer_part_size=as_dict.get("transfer_part_size", DEFAULT_TRANSFER_PART_SIZE),
         )
 
 
@@ -29,7 +29,13 @@ from galaxy.exceptions import (
     ItemAccessibilityException,
     RequestParameterInvalidException,
 )
+from galaxy.files.listings_cache import listings_cache
 from galaxy.files.plugins import FileSourcePluginsConfig
+from galaxy.files.transfer import (
+    ranged_download,
+    RangeOpener,
+    ReadableStream,
+)
 from galaxy.util.bool_expressions import (
     BooleanExpressionEvaluator,
     TokenContainedEvaluator,
@@ -324,11 +330,23 @@ def file_source_type_is_browsable(target_type: Type["BaseFilesSource"]) -> bool:
     return target_type.list != BaseFilesSource.list or target_type._list != BaseFilesSource._list
 
 
+def name_matches_query(name: str, query: Optional[str]) -> bool:
+    """Whether an entry named ``name`` is part of a listing searched for ``query``.
+
+    Plugins filtering listings themselves use this so that searching behaves
+    the same for all of them: the query is a case insensitive substring of
+    the entry name.
+    """
+    return not query or query.lower() in name.lower()
+
+
 class BaseFilesSource(FilesSource):
     plugin_kind: ClassVar[PluginKind] = PluginKind.rfs  # Remote File Source by default, override in subclasses
     supports_pagination: ClassVar[bool] = False
     supports_search: ClassVar[bool] = False
     supports_sorting: ClassVar[bool] = False
+    # Whether listings are kept for file_source_listings_expiry_time seconds, worth it for remote file systems.
+    cache_listings: ClassVar[bool] = False
 
     def get_browsable(self) -> bool:
         return file_source_type_is_browsable(type(self))
@@ -460,7 +478,23 @@ class BaseFilesSource(FilesSource):
             if offset is not None and offset < 0:
                 raise RequestParameterInvalidException("Offset must be greater than or equal to 0.")
 
-        return self._list(path, recursive, user_context, opts, limit, offset, query)
+        ttl = self._get_listings_expiry_time() if self.cache_listings else None
+        if not ttl or (opts is not None and opts.extra_props):
+            return self._list(path, recursive, user_context, opts, limit, offset, query)
+        writeable = bool(opts and opts.writeable)
+        username = user_context.username if user_context is not None else None
+        key = (self._listings_cache_key(), username, path, recursive, writeable, limit, offset, query, sort_by)
+        if (cached := listings_cache.get(key)) is not None:
+            return cached
+        entries, count = self._list(path, recursive, user_context, opts, limit, offset, query)
+        listings_cache.set(key, entries, count, ttl)
+        return entries, count
+
+    def _get_listings_expiry_time(self) -> Optional[int]:
+        return self._file_sources_config.listings_expiry_time
+
+    def _listings_cache_key(self) -> Tuple[str, str, str]:
+        return (self.plugin_type, self.id, self.get_uri_root())
 
     def _list(
         self,
@@ -483,7 +517,10 @@ class BaseFilesSource(FilesSource):
     ) -> Entry:
         self._ensure_writeable()
         self._check_user_access(user_context)
-        return self._create_entry(entry_data, user_context, opts)
+        try:
+            return self._create_entry(entry_data, user_context, opts)
+        finally:
+            listings_cache.invalidate(self._listings_cache_key())
 
     def _create_entry(
         self,
@@ -507,7 +544,10 @@ class BaseFilesSource(FilesSource):
     ):
         self._ensure_writeable()
         self._check_user_access(user_context)
-        self._write_from(target_path, native_path, user_context=user_context, opts=opts)
+        try:
+            self._write_from(target_path, native_path, user_context=user_context, opts=opts)
+        finally:
+            listings_cache.invalidate(self._listings_cache_key())
 
     @abc.abstractmethod
     def _write_from(
@@ -543,6 +583,20 @@ class BaseFilesSource(FilesSource):
         if not self.get_writable():
             raise Exception("Cannot write to a non-writable file source.")
 
+    def _ranged_download(
+        self, open_range: RangeOpener, size: int, native_path: str, first_part: Optional[ReadableStream] = None
+    ) -> str:
+        """Download a file of ``size`` bytes by byte ranges using the configured transfer settings."""
+        config = self._file_sources_config
+        return ranged_download(
+            open_range,
+            size,
+            native_path,
+            connections=config.transfer_connections,
+            part_size=config.transfer_part_size,
+            first_part=first_part,
+        )
+
     def _check_user_access(self, user_context):
         """Raises an exception if the given user doesn't have the rights to access this file source.
 
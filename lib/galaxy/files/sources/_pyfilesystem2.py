@@ -1,9 +1,12 @@
 import abc
 import functools
+import itertools
 import logging
 import os
 from typing import (
     ClassVar,
+    Iterable,
+    Iterator,
     List,
     Optional,
     Tuple,
@@ -13,6 +16,7 @@ from typing import (
 import fs
 import fs.errors
 from fs.base import FS
+from fs.info import Info
 from typing_extensions import Unpack
 
 from galaxy.exceptions import (
@@ -26,6 +30,7 @@ from . import (
     DEFAULT_PAGE_LIMIT,
     FilesSourceOptions,
     FilesSourceProperties,
+    name_matches_query,
 )
 
 log = logging.getLogger(__name__)
@@ -38,6 +43,7 @@ class PyFilesystem2FilesSource(BaseFilesSource):
     required_package: ClassVar[str]
     supports_pagination = True
     supports_search = True
+    cache_listings = True
     allow_key_error_on_empty_directories = False  # work around a bug in webdav
 
     def __init__(self, **kwd: Unpack[FilesSourceProperties]):
@@ -64,7 +70,7 @@ class PyFilesystem2FilesSource(BaseFilesSource):
         """Return dictionary of 'Directory's and 'File's."""
         try:
             with self._open_fs(user_context=user_context, opts=opts) as h:
-                if recursive:
+                if recursive and limit is None and offset is None and not query:
                     recursive_result: List[AnyRemoteEntry] = []
                     try:
                         for p, dirs, files in h.walk(path, namespaces=["details"]):
@@ -77,11 +83,16 @@ class PyFilesystem2FilesSource(BaseFilesSource):
                     return recursive_result, len(recursive_result)
                 else:
                     page = self._to_page(limit, offset)
-                    filter = self._query_to_filter(query)
-                    count = self._get_total_matches_count(h, path, filter)
-                    result = h.filterdir(path, namespaces=["details"], page=page, files=filter, dirs=filter)
-                    to_dict = functools.partial(self._resource_info_to_dict, path)
-                    return list(map(to_dict, result)), count
+                    if recursive:
+                        entries = self._walk_matches(h, path, query)
+                    else:
+                        result = h.scandir(path, namespaces=["details"])
+                        entries = (
+                            (path, resource_info)
+                            for resource_info in result
+                            if name_matches_query(resource_info.name, query)
+                        )
+                    return self._page_of(entries, page)
         except fs.errors.PermissionDenied as e:
             raise AuthenticationRequired(
                 f"Permission Denied. Reason: {e}. Please check your credentials in your preferences for {self.label}."
@@ -89,8 +100,28 @@ class PyFilesystem2FilesSource(BaseFilesSource):
         except fs.errors.FSError as e:
             raise MessageException(f"Problem listing file source path {path}. Reason: {e}") from e
 
-    def _get_total_matches_count(self, fs: FS, path: str, filter: Optional[List[str]] = None) -> int:
-        return sum(1 for _ in fs.filterdir(path, namespaces=["basic"], files=filter, dirs=filter))
+    def _walk_matches(self, fs: FS, path: str, query: Optional[str] = None) -> Iterator[Tuple[str, Info]]:
+        try:
+            for p, dirs, files in fs.walk(path, namespaces=["details"]):
+                for resource_info in itertools.chain(dirs, files):
+                    if name_matches_query(resource_info.name, query):
+                        yield p, resource_info
+        except KeyError:
+            if not self.allow_key_error_on_empty_directories:
+                raise
+
+    def _page_of(
+        self, entries: Iterable[Tuple[str, Info]], page: Optional[Tuple[int, int]] = None
+    ) -> Tuple[List[AnyRemoteEntry], int]:
+        """Convert the entries of ``page`` to dictionaries while counting all ``entries``."""
+        start, end = page or (0, None)
+        result: List[AnyRemoteEntry] = []
+        count = 0
+        for dir_path, resource_info in entries:
+            if count >= start and (end is None or count < end):
+                result.append(self._resource_info_to_dict(dir_path, resource_info))
+            count += 1
+        return result, count
 
     def _to_page(self, limit: Optional[int] = None, offset: Optional[int] = None) -> Optional[Tuple[int, int]]:
         if limit is None and offset is None:
@@ -100,11 +131,6 @@ class PyFilesystem2FilesSource(BaseFilesSource):
         end = start + limit
         return (start, end)
 
-    def _query_to_filter(self, query: Optional[str]) -> Optional[List[str]]:
-        if not query:
-            return None
-        return [f"*{query}*"]
-
     def _realize_to(
         self,
         source_path: str,
@@ -1,3 +1,4 @@
+import codecs
 import logging
 import re
 import urllib.request
@@ -11,6 +12,11 @@ from typing import (
 from typing_extensions import Unpack
 
 from galaxy.files import OptionalUserContext
+from galaxy.files.transfer import (
+    http_range_opener,
+    ranged_content_length,
+    RangeRequestsNotSupported,
+)
 from galaxy.files.uris import validate_non_local
 from galaxy.util import (
     DEFAULT_SOCKET_TIMEOUT,
@@ -67,15 +73,31 @@ class HTTPFilesSource(BaseFilesSource):
         extra_props: HTTPFilesSourceProperties = cast(HTTPFilesSourceProperties, opts.extra_props or {} if opts else {})
         headers = props.pop("http_headers", {}) or {}
         headers.update(extra_props.get("http_headers") or {})
+        allowlist = self._allowlist or extra_props.get("fetch_url_allowlist") or []
         req = urllib.request.Request(source_path, headers=headers)
 
         with urllib.request.urlopen(req, timeout=DEFAULT_SOCKET_TIMEOUT) as page:
             # Verify url post-redirects is still allowlisted
-            validate_non_local(page.geturl(), self._allowlist or extra_props.get("fetch_url_allowlist") or [])
-            f = open(native_path, "wb")  # fd will be .close()ed in stream_to_open_named_file
-            return stream_to_open_named_file(
-                page, f.fileno(), native_path, source_encoding=get_charset_from_http_headers(page.headers)
-            )
+            url = validate_non_local(page.geturl(), allowlist)
+            source_encoding = get_charset_from_http_headers(page.headers)
+            size = ranged_content_length(page.headers)
+            if size is not None and _is_utf8_compatible(source_encoding):
+                # Content is written as is, fetch the remaining ranges over pooled connections.
+                open_range = http_range_opener(url, headers, pool_size=self._file_sources_config.transfer_connections)
+                try:
+                    return self._ranged_download(open_range, size, native_path, first_part=page)
+                except RangeRequestsNotSupported as e:
+                    log.debug("Falling back to a single stream for [%s]: %s", url, e)
+            else:
+                return self._stream_to(page, native_path, source_encoding)
+
+        with urllib.request.urlopen(req, timeout=DEFAULT_SOCKET_TIMEOUT) as page:
+            validate_non_local(page.geturl(), allowlist)
+            return self._stream_to(page, native_path, get_charset_from_http_headers(page.headers))
+
+    def _stream_to(self, page, native_path: str, source_encoding: Optional[str]):
+        f = open(native_path, "wb")  # fd will be .close()ed in stream_to_open_named_file
+        return stream_to_open_named_file(page, f.fileno(), native_path, source_encoding=source_encoding)
 
     def _write_from(
         self,
@@ -100,4 +122,14 @@ class HTTPFilesSource(BaseFilesSource):
             return 0
 
 
+def _is_utf8_compatible(encoding: Optional[str]) -> bool:
+    # Content in these encodings is stored unchanged by stream_to_open_named_file.
+    if encoding is None:
+        return True
+    try:
+        return codecs.lookup(encoding).name in ("utf-8", "ascii")
+    except LookupError:
+        return False
+
+
 __all__ = ("HTTPFilesSource",)
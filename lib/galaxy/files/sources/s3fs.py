@@ -1,4 +1,5 @@
 import functools
+import io
 import logging
 import os
 from typing import (
@@ -16,8 +17,10 @@ from typing_extensions import (
 from galaxy.files import OptionalUserContext
 from . import (
     AnyRemoteEntry,
+    DEFAULT_PAGE_LIMIT,
     FilesSourceOptions,
     FilesSourceProperties,
+    name_matches_query,
 )
 
 try:
@@ -39,24 +42,24 @@ class S3FsFilesSourceProperties(FilesSourceProperties, total=False):
     user: str
     passwd: str
     listings_expiry_time: NotRequired[Optional[int]]
+    use_listings_cache: bool  # internally computed. Should not be specified in config file
     client_kwargs: dict  # internally computed. Should not be specified in config file
 
 
 class S3FsFilesSource(BaseFilesSource):
     plugin_type = "s3fs"
+    supports_pagination = True
+    supports_search = True
+    cache_listings = True
 
     def __init__(self, **kwd: Unpack[S3FsFilesSourceProperties]):
         if s3fs is None:
             raise Exception("Package s3fs unavailable but required for this file source plugin.")
         props: S3FsFilesSourceProperties = cast(S3FsFilesSourceProperties, self._parse_common_config_opts(kwd))
-        file_sources_config = self._file_sources_config
-        if (
-            props.get("listings_expiry_time") is None
-            and file_sources_config
-            and file_sources_config.listings_expiry_time
-        ):
-            if file_sources_config.listings_expiry_time:
-                props["listings_expiry_time"] = file_sources_config.listings_expiry_time
+        # Listings are cached by Galaxy (see ``cache_listings``), which is invalidated on writes - a second
+        # listings cache inside s3fs would keep serving stale listings.
+        self._listings_expiry_time = props.pop("listings_expiry_time", None)
+        props["use_listings_cache"] = False
         # There is a possibility that the bucket name could be parameterized: e.g.
         # bucket: ${user.preferences['generic_s3|bucket']}
         # that's ok, because we evaluate the bucket name again later. The bucket property here will only
@@ -68,6 +71,11 @@ class S3FsFilesSource(BaseFilesSource):
         if self._endpoint_url:
             self._props.update({"client_kwargs": {"endpoint_url": self._endpoint_url}})
 
+    def _get_listings_expiry_time(self) -> Optional[int]:
+        if self._listings_expiry_time is not None:
+            return self._listings_expiry_time
+        return super()._get_listings_expiry_time()
+
     def _list(
         self,
         path="/",
@@ -83,19 +91,22 @@ class S3FsFilesSource(BaseFilesSource):
         # we need to pop the 'bucket' here, because the argument is not recognised in a downstream function
         _bucket_name = _props.pop("bucket", "")
         fs = self._open_fs(props=_props, opts=opts)
+        bucket_path = self._bucket_path(_bucket_name, path)
         if recursive:
-            res: List[AnyRemoteEntry] = []
-            bucket_path = self._bucket_path(_bucket_name, path)
-            for p, dirs, files in fs.walk(bucket_path, detail=True):
-                to_dict = functools.partial(self._resource_info_to_dict, p)
-                res.extend(map(to_dict, dirs.values()))
-                res.extend(map(to_dict, files.values()))
-            return res, len(res)
+            # A single flat listing of all keys below the prefix, instead of listing each directory.
+            found = fs.find(bucket_path, withdirs=True, detail=True)
+            names = {name.rstrip("/"): info for name, info in found.items()}
+            names.pop(bucket_path.rstrip("/"), None)
+            entries = [(os.path.dirname(name), info) for name, info in names.items()]
         else:
-            bucket_path = self._bucket_path(_bucket_name, path)
-            res = fs.ls(bucket_path, detail=True)
-            to_dict = functools.partial(self._resource_info_to_dict, path)
-            return list(map(to_dict, res)), len(res)
+            entries = [(path, info) for info in fs.ls(bucket_path, detail=True)]
+        if query:
+            entries = [(p, info) for p, info in entries if name_matches_query(os.path.basename(info["name"]), query)]
+        count = len(entries)
+        if limit is not None or offset is not None:
+            start = offset or 0
+            entries = entries[start : start + (limit or DEFAULT_PAGE_LIMIT)]
+        return [self._resource_info_to_dict(p, info) for p, info in entries], count
 
     def _realize_to(
         self,
@@ -108,7 +119,14 @@ class S3FsFilesSource(BaseFilesSource):
         _bucket_name = _props.pop("bucket", "")
         fs = self._open_fs(props=_props, opts=opts)
         bucket_path = self._bucket_path(_bucket_name, source_path)
-        fs.download(bucket_path, native_path)
+        size = fs.size(bucket_path)
+        if size is None:
+            fs.download(bucket_path, native_path)
+        else:
+            self._ranged_download(functools.partial(self._open_range, fs, bucket_path), size, native_path)
+
+    def _open_range(self, fs, bucket_path: str, start: int, end: int):
+        return io.BytesIO(fs.cat_file(bucket_path, start=start, end=end))
 
     def _write_from(
         self,
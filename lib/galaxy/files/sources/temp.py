@@ -16,6 +16,7 @@ class TempFilesSource(PyFilesystem2FilesSource):
 
     plugin_type = "temp"
     required_module = OSFS
+    cache_listings = False
 
     def _open_fs(self, user_context=None, opts: Optional[FilesSourceOptions] = None):
         props = self._serialization_props(user_context)
@@ -0,0 +1,257 @@
+"""Parallel and resumable transfers of remote files.
+
+File source plugins that can read byte ranges of a remote file describe them
+with a ``RangeOpener`` and hand the transfer to :func:`ranged_download`, which
+fetches parts of the file over several connections, writes them in place and
+resumes interrupted parts from the last byte written. :func:`http_range_opener`
+provides such an opener for HTTP(S) servers using a requests session that keeps
+a pool of connections per host.
+"""
+
+import http.client
+import logging
+import os
+import socket
+import threading
+import time
+from concurrent.futures import (
+    FIRST_EXCEPTION,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Protocol,
+    Tuple,
+    TypeVar,
+)
+
+import urllib3.exceptions
+from requests.adapters import HTTPAdapter
+from requests.sessions import Session as RequestsSession
+
+from galaxy.util import (
+    DEFAULT_SOCKET_TIMEOUT,
+    requests,
+)
+
+log = logging.getLogger(__name__)
+
+DEFAULT_TRANSFER_CONNECTIONS = 4
+DEFAULT_TRANSFER_PART_SIZE = 8 * 1024 * 1024
+DEFAULT_TRANSFER_RETRIES = 3
+RETRY_BACKOFF = 0.5
+CHUNK_SIZE = 1024 * 1024
+
+
+class ReadableStream(Protocol):
+    def read(self, size: int = -1) -> bytes: ...
+
+    def close(self) -> None: ...
+
+
+# Called with the first byte and the end (exclusive) of a range, returns a
+# readable binary stream of exactly these bytes.
+RangeOpener = Callable[[int, int], ReadableStream]
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class IncompleteTransferError(Exception):
+    """A stream ended before all bytes of the requested range were read."""
+
+
+class RangeRequestsNotSupported(Exception):
+    """The remote server did not honour a byte range request."""
+
+
+def ranged_download(
+    open_range: RangeOpener,
+    size: int,
+    native_path: str,
+    connections: int = DEFAULT_TRANSFER_CONNECTIONS,
+    part_size: int = DEFAULT_TRANSFER_PART_SIZE,
+    retries: int = DEFAULT_TRANSFER_RETRIES,
+    first_part: Optional[ReadableStream] = None,
+) -> str:
+    """Download the ``size`` bytes described by ``open_range`` to ``native_path``.
+
+    The file is split in parts of ``part_size`` bytes of which up to
+    ``connections`` are transferred concurrently. A part that fails is resumed
+    from its last written byte up to ``retries`` times. ``first_part`` may be
+    an already opened stream of the whole file, it is used for the first part
+    to save a request.
+    """
+    part_size = max(part_size, 1)
+    parts = [(start, min(start + part_size, size)) for start in range(0, size, part_size)]
+    fd = os.open(native_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        os.ftruncate(fd, size)
+
+        def transfer(index: int, part: Tuple[int, int]) -> None:
+            _transfer_part(open_range, fd, part[0], part[1], retries, first_part if index == 0 else None)
+
+        try:
+            for_each_concurrently(lambda item: transfer(*item), enumerate(parts), connections, "file_transfer")
+        finally:
+            if first_part is not None:
+                first_part.close()
+    finally:
+        os.close(fd)
+    return native_path
+
+
+def for_each_concurrently(
+    f: Callable[[T], R], items: Iterable[T], workers: int, thread_name_prefix: str = "transfer"
+) -> List[R]:
+    """Apply ``f`` to all ``items`` using up to ``workers`` threads and return the results in order.
+
+    The first exception raised by ``f`` is re-raised once the calls already
+    running have finished, calls that have not started yet are cancelled.
+    """
+    items = list(items)
+    if workers <= 1 or len(items) <= 1:
+        return [f(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(workers, len(items)), thread_name_prefix=thread_name_prefix) as executor:
+        futures = [executor.submit(f, item) for item in items]
+        done, not_done = wait(futures, return_when=FIRST_EXCEPTION)
+        failed = [future for future in done if future.exception() is not None]
+        if failed:
+            for future in not_done:
+                future.cancel()
+            failed[0].result()
+        return [future.result() for future in futures]
+
+
+RETRYABLE_EXCEPTIONS = (
+    IncompleteTransferError,
+    ConnectionError,
+    TimeoutError,
+    socket.timeout,
+    http.client.HTTPException,
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+    urllib3.exceptions.ProtocolError,
+    urllib3.exceptions.TimeoutError,
+)
+
+
+def _transfer_part(
+    open_range: RangeOpener, fd: int, start: int, end: int, retries: int, stream: Optional[ReadableStream] = None
+) -> None:
+    offset = start
+    failures = 0
+    while offset < end:
+        try:
+            if stream is None:
+                stream = open_range(offset, end)
+            while offset < end:
+                chunk = stream.read(min(CHUNK_SIZE, end - offset))
+                if not chunk:
+                    raise IncompleteTransferError(f"Stream ended at byte {offset}, expected {end} bytes")
+                offset = _write_at(fd, chunk, offset)
+        except Exception as e:
+            failures += 1
+            if failures > retries or not _is_retryable(e):
+                raise
+            log.debug("Transfer of bytes %s-%s interrupted at byte %s, resuming: %s", start, end, offset, e)
+            time.sleep(RETRY_BACKOFF * failures)
+        finally:
+            if stream is not None:
+                stream.close()
+                stream = None
+
+
+def _write_at(fd: int, chunk: bytes, offset: int) -> int:
+    view = memoryview(chunk)
+    while view:
+        written = os.pwrite(fd, view, offset)
+        offset += written
+        view = view[written:]
+    return offset
+
+
+def _is_retryable(e: Exception) -> bool:
+    # Only interrupted connections and timeouts are retried, other errors
+    # (e.g. a full disk or a permission problem) would just fail again.
+    if isinstance(e, requests.exceptions.HTTPError):
+        return e.response is None or e.response.status_code >= 500
+    return isinstance(e, RETRYABLE_EXCEPTIONS)
+
+
+class HostSessions:
+    """requests sessions keeping up to ``pool_size`` connections per host alive.
+
+    A session pools connections per scheme, host and port, so ranged requests
+    for the parts of a file, and for files on the same host, reuse established
+    (TLS) connections instead of opening one per request.
+    """
+
+    def __init__(self):
+        self._sessions: Dict[int, RequestsSession] = {}
+        self._lock = threading.Lock()
+
+    def session(self, pool_size: int = DEFAULT_TRANSFER_CONNECTIONS) -> RequestsSession:
+        with self._lock:
+            if pool_size not in self._sessions:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_maxsize=pool_size)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._sessions[pool_size] = session
+            return self._sessions[pool_size]
+
+
+host_sessions = HostSessions()
+
+
+def http_range_opener(
+    url: str, headers: Optional[Dict[str, str]] = None, pool_size: int = DEFAULT_TRANSFER_CONNECTIONS
+) -> RangeOpener:
+    """Return a ``RangeOpener`` issuing byte range requests for ``url``.
+
+    Redirects are not followed, ``url`` should be the final location of the
+    file that has already been validated by the caller.
+    """
+    session = host_sessions.session(pool_size)
+
+    def open_range(start: int, end: int) -> ReadableStream:
+        range_headers = {**(headers or {}), "Range": f"bytes={start}-{end - 1}", "Accept-Encoding": "identity"}
+        response = session.get(
+            url, headers=range_headers, stream=True, allow_redirects=False, timeout=DEFAULT_SOCKET_TIMEOUT
+        )
+        response.raise_for_status()
+        content_range = response.headers.get("Content-Range", "")
+        if response.status_code != 206 or not content_range.startswith(f"bytes {start}-"):
+            response.close()
+            raise RangeRequestsNotSupported(f"Server did not honour range request for {url}")
+        return _ResponseStream(response)
+
+    return open_range
+
+
+class _ResponseStream:
+    def __init__(self, response: requests.Response):
+        self._response = response
+
+    def read(self, size: int = -1) -> bytes:
+        return self._response.raw.read(size if size >= 0 else None)
+
+    def close(self) -> None:
+        self._response.close()
+
+
+def ranged_content_length(headers) -> Optional[int]:
+    """Return the size of a file if HTTP response ``headers`` allow fetching it by byte ranges."""
+    if headers.get("Accept-Ranges", "").lower() != "bytes" or headers.get("Content-Encoding"):
+        return None
+    try:
+        return int(headers["Content-Length"])
+    except (KeyError, TypeError, ValueError):
+        return None
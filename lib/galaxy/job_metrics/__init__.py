@@ -31,6 +31,10 @@ from typing import (
 from galaxy import util
 from galaxy.util import plugin_config
 from . import formatting
+from .lifecycle import (
+    JobLifecycleFormatter,
+    LIFECYCLE_PLUGIN,
+)
 from .safety import (
     DEFAULT_SAFETY,
     Safety,
@@ -43,6 +47,7 @@ log = logging.getLogger(__name__)
 
 
 DEFAULT_FORMATTER = formatting.JobMetricFormatter()
+LIFECYCLE_FORMATTER = JobLifecycleFormatter()
 DEFAULT_CONFIG = [{"type": "core"}]
 
 
@@ -94,6 +99,8 @@ class JobMetrics:
         if plugin in self.plugin_classes:
             plugin_class = self.plugin_classes[plugin]
             formatter = plugin_class.formatter
+        elif plugin == LIFECYCLE_PLUGIN:
+            formatter = LIFECYCLE_FORMATTER
         else:
             formatter = DEFAULT_FORMATTER
         return formatter.format(key, value)
@@ -0,0 +1,203 @@
+"""Timing spans for the Galaxy side of a job's lifecycle.
+
+Job instrumenter plugins describe what happens on the compute node, the spans
+collected here describe where time goes inside Galaxy itself - waiting for
+and checking job readiness in the handler, preparing the job, building the
+command line, waiting at the destination and finishing the job.
+
+Spans are accumulated in memory on the job wrapper and persisted as numeric
+job metrics under the ``lifecycle`` plugin name when the job is finished, so
+they are exposed by the existing job metrics API and can be aggregated with
+plain SQL. When tracing is disabled the :data:`NULL_JOB_LIFECYCLE` object is
+used, all its operations are no-ops.
+"""
+
+import math
+import time
+from collections import defaultdict
+from contextlib import (
+    contextmanager,
+    nullcontext,
+)
+from typing import (
+    Any,
+    ContextManager,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from .formatting import (
+    FormattedMetric,
+    JobMetricFormatter,
+)
+
+LIFECYCLE_PLUGIN = "lifecycle"
+
+# time between job creation and the handler dispatching it to a runner
+HANDLER_WAIT = "handler_wait"
+# time spent in handler readiness checks (destination mapping, limits, quota)
+READY_CHECK = "ready_check"
+# time between dispatch and a runner worker thread picking the job up
+RUNNER_WAIT = "runner_wait"
+# JobWrapper.prepare - tool evaluation, working directory and config files
+PREPARE = "prepare"
+# BaseJobRunner.build_command_line - container resolution and command assembly
+BUILD_COMMAND_LINE = "build_command_line"
+# the runner's complete queue_job call (includes prepare and submission)
+QUEUE_JOB = "queue_job"
+# time between submission and Galaxy starting to finish the job
+DESTINATION = "destination"
+# DESTINATION minus the runtime recorded by the core job metrics plugin
+DESTINATION_QUEUE = "destination_queue"
+# dataset discovery or import of the extended metadata model store
+COLLECT_OUTPUTS = "collect_outputs"
+# per-output finishing, including setting metadata internally
+FINISH_DATASETS = "finish_datasets"
+# the complete JobWrapper.finish call
+FINISH = "finish"
+
+PHASE_TITLES = {
+    HANDLER_WAIT: "Waiting in Job Handler",
+    READY_CHECK: "Job Handler Readiness Checks",
+    RUNNER_WAIT: "Waiting for Runner Worker",
+    PREPARE: "Job Preparation",
+    BUILD_COMMAND_LINE: "Command Line Building",
+    QUEUE_JOB: "Job Runner Submission",
+    DESTINATION: "At Destination",
+    DESTINATION_QUEUE: "Queued at Destination",
+    COLLECT_OUTPUTS: "Output Collection",
+    FINISH_DATASETS: "Output Dataset Finishing",
+    FINISH: "Job Finishing",
+}
+
+DISPATCHED_MARK = "dispatched"
+SUBMITTED_MARK = "submitted"
+
+
+class JobLifecycleFormatter(JobMetricFormatter):
+    def format(self, key: str, value: Any) -> FormattedMetric:
+        title = PHASE_TITLES.get(key, key)
+        return FormattedMetric(f"Galaxy: {title}", f"{float(value):.3f} seconds")
+
+
+class JobLifecycleSpans:
+    """Accumulate durations (in seconds) of named lifecycle phases for one job."""
+
+    enabled = True
+
+    def __init__(self) -> None:
+        self._durations: Dict[str, float] = {}
+        self._marks: Dict[str, float] = {}
+
+    @contextmanager
+    def _span(self, phase: str) -> Iterator[None]:
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.add(phase, time.monotonic() - start)
+
+    def span(self, phase: str) -> ContextManager[None]:
+        """Time the enclosed block and add it to ``phase``."""
+        return self._span(phase)
+
+    def add(self, phase: str, seconds: float) -> None:
+        self._durations[phase] = self._durations.get(phase, 0.0) + max(seconds, 0.0)
+
+    def mark(self, name: str, at: Optional[float] = None) -> None:
+        """Record a wall clock timestamp so a later phase can be measured from it."""
+        self._marks[name] = time.time() if at is None else at
+
+    def add_since(self, phase: str, name: str) -> None:
+        """Add the time elapsed since mark ``name`` (if it was set) to ``phase``."""
+        start = self._marks.pop(name, None)
+        if start is not None:
+            self.add(phase, time.time() - start)
+
+    @property
+    def durations(self) -> Dict[str, float]:
+        return dict(self._durations)
+
+    def flush(self, has_metrics, runtime_seconds: Optional[float] = None) -> None:
+        """Store collected spans as ``lifecycle`` metrics on ``has_metrics`` and reset."""
+        durations = self._durations
+        if runtime_seconds is not None and DESTINATION in durations:
+            durations[DESTINATION_QUEUE] = max(durations[DESTINATION] - float(runtime_seconds), 0.0)
+        for phase, seconds in durations.items():
+            has_metrics.add_metric(LIFECYCLE_PLUGIN, phase, round(seconds, 6))
+        self._durations = {}
+
+
+class NullJobLifecycleSpans(JobLifecycleSpans):
+    """Drop-in replacement used when lifecycle tracing is disabled."""
+
+    enabled = False
+    _null_context: ContextManager[None] = nullcontext()
+
+    def span(self, phase: str) -> ContextManager[None]:
+        return self._null_context
+
+    def add(self, phase: str, seconds: float) -> None:
+        pass
+
+    def mark(self, name: str, at: Optional[float] = None) -> None:
+        pass
+
+    def add_since(self, phase: str, name: str) -> None:
+        pass
+
+    def flush(self, has_metrics, runtime_seconds: Optional[float] = None) -> None:
+        pass
+
+
+NULL_JOB_LIFECYCLE = NullJobLifecycleSpans()
+
+
+def job_lifecycle_spans(enabled: bool) -> JobLifecycleSpans:
+    return JobLifecycleSpans() if enabled else NULL_JOB_LIFECYCLE
+
+
+def percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    """Linearly interpolated percentile of an already sorted, non-empty sequence."""
+    if not sorted_values:
+        raise ValueError("Cannot compute percentile of an empty sequence")
+    position = (len(sorted_values) - 1) * fraction
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    if lower == upper:
+        return float(sorted_values[int(position)])
+    lower_value = float(sorted_values[lower])
+    upper_value = float(sorted_values[upper])
+    return lower_value + (upper_value - lower_value) * (position - lower)
+
+
+def summarize_phases(rows: Iterable[Tuple[Optional[str], Optional[str], str, Any]]) -> List[Dict[str, Any]]:
+    """Aggregate ``(tool_id, destination_id, phase, seconds)`` rows.
+
+    Returns one dictionary per tool, destination and phase with the count,
+    total, median and 95th percentile of the phase durations.
+    """
+    grouped: Dict[Tuple[Optional[str], Optional[str], str], List[float]] = defaultdict(list)
+    for tool_id, destination_id, phase, seconds in rows:
+        if seconds is not None:
+            grouped[(tool_id, destination_id, phase)].append(float(seconds))
+    summaries = []
+    for (tool_id, destination_id, phase), values in sorted(grouped.items(), key=lambda item: tuple(map(str, item[0]))):
+        values.sort()
+        summaries.append(
+            {
+                "tool_id": tool_id,
+                "destination_id": destination_id,
+                "phase": phase,
+                "count": len(values),
+                "total": sum(values),
+                "p50": percentile(values, 0.5),
+                "p95": percentile(values, 0.95),
+            }
+        )
+    return summaries
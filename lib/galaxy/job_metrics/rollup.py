@@ -0,0 +1,129 @@
+"""Mergeable summaries of numeric job metric values.
+
+A :class:`MetricRollup` keeps the count, sum, minimum and maximum of the
+values it has seen, together with a sparse histogram of log-scaled buckets
+(:data:`BUCKETS_PER_OCTAVE` buckets per doubling of the value). Rollups can be
+merged with each other, which lets Galaxy store one rollup per day, tool,
+destination and metric and still answer quantile queries over arbitrary date
+ranges without reading individual job metrics. Quantiles are estimated to
+within half a bucket width (about 9% relative error).
+"""
+
+import math
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+)
+
+BUCKETS_PER_OCTAVE = 4
+# values <= 0 are counted in a dedicated bucket
+ZERO_BUCKET = "z"
+
+
+def bucket_for(value: float) -> str:
+    if value <= 0:
+        return ZERO_BUCKET
+    return str(math.floor(math.log2(value) * BUCKETS_PER_OCTAVE))
+
+
+def bucket_midpoint(bucket: str) -> float:
+    if bucket == ZERO_BUCKET:
+        return 0.0
+    return 2 ** ((int(bucket) + 0.5) / BUCKETS_PER_OCTAVE)
+
+
+def _bucket_sort_key(bucket: str) -> Tuple[int, int]:
+    if bucket == ZERO_BUCKET:
+        return (0, 0)
+    return (1, int(bucket))
+
+
+class MetricRollup:
+    def __init__(
+        self,
+        count: int = 0,
+        total: float = 0.0,
+        minimum: Optional[float] = None,
+        maximum: Optional[float] = None,
+        histogram: Optional[Dict[str, int]] = None,
+    ):
+        self.count = count
+        self.total = total
+        self.minimum = minimum
+        self.maximum = maximum
+        self.histogram: Dict[str, int] = dict(histogram or {})
+
+    def add(self, value: float, count: int = 1) -> None:
+        value = float(value)
+        self.count += count
+        self.total += value * count
+        self.minimum = value if self.minimum is None else min(self.minimum, value)
+        self.maximum = value if self.maximum is None else max(self.maximum, value)
+        bucket = bucket_for(value)
+        self.histogram[bucket] = self.histogram.get(bucket, 0) + count
+
+    def merge(self, other: "MetricRollup") -> "MetricRollup":
+        if not other.count:
+            return self
+        self.count += other.count
+        self.total += other.total
+        if other.minimum is not None:
+            self.minimum = other.minimum if self.minimum is None else min(self.minimum, other.minimum)
+        if other.maximum is not None:
+            self.maximum = other.maximum if self.maximum is None else max(self.maximum, other.maximum)
+        for bucket, bucket_count in other.histogram.items():
+            self.histogram[bucket] = self.histogram.get(bucket, 0) + bucket_count
+        return self
+
+    @property
+    def mean(self) -> Optional[float]:
+        if not self.count:
+            return None
+        return self.total / self.count
+
+    def quantile(self, fraction: float) -> Optional[float]:
+        """Estimate the value below which ``fraction`` of the values fall."""
+        if not self.count:
+            return None
+        if fraction <= 0:
+            return self.minimum
+        if fraction >= 1:
+            return self.maximum
+        target = fraction * self.count
+        seen = 0
+        estimate = self.maximum
+        for bucket in sorted(self.histogram, key=_bucket_sort_key):
+            seen += self.histogram[bucket]
+            if seen >= target:
+                estimate = bucket_midpoint(bucket)
+                break
+        assert self.minimum is not None and self.maximum is not None and estimate is not None
+        return min(max(estimate, self.minimum), self.maximum)
+
+    def to_dict(self, quantiles: Iterable[float] = ()) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "min": self.minimum,
+            "max": self.maximum,
+            "mean": self.mean,
+            "quantiles": {str(q): self.quantile(q) for q in quantiles},
+        }
+
+
+def rollup_values(values: Iterable[float]) -> MetricRollup:
+    rollup = MetricRollup()
+    for value in values:
+        rollup.add(value)
+    return rollup
+
+
+def merge_rollups(rollups: List[MetricRollup]) -> MetricRollup:
+    merged = MetricRollup()
+    for rollup in rollups:
+        merged.merge(rollup)
+    return merged
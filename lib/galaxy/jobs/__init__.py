@@ -53,6 +53,8 @@ from galaxy.job_execution.setup import (
     TOOL_PROVIDED_JOB_METADATA_FILE,
     TOOL_PROVIDED_JOB_METADATA_KEYS,
 )
+from galaxy.job_metrics import lifecycle
+from galaxy.job_metrics.instrumenters.core import RUNTIME_SECONDS_KEY
 from galaxy.jobs.mapper import (
     JobMappingException,
     JobRunnerMapper,
@@ -61,6 +63,7 @@ from galaxy.jobs.runners import (
     BaseJobRunner,
     JobState,
 )
+from galaxy.managers.job_metric_rollups import record_job_metrics
 from galaxy.metadata import get_metadata_compute_strategy
 from galaxy.model import (
     Job,
@@ -1021,6 +1024,10 @@ class MinimalJobWrapper(HasResourceParameters):
         if job.params:
             self.params = loads(job.params)
         self.runner_command_line = None
+        # Set by the runner's preparation workers, see BaseJobRunner.prepare_ahead
+        self.prepared_ahead = False
+        # Timing spans of the Galaxy side of the job lifecycle, no-ops unless job_lifecycle_tracing is enabled
+        self.lifecycle = lifecycle.job_lifecycle_spans(self.app.config.job_lifecycle_tracing)
 
         # Wrapper holding the info required to restore and clean up from files used for setting metadata externally
         self.__external_output_metadata = None
@@ -1283,6 +1290,7 @@ class MinimalJobWrapper(HasResourceParameters):
         self.sa_session.add(job)
         with transaction(self.sa_session):
             self.sa_session.commit()
+        self.lifecycle.add(lifecycle.PREPARE, prepare_timer.elapsed)
         log.debug(f"Job wrapper for Job [{job.id}] prepared {prepare_timer}")
 
     def _setup_working_directory(self, job=None):
@@ -1401,6 +1409,7 @@ class MinimalJobWrapper(HasResourceParameters):
         Indicate job failure by setting state and message on all output
         datasets.
         """
+        self.lifecycle.add_since(lifecycle.DESTINATION, lifecycle.SUBMITTED_MARK)
         job = self.get_job()
         self.sa_session.refresh(job)
 
@@ -1474,6 +1483,7 @@ class MinimalJobWrapper(HasResourceParameters):
             job.set_final_state(
                 job.states.ERROR, supports_skip_locked=self.app.application_stack.supports_skip_locked()
             )
+            self._collect_lifecycle_metrics(job)
             job.command_line = self.command_line
             job.info = message
             # TODO: Put setting the stdout, stderr, and exit code in one place
@@ -1846,6 +1856,7 @@ class MinimalJobWrapper(HasResourceParameters):
         finish_timer = self.app.execution_timer_factory.get_timer(
             "internals.galaxy.jobs.job_wrapper_finish", "job_wrapper.finish for job ${job_id} executed"
         )
+        self.lifecycle.add_since(lifecycle.DESTINATION, lifecycle.SUBMITTED_MARK)
 
         # default post job setup
         job = self.get_job()
@@ -1939,7 +1950,8 @@ class MinimalJobWrapper(HasResourceParameters):
                     user=job.user,
                     tag_handler=self.app.tag_handler.create_tag_handler_session(job.galaxy_session),
                 )
-                import_model_store.perform_import(history=job.history, job=job)
+                with self.lifecycle.span(lifecycle.COLLECT_OUTPUTS):
+                    import_model_store.perform_import(history=job.history, job=job)
                 if job.state == job.states.ERROR:
                     final_job_state = job.state
             except store.FileTracebackException as e:
@@ -1960,7 +1972,8 @@ class MinimalJobWrapper(HasResourceParameters):
         if not extended_metadata:
             # importing metadata will discover outputs if extended metadata
             try:
-                self.discover_outputs(job, inp_data, out_data, out_collections, final_job_state=final_job_state)
+                with self.lifecycle.span(lifecycle.COLLECT_OUTPUTS):
+                    self.discover_outputs(job, inp_data, out_data, out_collections, final_job_state=final_job_state)
             except MaxDiscoveredFilesExceededError as e:
                 final_job_state = job.states.ERROR
                 job.job_messages = [
@@ -1990,7 +2003,10 @@ class MinimalJobWrapper(HasResourceParameters):
                     output_name = dataset_assoc.name
 
                     # Handles retry internally on error for instance...
-                    self._finish_dataset(output_name, dataset, job, context, final_job_state, remote_metadata_directory)
+                    with self.lifecycle.span(lifecycle.FINISH_DATASETS):
+                        self._finish_dataset(
+                            output_name, dataset, job, context, final_job_state, remote_metadata_directory
+                        )
                 if (
                     not final_job_state == job.states.ERROR
                     and not dataset_assoc.dataset.dataset.state == job.states.ERROR
@@ -2082,8 +2098,12 @@ class MinimalJobWrapper(HasResourceParameters):
         if not job.tasks:
             # If job was composed of tasks, don't attempt to recollect statistics
             self._collect_metrics(job, job_metrics_directory)
+        self.lifecycle.add(lifecycle.FINISH, finish_timer.elapsed)
+        self._collect_lifecycle_metrics(job)
         with transaction(self.sa_session):
             self.sa_session.commit()
+        if self.app.config.enable_job_metric_rollups and job.state == job.states.OK:
+            record_job_metrics(self.sa_session, job)
         if job.state == job.states.ERROR:
             self._report_error()
         elif task_wrapper:
@@ -2182,6 +2202,15 @@ class MinimalJobWrapper(HasResourceParameters):
                 if metric_value is not None:
                     has_metrics.add_metric(plugin, metric_name, metric_value)
 
+    def _collect_lifecycle_metrics(self, job):
+        if not self.lifecycle.enabled:
+            return
+        runtime_seconds = None
+        for metric in job.numeric_metrics:
+            if metric.plugin == "core" and metric.metric_name == RUNTIME_SECONDS_KEY:
+                runtime_seconds = metric.metric_value
+        self.lifecycle.flush(job, runtime_seconds=runtime_seconds)
+
     def get_output_sizes(self):
         sizes = []
         output_paths = self.job_io.get_output_fnames()
@@ -31,6 +31,7 @@ from sqlalchemy.sql.expression import (
 
 from galaxy import model
 from galaxy.exceptions import ObjectNotFound
+from galaxy.job_metrics import lifecycle
 from galaxy.jobs import (
     JobDestination,
     JobWrapper,
@@ -520,7 +521,10 @@ class JobHandlerQueue(BaseJobHandlerQueue):
             jw = self.__recover_job_wrapper(job)
             if jw.is_ready_for_resubmission(job):
                 self.increase_running_job_count(job.user_id, jw.job_destination.id)
+                jw.lifecycle.mark(lifecycle.DISPATCHED_MARK)
                 self.dispatcher.put(jw)
+        # Evaluate the quotas of all users with waiting jobs at once
+        self.__prefetch_quotas(jobs_to_check)
         # Iterate over new and waiting jobs and look for any that are
         # ready to run
         new_waiting_jobs = []
@@ -553,7 +557,9 @@ class JobHandlerQueue(BaseJobHandlerQueue):
                 elif job_state == JOB_INPUT_DELETED:
                     log.info("(%d) Job unable to run: one or more inputs deleted" % job.id)
                 elif job_state == JOB_READY:
-                    self.dispatcher.put(self.job_wrappers.pop(job.id))
+                    job_wrapper = self.job_wrappers.pop(job.id)
+                    self.__mark_dispatched(job, job_wrapper)
+                    self.dispatcher.put(job_wrapper)
                     log.info("(%d) Job dispatched" % job.id)
                 elif job_state == JOB_DELETED:
                     log.info("(%d) Job deleted by user while still queued" % job.id)
@@ -591,6 +597,22 @@ class JobHandlerQueue(BaseJobHandlerQueue):
         with transaction(self.sa_session):
             self.sa_session.commit()
 
+    def __prefetch_quotas(self, jobs):
+        """
+        Load the quotas of the owners of the supplied jobs for every quota
+        source with one query per quota source, so that the per job quota
+        checks are answered from the quota agent's cache.
+        """
+        user_ids = {job.user_id for job in jobs if job.user_id is not None}
+        if not user_ids or not self.app.config.enable_quotas:
+            return
+        try:
+            quota_source_labels = self.app.object_store.get_quota_source_map().get_quota_source_labels()
+            for quota_source_label in {None, *quota_source_labels}:
+                self.app.quota_agent.get_quotas(user_ids, quota_source_label=quota_source_label)
+        except Exception:
+            log.exception("Failed to prefetch quotas, falling back to checking quotas per job")
+
     def __filter_jobs_with_invalid_input_states(self, jobs):
         """
         Takes  list of jobs and filters out jobs whose input datasets are in invalid state and
@@ -699,7 +721,8 @@ class JobHandlerQueue(BaseJobHandlerQueue):
         # If state == JOB_READY, assume job_destination also set - otherwise
         # in case of various error or cancelled states do not assume
         # destination has been set.
-        state, job_destination = self.__verify_job_ready(job, job_wrapper)
+        with job_wrapper.lifecycle.span(lifecycle.READY_CHECK):
+            state, job_destination = self.__verify_job_ready(job, job_wrapper)
 
         if state == JOB_READY:
             # PASS.  increase usage by one job (if caching) so that multiple jobs aren't dispatched on this queue iteration
@@ -710,6 +733,12 @@ class JobHandlerQueue(BaseJobHandlerQueue):
                     job_to_input_dataset_association.dataset_version = job_to_input_dataset_association.dataset.version
         return state
 
+    def __mark_dispatched(self, job, job_wrapper):
+        if job_wrapper.lifecycle.enabled and job.create_time:
+            waited = datetime.datetime.utcnow() - job.create_time
+            job_wrapper.lifecycle.add(lifecycle.HANDLER_WAIT, waited.total_seconds())
+        job_wrapper.lifecycle.mark(lifecycle.DISPATCHED_MARK)
+
     def __verify_job_ready(self, job, job_wrapper):
         """Compute job destination and verify job is ready at that
         destination by checking job limits and quota. If this method
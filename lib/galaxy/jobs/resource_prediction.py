@@ -0,0 +1,247 @@
+"""Predict the resources a job will need from the metrics of earlier jobs.
+
+For every tool a :class:`ResourceModel` is fitted to the most recent
+successful jobs of that tool. The model is a least squares fit of the
+logarithm of the resource usage against the logarithm of the total input
+size, quantiles are estimated from the residuals of that fit. Tools whose
+usage does not depend on the input size end up with a flat model that just
+reproduces the empirical quantiles of the observed usage.
+
+Fitted models are cached in memory by :class:`JobResourcePredictor`, which is
+exposed to dynamic job rules through
+:meth:`galaxy.jobs.rule_helper.RuleHelper.predict_resource`.
+"""
+
+import logging
+import math
+import threading
+import time
+from typing import (
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from sqlalchemy import (
+    and_,
+    func,
+    or_,
+    select,
+)
+
+from galaxy import model
+from galaxy.job_metrics.lifecycle import percentile
+
+log = logging.getLogger(__name__)
+
+RUNTIME = "runtime_seconds"
+MEMORY = "memory_bytes"
+
+# (plugin, metric_name) pairs a resource is read from, the maximum is used if a
+# job recorded several of them.
+RESOURCE_METRICS: Dict[str, Tuple[Tuple[str, str], ...]] = {
+    RUNTIME: (("core", "runtime_seconds"),),
+    MEMORY: (("cgroup", "memory.peak"), ("cgroup", "memory.max_usage_in_bytes")),
+}
+
+DEFAULT_MIN_SAMPLES = 20
+
+
+class ResourceSample(NamedTuple):
+    input_size: float
+    value: float
+
+
+def _log(value: float) -> float:
+    # Sizes and usages below 1 (byte, second) carry no information for the fit.
+    return math.log(max(value, 1.0))
+
+
+class ResourceModel:
+    """Quantile estimates of a resource as a function of the total input size."""
+
+    def __init__(self, intercept: float, slope: float, residuals: Sequence[float]):
+        self.intercept = intercept
+        self.slope = slope
+        self.residuals = sorted(residuals)
+
+    @property
+    def sample_count(self) -> int:
+        return len(self.residuals)
+
+    @classmethod
+    def fit(
+        cls, samples: Sequence[ResourceSample], min_samples: int = DEFAULT_MIN_SAMPLES
+    ) -> Optional["ResourceModel"]:
+        """Fit a model to ``samples``, returns ``None`` if there are fewer than ``min_samples`` samples."""
+        if not samples or len(samples) < min_samples:
+            return None
+        xs = [_log(sample.input_size) for sample in samples]
+        ys = [_log(sample.value) for sample in samples]
+        mean_x = sum(xs) / len(xs)
+        mean_y = sum(ys) / len(ys)
+        variance_x = sum((x - mean_x) ** 2 for x in xs)
+        slope = 0.0
+        if variance_x > 0:
+            slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / variance_x
+            # Never predict less for bigger inputs, a negative slope is noise
+            # and would under-allocate the largest jobs.
+            slope = max(slope, 0.0)
+        intercept = mean_y - slope * mean_x
+        residuals = [y - (intercept + slope * x) for x, y in zip(xs, ys)]
+        return cls(intercept, slope, residuals)
+
+    def predict(self, input_size: float, quantile: float = 0.95) -> float:
+        """Return the usage that ``quantile`` of jobs with ``input_size`` bytes of input are expected to stay below."""
+        residual = percentile(self.residuals, quantile)
+        return math.exp(self.intercept + self.slope * _log(input_size) + residual)
+
+
+def job_input_size(job: model.Job) -> int:
+    """Return the total size in bytes of the input datasets of ``job``."""
+    total = 0
+    for assoc in job.input_datasets:
+        if assoc.dataset is not None:
+            total += assoc.dataset.get_size() or 0
+    return total
+
+
+class JobResourcePredictor:
+    """Fit and cache per-tool :class:`ResourceModel` objects from the job metrics in the database."""
+
+    def __init__(
+        self,
+        sa_session,
+        cache_time: int = 3600,
+        training_jobs: int = 1000,
+        min_samples: int = DEFAULT_MIN_SAMPLES,
+    ):
+        self.sa_session = sa_session
+        self.cache_time = cache_time
+        self.training_jobs = training_jobs
+        self.min_samples = min_samples
+        self._models: Dict[Tuple[str, str], Tuple[float, Optional[ResourceModel]]] = {}
+        self._lock = threading.Lock()
+
+    def predict(self, job: model.Job, resource: str, quantile: float = 0.95) -> Optional[float]:
+        """Predict ``resource`` for ``job``, ``None`` if there is not enough history for its tool."""
+        resource_model = self.model_for(job.tool_id, resource)
+        if resource_model is None:
+            return None
+        return resource_model.predict(job_input_size(job), quantile)
+
+    def model_for(self, tool_id: str, resource: str) -> Optional[ResourceModel]:
+        if resource not in RESOURCE_METRICS:
+            raise ValueError(f"Unknown resource [{resource}], must be one of {sorted(RESOURCE_METRICS)}")
+        key = (tool_id, resource)
+        now = time.monotonic()
+        with self._lock:
+            cached = self._models.get(key)
+        if cached is not None and now - cached[0] < self.cache_time:
+            return cached[1]
+        resource_model = ResourceModel.fit(self.training_samples(tool_id, resource), self.min_samples)
+        with self._lock:
+            self._models[key] = (now, resource_model)
+        return resource_model
+
+    def clear_cache(self) -> None:
+        with self._lock:
+            self._models.clear()
+
+    def training_samples(self, tool_id: str, resource: str) -> List[ResourceSample]:
+        """Collect input sizes and usage of the most recent successful jobs of ``tool_id``."""
+        metric_filter = or_(
+            *(
+                and_(model.JobMetricNumeric.plugin == plugin, model.JobMetricNumeric.metric_name == metric_name)
+                for plugin, metric_name in RESOURCE_METRICS[resource]
+            )
+        )
+        jobs_subquery = (
+            select(model.Job.id)
+            .where(model.Job.tool_id == tool_id, model.Job.state == model.Job.states.OK)
+            .order_by(model.Job.id.desc())
+            .limit(self.training_jobs)
+            .subquery()
+        )
+        usage: Dict[int, float] = {}
+        stmt = (
+            select(model.JobMetricNumeric.job_id, model.JobMetricNumeric.metric_value)
+            .join(jobs_subquery, jobs_subquery.c.id == model.JobMetricNumeric.job_id)
+            .where(metric_filter)
+        )
+        for job_id, metric_value in self.sa_session.execute(stmt):
+            if metric_value is not None:
+                usage[job_id] = max(usage.get(job_id, 0.0), float(metric_value))
+        if not usage:
+            return []
+        sizes_stmt = (
+            select(model.JobToInputDatasetAssociation.job_id, func.sum(model.Dataset.file_size))
+            .join(
+                model.HistoryDatasetAssociation,
+                model.HistoryDatasetAssociation.id == model.JobToInputDatasetAssociation.dataset_id,
+            )
+            .join(model.Dataset, model.Dataset.id == model.HistoryDatasetAssociation.dataset_id)
+            .where(model.JobToInputDatasetAssociation.job_id.in_(list(usage)))
+            .group_by(model.JobToInputDatasetAssociation.job_id)
+        )
+        sizes = {job_id: float(size or 0) for job_id, size in self.sa_session.execute(sizes_stmt)}
+        return [ResourceSample(sizes.get(job_id, 0.0), value) for job_id, value in usage.items()]
+
+
+class EvaluationResult(NamedTuple):
+    tool_id: str
+    test_count: int
+    # fraction of test jobs whose usage did not exceed the prediction
+    coverage: float
+    # mean of prediction / usage over the test jobs
+    allocation_ratio: float
+    baseline_coverage: float
+    baseline_allocation_ratio: float
+
+
+def evaluate(
+    samples_by_tool: Dict[str, List[ResourceSample]],
+    quantile: float = 0.95,
+    train_fraction: float = 0.8,
+    min_samples: int = DEFAULT_MIN_SAMPLES,
+) -> Iterable[EvaluationResult]:
+    """Evaluate models offline on exported samples.
+
+    The samples of each tool must be in chronological order, the first
+    ``train_fraction`` of them are used for fitting and the rest for testing.
+    The baseline is a size-independent model, i.e. the empirical quantile of
+    the training usage, which is roughly what a static allocation tuned on
+    history would achieve.
+    """
+    for tool_id, samples in sorted(samples_by_tool.items()):
+        split = int(len(samples) * train_fraction)
+        train, test = samples[:split], samples[split:]
+        if not test:
+            continue
+        resource_model = ResourceModel.fit(train, min_samples)
+        baseline = ResourceModel.fit([ResourceSample(0, sample.value) for sample in train], min_samples)
+        if resource_model is None or baseline is None:
+            continue
+        predictions = [resource_model.predict(sample.input_size, quantile) for sample in test]
+        baseline_prediction = baseline.predict(0, quantile)
+        yield EvaluationResult(
+            tool_id=tool_id,
+            test_count=len(test),
+            coverage=_coverage(predictions, test),
+            allocation_ratio=_allocation_ratio(predictions, test),
+            baseline_coverage=_coverage([baseline_prediction] * len(test), test),
+            baseline_allocation_ratio=_allocation_ratio([baseline_prediction] * len(test), test),
+        )
+
+
+def _coverage(predictions: Sequence[float], samples: Sequence[ResourceSample]) -> float:
+    return sum(1 for prediction, sample in zip(predictions, samples) if sample.value <= prediction) / len(samples)
+
+
+def _allocation_ratio(predictions: Sequence[float], samples: Sequence[ResourceSample]) -> float:
+    ratios = [prediction / max(sample.value, 1.0) for prediction, sample in zip(predictions, samples)]
+    return sum(ratios) / len(ratios)
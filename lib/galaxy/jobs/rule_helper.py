@@ -1,5 +1,6 @@
 import hashlib
 import logging
+import math
 import random
 from datetime import datetime
 
@@ -9,6 +10,10 @@ from galaxy import (
     model,
     util,
 )
+from galaxy.jobs.resource_prediction import (
+    MEMORY,
+    RUNTIME,
+)
 from galaxy.tool_util.deps.dependencies import ToolInfo
 
 log = logging.getLogger(__name__)
@@ -72,6 +77,33 @@ class RuleHelper:
         """
         return self.supports_container(job_or_tool, container_type="singularity")
 
+    def predict_resource(self, job_or_wrapper, resource, quantile=0.95, default=None):
+        """Estimate the resources a job will use from earlier successful jobs of the same tool.
+
+        Models are fitted on the job metrics recorded for recent jobs of the
+        tool and the total input size of the job, so the ``core`` and (for
+        memory) ``cgroup`` job metrics plugins need to be enabled.
+
+        :param job_or_wrapper: the job (or job wrapper) to estimate resources for.
+        :param resource: ``runtime_seconds`` or ``memory_bytes``.
+        :param quantile: fraction of similar jobs expected to stay within the returned value.
+        :param default: value to return if there is not enough history for the tool.
+        :return: the estimated walltime in seconds or peak memory in bytes.
+        """
+        job = job_or_wrapper.get_job() if hasattr(job_or_wrapper, "get_job") else job_or_wrapper
+        prediction = self.app.job_resource_predictor.predict(job, resource, quantile=quantile)
+        return default if prediction is None else prediction
+
+    def predict_memory_mb(self, job_or_wrapper, quantile=0.95, default=None):
+        """Estimate the peak memory of a job in MB, see ``predict_resource``."""
+        prediction = self.predict_resource(job_or_wrapper, MEMORY, quantile=quantile)
+        return default if prediction is None else int(math.ceil(prediction / 1024**2))
+
+    def predict_walltime_seconds(self, job_or_wrapper, quantile=0.95, default=None):
+        """Estimate the runtime of a job in seconds, see ``predict_resource``."""
+        prediction = self.predict_resource(job_or_wrapper, RUNTIME, quantile=quantile)
+        return default if prediction is None else int(math.ceil(prediction))
+
     def job_count(self, **kwds):
         query = self.query(model.Job)
         return self._filter_job_query(query, **kwds).count()
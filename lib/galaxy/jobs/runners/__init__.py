@@ -33,6 +33,7 @@ from galaxy.job_execution.output_collect import (
     default_exit_code_file,
     read_exit_code_from,
 )
+from galaxy.job_metrics import lifecycle
 from galaxy.jobs.command_factory import build_command
 from galaxy.jobs.runners.util import runner_states
 from galaxy.jobs.runners.util.env import env_to_statement
@@ -102,7 +103,13 @@ class BaseJobRunner:
     runner_name = "BaseJobRunner"
 
     start_methods = ["_init_monitor_thread", "_init_worker_threads"]
-    DEFAULT_SPECS = dict(recheck_missing_job_retries=dict(map=int, valid=lambda x: int(x) >= 0, default=0))
+    DEFAULT_SPECS = dict(
+        recheck_missing_job_retries=dict(map=int, valid=lambda x: int(x) >= 0, default=0),
+        prepare_workers=dict(map=int, valid=lambda x: int(x) >= 0, default=0),
+    )
+    # Whether jobs can be prepared with the default compute environment ahead
+    # of ``queue_job`` by separate preparation workers (see ``prepare_ahead``).
+    supports_prepare_ahead = True
 
     def __init__(self, app: "GalaxyManagerApplication", nworkers: int, **kwargs):
         """Start the job runner"""
@@ -124,7 +131,7 @@ class BaseJobRunner:
             getattr(self, start_method, lambda: None)()
 
     def _init_worker_threads(self):
-        """Start ``nworkers`` worker threads."""
+        """Start ``nworkers`` worker threads and ``prepare_workers`` preparation threads."""
         self.work_queue = Queue()
         self.work_threads = []
         log.debug(f"Starting {self.nworkers} {self.runner_name} workers")
@@ -133,24 +140,46 @@ class BaseJobRunner:
             worker.daemon = True
             worker.start()
             self.work_threads.append(worker)
+        self.prepare_queue: Optional[Queue] = None
+        self.prepare_threads = []
+        prepare_workers = self.runner_params["prepare_workers"]
+        if prepare_workers and not self.supports_prepare_ahead:
+            log.warning(f"{self.runner_name} does not support the prepare_workers parameter, ignoring it")
+        elif prepare_workers:
+            # Preparing jobs (tool evaluation, command line templating, config
+            # files) is much more expensive than submitting them, keep these
+            # stages apart so a burst of jobs does not starve submission.
+            self.prepare_queue = Queue()
+            log.debug(f"Starting {prepare_workers} {self.runner_name} preparation workers")
+            for i in range(prepare_workers):
+                worker = threading.Thread(
+                    name="%s.prepare_thread-%d" % (self.runner_name, i),
+                    target=self.run_next,
+                    args=(self.prepare_queue,),
+                )
+                worker.daemon = True
+                worker.start()
+                self.prepare_threads.append(worker)
 
     def _alive_worker_threads(self, cycle=False):
         # yield endlessly as long as there are alive threads if cycle is True
         alive = True
         while alive:
             alive = False
-            for thread in self.work_threads:
+            for thread in self.work_threads + self.prepare_threads:
                 if thread.is_alive():
                     if cycle:
                         alive = True
                     yield thread
 
-    def run_next(self):
+    def run_next(self, work_queue: Optional[Queue] = None):
         """Run the next item in the work queue (a job waiting to run)"""
+        if work_queue is None:
+            work_queue = self.work_queue
         while self._should_stop is False:
             with self.app.model.session():  # Create a Session instance and ensure it's closed.
                 try:
-                    (method, arg) = self.work_queue.get(timeout=1)
+                    (method, arg) = work_queue.get(timeout=1)
                 except Empty:
                     continue
                 if method is STOP_SIGNAL:
@@ -178,6 +207,9 @@ class BaseJobRunner:
                         f"internals.{action_str}", f"job runner action {action_str} for job ${{job_id}} executed"
                     )
                     method(arg)
+                    if name == "queue_job" and not isinstance(arg, JobState):
+                        arg.lifecycle.add(lifecycle.QUEUE_JOB, action_timer.elapsed)
+                        arg.lifecycle.mark(lifecycle.SUBMITTED_MARK)
                     log.trace(action_timer.to_str(job_id=job_id))
                 except Exception:
                     log.exception(f"({job_id}) Unhandled exception calling {name}")
@@ -220,14 +252,42 @@ class BaseJobRunner:
             log.debug(f"Job [{job_wrapper.job_id}] queued {put_timer}")
 
     def mark_as_queued(self, job_wrapper: "MinimalJobWrapper"):
+        if self.prepare_queue is not None:
+            self.prepare_queue.put((self.prepare_ahead, job_wrapper))
+        else:
+            self.work_queue.put((self.queue_job, job_wrapper))
+
+    def prepare_ahead(self, job_wrapper: "MinimalJobWrapper"):
+        """Prepare a job in a preparation worker and hand it over to the worker threads for submission.
+
+        ``prepare_job`` skips ``job_wrapper.prepare()`` for jobs prepared here,
+        jobs that are no longer queued are passed on unprepared so that
+        ``prepare_job`` can deal with them as usual.
+        """
+        job_wrapper.lifecycle.add_since(lifecycle.RUNNER_WAIT, lifecycle.DISPATCHED_MARK)
+        if job_wrapper.get_state() == model.Job.states.QUEUED:
+            try:
+                job_wrapper.prepare()
+            except Exception as e:
+                log.exception("(%s) Failure preparing job", job_wrapper.get_id_tag())
+                job_wrapper.fail(unicodify(e), exception=True)
+                return
+            job_wrapper.prepared_ahead = True
         self.work_queue.put((self.queue_job, job_wrapper))
 
     def shutdown(self):
         """Attempts to gracefully shut down the worker threads"""
-        log.info("%s: Sending stop signal to %s job worker threads", self.runner_name, len(self.work_threads))
+        log.info(
+            "%s: Sending stop signal to %s job worker threads",
+            self.runner_name,
+            len(self.work_threads) + len(self.prepare_threads),
+        )
         self._should_stop = True
         for _ in range(len(self.work_threads)):
             self.work_queue.put((STOP_SIGNAL, None))
+        if self.prepare_queue is not None:
+            for _ in range(len(self.prepare_threads)):
+                self.prepare_queue.put((STOP_SIGNAL, None))
 
         if (join_timeout := self.app.config.monitor_thread_join_timeout) > 0:
             log.info("Waiting up to %d seconds for job worker threads to shutdown...", join_timeout)
@@ -284,6 +344,7 @@ class BaseJobRunner:
     ):
         """Some sanity checks that all runners' queue_job() methods are likely to want to do"""
         job_id = job_wrapper.get_id_tag()
+        job_wrapper.lifecycle.add_since(lifecycle.RUNNER_WAIT, lifecycle.DISPATCHED_MARK)
         job_state = job_wrapper.get_state()
         job_wrapper.runner_command_line = None
 
@@ -300,14 +361,18 @@ class BaseJobRunner:
 
         # Prepare the job
         try:
-            job_wrapper.prepare()
-            job_wrapper.runner_command_line = self.build_command_line(
-                job_wrapper,
-                include_metadata=include_metadata,
-                include_work_dir_outputs=include_work_dir_outputs,
-                modify_command_for_container=modify_command_for_container,
-                stream_stdout_stderr=stream_stdout_stderr,
-            )
+            if job_wrapper.prepared_ahead:
+                job_wrapper.prepared_ahead = False
+            else:
+                job_wrapper.prepare()
+            with job_wrapper.lifecycle.span(lifecycle.BUILD_COMMAND_LINE):
+                job_wrapper.runner_command_line = self.build_command_line(
+                    job_wrapper,
+                    include_metadata=include_metadata,
+                    include_work_dir_outputs=include_work_dir_outputs,
+                    modify_command_for_container=modify_command_for_container,
+                    stream_stdout_stderr=stream_stdout_stderr,
+                )
         except Exception as e:
             log.exception("(%s) Failure preparing job", job_id)
             job_wrapper.fail(unicodify(e), exception=True)
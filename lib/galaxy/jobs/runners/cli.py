@@ -33,9 +33,9 @@ class ShellJobRunner(AsynchronousJobRunner):
 
     runner_name = "ShellRunner"
 
-    def __init__(self, app, nworkers):
+    def __init__(self, app, nworkers, **kwargs):
         """Start the job runner"""
-        super().__init__(app, nworkers)
+        super().__init__(app, nworkers, **kwargs)
 
         self.cli_interface = CliInterface()
 
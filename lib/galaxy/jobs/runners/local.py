@@ -47,7 +47,7 @@ class LocalJobRunner(BaseJobRunner):
 
     runner_name = "LocalRunner"
 
-    def __init__(self, app, nworkers):
+    def __init__(self, app, nworkers, **kwargs):
         """Start the job runner"""
 
         self._proc_lock = threading.Lock()
@@ -55,7 +55,7 @@ class LocalJobRunner(BaseJobRunner):
 
         self._environ = new_clean_env()
 
-        super().__init__(app, nworkers)
+        super().__init__(app, nworkers, **kwargs)
 
     def _command_line(self, job_wrapper: "MinimalJobWrapper") -> Tuple[str, str]:
         """ """
@@ -93,7 +93,7 @@ class PBSJobRunner(AsynchronousJobRunner):
 
     runner_name = "PBSRunner"
 
-    def __init__(self, app, nworkers):
+    def __init__(self, app, nworkers, **kwargs):
         """Start the job runner"""
         # Check if PBS was importable, fail if not
         assert pbs is not None, PBS_IMPORT_MESSAGE
@@ -107,7 +107,7 @@ class PBSJobRunner(AsynchronousJobRunner):
         self.default_pbs_server  # noqa: B018 this is a method with a property decorator, so this causes the default server to be set
 
         # Proceed with general initialization
-        super().__init__(app, nworkers)
+        super().__init__(app, nworkers, **kwargs)
 
     @property
     def default_pbs_server(self):
@@ -202,6 +202,8 @@ class PulsarJobRunner(AsynchronousJobRunner):
 
     start_methods = ["_init_worker_threads", "_init_client_manager", "_monitor"]
     runner_name = "PulsarJobRunner"
+    # Jobs are prepared against the remote compute environment in queue_job
+    supports_prepare_ahead = False
     default_build_pulsar_app = False
     use_mq = False
     poll = True
@@ -1242,7 +1242,7 @@ class ModelFilterParser(HasAModelManager):
         Split `id_list_string` at `sep` and decode as ids.
         """
         # TODO: move id decoding out
-        id_list = [self.app.security.decode_id(id_) for id_ in id_list_string.split(sep)]
+        id_list = self.app.security.decode_ids(id_list_string.split(sep))
         return id_list
 
     def parse_int_list(self, int_list_string, sep=","):
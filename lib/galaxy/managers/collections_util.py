@@ -79,6 +79,7 @@ def validate_input_element_identifiers(element_identifiers):
 def get_hda_and_element_identifiers(dataset_collection_instance):
     name = dataset_collection_instance.name
     collection = dataset_collection_instance.collection
+    collection.load_elements()
     return get_collection(collection, name=name)
 
 
@@ -140,6 +141,9 @@ def dictify_dataset_collection_instance(
     )
     if view in ["element", "element-reference"]:
         collection = dataset_collection_instance.collection
+        if fuzzy_count is None:
+            # All elements are serialized, load them at once instead of level by level
+            collection.load_elements()
         rank_fuzzy_counts = gen_rank_fuzzy_counts(collection.collection_type, fuzzy_count)
         elements, rest_fuzzy_counts = get_fuzzy_count_elements(collection, rank_fuzzy_counts)
         if view == "element":
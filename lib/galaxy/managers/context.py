@@ -249,7 +249,7 @@ class ProvidesUserContext(ProvidesAppContext):
 
     def get_current_user_roles(self) -> List[Role]:
         if user := self.user:
-            roles = user.all_roles()
+            roles = self.app.security_agent.get_user_roles(user)
         else:
             roles = []
         return roles
@@ -159,39 +159,30 @@ class DatasetManager(base.ModelManager[Dataset], secured.AccessibleManagerMixin,
             sa_session.commit()
 
     def compute_hash(self, request: ComputeDatasetHashTaskRequest):
-        # For files in extra_files_path
         dataset = self.by_id(request.dataset_id)
+        hash_function = request.hash_function
         extra_files_path = request.extra_files_path
+        sa_session = self.session()
+        if get_dataset_hash(sa_session, dataset.id, hash_function, extra_files_path) is not None:
+            # e.g. calculated while the dataset was uploaded, avoid reading the file back from the object store
+            log.debug("Duplicated dataset hash request, no update to the database.")
+            return
+        # For files in extra_files_path
         if extra_files_path:
             extra_dir = dataset.extra_files_path_name
             file_path = self.app.object_store.get_filename(dataset, extra_dir=extra_dir, alt_name=extra_files_path)
         else:
             file_path = dataset.get_file_name()
-        hash_function = request.hash_function
         calculated_hash_value = memory_bound_hexdigest(hash_func_name=hash_function, path=file_path)
-        extra_files_path = request.extra_files_path
         dataset_hash = model.DatasetHash(
             hash_function=hash_function,
             hash_value=calculated_hash_value,
             extra_files_path=extra_files_path,
         )
         dataset_hash.dataset = dataset
-        # TODO: replace/update if the combination of dataset_id/hash_function has already
-        # been stored.
-        sa_session = self.session()
-        hash = get_dataset_hash(sa_session, dataset.id, hash_function, extra_files_path)
-        if hash is None:
-            sa_session.add(dataset_hash)
-            with transaction(sa_session):
-                sa_session.commit()
-        else:
-            old_hash_value = hash.hash_value
-            if old_hash_value != calculated_hash_value:
-                log.warning(
-                    f"Re-calculated dataset hash for dataset [{dataset.id}] and new hash value [{calculated_hash_value}] does not equal previous hash value [{old_hash_value}]."
-                )
-            else:
-                log.debug("Duplicated dataset hash request, no update to the database.")
+        sa_session.add(dataset_hash)
+        with transaction(sa_session):
+            sa_session.commit()
 
     # TODO: implement above for groups
     # TODO: datatypes?
@@ -313,8 +304,8 @@ class DatasetSerializer(base.ModelSerializer[DatasetManager], deletable.Purgable
         management_permissions = self.dataset_manager.permissions.manage.by_dataset(dataset)
         access_permissions = self.dataset_manager.permissions.access.by_dataset(dataset)
         permissions = {
-            "manage": [self.app.security.encode_id(perm.role.id) for perm in management_permissions],
-            "access": [self.app.security.encode_id(perm.role.id) for perm in access_permissions],
+            "manage": self.app.security.encode_ids(perm.role.id for perm in management_permissions),
+            "access": self.app.security.encode_ids(perm.role.id for perm in access_permissions),
         }
         return permissions
 
@@ -239,9 +239,17 @@ class HDAManager(
     # .... deletion and purging
     def purge(self, item, flush=True, **kwargs):
         if self.app.config.enable_celery_tasks:
-            from galaxy.celery.tasks import purge_hda
+            from galaxy.celery.tasks import (
+                purge_hda,
+                purge_hda_batch,
+            )
 
             user = kwargs.get("user")
+            task_batcher = kwargs.get("task_batcher")
+            if task_batcher is not None:
+                # the caller submits the batch once all items have been processed
+                task_batcher.add(purge_hda_batch, item.id, task_user_id=getattr(user, "id", None))
+                return None
             return purge_hda.delay(hda_id=item.id, task_user_id=getattr(user, "id", None))
         else:
             self._purge(item, flush=flush)
@@ -6,7 +6,14 @@ history.
 """
 
 import logging
-from typing import Dict
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    Tuple,
+)
 
 from galaxy import model
 from galaxy.exceptions import RequestParameterInvalidException
@@ -29,29 +36,64 @@ from galaxy.util.zipstream import ZipstreamWrapper
 log = logging.getLogger(__name__)
 
 
-def stream_dataset_collection(dataset_collection_instance, upstream_mod_zip=False, upstream_gzip=False):
+def stream_dataset_collection(
+    dataset_collection_instance, upstream_mod_zip=False, upstream_gzip=False, prefetch_workers=1
+):
     archive_name = f"{dataset_collection_instance.hid}: {dataset_collection_instance.name}"
     archive = ZipstreamWrapper(
         archive_name=archive_name,
         upstream_mod_zip=upstream_mod_zip,
         upstream_gzip=upstream_gzip,
     )
-    write_dataset_collection(dataset_collection_instance, archive)
+    write_dataset_collection(dataset_collection_instance, archive, prefetch_workers=prefetch_workers)
     return archive
 
 
-def write_dataset_collection(dataset_collection_instance, archive):
+def write_dataset_collection(dataset_collection_instance, archive, prefetch_workers=1):
     if not dataset_collection_instance.collection.populated_optimized:
         raise RequestParameterInvalidException("Attempt to write dataset collection that has not been populated yet")
     names, hdas = get_hda_and_element_identifiers(dataset_collection_instance)
-    for name, hda in zip(names, hdas):
-        if hda.state != hda.states.OK or hda.purged or hda.dataset.purged:
-            continue
+    members = [
+        (name, hda)
+        for name, hda in zip(names, hdas)
+        if hda.state == hda.states.OK and not hda.purged and not hda.dataset.purged
+    ]
+    for name, hda in prefetch_dataset_files(members, prefetch_workers):
         for file_path, relpath in hda.datatype.to_archive(dataset=hda, name=name):
             archive.write(file_path, relpath)
     return archive
 
 
+def prefetch_dataset_files(
+    members: Iterable[Tuple[str, model.DatasetInstance]], workers: int
+) -> Iterator[Tuple[str, model.DatasetInstance]]:
+    """Yield ``members`` in order after the files of their datasets are available locally.
+
+    For object stores with a cache, resolving the file name of a dataset fills
+    the cache. Up to ``workers`` datasets are fetched concurrently and at most
+    ``2 * workers`` datasets are fetched ahead of the member being yielded.
+    """
+    if workers <= 1:
+        yield from members
+        return
+    members = iter(members)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="collection_download") as executor:
+        pending: deque = deque()
+
+        def submit_next():
+            for member in members:
+                pending.append((member, executor.submit(member[1].dataset.get_file_name)))
+                return
+
+        for _ in range(2 * workers):
+            submit_next()
+        while pending:
+            member, future = pending.popleft()
+            future.result()
+            submit_next()
+            yield member
+
+
 def set_collection_attributes(dataset_element, *payload):
     for attribute, value in payload:
         setattr(dataset_element, attribute[1], value[1])
@@ -92,6 +134,7 @@ class HDCAManager(
         returned = []
         # lots of nesting going on within the nesting
         collection = content.collection if hasattr(content, "collection") else content
+        collection.load_elements()
         this_parents = (content,) + parents
         for element in collection.elements:
             next_parents = (element,) + this_parents
@@ -179,6 +222,7 @@ class DCSerializer(base.ModelSerializer):
 
     def serialize_elements(self, item, key, **context):
         returned = []
+        item.load_elements()
         for element in item.elements:
             serialized = self.dce_serializer.serialize_to_view(element, view="summary", **context)
             returned.append(serialized)
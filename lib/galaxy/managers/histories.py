@@ -444,7 +444,8 @@ class HistoryManager(sharable.SharableModelManager, deletable.PurgableManagerMix
                 continue
 
             user_roles = user.all_roles()
-            # TODO: Handle this is a more performant way
+            # Resolve access to all datasets at once, can_access_dataset uses the resulting map
+            trans.app.security_agent.dataset_access_map(user_roles, [hda.dataset_id for hda in datasets])
             # Only deal with datasets that have not been purged
             for hda in datasets:
                 if trans.app.security_agent.can_access_dataset(user_roles, hda.dataset):
@@ -853,15 +854,17 @@ class HistorySerializer(sharable.SharableModelSerializer, deletable.PurgableSeri
             "contents_url": lambda item, key, **context: self.url_for(
                 "history_contents", history_id=self.app.security.encode_id(item.id), context=context
             ),
-            "hdas": lambda item, key, encode_id=True, **context: [
-                self.app.security.encode_id(hda.id) if encode_id else hda.id for hda in item.datasets
-            ],
+            "hdas": lambda item, key, encode_id=True, **context: (
+                self.app.security.encode_ids(hda.id for hda in item.datasets)
+                if encode_id
+                else [hda.id for hda in item.datasets]
+            ),
             "state_details": self.serialize_state_counts,
             "state_ids": self.serialize_state_ids,
             "contents": self.serialize_contents,
-            "non_ready_jobs": lambda item, key, encode_id=True, **context: [
-                self.app.security.encode_id(job.id) for job in self.manager.non_ready_jobs(item)
-            ],
+            "non_ready_jobs": lambda item, key, encode_id=True, **context: self.app.security.encode_ids(
+                job.id for job in self.manager.non_ready_jobs(item)
+            ),
             "contents_states": self.serialize_contents_states,
             "contents_active": self.serialize_contents_active,
             #  TODO: Use base manager's serialize_id for user_id (and others)
@@ -884,9 +887,10 @@ class HistorySerializer(sharable.SharableModelSerializer, deletable.PurgableSeri
             state_ids[state] = []
 
         # TODO:?? collections and coll. states?
-        for hda in history.datasets:
-            # TODO: do not encode ids at this layer
-            encoded_id = self.app.security.encode_id(hda.id)
+        hdas = history.datasets
+        # TODO: do not encode ids at this layer
+        encoded_ids = self.app.security.encode_ids(hda.id for hda in hdas)
+        for hda, encoded_id in zip(hdas, encoded_ids):
             state_ids[hda.state].append(encoded_id)
         return state_ids
 
@@ -0,0 +1,252 @@
+"""Maintain and query the ``job_metric_rollup`` table.
+
+Numeric job metrics are stored one row per job and metric in
+``job_metric_numeric``, aggregating them per tool over months of jobs is
+expensive. When ``enable_job_metric_rollups`` is set, the numeric metrics of
+every successfully finished job are also folded into a
+:class:`galaxy.model.JobMetricRollup` row for the day, tool, destination and
+metric. Quantiles, sums and extrema over any date range are then answered by
+merging a handful of these rows.
+"""
+
+import logging
+from collections import defaultdict
+from datetime import (
+    date,
+    datetime,
+)
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from sqlalchemy import (
+    delete,
+    select,
+)
+from sqlalchemy.exc import IntegrityError
+
+from galaxy import model
+from galaxy.job_metrics.rollup import MetricRollup
+from galaxy.model.base import transaction
+from galaxy.model.scoped_session import galaxy_scoped_session
+
+log = logging.getLogger(__name__)
+
+DEFAULT_QUANTILES = (0.5, 0.95)
+
+RollupKey = Tuple[date, str, str, str, str]
+
+
+def _as_rollup(row: model.JobMetricRollup) -> MetricRollup:
+    return MetricRollup(row.count, row.total, row.minimum, row.maximum, row.histogram)
+
+
+def _update_row(row: model.JobMetricRollup, rollup: MetricRollup) -> None:
+    row.count = rollup.count
+    row.total = rollup.total
+    row.minimum = rollup.minimum
+    row.maximum = rollup.maximum
+    row.histogram = rollup.histogram
+
+
+def _job_day(job: model.Job) -> date:
+    return (job.update_time or datetime.utcnow()).date()
+
+
+def _get_or_create_row(session: galaxy_scoped_session, key: RollupKey) -> model.JobMetricRollup:
+    day, tool_id, destination_id, plugin, metric_name = key
+    stmt = (
+        select(model.JobMetricRollup)
+        .filter_by(day=day, tool_id=tool_id, destination_id=destination_id, plugin=plugin, metric_name=metric_name)
+        .with_for_update()
+    )
+    row = session.scalars(stmt).first()
+    if row is None:
+        row = model.JobMetricRollup(
+            day=day,
+            tool_id=tool_id,
+            destination_id=destination_id,
+            plugin=plugin,
+            metric_name=metric_name,
+            count=0,
+            total=0.0,
+            histogram={},
+        )
+        try:
+            with session.begin_nested():
+                session.add(row)
+        except IntegrityError:
+            # Another handler created the row concurrently.
+            row = session.scalars(stmt).one()
+    return row
+
+
+def add_to_rollups(session: galaxy_scoped_session, rollups: Dict[RollupKey, MetricRollup]) -> None:
+    # Lock rows in a stable order to avoid deadlocks between job handlers.
+    for key in sorted(rollups):
+        row = _get_or_create_row(session, key)
+        _update_row(row, _as_rollup(row).merge(rollups[key]))
+
+
+def job_metric_rollups(job: model.Job) -> Dict[RollupKey, MetricRollup]:
+    day = _job_day(job)
+    rollups: Dict[RollupKey, MetricRollup] = defaultdict(MetricRollup)
+    for metric in job.numeric_metrics:
+        if metric.metric_value is None:
+            continue
+        key = (day, job.tool_id or "", job.destination_id or "", metric.plugin, metric.metric_name)
+        rollups[key].add(float(metric.metric_value))
+    return rollups
+
+
+def record_job_metrics(session: galaxy_scoped_session, job: model.Job) -> None:
+    """Fold the numeric metrics of a finished job into the rollup rows of its day and commit.
+
+    Failures are logged and rolled back, they never affect the job.
+    """
+    try:
+        add_to_rollups(session, job_metric_rollups(job))
+        with transaction(session):
+            session.commit()
+    except Exception:
+        log.exception("Failed to record metrics of job %s in job metric rollups", job.id)
+        session.rollback()
+
+
+def rebuild_job_metric_rollups(
+    session: galaxy_scoped_session,
+    date_range_min: Optional[Union[datetime, date]] = None,
+    date_range_max: Optional[Union[datetime, date]] = None,
+) -> int:
+    """(Re)compute rollup rows for successful jobs updated in the given date range.
+
+    Existing rollup rows for the covered days are replaced. Returns the number
+    of metric values that were aggregated.
+    """
+    day_min = date_range_min.date() if isinstance(date_range_min, datetime) else date_range_min
+    day_max = date_range_max.date() if isinstance(date_range_max, datetime) else date_range_max
+    delete_stmt = delete(model.JobMetricRollup)
+    stmt = (
+        select(
+            model.Job.update_time,
+            model.Job.tool_id,
+            model.Job.destination_id,
+            model.JobMetricNumeric.plugin,
+            model.JobMetricNumeric.metric_name,
+            model.JobMetricNumeric.metric_value,
+        )
+        .join(model.JobMetricNumeric, model.JobMetricNumeric.job_id == model.Job.id)
+        .where(model.Job.state == model.Job.states.OK)
+    )
+    if day_min is not None:
+        delete_stmt = delete_stmt.where(model.JobMetricRollup.day >= day_min)
+        stmt = stmt.where(model.Job.update_time >= day_min)
+    if day_max is not None:
+        delete_stmt = delete_stmt.where(model.JobMetricRollup.day <= day_max)
+        stmt = stmt.where(model.Job.update_time < datetime.combine(day_max, datetime.max.time()))
+    rollups: Dict[RollupKey, MetricRollup] = defaultdict(MetricRollup)
+    aggregated = 0
+    for update_time, tool_id, destination_id, plugin, metric_name, metric_value in session.execute(
+        stmt.execution_options(yield_per=model.YIELD_PER_ROWS)
+    ):
+        if metric_value is None or update_time is None:
+            continue
+        key = (update_time.date(), tool_id or "", destination_id or "", plugin, metric_name)
+        rollups[key].add(float(metric_value))
+        aggregated += 1
+    session.execute(delete_stmt)
+    for key, rollup in rollups.items():
+        day, tool_id, destination_id, plugin, metric_name = key
+        row = model.JobMetricRollup(
+            day=day, tool_id=tool_id, destination_id=destination_id, plugin=plugin, metric_name=metric_name
+        )
+        _update_row(row, rollup)
+        session.add(row)
+    with transaction(session):
+        session.commit()
+    return aggregated
+
+
+def summarize_job_metric_rollups(
+    session: galaxy_scoped_session,
+    plugin: Optional[str] = None,
+    metric_name: Optional[str] = None,
+    tool_id: Optional[str] = None,
+    destination_id: Optional[str] = None,
+    date_range_min: Optional[Union[datetime, date]] = None,
+    date_range_max: Optional[Union[datetime, date]] = None,
+    by_destination: bool = True,
+    quantiles: Sequence[float] = DEFAULT_QUANTILES,
+) -> List[Dict[str, Any]]:
+    """Merge rollup rows matching the filters per tool (and destination) and metric.
+
+    Each returned dictionary holds the grouping keys and the ``count``,
+    ``sum``, ``min``, ``max``, ``mean`` and estimated ``quantiles`` of the
+    metric values.
+    """
+    rollups = query_job_metric_rollups(
+        session,
+        plugin=plugin,
+        metric_name=metric_name,
+        tool_id=tool_id,
+        destination_id=destination_id,
+        date_range_min=date_range_min,
+        date_range_max=date_range_max,
+        by_destination=by_destination,
+    )
+    summaries = []
+    for (group_tool_id, group_destination_id, group_plugin, group_metric_name), rollup in sorted(rollups.items()):
+        summary = rollup.to_dict(quantiles)
+        summary.update(
+            tool_id=group_tool_id,
+            destination_id=group_destination_id if by_destination else None,
+            plugin=group_plugin,
+            metric_name=group_metric_name,
+        )
+        summaries.append(summary)
+    return summaries
+
+
+def query_job_metric_rollups(
+    session: galaxy_scoped_session,
+    plugin: Optional[str] = None,
+    metric_name: Optional[str] = None,
+    tool_id: Optional[str] = None,
+    destination_id: Optional[str] = None,
+    date_range_min: Optional[Union[datetime, date]] = None,
+    date_range_max: Optional[Union[datetime, date]] = None,
+    by_destination: bool = True,
+) -> Dict[Tuple[str, str, str, str], MetricRollup]:
+    """Return merged :class:`MetricRollup` objects keyed by tool, destination, plugin and metric name.
+
+    If ``by_destination`` is false rows of all destinations are merged and the
+    destination part of the key is the empty string.
+    """
+    stmt = select(model.JobMetricRollup)
+    filters: Iterable[Tuple[Any, Any]] = (
+        (model.JobMetricRollup.plugin, plugin),
+        (model.JobMetricRollup.metric_name, metric_name),
+        (model.JobMetricRollup.tool_id, tool_id),
+        (model.JobMetricRollup.destination_id, destination_id),
+    )
+    for column, value in filters:
+        if value is not None:
+            stmt = stmt.where(column == value)
+    if date_range_min is not None:
+        day_min = date_range_min.date() if isinstance(date_range_min, datetime) else date_range_min
+        stmt = stmt.where(model.JobMetricRollup.day >= day_min)
+    if date_range_max is not None:
+        day_max = date_range_max.date() if isinstance(date_range_max, datetime) else date_range_max
+        stmt = stmt.where(model.JobMetricRollup.day <= day_max)
+    merged: Dict[Tuple[str, str, str, str], MetricRollup] = defaultdict(MetricRollup)
+    for row in session.scalars(stmt):
+        key = (row.tool_id, row.destination_id if by_destination else "", row.plugin, row.metric_name)
+        merged[key].merge(_as_rollup(row))
+    return merged
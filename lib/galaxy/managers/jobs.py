@@ -10,6 +10,7 @@ from typing import (
     Dict,
     List,
     Optional,
+    Sequence,
     Union,
 )
 
@@ -33,6 +34,7 @@ from typing_extensions import TypedDict
 
 from galaxy import model
 from galaxy.exceptions import (
+    ConfigDoesNotAllowException,
     ItemAccessibilityException,
     ObjectNotFound,
     RequestParameterInvalidException,
@@ -42,6 +44,10 @@ from galaxy.job_metrics import (
     RawMetric,
     Safety,
 )
+from galaxy.job_metrics.lifecycle import (
+    LIFECYCLE_PLUGIN,
+    summarize_phases,
+)
 from galaxy.managers.collections import DatasetCollectionManager
 from galaxy.managers.context import (
     ProvidesHistoryContext,
@@ -49,6 +55,7 @@ from galaxy.managers.context import (
 )
 from galaxy.managers.datasets import DatasetManager
 from galaxy.managers.hdas import HDAManager
+from galaxy.managers.job_metric_rollups import summarize_job_metric_rollups
 from galaxy.managers.lddas import LDDAManager
 from galaxy.model import (
     ImplicitCollectionJobs,
@@ -266,6 +273,66 @@ class JobManager:
         stmt = stmt.limit(payload.limit)
         return trans.sa_session.scalars(stmt)
 
+    def lifecycle_summary(
+        self,
+        trans: ProvidesUserContext,
+        tool_id: Optional[str] = None,
+        destination_id: Optional[str] = None,
+        date_range_min: Optional[Union[datetime, date]] = None,
+        limit: int = 10000,
+    ) -> List[Dict[str, Any]]:
+        """Aggregate job lifecycle phase durations per tool, destination and phase.
+
+        Only the ``limit`` most recent jobs matching the filters are considered.
+        """
+        jobs_stmt = select(model.Job.id).where(model.Job.state.in_(model.Job.terminal_states))
+        if tool_id is not None:
+            jobs_stmt = jobs_stmt.where(model.Job.tool_id == tool_id)
+        if destination_id is not None:
+            jobs_stmt = jobs_stmt.where(model.Job.destination_id == destination_id)
+        if date_range_min is not None:
+            jobs_stmt = jobs_stmt.where(model.Job.update_time >= date_range_min)
+        jobs_subquery = jobs_stmt.order_by(model.Job.id.desc()).limit(limit).subquery()
+        stmt = (
+            select(
+                model.Job.tool_id,
+                model.Job.destination_id,
+                model.JobMetricNumeric.metric_name,
+                model.JobMetricNumeric.metric_value,
+            )
+            .join(model.JobMetricNumeric, model.JobMetricNumeric.job_id == model.Job.id)
+            .join(jobs_subquery, jobs_subquery.c.id == model.Job.id)
+            .where(model.JobMetricNumeric.plugin == LIFECYCLE_PLUGIN)
+        )
+        return summarize_phases(trans.sa_session.execute(stmt))
+
+    def metrics_summary(
+        self,
+        trans: ProvidesUserContext,
+        plugin: Optional[str] = None,
+        metric_name: Optional[str] = None,
+        tool_id: Optional[str] = None,
+        destination_id: Optional[str] = None,
+        date_range_min: Optional[Union[datetime, date]] = None,
+        date_range_max: Optional[Union[datetime, date]] = None,
+        by_destination: bool = True,
+        quantiles: Sequence[float] = (0.5, 0.95),
+    ) -> List[Dict[str, Any]]:
+        """Summarize numeric job metrics per tool (and destination) from the daily job metric rollups."""
+        if not self.app.config.enable_job_metric_rollups:
+            raise ConfigDoesNotAllowException("Job metric rollups are disabled on this Galaxy server.")
+        return summarize_job_metric_rollups(
+            trans.sa_session,
+            plugin=plugin,
+            metric_name=metric_name,
+            tool_id=tool_id,
+            destination_id=destination_id,
+            date_range_min=date_range_min,
+            date_range_max=date_range_max,
+            by_destination=by_destination,
+            quantiles=quantiles,
+        )
+
     def job_lock(self) -> JobLock:
         return JobLock(active=self.app.job_manager.job_lock)
 
@@ -509,7 +509,7 @@ class SharableModelDeserializer(
         add or remove user shares in order to update the users_shared_with to
         match the given list finally returning the new list of shares.
         """
-        unencoded_ids = [self.app.security.decode_id(id_) for id_ in val]
+        unencoded_ids = self.app.security.decode_ids(val)
         new_users_shared_with = set(self.manager.user_manager.by_ids(unencoded_ids))
         current_shares, _, _ = self.manager.update_current_sharing_with_users(item, new_users_shared_with)
         # TODO: or should this return the list of ids?
@@ -20,6 +20,7 @@ from collections import defaultdict
 from collections.abc import Callable
 from dataclasses import dataclass
 from datetime import (
+    date,
     datetime,
     timedelta,
 )
@@ -120,8 +121,12 @@ from sqlalchemy.orm import (
     reconstructor,
     registry,
     relationship,
+    selectinload,
+)
+from sqlalchemy.orm.attributes import (
+    flag_modified,
+    set_committed_value,
 )
-from sqlalchemy.orm.attributes import flag_modified
 from sqlalchemy.orm.collections import attribute_keyed_dict
 from sqlalchemy.sql import exists
 from sqlalchemy.sql.expression import FromClause
@@ -1432,6 +1437,59 @@ class TaskMetricNumeric(BaseJobMetric, RepresentById):
     metric_value: Mapped[Optional[Decimal]] = mapped_column(Numeric(JOB_METRIC_PRECISION, JOB_METRIC_SCALE))
 
 
+class JobMetricRollup(Base, RepresentById):
+    """Numeric job metrics of successful jobs aggregated per day, tool, destination and metric.
+
+    ``histogram`` maps log-scaled buckets to counts, see :mod:`galaxy.job_metrics.rollup`.
+    """
+
+    __tablename__ = "job_metric_rollup"
+    __table_args__ = (UniqueConstraint("day", "tool_id", "destination_id", "plugin", "metric_name"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    update_time: Mapped[datetime] = mapped_column(default=now, onupdate=now, nullable=True)
+    day: Mapped[date] = mapped_column(index=True)
+    tool_id: Mapped[str] = mapped_column(String(255), index=True, default="")
+    destination_id: Mapped[str] = mapped_column(String(255), default="")
+    plugin: Mapped[str] = mapped_column(Unicode(255))
+    metric_name: Mapped[str] = mapped_column(Unicode(255))
+    count: Mapped[int] = mapped_column(default=0)
+    total: Mapped[float] = mapped_column(default=0.0)
+    minimum: Mapped[Optional[float]]
+    maximum: Mapped[Optional[float]]
+    histogram: Mapped[Optional[Dict[str, int]]] = mapped_column(MutableJSONType)
+
+
+class ShortTermStorageEntry(Base):
+    """A short term storage request, indexed for reuse, expiry and size limits.
+
+    See :class:`galaxy.short_term_storage.ShortTermStorageIndex`. Entries are
+    removed with their files, ``user_id`` is not a foreign key so that they
+    don't hold on to users.
+    """
+
+    __tablename__ = "short_term_storage_entry"
+
+    request_id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    fingerprint: Mapped[Optional[str]] = mapped_column(String(255), index=True)
+    user_id: Mapped[Optional[int]] = mapped_column(index=True)
+    session_id: Mapped[Optional[int]]
+    create_time: Mapped[datetime] = mapped_column(default=now)
+    expire_time: Mapped[datetime] = mapped_column(index=True)
+    size: Mapped[Optional[int]] = mapped_column(BigInteger)
+    state: Mapped[str] = mapped_column(String(16))
+    task_summary: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSONType)
+
+
+class ShortTermStorageCounter(Base):
+    """Usage counters of the short term storage, e.g. reuse hits and misses."""
+
+    __tablename__ = "short_term_storage_counter"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    value: Mapped[int] = mapped_column(BigInteger, default=0)
+
+
 class IoDicts(NamedTuple):
     inp_data: Dict[str, Optional["DatasetInstance"]]
     out_data: Dict[str, "DatasetInstance"]
@@ -6439,6 +6497,11 @@ class InnerCollectionFilter(NamedTuple):
         return self.operator_function(getattr(table, self.column), self.expected_value)
 
 
+def _set_committed_value_if_unloaded(instance, key, value):
+    if key not in inspect(instance).dict:
+        set_committed_value(instance, key, value)
+
+
 class DatasetCollection(Base, Dictifiable, UsesAnnotations, Serializable):
     __tablename__ = "dataset_collection"
 
@@ -6556,6 +6619,85 @@ class DatasetCollection(Base, Dictifiable, UsesAnnotations, Serializable):
         q = q.order_by(*order_by_columns)
         return q
 
+    def load_elements(self):
+        """Load the elements of this collection and all its subcollections in a single query.
+
+        A recursive CTE collects the elements of all nesting levels, the
+        ``elements`` of every (sub)collection and the dataset instance,
+        dataset and child collection of every element are then set from the
+        result so that walking the collection (``elements``,
+        ``element_object``, ``dataset_instances``, ``populated_optimized``)
+        does not issue further queries. Relationships that are already loaded
+        are kept, so pending changes are not overwritten. The preloaded
+        elements are used until the elements of a collection change or the
+        collection is expired (e.g. on commit).
+        """
+        if getattr(self, "_elements_loaded", False):
+            return
+        session = object_session(self)
+        if session is None or not self.id:
+            return
+        dce = DatasetCollectionElement
+        element_tree = (
+            select(dce.id, dce.child_collection_id)
+            .where(dce.dataset_collection_id == self.id)
+            .cte(name="element_tree", recursive=True)
+        )
+        parent = aliased(element_tree, name="parent")
+        child = aliased(dce, name="child")
+        element_tree = element_tree.union_all(
+            select(child.id, child.child_collection_id).where(
+                child.dataset_collection_id == parent.c.child_collection_id
+            )
+        )
+        child_collection = aliased(DatasetCollection, name="child_collection")
+        stmt = (
+            select(dce, child_collection, HistoryDatasetAssociation, LibraryDatasetDatasetAssociation, Dataset)
+            .join(element_tree, element_tree.c.id == dce.id)
+            .outerjoin(child_collection, child_collection.id == dce.child_collection_id)
+            .outerjoin(HistoryDatasetAssociation, HistoryDatasetAssociation.id == dce.hda_id)
+            .outerjoin(LibraryDatasetDatasetAssociation, LibraryDatasetDatasetAssociation.id == dce.ldda_id)
+            .outerjoin(
+                Dataset,
+                Dataset.id
+                == func.coalesce(HistoryDatasetAssociation.dataset_id, LibraryDatasetDatasetAssociation.dataset_id),
+            )
+            .order_by(dce.dataset_collection_id, dce.element_index)
+            .options(selectinload(HistoryDatasetAssociation.tags))
+        )
+        collections = {self.id: self}
+        elements_by_collection_id: Dict[int, List[DatasetCollectionElement]] = defaultdict(list)
+        for element, element_collection, hda, ldda, dataset in session.execute(stmt):
+            elements_by_collection_id[element.dataset_collection_id].append(element)
+            _set_committed_value_if_unloaded(element, "hda", hda)
+            _set_committed_value_if_unloaded(element, "ldda", ldda)
+            _set_committed_value_if_unloaded(element, "child_collection", element_collection)
+            if element_collection is not None:
+                collections[element_collection.id] = element_collection
+            if (dataset_instance := hda or ldda) is not None:
+                _set_committed_value_if_unloaded(dataset_instance, "dataset", dataset)
+        for collection_id, collection in collections.items():
+            elements = elements_by_collection_id[collection_id]
+            for element in elements:
+                _set_committed_value_if_unloaded(element, "collection", collection)
+            _set_committed_value_if_unloaded(collection, "elements", elements)
+            collection._elements_loaded = True
+        self._set_loaded_populated_optimized()
+
+    def _set_loaded_populated_optimized(self):
+        # Same semantics as populated_optimized: the state of the innermost
+        # collections decides whether a nested collection is populated.
+        if not hasattr(self, "_populated_optimized"):
+            if ":" not in self.collection_type:
+                self._populated_optimized = self.populated_state == DatasetCollection.populated_states.OK
+            else:
+                self._populated_optimized = True
+                for element in self.elements:
+                    if (child_collection := element.child_collection) is not None:
+                        if not child_collection._set_loaded_populated_optimized():
+                            self._populated_optimized = False
+        return self._populated_optimized
+
     @property
     def elements_deleted(self):
         if not hasattr(self, "_elements_deleted"):
@@ -6713,7 +6855,7 @@ class DatasetCollection(Base, Dictifiable, UsesAnnotations, Serializable):
     @property
     def dataset_instances(self):
         db_session = object_session(self)
-        if db_session and self.id:
+        if db_session and self.id and not getattr(self, "_elements_loaded", False):
             stmt = self._build_nested_collection_attributes_stmt(return_entities=(HistoryDatasetAssociation,))
             tuples = db_session.execute(stmt).all()
             return [tuple[0] for tuple in tuples]
@@ -6731,7 +6873,7 @@ class DatasetCollection(Base, Dictifiable, UsesAnnotations, Serializable):
     @property
     def dataset_elements(self):
         db_session = object_session(self)
-        if db_session and self.id:
+        if db_session and self.id and not getattr(self, "_elements_loaded", False):
             stmt = self._build_nested_collection_attributes_stmt(return_entities=(DatasetCollectionElement,))
             tuples = db_session.execute(stmt).all()
             return [tuple[0] for tuple in tuples]
@@ -8808,7 +8950,7 @@ class WorkflowInvocation(Base, UsesCreateAndUpdateTime, Dictifiable, Serializabl
         return list(sa_session.scalars(stmt))
 
     @staticmethod
-    def poll_active_workflow_ids(engine, scheduler=None, handler=None):
+    def _active_workflow_conditions(scheduler=None, handler=None):
         and_conditions = [
             or_(
                 WorkflowInvocation.state == WorkflowInvocation.states.NEW,
@@ -8821,13 +8963,34 @@ class WorkflowInvocation(Base, UsesCreateAndUpdateTime, Dictifiable, Serializabl
             and_conditions.append(WorkflowInvocation.scheduler == scheduler)
         if handler is not None:
             and_conditions.append(WorkflowInvocation.handler == handler)
+        return and_(*and_conditions)
 
-        stmt = select(WorkflowInvocation.id).filter(and_(*and_conditions)).order_by(WorkflowInvocation.id.asc())
+    @staticmethod
+    def poll_active_workflow_ids(engine, scheduler=None, handler=None):
+        stmt = (
+            select(WorkflowInvocation.id)
+            .filter(WorkflowInvocation._active_workflow_conditions(scheduler, handler))
+            .order_by(WorkflowInvocation.id.asc())
+        )
         # Immediately just load all ids into memory so time slicing logic
         # is relatively intutitive.
         with engine.connect() as conn:
             return conn.scalars(stmt).all()
 
+    @staticmethod
+    def poll_active_workflows(engine, scheduler=None, handler=None):
+        """Like ``poll_active_workflow_ids`` but return ``(id, user_id, create_time, history_id)`` rows."""
+        stmt = (
+            select(
+                WorkflowInvocation.id, History.user_id, WorkflowInvocation.create_time, WorkflowInvocation.history_id
+            )
+            .join(History, History.id == WorkflowInvocation.history_id)
+            .filter(WorkflowInvocation._active_workflow_conditions(scheduler, handler))
+            .order_by(WorkflowInvocation.id.asc())
+        )
+        with engine.connect() as conn:
+            return [tuple(row) for row in conn.execute(stmt)]
+
     def add_output(self, workflow_output, step, output_object):
         if not hasattr(output_object, "history_content_type"):
             # assuming this is a simple type, just JSON-ify it and stick in the database. In the future
@@ -11824,4 +11987,25 @@ def receive_init(target, args, kwargs):
             return  # Once is enough.
 
 
+@event.listens_for(DatasetCollection.elements, "append")
+@event.listens_for(DatasetCollection.elements, "remove")
+def _clear_loaded_elements_on_change(target, value, initiator):
+    # Elements preloaded by ``DatasetCollection.load_elements`` no longer
+    # reflect the collection, query them again.
+    target._elements_loaded = False
+
+
+@event.listens_for(DatasetCollection, "expire")
+def _clear_loaded_elements_on_expire(target, attrs):
+    # target is None for instances that were garbage collected already
+    if target is not None and (attrs is None or "elements" in attrs):
+        target._elements_loaded = False
+
+
+@event.listens_for(DatasetCollection, "refresh")
+def _clear_loaded_elements_on_refresh(target, context, attrs):
+    if attrs is None or "elements" in attrs:
+        target._elements_loaded = False
+
+
 JobStateSummary = NamedTuple("JobStateSummary", [(value, int) for value in enum_values(Job.states)] + [("all_jobs", int)])  # type: ignore[misc]  # Ref https://github.com/python/mypy/issues/848#issuecomment-255237167
@@ -2,9 +2,30 @@
 """
 
 import logging
+from array import array
+from typing import (
+    List,
+    Optional,
+)
+
+from sqlalchemy import (
+    inspect,
+    select,
+)
+from sqlalchemy.orm import (
+    aliased,
+    object_session,
+)
+
+from galaxy import model
 
 log = logging.getLogger(__name__)
 
+# Persisted collections with at least this many elements (or with
+# subcollections) are described by a ColumnarTree loaded in a single query
+# instead of a Tree built by walking the ORM relationships.
+COLUMNAR_STRUCTURE_MIN_ELEMENTS = 100
+
 
 class Leaf:
     children_known = True
@@ -114,21 +135,7 @@ class Tree(BaseTree):
         return False
 
     def can_match(self, other_structure):
-        if not self.collection_type_description.can_match_type(other_structure.collection_type_description):
-            return False
-
-        if len(self.children) != len(other_structure.children):
-            return False
-
-        for my_child, other_child in zip(self.children, other_structure.children):
-            # At least one is nested collection...
-            if my_child[1].is_leaf != other_child[1].is_leaf:
-                return False
-
-            if not my_child[1].is_leaf and not my_child[1].can_match(other_child[1]):
-                return False
-
-        return True
+        return _can_match(self, other_structure)
 
     def __len__(self):
         return sum(len(c[1]) for c in self.children)
@@ -152,6 +159,348 @@ class Tree(BaseTree):
         return f"Tree[collection_type={self.collection_type_description},children={','.join(f'{identifier_and_element[0]}={identifier_and_element[1]}' for identifier_and_element in self.children)}]"
 
 
+def _can_match(structure, other_structure):
+    if not structure.collection_type_description.can_match_type(other_structure.collection_type_description):
+        return False
+
+    if len(structure.children) != len(other_structure.children):
+        return False
+
+    for my_child, other_child in zip(structure.children, other_structure.children):
+        # At least one is nested collection...
+        if my_child[1].is_leaf != other_child[1].is_leaf:
+            return False
+
+        if not my_child[1].is_leaf and not my_child[1].can_match(other_child[1]):
+            return False
+
+    return True
+
+
+class ColumnarTree(BaseTree):
+    """Array backed equivalent of :class:`Tree` for large collections.
+
+    The element identifiers of each nesting level of a collection are stored
+    in one flat list per level, ``offsets[level][i]`` is the index of the first
+    child of element ``i`` of ``level`` in the next level. A ``ColumnarTree``
+    is a view of the elements ``start:stop`` of ``level``, views of children
+    share the arrays of their parent. ``leaf_structure`` is the structure of
+    the elements of the last level, ``leaf`` unless an uninitialized
+    structure was multiplied in.
+    """
+
+    children_known = True
+
+    def __init__(
+        self,
+        collection_type_description,
+        identifiers: List[List[str]],
+        offsets: List[array],
+        level: int = 0,
+        start: int = 0,
+        stop: Optional[int] = None,
+        leaf_structure=leaf,
+        when_values=None,
+    ):
+        super().__init__(collection_type_description)
+        self.identifiers = identifiers
+        self.offsets = offsets
+        self.level = level
+        self.start = start
+        self.stop = len(identifiers[level]) if stop is None else stop
+        self.leaf_structure = leaf_structure
+        self.when_values = when_values
+
+    @staticmethod
+    def for_dataset_collection(dataset_collection, collection_type_description):
+        return structure_for_dataset_collection(dataset_collection, collection_type_description)
+
+    @staticmethod
+    def load(dataset_collection, collection_type_description) -> "ColumnarTree":
+        """Load the structure of a persisted collection with a single query."""
+        depth = len(collection_type_description.collection_type.split(":"))
+        session = object_session(dataset_collection)
+        element_aliases = [aliased(model.DatasetCollectionElement) for _ in range(depth)]
+        columns = []
+        for element_alias in element_aliases:
+            columns.extend((element_alias.id, element_alias.element_identifier))
+        stmt = select(*columns).select_from(element_aliases[0])
+        for parent, child in zip(element_aliases, element_aliases[1:]):
+            # Outer joins keep empty subcollections
+            stmt = stmt.outerjoin(child, child.dataset_collection_id == parent.child_collection_id)
+        stmt = stmt.where(element_aliases[0].dataset_collection_id == dataset_collection.id).order_by(
+            *(element_alias.element_index for element_alias in element_aliases)
+        )
+        identifiers: List[List[str]] = [[] for _ in range(depth)]
+        offsets = [array("q") for _ in range(depth - 1)]
+        previous_ids: List[Optional[int]] = [None] * depth
+        for row in session.execute(stmt):
+            for level in range(depth):
+                element_id = row[2 * level]
+                if element_id is None:
+                    break
+                if element_id != previous_ids[level]:
+                    previous_ids[level] = element_id
+                    if level < depth - 1:
+                        offsets[level].append(len(identifiers[level + 1]))
+                    identifiers[level].append(row[2 * level + 1])
+        for level in range(depth - 1):
+            offsets[level].append(len(identifiers[level + 1]))
+        return ColumnarTree(collection_type_description, identifiers, offsets)
+
+    @staticmethod
+    def from_structure(structure) -> Optional["ColumnarTree"]:
+        """Convert a structure with known children to a ``ColumnarTree``.
+
+        Returns ``None`` if the leaves of ``structure`` are not all at the same
+        depth or not all of the same kind.
+        """
+        if isinstance(structure, ColumnarTree):
+            return structure.compact()
+        identifiers: List[List[str]] = []
+        offsets: List[array] = []
+        level_structures = [structure]
+        while True:
+            level_identifiers: List[str] = []
+            child_structures = []
+            for level_structure in level_structures:
+                for identifier, child_structure in level_structure.children:
+                    level_identifiers.append(identifier)
+                    child_structures.append(child_structure)
+            identifiers.append(level_identifiers)
+            if all(child_structure.is_leaf for child_structure in child_structures):
+                leaf_structure = leaf
+                break
+            if all(not child_structure.children_known for child_structure in child_structures):
+                leaf_structure = child_structures[0]
+                break
+            if any(
+                child_structure.is_leaf or not child_structure.children_known for child_structure in child_structures
+            ):
+                return None
+            level_offsets = array("q", [0])
+            child_count = 0
+            for child_structure in child_structures:
+                child_count += len(child_structure.children)
+                level_offsets.append(child_count)
+            offsets.append(level_offsets)
+            level_structures = child_structures
+        return ColumnarTree(structure.collection_type_description, identifiers, offsets, leaf_structure=leaf_structure)
+
+    @property
+    def depth(self):
+        return len(self.identifiers) - self.level
+
+    def _level_bounds(self, level):
+        """Return the start and stop index in ``level`` of the elements below this view."""
+        start, stop = self.start, self.stop
+        for offsets in self.offsets[self.level : level]:
+            start, stop = offsets[start], offsets[stop]
+        return start, stop
+
+    def compact(self) -> "ColumnarTree":
+        """Return a tree with arrays holding only the elements of this view."""
+        if self.level == 0 and self.start == 0 and self.stop == len(self.identifiers[0]):
+            return ColumnarTree(
+                self.collection_type_description,
+                self.identifiers,
+                self.offsets,
+                leaf_structure=self.leaf_structure,
+            )
+        identifiers = []
+        offsets = []
+        for level in range(self.level, len(self.identifiers)):
+            start, stop = self._level_bounds(level)
+            identifiers.append(self.identifiers[level][start:stop])
+            if level < len(self.offsets):
+                level_offsets = self.offsets[level][start : stop + 1]
+                base = level_offsets[0]
+                offsets.append(array("q", (offset - base for offset in level_offsets)))
+        return ColumnarTree(self.collection_type_description, identifiers, offsets, leaf_structure=self.leaf_structure)
+
+    @property
+    def is_leaf(self):
+        return False
+
+    @property
+    def children(self):
+        identifiers = self.identifiers[self.level][self.start : self.stop]
+        if self.level == len(self.identifiers) - 1:
+            return [(identifier, self.leaf_structure) for identifier in identifiers]
+        offsets = self.offsets[self.level]
+        subcollection_type_description = self.collection_type_description.subcollection_type_description()
+        return [
+            (
+                identifier,
+                ColumnarTree(
+                    subcollection_type_description,
+                    self.identifiers,
+                    self.offsets,
+                    level=self.level + 1,
+                    start=offsets[index],
+                    stop=offsets[index + 1],
+                    leaf_structure=self.leaf_structure,
+                ),
+            )
+            for index, identifier in enumerate(identifiers, start=self.start)
+        ]
+
+    def __len__(self):
+        start, stop = self._level_bounds(len(self.identifiers) - 1)
+        if stop > start and not self.leaf_structure.is_leaf:
+            raise Exception("Unknown length")
+        return stop - start
+
+    def _relative_offsets(self, level):
+        start, stop = self._level_bounds(level)
+        level_offsets = self.offsets[level][start : stop + 1]
+        base = level_offsets[0]
+        if base:
+            level_offsets = array("q", (offset - base for offset in level_offsets))
+        return level_offsets
+
+    def can_match(self, other_structure):
+        if not isinstance(other_structure, ColumnarTree) or other_structure.depth != self.depth:
+            return _can_match(self, other_structure)
+        if not self.collection_type_description.can_match_type(other_structure.collection_type_description):
+            return False
+        if self.stop - self.start != other_structure.stop - other_structure.start:
+            return False
+        if self.leaf_structure.is_leaf != other_structure.leaf_structure.is_leaf:
+            return False
+        # Same number of children for every element of every level.
+        for offset in range(self.depth - 1):
+            if self._relative_offsets(self.level + offset) != other_structure._relative_offsets(
+                other_structure.level + offset
+            ):
+                return False
+        return True
+
+    def multiply(self, other_structure):
+        if other_structure.is_leaf:
+            return self.clone()
+
+        new_collection_type = self.collection_type_description.multiply(other_structure.collection_type_description)
+        tree = self.compact()
+        if not tree.leaf_structure.is_leaf:
+            return tree._with(new_collection_type, tree.leaf_structure.multiply(other_structure))
+        if not other_structure.children_known:
+            return tree._with(new_collection_type, other_structure.clone())
+        other_tree = ColumnarTree.from_structure(other_structure)
+        if other_tree is None:
+            return Tree(
+                [(identifier, child.multiply(other_structure)) for identifier, child in self.children],
+                new_collection_type,
+            )
+        # Every leaf of this tree is replaced by a copy of the other tree.
+        leaf_count = len(tree.identifiers[-1])
+        other_count = len(other_tree.identifiers[0])
+        identifiers = list(tree.identifiers)
+        offsets = list(tree.offsets)
+        offsets.append(array("q", (index * other_count for index in range(leaf_count + 1))))
+        for level, other_identifiers in enumerate(other_tree.identifiers):
+            identifiers.append(other_identifiers * leaf_count)
+            if level < len(other_tree.offsets):
+                other_offsets = other_tree.offsets[level]
+                child_count = other_offsets[-1]
+                level_offsets = array("q")
+                for copy_index in range(leaf_count):
+                    shift = copy_index * child_count
+                    level_offsets.extend(offset + shift for offset in other_offsets[:-1])
+                level_offsets.append(leaf_count * child_count)
+                offsets.append(level_offsets)
+        return ColumnarTree(new_collection_type, identifiers, offsets, leaf_structure=other_tree.leaf_structure)
+
+    def _with(self, collection_type_description, leaf_structure):
+        return ColumnarTree(
+            collection_type_description,
+            self.identifiers,
+            self.offsets,
+            level=self.level,
+            start=self.start,
+            stop=self.stop,
+            leaf_structure=leaf_structure,
+        )
+
+    def clone(self):
+        return self._with(self.collection_type_description, self.leaf_structure.clone())
+
+    def walk_collections(self, hdca_dict):
+        collection_dict = dict_map(lambda hdca: hdca.collection, hdca_dict)
+        if self.leaf_structure.is_leaf:
+            leaf_start, leaf_stop = self._level_bounds(len(self.identifiers) - 1)
+            elements_dict = {}
+            for key, collection in collection_dict.items():
+                elements = _load_leaf_elements(collection, self.depth)
+                if elements is None or len(elements) != leaf_stop - leaf_start:
+                    break
+                elements_dict[key] = elements
+            else:
+                return self._walk_elements(elements_dict)
+        return self._walk_collections(collection_dict)
+
+    def _walk_elements(self, elements_dict):
+        # Index of the first leaf below each element of the view, relative to
+        # the first leaf of the view.
+        leaf_starts = self._relative_leaf_starts()
+        for index in range(self.stop - self.start):
+            when_value = None
+            if self.when_values:
+                if len(self.when_values) == 1:
+                    when_value = self.when_values[0]
+                else:
+                    when_value = self.when_values[index]
+            for leaf_index in range(leaf_starts[index], leaf_starts[index + 1]):
+                yield {key: elements[leaf_index] for key, elements in elements_dict.items()}, when_value
+
+    def _relative_leaf_starts(self):
+        leaf_starts = list(range(self.start, self.stop + 1))
+        for offsets in self.offsets[self.level :]:
+            leaf_starts = [offsets[index] for index in leaf_starts]
+        base = leaf_starts[0]
+        return [leaf_start - base for leaf_start in leaf_starts]
+
+    _walk_collections = Tree._walk_collections
+
+    def __str__(self):
+        return f"Tree[collection_type={self.collection_type_description},children={','.join(f'{identifier_and_element[0]}={identifier_and_element[1]}' for identifier_and_element in self.children)}]"
+
+
+def _load_leaf_elements(dataset_collection, depth) -> Optional[List["model.DatasetCollectionElement"]]:
+    """Load the elements at ``depth`` of a persisted collection in order, ``None`` if it has pending changes."""
+    session = _clean_session(dataset_collection)
+    if session is None:
+        return None
+    element_aliases = [aliased(model.DatasetCollectionElement) for _ in range(depth)]
+    stmt = select(element_aliases[-1]).select_from(element_aliases[0])
+    for parent, child in zip(element_aliases, element_aliases[1:]):
+        stmt = stmt.join(child, child.dataset_collection_id == parent.child_collection_id)
+    stmt = stmt.where(element_aliases[0].dataset_collection_id == dataset_collection.id).order_by(
+        *(element_alias.element_index for element_alias in element_aliases)
+    )
+    return list(session.scalars(stmt))
+
+
+def _clean_session(dataset_collection):
+    """Return the session of ``dataset_collection`` if its database state is current."""
+    state = inspect(dataset_collection, raiseerr=False)
+    if state is None or not state.persistent:
+        return None
+    session = object_session(dataset_collection)
+    if session is None or dataset_collection in session.dirty:
+        return None
+    return session
+
+
+def structure_for_dataset_collection(dataset_collection, collection_type_description):
+    if _clean_session(dataset_collection) is not None and (
+        collection_type_description.has_subcollections()
+        or (dataset_collection.element_count or 0) >= COLUMNAR_STRUCTURE_MIN_ELEMENTS
+    ):
+        return ColumnarTree.load(dataset_collection, collection_type_description)
+    return Tree.for_dataset_collection(dataset_collection, collection_type_description)
+
+
 def tool_output_to_structure(get_sliced_input_collection_structure, tool_output, collections_manager):
     if not tool_output.collection:
         tree = leaf
@@ -204,4 +553,4 @@ def get_structure(dataset_collection_instance, collection_type_description, leaf
             return UninitializedTree(collection_type_description)
 
     collection = dataset_collection_instance.collection
-    return Tree.for_dataset_collection(collection, collection_type_description)
+    return structure_for_dataset_collection(collection, collection_type_description)
@@ -0,0 +1,66 @@
+"""add job_metric_rollup table
+
+Revision ID: a4c4d5f8e2b1
+Revises: 7ffd33d5d144
+Create Date: 2024-10-21 10:12:31.427105
+
+"""
+
+from sqlalchemy import (
+    Column,
+    Date,
+    DateTime,
+    Float,
+    Integer,
+    String,
+    Unicode,
+    UniqueConstraint,
+)
+
+from galaxy.model.custom_types import JSONType
+from galaxy.model.database_object_names import build_unique_constraint_name
+from galaxy.model.migrations.util import (
+    create_table,
+    drop_table,
+    transaction,
+)
+
+# revision identifiers, used by Alembic.
+revision = "a4c4d5f8e2b1"
+down_revision = "7ffd33d5d144"
+branch_labels = None
+depends_on = None
+
+table_name = "job_metric_rollup"
+
+
+def upgrade():
+    with transaction():
+        create_table(
+            table_name,
+            Column("id", Integer, primary_key=True),
+            Column("update_time", DateTime),
+            Column("day", Date, nullable=False, index=True),
+            Column("tool_id", String(255), nullable=False, index=True),
+            Column("destination_id", String(255), nullable=False),
+            Column("plugin", Unicode(255), nullable=False),
+            Column("metric_name", Unicode(255), nullable=False),
+            Column("count", Integer, nullable=False),
+            Column("total", Float, nullable=False),
+            Column("minimum", Float),
+            Column("maximum", Float),
+            Column("histogram", JSONType),
+            UniqueConstraint(
+                "day",
+                "tool_id",
+                "destination_id",
+                "plugin",
+                "metric_name",
+                name=build_unique_constraint_name(table_name, "day"),
+            ),
+        )
+
+
+def downgrade():
+    with transaction():
+        drop_table(table_name)
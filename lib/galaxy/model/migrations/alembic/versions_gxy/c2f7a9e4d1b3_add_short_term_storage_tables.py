@@ -0,0 +1,58 @@
+"""add short_term_storage_entry and short_term_storage_counter tables
+
+Revision ID: c2f7a9e4d1b3
+Revises: a4c4d5f8e2b1
+Create Date: 2024-10-28 14:03:52.218440
+
+"""
+
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    DateTime,
+    Integer,
+    String,
+)
+
+from galaxy.model.custom_types import JSONType
+from galaxy.model.migrations.util import (
+    create_table,
+    drop_table,
+    transaction,
+)
+
+# revision identifiers, used by Alembic.
+revision = "c2f7a9e4d1b3"
+down_revision = "a4c4d5f8e2b1"
+branch_labels = None
+depends_on = None
+
+entry_table_name = "short_term_storage_entry"
+counter_table_name = "short_term_storage_counter"
+
+
+def upgrade():
+    with transaction():
+        create_table(
+            entry_table_name,
+            Column("request_id", String(36), primary_key=True),
+            Column("fingerprint", String(255), index=True),
+            Column("user_id", Integer, index=True),
+            Column("session_id", Integer),
+            Column("create_time", DateTime, nullable=False),
+            Column("expire_time", DateTime, nullable=False, index=True),
+            Column("size", BigInteger),
+            Column("state", String(16), nullable=False),
+            Column("task_summary", JSONType),
+        )
+        create_table(
+            counter_table_name,
+            Column("name", String(64), primary_key=True),
+            Column("value", BigInteger, nullable=False),
+        )
+
+
+def downgrade():
+    with transaction():
+        drop_table(counter_table_name)
+        drop_table(entry_table_name)
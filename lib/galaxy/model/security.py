@@ -1,25 +1,37 @@
 import logging
 import socket
 import sqlite3
+import threading
+import time
+import weakref
 from datetime import (
     datetime,
     timedelta,
 )
 from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
     List,
     Optional,
+    Tuple,
 )
 
 from sqlalchemy import (
     and_,
     delete,
+    event,
     false,
     func,
     insert,
+    inspect,
     not_,
     or_,
     select,
     text,
+    union,
 )
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import joinedload
@@ -64,12 +76,206 @@ from galaxy.util.bunch import Bunch
 
 log = logging.getLogger(__name__)
 
+# Key in ``Session.info`` of the dataset access cache of the current transaction.
+DATASET_ACCESS_CACHE_KEY = "dataset_access"
+# Maximum number of dataset ids resolved by a single dataset access query.
+DATASET_ACCESS_BATCH_SIZE = 5000
+# Key in ``Session.info`` of the per session (and so per request) effective roles of users.
+EFFECTIVE_ROLES_KEY = "effective_roles"
+# Key in ``Session.info`` collecting users whose effective roles changed until commit.
+EFFECTIVE_ROLES_INVALIDATIONS_KEY = "effective_roles_invalidations"
+# Number of seconds effective roles are cached across requests. Association changes made
+# through Galaxy invalidate the cache in all processes, this bounds the staleness of changes
+# made directly in the database.
+EFFECTIVE_ROLES_CACHE_TTL = 60
+EFFECTIVE_ROLES_CACHE_MAX_ENTRIES = 100000
+
+
+class EffectiveRoleCache:
+    """
+    Process wide cache of the ids of the roles users have directly or through
+    their groups.
+
+    Every user has a version stamp that changes when the cached roles of the
+    user are invalidated, so role ids computed before an invalidation are
+    never stored and copies kept elsewhere (e.g. for the current request)
+    can be validated cheaply.
+    """
+
+    def __init__(self, ttl: int = EFFECTIVE_ROLES_CACHE_TTL, max_entries: int = EFFECTIVE_ROLES_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        # Called with the ids of the users whose roles changed (or None for all users)
+        # after a commit, used to invalidate the caches of the other Galaxy processes.
+        self.on_invalidate: Optional[Callable[[Optional[List[int]]], None]] = None
+        self._generation = 0
+        self._user_versions: Dict[int, int] = {}
+        self._entries: Dict[int, Tuple[Tuple[int, int], float, FrozenSet[int]]] = {}
+        self._lock = threading.Lock()
+
+    def stamp(self, user_id: int) -> Tuple[int, int]:
+        with self._lock:
+            return self._generation, self._user_versions.get(user_id, 0)
+
+    def get(self, user_id: int) -> Optional[FrozenSet[int]]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            stamp, expires, role_ids = entry
+            if stamp != (self._generation, self._user_versions.get(user_id, 0)) or expires < time.monotonic():
+                del self._entries[user_id]
+                return None
+            return role_ids
+
+    def set(self, user_id: int, stamp: Tuple[int, int], role_ids: FrozenSet[int]):
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            if stamp != (self._generation, self._user_versions.get(user_id, 0)):
+                # invalidated while the roles were computed
+                return
+            if len(self._entries) >= self.max_entries:
+                self._entries.clear()
+            self._entries[user_id] = (stamp, time.monotonic() + self.ttl, role_ids)
+
+    def invalidate(self, user_ids: Optional[Iterable[int]] = None):
+        with self._lock:
+            if user_ids is None:
+                self._generation += 1
+                self._user_versions.clear()
+                self._entries.clear()
+            else:
+                for user_id in user_ids:
+                    self._user_versions[user_id] = self._user_versions.get(user_id, 0) + 1
+                    self._entries.pop(user_id, None)
+
+
+class _EffectiveRolesInvalidationDispatcher:
+    """Track role association changes made through a session and invalidate all effective role caches using it.
+
+    The session event listeners are registered once per session, registering them for every
+    agent would pile them up on the shared scoped session and leave only the first agent to
+    see the changes.
+    """
+
+    _dispatchers: "weakref.WeakKeyDictionary[Any, _EffectiveRolesInvalidationDispatcher]" = weakref.WeakKeyDictionary()
+    _dispatchers_lock = threading.Lock()
+
+    def __init__(self, session):
+        self.caches: weakref.WeakSet[EffectiveRoleCache] = weakref.WeakSet()
+        event.listen(session, "after_flush", self._track_flushed_role_changes)
+        event.listen(session, "do_orm_execute", self._track_executed_role_changes)
+        event.listen(session, "after_commit", self._apply_role_invalidations)
+
+    @classmethod
+    def for_session(cls, session) -> "_EffectiveRolesInvalidationDispatcher":
+        with cls._dispatchers_lock:
+            dispatcher = cls._dispatchers.get(session)
+            if dispatcher is None:
+                dispatcher = cls._dispatchers[session] = cls(session)
+            return dispatcher
+
+    def _track_flushed_role_changes(self, session, flush_context):
+        user_ids = set()
+        invalidate_all = False
+        for obj in session.new | session.dirty | session.deleted:
+            if isinstance(obj, (UserRoleAssociation, UserGroupAssociation)):
+                # read the loaded value, deleted rows can't be refreshed
+                user_id = inspect(obj).dict.get("user_id")
+                if user_id is None:
+                    invalidate_all = True
+                else:
+                    user_ids.add(user_id)
+            elif isinstance(obj, GroupRoleAssociation):
+                invalidate_all = True
+        if invalidate_all or user_ids:
+            self._invalidate_effective_roles(session, None if invalidate_all else user_ids)
+
+    def _track_executed_role_changes(self, orm_execute_state):
+        if orm_execute_state.is_select:
+            return
+        for mapper in orm_execute_state.all_mappers:
+            if issubclass(mapper.class_, (UserRoleAssociation, UserGroupAssociation, GroupRoleAssociation)):
+                self._invalidate_effective_roles(orm_execute_state.session, None)
+                return
+
+    def _invalidate_effective_roles(self, session, user_ids):
+        # Invalidate immediately for this session, which sees the flushed changes,
+        # and again after commit for everyone else.
+        for cache in list(self.caches):
+            cache.invalidate(user_ids)
+        pending = session.info.setdefault(EFFECTIVE_ROLES_INVALIDATIONS_KEY, {"all": False, "user_ids": set()})
+        if user_ids is None:
+            pending["all"] = True
+        else:
+            pending["user_ids"].update(user_ids)
+
+    def _apply_role_invalidations(self, session):
+        invalidations = session.info.pop(EFFECTIVE_ROLES_INVALIDATIONS_KEY, None)
+        if not invalidations:
+            return
+        user_ids = None if invalidations["all"] else sorted(invalidations["user_ids"])
+        for cache in list(self.caches):
+            cache.invalidate(user_ids)
+            if cache.on_invalidate is not None:
+                try:
+                    cache.on_invalidate(user_ids)
+                except Exception:
+                    log.exception("Failed to send role cache invalidation to other Galaxy processes")
+
+
+class _DatasetAccessCacheDispatcher:
+    """Clear the dataset access cache of a session when its transaction ends or dataset permissions change.
+
+    Sessions of long running threads (job handlers, the workflow scheduler, Celery
+    workers) outlive requests, the cache must not outlive the transaction that filled
+    it or access revoked by another process stays granted. Like
+    ``_EffectiveRolesInvalidationDispatcher`` the listeners are registered once per session.
+    """
+
+    _dispatchers: "weakref.WeakKeyDictionary[Any, _DatasetAccessCacheDispatcher]" = weakref.WeakKeyDictionary()
+    _dispatchers_lock = threading.Lock()
+
+    def __init__(self, session):
+        event.listen(session, "after_flush", self._clear_on_flushed_permission_changes)
+        event.listen(session, "do_orm_execute", self._clear_on_executed_permission_changes)
+        event.listen(session, "after_transaction_end", self._clear_on_transaction_end)
+
+    @classmethod
+    def for_session(cls, session) -> "_DatasetAccessCacheDispatcher":
+        with cls._dispatchers_lock:
+            dispatcher = cls._dispatchers.get(session)
+            if dispatcher is None:
+                dispatcher = cls._dispatchers[session] = cls(session)
+            return dispatcher
+
+    def _clear_on_flushed_permission_changes(self, session, flush_context):
+        if DATASET_ACCESS_CACHE_KEY in session.info and any(
+            isinstance(obj, DatasetPermissions) for obj in session.new | session.dirty | session.deleted
+        ):
+            session.info.pop(DATASET_ACCESS_CACHE_KEY, None)
+
+    def _clear_on_executed_permission_changes(self, orm_execute_state):
+        if orm_execute_state.is_select:
+            return
+        if any(issubclass(mapper.class_, DatasetPermissions) for mapper in orm_execute_state.all_mappers):
+            orm_execute_state.session.info.pop(DATASET_ACCESS_CACHE_KEY, None)
+
+    def _clear_on_transaction_end(self, session, transaction):
+        # commit, rollback and close all end the outermost transaction
+        if transaction.parent is None:
+            session.info.pop(DATASET_ACCESS_CACHE_KEY, None)
+
 
 class GalaxyRBACAgent(RBACAgent):
     def __init__(self, sa_session, permitted_actions=None):
         self.sa_session = sa_session
         if permitted_actions:
             self.permitted_actions = permitted_actions
+        _DatasetAccessCacheDispatcher.for_session(sa_session)
+        self.effective_roles = EffectiveRoleCache()
+        _EffectiveRolesInvalidationDispatcher.for_session(sa_session).caches.add(self.effective_roles)
         # List of "library_item" objects and their associated permissions and info template objects
         self.library_item_assocs = (
             (Library, LibraryPermissions),
@@ -290,6 +496,57 @@ class GalaxyRBACAgent(RBACAgent):
             return True
         return role_type != Role.types.PRIVATE and role_type != Role.types.SHARING
 
+    def get_user_role_ids(self, user) -> FrozenSet[int]:
+        """
+        Return the ids of the roles associated with the user or any of their groups.
+
+        The role ids are kept for the current database session (i.e. the current
+        request) and cached across requests until the user's role or group
+        associations change.
+        """
+        user_id = galaxy.model.cached_id(user)
+        if user_id is None:
+            return frozenset(galaxy.model.cached_id(role) for role in user.all_roles())
+        stamp = self.effective_roles.stamp(user_id)
+        request_roles = self.sa_session.info.setdefault(EFFECTIVE_ROLES_KEY, {})
+        entry = request_roles.get(user_id)
+        if entry is not None and entry[0] == stamp:
+            return entry[1]
+        role_ids = self.effective_roles.get(user_id)
+        if role_ids is None:
+            stmt = union(
+                select(UserRoleAssociation.role_id).where(UserRoleAssociation.user_id == user_id),
+                select(GroupRoleAssociation.role_id)
+                .join(UserGroupAssociation, UserGroupAssociation.group_id == GroupRoleAssociation.group_id)
+                .where(UserGroupAssociation.user_id == user_id),
+            )
+            role_ids = frozenset(role_id for role_id in self.sa_session.scalars(stmt) if role_id is not None)
+            self.effective_roles.set(user_id, stamp, role_ids)
+        request_roles[user_id] = (stamp, role_ids, None)
+        return role_ids
+
+    def get_user_roles(self, user) -> List[Role]:
+        """Return the roles associated with the user or any of their groups, see get_user_role_ids."""
+        role_ids = self.get_user_role_ids(user)
+        user_id = galaxy.model.cached_id(user)
+        if user_id is None:
+            return user.all_roles()
+        request_roles = self.sa_session.info[EFFECTIVE_ROLES_KEY]
+        stamp, _, roles = request_roles[user_id]
+        if roles is None:
+            roles = list(self.sa_session.scalars(select(Role).where(Role.id.in_(role_ids)).order_by(Role.id)))
+            request_roles[user_id] = (stamp, role_ids, roles)
+        return roles
+
+    def _role_ids(self, roles) -> FrozenSet[int]:
+        return frozenset(galaxy.model.cached_id(role) for role in roles)
+
+    def _item_action_role_id(self, item_action):
+        # new permissions may only reference their role object
+        if item_action.role_id is None and item_action.role is not None:
+            return galaxy.model.cached_id(item_action.role)
+        return item_action.role_id
+
     def allow_action(self, roles, action, item):
         """
         Method for checking a permission for the current user ( based on roles ) to perform a
@@ -301,21 +558,12 @@ class GalaxyRBACAgent(RBACAgent):
 
         if not item_actions:
             return action.model == "restrict"
-        ret_val = False
+        role_ids = self._role_ids(roles)
         # For DATASET_ACCESS only, user must have ALL associated roles
         if action == self.permitted_actions.DATASET_ACCESS:
-            for item_action in item_actions:
-                if item_action.role not in roles:
-                    break
-            else:
-                ret_val = True
+            return all(self._item_action_role_id(item_action) in role_ids for item_action in item_actions)
         # For remaining actions, user must have any associated role
-        else:
-            for item_action in item_actions:
-                if item_action.role in roles:
-                    ret_val = True
-                    break
-        return ret_val
+        return any(self._item_action_role_id(item_action) in role_ids for item_action in item_actions)
 
     def get_actions_for_items(self, trans, action, permission_items):
         # TODO: Rename this; it's a replacement for get_item_actions, but it
@@ -417,6 +665,8 @@ class GalaxyRBACAgent(RBACAgent):
         """
         all_items_actions = self.get_actions_for_items(trans, action, items)
         ret_allow_action = {}
+        # Compare role ids, comparing roles would load the role of every permission.
+        user_role_ids = self._role_ids(user_roles)
 
         # Change item to lib_dataset or vice-versa.
         for item in items:
@@ -426,7 +676,7 @@ class GalaxyRBACAgent(RBACAgent):
                 if self.permitted_actions.DATASET_ACCESS == action:
                     ret_allow_action[item.id] = True
                     for item_action in item_actions:
-                        if item_action.role not in user_roles:
+                        if item_action.role_id not in user_role_ids:
                             ret_allow_action[item.id] = False
                             break
 
@@ -435,7 +685,7 @@ class GalaxyRBACAgent(RBACAgent):
                 else:
                     ret_allow_action[item.id] = False
                     for item_action in item_actions:
-                        if item_action.role in user_roles:
+                        if item_action.role_id in user_role_ids:
                             ret_allow_action[item.id] = True
                             break
 
@@ -466,14 +716,7 @@ class GalaxyRBACAgent(RBACAgent):
         to whether they can be accessed by the user or not. The datasets input
         is expected to be a simple list of Dataset objects.
         """
-        datasets_public_map = self.datasets_are_public(trans, datasets)
-        datasets_allow_action_map = self.allow_action_on_libitems(
-            trans, user_roles, self.permitted_actions.DATASET_ACCESS, datasets
-        )
-        can_access = {}
-        for dataset in datasets:
-            can_access[dataset.id] = datasets_public_map[dataset.id] or datasets_allow_action_map[dataset.id]
-        return can_access
+        return self.dataset_access_map(user_roles, [dataset.id for dataset in datasets])
 
     def dataset_permission_map_for_access(self, trans, user_roles, libitems):
         """
@@ -485,20 +728,11 @@ class GalaxyRBACAgent(RBACAgent):
         NB: This is currently only usable for Datasets; it was intended to
         be used for any library item.
         """
-        # Map the library items to whether they are publicly accessible or not.
-        # Then determine what actions are allowed on the item (in case it's not
-        # public). Finally, the item is accessible if it's publicly available
-        # or the right permissions are enabled.
+        # An item is accessible if it's publicly available or the right
+        # permissions are enabled, see dataset_access_map.
         # TODO: This only works for Datasets; other code is using X_is_public,
         # so this will have to be rewritten to support other items.
-        libitems_public_map = self.datasets_are_public(trans, libitems)
-        libitems_allow_action_map = self.allow_action_on_libitems(
-            trans, user_roles, self.permitted_actions.DATASET_ACCESS, libitems
-        )
-        can_access = {}
-        for libitem in libitems:
-            can_access[libitem.id] = libitems_public_map[libitem.id] or libitems_allow_action_map[libitem.id]
-        return can_access
+        return self.dataset_access_map(user_roles, [libitem.id for libitem in libitems])
 
     def item_permission_map_for_modify(self, trans, user_roles, libitems):
         return self.allow_action_on_libitems(trans, user_roles, self.permitted_actions.LIBRARY_MODIFY, libitems)
@@ -510,15 +744,49 @@ class GalaxyRBACAgent(RBACAgent):
         return self.allow_action_on_libitems(trans, user_roles, self.permitted_actions.LIBRARY_ADD, libitems)
 
     def can_access_dataset(self, user_roles, dataset: Dataset):
-        # SM: dataset_is_public will access dataset.actions, which is a
-        # backref that causes a query to be made to DatasetPermissions
-        retval = self.dataset_is_public(dataset) or self.allow_action(
-            user_roles, self.permitted_actions.DATASET_ACCESS, dataset
-        )
-        return retval
+        dataset_id = galaxy.model.cached_id(dataset)
+        if dataset_id is None or "actions" in inspect(dataset).dict:
+            # New datasets and datasets with loaded permissions (which may include
+            # unflushed changes) are checked against dataset.actions directly.
+            return self.dataset_is_public(dataset) or self.allow_action(
+                user_roles, self.permitted_actions.DATASET_ACCESS, dataset
+            )
+        return self.dataset_access_map(user_roles, [dataset_id])[dataset_id]
+
+    def dataset_access_map(self, user_roles, dataset_ids: Iterable[int]) -> Dict[int, bool]:
+        """
+        Return a mapping of the supplied dataset ids to whether a user with
+        the supplied roles can access the dataset.
+
+        A dataset can be accessed if it has no access permissions or if the
+        user has all of its access roles. Access is resolved with one query
+        for the whole set of datasets and cached until the current database
+        transaction ends, so managers and serializers checking the same
+        datasets during a request don't query the permissions again.
+        """
+        dataset_ids = list(dataset_ids)
+        user_role_ids = self._role_ids(user_roles) - {None}
+        cache = self.sa_session.info.setdefault(DATASET_ACCESS_CACHE_KEY, {}).setdefault(user_role_ids, {})
+        missing = sorted({dataset_id for dataset_id in dataset_ids if dataset_id not in cache})
+        for start in range(0, len(missing), DATASET_ACCESS_BATCH_SIZE):
+            batch = missing[start : start + DATASET_ACCESS_BATCH_SIZE]
+            # datasets having an access role the user doesn't have
+            stmt = (
+                select(DatasetPermissions.dataset_id)
+                .where(DatasetPermissions.dataset_id.in_(batch))
+                .where(DatasetPermissions.action == self.permitted_actions.DATASET_ACCESS.action)
+                .where(
+                    or_(DatasetPermissions.role_id.is_(None), DatasetPermissions.role_id.not_in(sorted(user_role_ids)))
+                )
+                .distinct()
+            )
+            restricted = set(self.sa_session.scalars(stmt))
+            for dataset_id in batch:
+                cache[dataset_id] = dataset_id not in restricted
+        return {dataset_id: cache[dataset_id] for dataset_id in dataset_ids}
 
     def can_access_datasets(self, user_roles, action_tuples):
-        user_role_ids = [galaxy.model.cached_id(r) for r in user_roles]
+        user_role_ids = self._role_ids(user_roles)
 
         # For DATASET_ACCESS, user must have ALL associated roles
         for action, user_role_id in action_tuples:
@@ -1650,13 +1918,14 @@ WHERE history.user_id != :user_id and history_dataset_association.dataset_id = :
             .options(joinedload(LibraryDatasetDatasetAssociation.dataset).joinedload(Dataset.actions))
         )
         lddas = self.sa_session.scalars(stmt).unique()
+        role_ids = self._role_ids(roles)
         for ldda in lddas:
             ldda_access_permissions = self.get_item_actions(action, ldda.dataset)
             if not ldda_access_permissions:
                 # Dataset is public
                 return True, hidden_folder_ids
             for ldda_access_permission in ldda_access_permissions:
-                if ldda_access_permission.role in roles:
+                if ldda_access_permission.role_id in role_ids:
                     # The current user has access permission on the dataset
                     return True, hidden_folder_ids
         for sub_folder in folder.active_folders:
@@ -82,6 +82,8 @@ class GalaxyDataTestConfig(Bunch):
         self.file_source_temp_dir = None
         self.file_source_webdav_use_temp_files = False
         self.file_source_listings_expiry_time = 60
+        self.file_source_transfer_connections = 4
+        self.file_source_transfer_part_size = 8388608
 
     def __del__(self):
         if self._remove_root:
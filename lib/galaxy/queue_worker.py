@@ -227,6 +227,18 @@ def recalculate_user_disk_usage(app, **kwargs):
         log.error("Recalculate user disk usage task received without user_id.")
 
 
+def invalidate_quota_cache(app, **kwargs):
+    user_ids = kwargs.get("user_ids")
+    log.debug("Executing quota cache invalidation for %s", "all users" if user_ids is None else user_ids)
+    app.quota_agent.invalidate_quota_cache(user_ids)
+
+
+def invalidate_role_cache(app, **kwargs):
+    user_ids = kwargs.get("user_ids")
+    log.debug("Executing role cache invalidation for %s", "all users" if user_ids is None else user_ids)
+    app.security_agent.effective_roles.invalidate(user_ids)
+
+
 def reload_tool_data_tables(app, **kwargs):
     path = kwargs.get("path")
     table_name = kwargs.get("table_name")
@@ -310,6 +322,8 @@ control_message_to_task = {
     "admin_job_lock": admin_job_lock,
     "reload_sanitize_allowlist": reload_sanitize_allowlist,
     "recalculate_user_disk_usage": recalculate_user_disk_usage,
+    "invalidate_quota_cache": invalidate_quota_cache,
+    "invalidate_role_cache": invalidate_role_cache,
     "rebuild_toolbox_search_index": rebuild_toolbox_search_index,
     "reconfigure_watcher": reconfigure_watcher,
     "reload_tour": reload_tour,
@@ -1,9 +1,24 @@
 """Galaxy Quotas"""
 
 import logging
-from typing import Optional
+import threading
+import time
+import weakref
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+)
 
-from sqlalchemy import select
+from sqlalchemy import (
+    bindparam,
+    event,
+    inspect,
+    select,
+)
 from sqlalchemy.sql import text
 
 import galaxy.util
@@ -11,6 +26,66 @@ from galaxy.model.base import transaction
 
 log = logging.getLogger(__name__)
 
+_CACHE_MISS = object()
+
+# Number of seconds an effective quota is cached for, changes made through
+# Galaxy invalidate cached quotas immediately, this only bounds the staleness
+# of changes made directly in the database.
+DEFAULT_QUOTA_CACHE_TTL = 60
+
+QUOTA_CACHE_MAX_ENTRIES = 100000
+
+# Key in ``Session.info`` collecting quota cache invalidations until commit.
+QUOTA_CACHE_INVALIDATIONS_KEY = "quota_cache_invalidations"
+
+_USER_QUOTA_SQL = """
+SELECT guser.id as user_id, (
+        COALESCE(MAX(CASE WHEN union_quota.operation = '='
+                          THEN union_quota.bytes
+                          ELSE NULL
+                          END),
+                 (SELECT default_quota.bytes
+                  FROM quota as default_quota
+                      LEFT JOIN default_quota_association on default_quota.id = default_quota_association.quota_id
+                      WHERE default_quota_association.type = 'registered'
+                          AND default_quota.deleted != :is_true
+                          AND default_quota.quota_source_label {label_cond}))
+        +
+        (CASE WHEN SUM(CASE WHEN union_quota.operation = '=' AND union_quota.bytes = -1
+                            THEN 1 ELSE 0
+                            END) > 0
+              THEN NULL
+              ELSE 0 END)
+        +
+        (COALESCE(SUM(
+                CASE WHEN union_quota.operation = '+' THEN union_quota.bytes
+                     WHEN union_quota.operation = '-' THEN -1 * union_quota.bytes
+                     ELSE 0
+                     END
+              ), 0))
+       )
+FROM galaxy_user as guser
+LEFT JOIN (
+    SELECT uqa.user_id as user_id, user_quota.operation as operation, user_quota.bytes as bytes
+    FROM user_quota_association as uqa
+        LEFT JOIN quota as user_quota on user_quota.id = uqa.quota_id
+    WHERE user_quota.deleted != :is_true
+        AND user_quota.quota_source_label {label_cond}
+        AND uqa.user_id IN :user_ids
+    UNION ALL
+    SELECT uga.user_id as user_id, group_quota.operation as operation, group_quota.bytes as bytes
+    FROM user_group_association as uga
+        LEFT JOIN galaxy_group on galaxy_group.id = uga.group_id
+        LEFT JOIN group_quota_association as gqa on galaxy_group.id = gqa.group_id
+        LEFT JOIN quota as group_quota on group_quota.id = gqa.quota_id
+    WHERE group_quota.deleted != :is_true
+        AND group_quota.quota_source_label {label_cond}
+        AND uga.user_id IN :user_ids
+) as union_quota on union_quota.user_id = guser.id
+WHERE guser.id IN :user_ids
+GROUP BY guser.id
+"""
+
 
 class QuotaAgent:  # metaclass=abc.ABCMeta
     """Abstraction around querying Galaxy for quota available and used.
@@ -37,6 +112,13 @@ class QuotaAgent:  # metaclass=abc.ABCMeta
     def get_quota(self, user, quota_source_label=None) -> Optional[int]:
         """Return quota in bytes or None if no quota is set."""
 
+    def get_quotas(self, user_ids: Iterable[int], quota_source_label=None) -> Dict[int, Optional[int]]:
+        """Return quotas in bytes (or None if no quota is set) keyed by the ids of the supplied users."""
+        return {user_id: None for user_id in user_ids}
+
+    def invalidate_quota_cache(self, user_ids: Optional[Iterable[int]] = None):
+        """Forget cached quotas for the supplied users or for all users if ``user_ids`` is None."""
+
     def get_quota_nice_size(self, user, quota_source_label=None) -> Optional[str]:
         """Return quota as a human-readable string or 'unlimited' if no quota is set."""
         quota_bytes = self.get_quota(user, quota_source_label=quota_source_label)
@@ -108,9 +190,17 @@ class NoQuotaAgent(QuotaAgent):
 class DatabaseQuotaAgent(QuotaAgent):
     """Class that handles galaxy quotas"""
 
-    def __init__(self, model):
+    def __init__(self, model, cache_ttl: int = DEFAULT_QUOTA_CACHE_TTL):
         self.model = model
         self.sa_session = model.context
+        self.cache_ttl = cache_ttl
+        # Called with the ids of the users whose quotas changed (or None for all users)
+        # after a commit, used to invalidate the caches of the other Galaxy processes.
+        self.on_invalidate: Optional[Callable[[Optional[List[int]]], None]] = None
+        self._quota_cache: Dict[tuple, tuple] = {}
+        self._quota_cache_lock = threading.Lock()
+        if cache_ttl > 0:
+            _QuotaInvalidationDispatcher.for_session(self.sa_session, model).agents.add(self)
 
     def get_quota(self, user, quota_source_label=None) -> Optional[int]:
         """
@@ -124,8 +214,83 @@ class DatabaseQuotaAgent(QuotaAgent):
             3. Quota is increased or decreased by any corresponding '+' or '-'
                quotas.
         """
+        user_id = user.id if user else None
+        cached = self._cached_quota(user_id, quota_source_label)
+        if cached is not _CACHE_MISS:
+            return cached
         if not user:
-            return self._default_unregistered_quota(quota_source_label)
+            quota = self._default_unregistered_quota(quota_source_label)
+        else:
+            quota = self._query_quota(user_id, quota_source_label)
+        self._cache_quota(user_id, quota_source_label, quota)
+        return quota
+
+    def get_quotas(self, user_ids: Iterable[int], quota_source_label=None) -> Dict[int, Optional[int]]:
+        """Return the quotas of many users, evaluating all uncached quotas with a single query."""
+        quotas: Dict[int, Optional[int]] = {}
+        missing = []
+        for user_id in set(user_ids):
+            cached = self._cached_quota(user_id, quota_source_label)
+            if cached is _CACHE_MISS:
+                missing.append(user_id)
+            else:
+                quotas[user_id] = cached
+        if missing:
+            query = text(_USER_QUOTA_SQL.format(label_cond=self._label_condition(quota_source_label))).bindparams(
+                bindparam("user_ids", expanding=True)
+            )
+            engine = self.sa_session.get_bind()
+            with engine.connect() as conn:
+                rows = conn.execute(
+                    query, {"is_true": True, "user_ids": missing, "label": quota_source_label}
+                ).fetchall()
+            for user_id, quota in rows:
+                quota = int(quota) if quota else None
+                quotas[user_id] = quota
+                self._cache_quota(user_id, quota_source_label, quota)
+        return quotas
+
+    def invalidate_quota_cache(self, user_ids: Optional[Iterable[int]] = None):
+        with self._quota_cache_lock:
+            if user_ids is None:
+                self._quota_cache.clear()
+            else:
+                user_ids = set(user_ids)
+                for key in [key for key in self._quota_cache if key[0] in user_ids]:
+                    del self._quota_cache[key]
+
+    def _cached_quota(self, user_id, quota_source_label):
+        if self.cache_ttl <= 0:
+            return _CACHE_MISS
+        with self._quota_cache_lock:
+            entry = self._quota_cache.get((user_id, quota_source_label))
+        if entry is None or entry[0] < time.monotonic():
+            return _CACHE_MISS
+        return entry[1]
+
+    def _cache_quota(self, user_id, quota_source_label, quota):
+        if self.cache_ttl > 0:
+            now = time.monotonic()
+            with self._quota_cache_lock:
+                if len(self._quota_cache) >= QUOTA_CACHE_MAX_ENTRIES:
+                    self._quota_cache = {key: entry for key, entry in self._quota_cache.items() if entry[0] >= now}
+                    if len(self._quota_cache) >= QUOTA_CACHE_MAX_ENTRIES:
+                        self._quota_cache.clear()
+                self._quota_cache[(user_id, quota_source_label)] = (now + self.cache_ttl, quota)
+
+    def _apply_quota_invalidations(self, user_ids: Optional[List[int]]):
+        self.invalidate_quota_cache(user_ids)
+        if self.on_invalidate is not None:
+            try:
+                self.on_invalidate(user_ids)
+            except Exception:
+                log.exception("Failed to send quota cache invalidation to other Galaxy processes")
+
+    @staticmethod
+    def _label_condition(quota_source_label):
+        return "IS NULL" if quota_source_label is None else " = :label"
+
+    def _query_quota(self, user_id, quota_source_label) -> Optional[int]:
         query = text(
             """
 SELECT (
@@ -173,12 +338,12 @@ FROM (
         AND guser.id = :user_id
 ) as union_quota
 """.format(
-                label_cond="IS NULL" if quota_source_label is None else " = :label"
+                label_cond=self._label_condition(quota_source_label)
             )
         )
         engine = self.sa_session.get_bind()
         with engine.connect() as conn:
-            res = conn.execute(query, {"is_true": True, "user_id": user.id, "label": quota_source_label}).fetchone()
+            res = conn.execute(query, {"is_true": True, "user_id": user_id, "label": quota_source_label}).fetchone()
             if res:
                 return int(res[0]) if res[0] else None
             else:
@@ -398,10 +563,74 @@ WHERE default_quota_association.type = :default_type
         return False
 
 
+class _QuotaInvalidationDispatcher:
+    """Track quota changes made through a session and invalidate the caches of all quota agents using it.
+
+    The session event listeners are registered once per session, registering them for every
+    agent would pile them up on the shared scoped session and leave only the first agent to
+    see the changes.
+    """
+
+    _dispatchers: "weakref.WeakKeyDictionary[Any, _QuotaInvalidationDispatcher]" = weakref.WeakKeyDictionary()
+    _dispatchers_lock = threading.Lock()
+
+    def __init__(self, session, model):
+        self.agents: weakref.WeakSet[DatabaseQuotaAgent] = weakref.WeakSet()
+        self._model = model
+        self._quota_model_classes = (
+            model.Quota,
+            model.DefaultQuotaAssociation,
+            model.GroupQuotaAssociation,
+            model.UserQuotaAssociation,
+            model.UserGroupAssociation,
+        )
+        event.listen(session, "after_flush", self._track_flushed_quota_changes)
+        event.listen(session, "do_orm_execute", self._track_executed_quota_changes)
+        event.listen(session, "after_commit", self._apply_quota_invalidations)
+
+    @classmethod
+    def for_session(cls, session, model) -> "_QuotaInvalidationDispatcher":
+        with cls._dispatchers_lock:
+            dispatcher = cls._dispatchers.get(session)
+            if dispatcher is None:
+                dispatcher = cls._dispatchers[session] = cls(session, model)
+            return dispatcher
+
+    def _pending_invalidations(self, session):
+        return session.info.setdefault(QUOTA_CACHE_INVALIDATIONS_KEY, {"all": False, "user_ids": set()})
+
+    def _track_flushed_quota_changes(self, session, flush_context):
+        for obj in session.new | session.dirty | session.deleted:
+            if isinstance(obj, (self._model.UserQuotaAssociation, self._model.UserGroupAssociation)):
+                # read the loaded value, deleted rows can't be refreshed
+                user_id = inspect(obj).dict.get("user_id")
+                if user_id is None:
+                    self._pending_invalidations(session)["all"] = True
+                else:
+                    self._pending_invalidations(session)["user_ids"].add(user_id)
+            elif isinstance(obj, self._quota_model_classes):
+                self._pending_invalidations(session)["all"] = True
+
+    def _track_executed_quota_changes(self, orm_execute_state):
+        if orm_execute_state.is_select:
+            return
+        for mapper in orm_execute_state.all_mappers:
+            if issubclass(mapper.class_, self._quota_model_classes):
+                self._pending_invalidations(orm_execute_state.session)["all"] = True
+
+    def _apply_quota_invalidations(self, session):
+        invalidations = session.info.pop(QUOTA_CACHE_INVALIDATIONS_KEY, None)
+        if not invalidations:
+            return
+        user_ids = None if invalidations["all"] else sorted(invalidations["user_ids"])
+        for agent in list(self.agents):
+            agent._apply_quota_invalidations(user_ids)
+
+
 def get_quota_agent(config, model) -> QuotaAgent:
     quota_agent: QuotaAgent
     if config.enable_quotas:
-        quota_agent = galaxy.quota.DatabaseQuotaAgent(model)
+        quota_agent = galaxy.quota.DatabaseQuotaAgent(model, cache_ttl=config.quota_cache_ttl)
     else:
         quota_agent = galaxy.quota.NoQuotaAgent()
     return quota_agent
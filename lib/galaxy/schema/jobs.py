@@ -207,6 +207,41 @@ class JobDestinationParams(Model):
     model_config = ConfigDict(extra="allow")  # JobDestinationParams can have extra fields
 
 
+class JobLifecyclePhaseSummary(Model):
+    tool_id: Optional[str] = Field(None, title="Tool ID", description="The tool ID of the summarized jobs.")
+    destination_id: Optional[str] = Field(
+        None, title="Destination ID", description="The job destination ID of the summarized jobs."
+    )
+    phase: str = Field(..., title="Phase", description="The name of the job lifecycle phase.")
+    count: int = Field(..., title="Count", description="Number of jobs that recorded this phase.")
+    total: float = Field(..., title="Total", description="Total time spent in this phase in seconds.")
+    p50: float = Field(..., title="Median", description="Median time spent in this phase in seconds.")
+    p95: float = Field(
+        ..., title="95th percentile", description="95th percentile of the time spent in this phase in seconds."
+    )
+
+
+class JobMetricSummary(Model):
+    tool_id: str = Field(..., title="Tool ID", description="The tool ID of the summarized jobs.")
+    destination_id: Optional[str] = Field(
+        None,
+        title="Destination ID",
+        description="The job destination ID of the summarized jobs, unset if all destinations are summarized together.",
+    )
+    plugin: str = Field(..., title="Plugin", description="The job metrics plugin that recorded the metric.")
+    metric_name: str = Field(..., title="Metric name", description="The name of the metric.")
+    count: int = Field(..., title="Count", description="Number of recorded metric values.")
+    sum: float = Field(..., title="Sum", description="Sum of the recorded metric values.")
+    min: Optional[float] = Field(None, title="Minimum", description="Smallest recorded metric value.")
+    max: Optional[float] = Field(None, title="Maximum", description="Largest recorded metric value.")
+    mean: Optional[float] = Field(None, title="Mean", description="Mean of the recorded metric values.")
+    quantiles: Dict[str, Optional[float]] = Field(
+        {},
+        title="Quantiles",
+        description="Estimated quantiles of the recorded metric values, keyed by the requested fraction.",
+    )
+
+
 class JobOutput(Model):
     label: Any = Field(default=..., title="Output label", description="The output label")  # check if this is true
     value: EncodedDataItemSourceId = Field(default=..., title="Dataset", description="The associated dataset.")
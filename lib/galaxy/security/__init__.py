@@ -70,6 +70,10 @@ class RBACAgent:
     def get_item_actions(self, action, item):
         raise Exception(f"No valid method of retrieving action ({action}) for item {item}.")
 
+    def get_user_roles(self, user):
+        """Return the roles associated with the user or any of their groups."""
+        return user.all_roles()
+
     def guess_derived_permissions_for_datasets(self, datasets=None):
         datasets = datasets or []
         raise Exception("Unimplemented Method")
@@ -1,7 +1,13 @@
 import codecs
 import collections
 import logging
+import threading
 from typing import (
+    Any,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
     Optional,
     Union,
 )
@@ -24,6 +30,7 @@ MAXIMUM_ID_SECRET_LENGTH = int(MAXIMUM_ID_SECRET_BITS / 8)
 KIND_TOO_LONG_MESSAGE = (
     "Galaxy coding error, keep encryption 'kinds' smaller to utilize more bites of randomness from id_secret values."
 )
+DEFAULT_ID_CACHE_SIZE = 50000
 
 
 class IdEncodingHelper:
@@ -35,18 +42,61 @@ class IdEncodingHelper:
         per_kind_id_secret_base = config.get("per_kind_id_secret_base", self.id_secret)
         self.id_ciphers_for_kind = _cipher_cache(per_kind_id_secret_base)
 
+        id_cache_size = config.get("id_cache_size", DEFAULT_ID_CACHE_SIZE)
+        self._encoded_ids = _LRUCache(id_cache_size)
+        self._decoded_ids = _LRUCache(id_cache_size)
+
     def encode_id(self, obj_id, kind=None, strict_integer=False):
         if obj_id is None:
             raise galaxy.exceptions.MalformedId("Attempted to encode None id")
         if strict_integer and not isinstance(obj_id, int):
             raise galaxy.exceptions.MalformedId("Attempted to encode id that is not an integer")
-        id_cipher = self.__id_cipher(kind)
         # Convert to bytes
         s = smart_str(obj_id)
-        # Pad to a multiple of 8 with leading "!"
-        s = (b"!" * (8 - len(s) % 8)) + s
-        # Encrypt
-        return unicodify(codecs.encode(id_cipher.encrypt(s), "hex"))
+        key = (kind, s)
+        encoded_id = self._encoded_ids.get(key)
+        if encoded_id is None:
+            id_cipher = self.__id_cipher(kind)
+            # Encrypt
+            encoded_id = id_cipher.encrypt(_pad(s)).hex()
+            self._encoded_ids.put(key, encoded_id)
+        return encoded_id
+
+    def encode_ids(self, obj_ids: Iterable[Any], kind=None, strict_integer=False) -> List[str]:
+        """
+        Encode a sequence of ids, encrypting all ids that are not cached with a
+        single cipher call. Returns the encoded ids in the order of ``obj_ids``.
+        """
+        keys = []
+        encoded_ids: Dict[Hashable, str] = {}
+        missing: Dict[bytes, bytes] = {}
+        for obj_id in obj_ids:
+            if obj_id is None:
+                raise galaxy.exceptions.MalformedId("Attempted to encode None id")
+            if strict_integer and not isinstance(obj_id, int):
+                raise galaxy.exceptions.MalformedId("Attempted to encode id that is not an integer")
+            s = smart_str(obj_id)
+            key = (kind, s)
+            keys.append(key)
+            if key in encoded_ids or s in missing:
+                continue
+            encoded_id = self._encoded_ids.get(key)
+            if encoded_id is None:
+                missing[s] = _pad(s)
+            else:
+                encoded_ids[key] = encoded_id
+        if missing:
+            # Blowfish in ECB mode encrypts each 8 byte block independently, so the
+            # padded ids can be encrypted at once and the result split up again.
+            encrypted = self.__id_cipher(kind).encrypt(b"".join(missing.values())).hex()
+            offset = 0
+            for s, padded in missing.items():
+                end = offset + 2 * len(padded)
+                encoded_id = encrypted[offset:end]
+                offset = end
+                encoded_ids[(kind, s)] = encoded_id
+                self._encoded_ids.put((kind, s), encoded_id)
+        return [encoded_ids[key] for key in keys]
 
     def encode_dict_ids(self, a_dict, kind=None, skip_startswith=None):
         """
@@ -75,10 +125,7 @@ class IdEncodingHelper:
                     pass  # probably already encoded
             if k.endswith("_ids") and isinstance(v, list):
                 try:
-                    o = []
-                    for i in v:
-                        o.append(self.encode_id(i))
-                    rval[k] = o
+                    rval[k] = self.encode_ids(v)
                 except Exception:
                     pass
             else:
@@ -90,8 +137,13 @@ class IdEncodingHelper:
 
     def decode_id(self, obj_id, kind=None, object_name: Optional[str] = None):
         try:
-            id_cipher = self.__id_cipher(kind)
-            return int(unicodify(id_cipher.decrypt(codecs.decode(obj_id, "hex"))).lstrip("!"))
+            key = (kind, obj_id)
+            decoded_id = self._decoded_ids.get(key)
+            if decoded_id is None:
+                id_cipher = self.__id_cipher(kind)
+                decoded_id = int(unicodify(id_cipher.decrypt(codecs.decode(obj_id, "hex"))).lstrip("!"))
+                self._decoded_ids.put(key, decoded_id)
+            return decoded_id
         except TypeError:
             raise galaxy.exceptions.MalformedId(
                 f"Malformed {object_name if object_name is not None else ''} id ( {obj_id} ) specified, unable to decode."
@@ -101,6 +153,45 @@ class IdEncodingHelper:
                 f"Wrong {object_name if object_name is not None else ''} id ( {obj_id} ) specified, unable to decode."
             )
 
+    def decode_ids(self, obj_ids: Iterable[Any], kind=None, object_name: Optional[str] = None) -> List[int]:
+        """
+        Decode a sequence of encoded ids, decrypting all ids that are not cached
+        with a single cipher call. Raises ``MalformedId`` for the first invalid id.
+        """
+        obj_ids = list(obj_ids)
+        decoded_ids: Dict[Hashable, int] = {}
+        missing: Dict[Hashable, bytes] = {}
+        try:
+            for obj_id in obj_ids:
+                key = (kind, obj_id)
+                if key in decoded_ids or key in missing:
+                    continue
+                decoded_id = self._decoded_ids.get(key)
+                if decoded_id is None:
+                    raw_id = codecs.decode(obj_id, "hex")
+                    if not raw_id or len(raw_id) % 8:
+                        raise ValueError("Encoded id is not a multiple of the cipher block size")
+                    missing[key] = raw_id
+                else:
+                    decoded_ids[key] = decoded_id
+            if missing:
+                decrypted = self.__id_cipher(kind).decrypt(b"".join(missing.values()))
+                offset = 0
+                for key, raw_id in missing.items():
+                    end = offset + len(raw_id)
+                    decoded_id = int(unicodify(decrypted[offset:end]).lstrip("!"))
+                    offset = end
+                    decoded_ids[key] = decoded_id
+                    self._decoded_ids.put(key, decoded_id)
+        except (TypeError, ValueError):
+            # raise the same error decode_id reports for the offending id
+            for obj_id in obj_ids:
+                self.decode_id(obj_id, kind=kind, object_name=object_name)
+            raise galaxy.exceptions.MalformedId(
+                f"Malformed {object_name if object_name is not None else ''} ids specified, unable to decode."
+            )
+        return [decoded_ids[(kind, obj_id)] for obj_id in obj_ids]
+
     def encode_guid(self, session_key):
         # Session keys are strings
         # Pad to a multiple of 8 with leading "!"
@@ -141,7 +232,41 @@ class _cipher_cache(collections.defaultdict):
     def __missing__(self, key):
         assert len(key) < 15, KIND_TOO_LONG_MESSAGE
         secret = f"{self.secret_base}__{key}"
-        return Blowfish.new(_last_bits(secret), mode=Blowfish.MODE_ECB)
+        cipher = Blowfish.new(_last_bits(secret), mode=Blowfish.MODE_ECB)
+        self[key] = cipher
+        return cipher
+
+
+class _LRUCache:
+    """Thread safe, size bounded mapping that evicts the least recently used entries."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: collections.OrderedDict[Hashable, Any] = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any:
+        if self.maxsize <= 0:
+            return None
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+def _pad(s: bytes) -> bytes:
+    # Pad to a multiple of 8 with leading "!"
+    return (b"!" * (8 - len(s) % 8)) + s
 
 
 def _last_bits(secret):
@@ -10,14 +10,22 @@ generate and are not worth storing permanently.
 import abc
 import contextlib
 import json
+import logging
 import os
 import shutil
-from dataclasses import dataclass
-from datetime import datetime
+from dataclasses import (
+    dataclass,
+    field,
+)
+from datetime import (
+    datetime,
+    timedelta,
+)
 from pathlib import Path
 from typing import (
     Any,
     Dict,
+    List,
     Optional,
     Union,
 )
@@ -26,6 +34,23 @@ from uuid import (
     uuid4,
 )
 
+from sqlalchemy import (
+    and_,
+    create_engine,
+    delete,
+    func,
+    insert,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import (
+    Connection,
+    Engine,
+)
+from sqlalchemy.pool import StaticPool
+
 from galaxy.exceptions import (
     InternalServerError,
     MessageException,
@@ -34,6 +59,10 @@ from galaxy.exceptions import (
 )
 from galaxy.exceptions.error_codes import error_codes_by_int_code
 from galaxy.exceptions.utils import api_error_to_dict
+from galaxy.model import (
+    ShortTermStorageCounter,
+    ShortTermStorageEntry,
+)
 from galaxy.schema.schema import OptionalNumberT
 from galaxy.util import (
     directory_hash_id,
@@ -41,8 +70,12 @@ from galaxy.util import (
     safe_makedirs,
 )
 
+log = logging.getLogger(__name__)
+
 now = datetime.utcnow
 DEFAULT_STORAGE_DURATION = 24 * 60 * 60  # store for a day by default
+ENTRY = ShortTermStorageEntry.__table__
+COUNTER = ShortTermStorageCounter.__table__
 
 
 @dataclass
@@ -50,6 +83,8 @@ class ShortTermStorageConfiguration:
     short_term_storage_directory: str
     default_storage_duration: OptionalNumberT = None
     maximum_storage_duration: OptionalNumberT = None
+    maximum_storage_size: Optional[int] = None
+    maximum_user_storage_size: Optional[int] = None
 
 
 @dataclass
@@ -76,6 +111,10 @@ class ShortTermStorageTarget:
     request_id: UUID
     raw_path: str
     duration: OptionalNumberT = None
+    # True if an identical earlier request (same fingerprint) is reused, its
+    # artifact must not be generated again.
+    reused: bool = False
+    task_summary: Optional[Dict[str, Any]] = None
 
     @property
     def path(self):
@@ -113,6 +152,13 @@ ShortTermStorageServeInformation = Union[
 ]
 
 
+@dataclass
+class ShortTermStorageStatistics:
+    entries: int
+    size: int
+    counters: Dict[str, int] = field(default_factory=dict)
+
+
 class ShortTermStorageAllocator(metaclass=abc.ABCMeta):
     # TODO: Implement upstream_mod_zip=False, upstream_gzip=False - in initial request and serving...
     @abc.abstractmethod
@@ -122,8 +168,25 @@ class ShortTermStorageAllocator(metaclass=abc.ABCMeta):
         mime_type: str,
         duration: Optional[int] = None,
         security: Optional[ShortTermStorageTargetSecurity] = None,
+        fingerprint: Optional[str] = None,
     ) -> ShortTermStorageTarget:
-        """Return a new ShortTermStorageTarget for this short term file request."""
+        """Return a new ShortTermStorageTarget for this short term file request.
+
+        If ``fingerprint`` is set and an unexpired request with the same
+        fingerprint is in progress or completed and has its task recorded, its
+        target is returned with ``reused`` set instead.
+        """
+
+    @abc.abstractmethod
+    def set_task_summary(self, target: ShortTermStorageTarget, task_summary: Dict[str, Any]) -> None:
+        """Record the task generating the target, returned for reused targets."""
+
+    @abc.abstractmethod
+    def invalidate(self, target: ShortTermStorageTarget) -> bool:
+        """Stop reusing a target that is not complete, e.g. because its task died.
+
+        Returns ``False`` if the target was already completed or cancelled.
+        """
 
 
 class ShortTermStorageMonitor(metaclass=abc.ABCMeta):
@@ -158,10 +221,190 @@ class ShortTermStorageMonitor(metaclass=abc.ABCMeta):
     def recover_target(self, request_id: UUID) -> ShortTermStorageTarget:
         """Return an existing ShortTermStorageTarget from a specified request_id."""
 
+    @abc.abstractmethod
+    def statistics(self) -> ShortTermStorageStatistics:
+        """Return the number and size of stored entries and usage counters."""
+
+
+class ShortTermStorageIndex:
+    """Index of the short term storage entries and usage counters in the Galaxy database.
+
+    The short term storage directory is usually shared by the web and Celery
+    hosts over a network file system, where file locking can't be relied upon,
+    so the index is kept in the database all of them use. Every operation
+    uses its own transaction.
+    """
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+
+    def add(
+        self,
+        request_id: UUID,
+        fingerprint: Optional[str],
+        security: ShortTermStorageTargetSecurity,
+        duration: float,
+    ) -> Optional[Dict[str, Any]]:
+        """Add a pending entry, unless an unexpired entry with ``fingerprint`` requested by the same user exists.
+
+        Returns the existing entry in that case. Entries are only shared between
+        requests of the same user (or the same session for anonymous users), so
+        that an entry counts against the size budget of everyone using it.
+        """
+        created = now()
+        with self.engine.begin() as conn:
+            if fingerprint is not None:
+                # Updating the counter locks its row until commit, so that
+                # concurrent identical requests can't both miss.
+                self._increment(conn, "lookups")
+                if security.user_id is not None:
+                    requester = ENTRY.c.user_id == security.user_id
+                else:
+                    requester = and_(ENTRY.c.user_id.is_(None), ENTRY.c.session_id == security.session_id)
+                stmt = (
+                    select(ENTRY.c.request_id, ENTRY.c.expire_time, ENTRY.c.task_summary)
+                    .where(
+                        ENTRY.c.fingerprint == fingerprint,
+                        requester,
+                        ENTRY.c.state != "cancelled",
+                        ENTRY.c.expire_time > created,
+                        ENTRY.c.task_summary.is_not(None),
+                    )
+                    .order_by(ENTRY.c.create_time.desc())
+                    .limit(1)
+                )
+                row = conn.execute(stmt).first()
+                if row is not None:
+                    self._increment(conn, "hits")
+                    return {
+                        "request_id": UUID(row.request_id),
+                        "duration": (row.expire_time - created).total_seconds(),
+                        "task_summary": row.task_summary,
+                    }
+                self._increment(conn, "misses")
+            conn.execute(
+                insert(ENTRY).values(
+                    request_id=str(request_id),
+                    fingerprint=fingerprint,
+                    user_id=security.user_id,
+                    session_id=security.session_id,
+                    create_time=created,
+                    expire_time=created + timedelta(seconds=duration),
+                    state="pending",
+                )
+            )
+        return None
+
+    def add_existing(
+        self, request_id: UUID, user_id: Optional[int], created: datetime, duration: float, state: str
+    ) -> None:
+        """Add an entry found on disk if it is not indexed yet."""
+        with self.engine.begin() as conn:
+            if conn.execute(select(ENTRY.c.request_id).where(ENTRY.c.request_id == str(request_id))).first():
+                return
+            conn.execute(
+                insert(ENTRY).values(
+                    request_id=str(request_id),
+                    user_id=user_id,
+                    create_time=created,
+                    expire_time=created + timedelta(seconds=duration),
+                    state=state,
+                )
+            )
+
+    def set_task_summary(self, request_id: UUID, task_summary: Dict[str, Any]) -> None:
+        with self.engine.begin() as conn:
+            conn.execute(update(ENTRY).where(ENTRY.c.request_id == str(request_id)).values(task_summary=task_summary))
+
+    def invalidate(self, request_id: UUID) -> bool:
+        """Mark a pending entry as cancelled so it is no longer reused, return whether it was pending."""
+        with self.engine.begin() as conn:
+            result = conn.execute(
+                update(ENTRY)
+                .where(ENTRY.c.request_id == str(request_id), ENTRY.c.state == "pending")
+                .values(state="cancelled")
+            )
+            return result.rowcount > 0
+
+    def finalize(self, request_id: UUID, state: str, size: Optional[int]) -> Optional[int]:
+        """Record the final state and size of an entry, return its user id."""
+        with self.engine.begin() as conn:
+            conn.execute(update(ENTRY).where(ENTRY.c.request_id == str(request_id)).values(state=state, size=size))
+            return conn.execute(select(ENTRY.c.user_id).where(ENTRY.c.request_id == str(request_id))).scalar()
+
+    def remove(self, request_id: UUID) -> None:
+        with self.engine.begin() as conn:
+            conn.execute(delete(ENTRY).where(ENTRY.c.request_id == str(request_id)))
+
+    def expired(self) -> List[UUID]:
+        with self.engine.begin() as conn:
+            request_ids = conn.execute(select(ENTRY.c.request_id).where(ENTRY.c.expire_time <= now())).scalars()
+            return [UUID(request_id) for request_id in request_ids]
+
+    def over_size(self, maximum_size: int, user_id: Optional[int] = None, keep: Optional[UUID] = None) -> List[UUID]:
+        """Return the oldest completed entries to remove to reduce their total size to ``maximum_size``.
+
+        Only entries of ``user_id`` are considered if set, ``keep`` is never returned.
+        """
+        stmt = (
+            select(ENTRY.c.request_id, ENTRY.c.size)
+            .where(ENTRY.c.state == "ready", ENTRY.c.size.is_not(None))
+            .order_by(ENTRY.c.create_time)
+        )
+        if user_id is not None:
+            stmt = stmt.where(ENTRY.c.user_id == user_id)
+        with self.engine.begin() as conn:
+            rows = conn.execute(stmt).all()
+        total_size = sum(size for _, size in rows)
+        request_ids = []
+        for request_id, size in rows:
+            if total_size <= maximum_size:
+                break
+            if keep is not None and request_id == str(keep):
+                continue
+            request_ids.append(UUID(request_id))
+            total_size -= size
+        return request_ids
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        with self.engine.begin() as conn:
+            self._increment(conn, name, amount)
+
+    def _increment(self, conn: Connection, name: str, amount: int = 1) -> None:
+        dialect_insert = postgresql_insert if conn.dialect.name == "postgresql" else sqlite_insert
+        conn.execute(
+            dialect_insert(COUNTER)
+            .values(name=name, value=amount)
+            .on_conflict_do_update(index_elements=["name"], set_={"value": COUNTER.c.value + amount})
+        )
+
+    @property
+    def directory_scanned(self) -> bool:
+        """Whether entries created before the index existed have been added by scanning the directory."""
+        return self.get_counter("directory_scans") >= 1
+
+    def set_directory_scanned(self) -> None:
+        self.increment("directory_scans")
+
+    def get_counter(self, name: str) -> int:
+        with self.engine.begin() as conn:
+            return conn.execute(select(COUNTER.c.value).where(COUNTER.c.name == name)).scalar() or 0
+
+    def statistics(self) -> ShortTermStorageStatistics:
+        with self.engine.begin() as conn:
+            entries, size = conn.execute(select(func.count(), func.coalesce(func.sum(ENTRY.c.size), 0))).one()
+            counters = dict(conn.execute(select(COUNTER.c.name, COUNTER.c.value)).all())
+        return ShortTermStorageStatistics(entries=entries, size=size, counters=counters)
+
 
 class ShortTermStorageManager(ShortTermStorageAllocator, ShortTermStorageMonitor):
-    def __init__(self, config: ShortTermStorageConfiguration):
+    def __init__(self, config: ShortTermStorageConfiguration, engine: Optional[Engine] = None):
         self._config = config
+        if engine is None:
+            # An index private to this process, e.g. for tests.
+            engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+            ENTRY.metadata.create_all(engine, tables=[ENTRY, COUNTER])
+        self._index = ShortTermStorageIndex(engine)
 
     def new_target(
         self,
@@ -169,6 +412,7 @@ class ShortTermStorageManager(ShortTermStorageAllocator, ShortTermStorageMonitor
         mime_type: str,
         duration: OptionalNumberT = None,
         security: Optional[ShortTermStorageTargetSecurity] = None,
+        fingerprint: Optional[str] = None,
     ) -> ShortTermStorageTarget:
         if security is None:
             security = ShortTermStorageTargetSecurity()
@@ -178,6 +422,16 @@ class ShortTermStorageManager(ShortTermStorageAllocator, ShortTermStorageMonitor
         maximum_storage_duration = self._config.maximum_storage_duration
         if duration and maximum_storage_duration and duration > maximum_storage_duration:
             duration = maximum_storage_duration
+        existing = self._index.add(request_id, fingerprint, security, duration)
+        if existing is not None:
+            existing_request_id = existing["request_id"]
+            return ShortTermStorageTarget(
+                request_id=existing_request_id,
+                raw_path=str(self._directory(existing_request_id) / "target"),
+                duration=existing["duration"],
+                reused=True,
+                task_summary=existing["task_summary"],
+            )
         target = ShortTermStorageTarget(
             request_id=request_id, raw_path=str(target_directory / "target"), duration=duration
         )
@@ -193,11 +447,20 @@ class ShortTermStorageManager(ShortTermStorageAllocator, ShortTermStorageMonitor
         self._store_metadata(target_directory, "request", request_info)
         return target
 
+    def set_task_summary(self, target: ShortTermStorageTarget, task_summary: Dict[str, Any]) -> None:
+        self._index.set_task_summary(target.request_id, task_summary)
+
+    def invalidate(self, target: ShortTermStorageTarget) -> bool:
+        return self._index.invalidate(target.request_id)
+
     def recover_target(self, request_id: UUID) -> ShortTermStorageTarget:
         target_directory = self._directory(request_id)
         target = ShortTermStorageTarget(request_id=request_id, raw_path=str(target_directory / "target"))
         return target
 
+    def statistics(self) -> ShortTermStorageStatistics:
+        return self._index.statistics()
+
     def is_ready(self, target: ShortTermStorageTarget) -> bool:
         """Check if storage is ready."""
         return self._finalized_path(target).exists()
@@ -222,6 +485,8 @@ class ShortTermStorageManager(ShortTermStorageAllocator, ShortTermStorageMonitor
                 mime_type=request_metadata["mime_type"],
                 security=ShortTermStorageTargetSecurity.from_dict(request_metadata["security"]),
             )
+            self._index.increment("served")
+            self._index.increment("bytes_served", self._size(target))
         return serve_info
 
     def cancel(self, target: ShortTermStorageTarget, exception: Optional[MessageException] = None):
@@ -234,11 +499,40 @@ class ShortTermStorageManager(ShortTermStorageAllocator, ShortTermStorageMonitor
         else:
             exception_json = {"status_code": 204, "exception": None}  # NO CONTENT
         self._store_metadata(self._directory(target), "cancelled", exception_json)
-        self.finalize(target)
+        self._finalize(target, "cancelled")
 
     def finalize(self, target: ShortTermStorageTarget) -> None:
         """Indicate the file is ready to be served."""
+        self._finalize(target, "ready")
+
+    def _finalize(self, target: ShortTermStorageTarget, state: str) -> None:
         self._finalized_path(target).touch()
+        user_id = self._index.finalize(target.request_id, state, self._size(target))
+        if state == "ready":
+            self._enforce_size_limits(target, user_id)
+
+    def _enforce_size_limits(self, target: ShortTermStorageTarget, user_id: Optional[int]) -> None:
+        # Remove the oldest completed entries of the user, then of everyone, to
+        # stay within the size budgets. The new entry is always kept.
+        maximum_user_storage_size = self._config.maximum_user_storage_size
+        if maximum_user_storage_size and user_id is not None:
+            for request_id in self._index.over_size(maximum_user_storage_size, user_id=user_id, keep=target.request_id):
+                self._evict(request_id)
+        maximum_storage_size = self._config.maximum_storage_size
+        if maximum_storage_size:
+            for request_id in self._index.over_size(maximum_storage_size, keep=target.request_id):
+                self._evict(request_id)
+
+    def _evict(self, request_id: UUID) -> None:
+        log.debug("Removing short term storage request %s to stay within size limits", request_id)
+        self._delete(request_id)
+        self._index.increment("evictions")
+
+    def _size(self, target: ShortTermStorageTarget) -> int:
+        try:
+            return os.path.getsize(self.target_path(target))
+        except OSError:
+            return 0
 
     def target_path(self, target: ShortTermStorageTarget) -> Path:
         return self._directory(target) / "target"
@@ -295,13 +589,34 @@ class ShortTermStorageManager(ShortTermStorageAllocator, ShortTermStorageMonitor
 
     def _delete(self, request_id: UUID):
         shutil.rmtree(self._directory(request_id), ignore_errors=True)
+        self._index.remove(request_id)
 
     def cleanup(self):
+        if not self._index.directory_scanned:
+            self._scan_directory()
+        for request_id in self._index.expired():
+            self._delete(request_id)
+
+    def _scan_directory(self):
+        # Entries created before the index existed are only found by scanning
+        # the directory, do this once and add the remaining ones to the index.
         for directory in self._root.glob("*/*/*/*"):
             request_id = os.path.basename(directory)
             if not is_uuid(request_id):
                 continue
             self._cleanup_if_needed(UUID(request_id))
+            request_metadata = self._load_metadata_safe(directory, "request")
+            if request_metadata is not None:
+                creation_datetime = datetime.strptime(request_metadata["created"], "%Y-%m-%d %H:%M:%S.%f")
+                state = "ready" if (directory / "finalized").exists() else "pending"
+                self._index.add_existing(
+                    UUID(request_id),
+                    request_metadata["security"].get("user_id"),
+                    creation_datetime,
+                    request_metadata["duration"],
+                    state,
+                )
+        self._index.set_directory_scanned()
 
     @property
     def _root(self) -> Path:
@@ -43,6 +43,7 @@ from galaxy.workflow.trs_proxy import TrsProxy
 if TYPE_CHECKING:
     from galaxy.config_watchers import ConfigWatchers
     from galaxy.jobs import JobConfiguration
+    from galaxy.jobs.resource_prediction import JobResourcePredictor
     from galaxy.managers.collections import DatasetCollectionManager
     from galaxy.managers.hdas import HDAManager
     from galaxy.managers.histories import HistoryManager
@@ -122,6 +123,7 @@ class MinimalManagerApp(MinimalApp):
     job_config: "JobConfiguration"
     job_manager: Any  # galaxy.jobs.manager.JobManager
     job_metrics: JobMetrics
+    job_resource_predictor: "JobResourcePredictor"
     dynamic_tool_manager: Any  # 'galaxy.managers.tools.DynamicToolManager'
     genomes: "Genomes"
     error_reports: "ErrorReports"
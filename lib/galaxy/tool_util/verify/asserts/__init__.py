@@ -1,5 +1,6 @@
 import logging
 import sys
+from functools import lru_cache
 from inspect import (
     getfullargspec,
     getmembers,
@@ -8,11 +9,16 @@ from tempfile import NamedTemporaryFile
 from typing import (
     Callable,
     Dict,
+    List,
     Tuple,
 )
 
-from galaxy.util import unicodify
 from galaxy.util.compression_utils import get_fileobj
+from ._util import (
+    output_text,
+    output_views,
+    OutputViews,
+)
 
 log = logging.getLogger(__name__)
 
@@ -50,8 +56,18 @@ def verify_assertions(data: bytes, assertion_description_list: list, decompress:
             tmpfh.flush()
             with get_fileobj(tmpfh.name, mode="rb", compressed_formats=None) as fh:
                 data = fh.read()
-    for assertion_description in assertion_description_list:
-        verify_assertion(data, assertion_description)
+    # Assertions checked against the same output share its decoded and parsed forms.
+    token = output_views.set(OutputViews(data))
+    try:
+        for assertion_description in assertion_description_list:
+            verify_assertion(data, assertion_description)
+    finally:
+        output_views.reset(token)
+
+
+@lru_cache(maxsize=None)
+def _assertion_function_args(assert_function: Callable) -> List[str]:
+    return getfullargspec(assert_function).args
 
 
 def verify_assertion(data: bytes, assertion_description):
@@ -63,7 +79,7 @@ def verify_assertion(data: bytes, assertion_description):
         errmsg = f"Unable to find test function associated with XML tag {tag}. Check your tool file syntax."
         raise AssertionError(errmsg)
 
-    assert_function_args = getfullargspec(assert_function).args
+    assert_function_args = _assertion_function_args(assert_function)
     args = {}
     for attribute, value in assertion_description["attributes"].items():
         if attribute in assert_function_args:
@@ -91,7 +107,7 @@ def verify_assertion(data: bytes, assertion_description):
         # the data passed from the test to the function will be unicodified.
         # This is because most of the assert functions are working on pure
         # text files.
-        args["output"] = unicodify(data)
+        args["output"] = output_text(data)
     if "output_bytes" in assert_function_args:
         # This will read in data as bytes and will not change it prior passing
         # it to the assert_function
@@ -1,14 +1,93 @@
+import re
+from contextvars import ContextVar
+from functools import lru_cache
 from math import inf
 from typing import (
+    Any,
     Callable,
+    Dict,
     Optional,
+    Pattern,
     TypeVar,
     Union,
 )
 
-from galaxy.util import asbool
+from galaxy.util import (
+    asbool,
+    unicodify,
+)
 from galaxy.util.bytesize import parse_bytesize
 
+# Line boundaries recognized by str.splitlines
+LINE_BREAK = re.compile("\r\n|[\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]")
+
+
+class OutputViews:
+    """Decoded and parsed forms of an output shared by the assertions checked against it.
+
+    Decoding the output, parsing it as XML or JSON and counting its lines
+    happens at most once per ``verify_assertions`` call instead of once per
+    assertion. Views only live as long as that call, so memory is not held
+    on to across outputs.
+    """
+
+    def __init__(self, data: Optional[bytes]):
+        self.data = data
+        self._text: Optional[str] = None
+        self._parsed: Dict[str, Any] = {}
+
+    @property
+    def text(self) -> Optional[str]:
+        if self._text is None:
+            self._text = unicodify(self.data)
+        return self._text
+
+    def parsed(self, output: str, kind: str, parse: Callable[[str], Any]) -> Any:
+        if output is None or output is not self._text:
+            return parse(output)
+        if kind not in self._parsed:
+            self._parsed[kind] = parse(output)
+        return self._parsed[kind]
+
+
+output_views: ContextVar[Optional[OutputViews]] = ContextVar("output_views", default=None)
+
+
+def output_text(data: Optional[bytes]) -> Optional[str]:
+    """Return ``data`` decoded, shared with other assertions checked against the same output."""
+    views = output_views.get()
+    if views is not None and views.data is data:
+        return views.text
+    return unicodify(data)
+
+
+def parsed_output(output: str, kind: str, parse: Callable[[str], Any]) -> Any:
+    """Return ``parse(output)``, parsed only once for all assertions checked against the same output."""
+    views = output_views.get()
+    if views is None:
+        return parse(output)
+    return views.parsed(output, kind, parse)
+
+
+@lru_cache(maxsize=1024)
+def compiled_regex(pattern: str, flags: int = 0) -> Pattern[str]:
+    return re.compile(pattern, flags)
+
+
+def count_matches(pattern: Pattern[str], output: str) -> int:
+    """Count non-overlapping matches without holding on to all of them."""
+    return sum(1 for _ in pattern.finditer(output))
+
+
+def count_lines(output: str) -> int:
+    """Count lines like ``len(output.splitlines())`` without splitting the output."""
+    n_lines = 0
+    end = 0
+    for match in LINE_BREAK.finditer(output):
+        n_lines += 1
+        end = match.end()
+    return n_lines + (1 if end < len(output) else 0)
+
 
 def _assert_number(
     count: int,
@@ -10,6 +10,7 @@ from ._types import (
     AssertionParameter,
     Output,
 )
+from ._util import parsed_output
 
 PropertyVisitor = Callable[[str, Any], Any]
 
@@ -47,7 +48,7 @@ def assert_has_json_property_with_value(
     <has_json_property_with_value property="skipped_columns" value="[1, 3, 5]" />
     ```
     """
-    output_json = _assert_json_and_load(output)
+    output_json = parsed_output(output, "json", _assert_json_and_load)
     expected_value = _assert_json_and_load(value)
 
     def is_property(key, value):
@@ -67,7 +68,7 @@ def assert_has_json_property_with_text(
     <has_json_property_with_text property="color" text="red" />
     ```
     """
-    output_json = _assert_json_and_load(output)
+    output_json = parsed_output(output, "json", _assert_json_and_load)
 
     def is_property(key, value):
         return key == property and value == text
@@ -11,7 +11,10 @@ from ._types import (
     NEGATE_DEFAULT,
     Output,
 )
-from ._util import _assert_number
+from ._util import (
+    _assert_number,
+    compiled_regex,
+)
 
 Sep = Annotated[str, AssertionParameter("Separator defining columns, default: tab")]
 Comment = Annotated[
@@ -27,9 +30,9 @@ def get_first_line(output: str, comment: str) -> str:
     get the first non-comment and non-empty line
     """
     if comment != "":
-        match = re.search(f"^([^{comment}].*)$", output, flags=re.MULTILINE)
+        match = compiled_regex(f"^([^{comment}].*)$", re.MULTILINE).search(output)
     else:
-        match = re.search("^(.+)$", output, flags=re.MULTILINE)
+        match = compiled_regex("^(.+)$", re.MULTILINE).search(output)
     if match is None:
         return ""
     else:
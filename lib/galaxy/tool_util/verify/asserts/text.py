@@ -15,6 +15,10 @@ from ._types import (
 from ._util import (
     _assert_number,
     _assert_presence_number,
+    compiled_regex,
+    count_lines,
+    count_matches,
+    parsed_output,
 )
 
 Text = Annotated[str, AssertionParameter("The text to search for in the output.")]
@@ -44,7 +48,7 @@ def assert_has_text(
         max,
         negate,
         lambda o, t: o.find(t) >= 0,
-        lambda o, t: len(re.findall(re.escape(t), o)),
+        lambda o, t: o.count(t),
         "{expected} text '{text}' in output ('{output}')",
         "{expected} {n}+-{delta} occurences of '{text}' in output ('{output}')",
         "{expected} that the number of occurences of '{text}' in output is in [{min}:{max}] ('{output}')",
@@ -79,8 +83,8 @@ def assert_has_line(
         min,
         max,
         negate,
-        lambda o, t: re.search(f"^{re.escape(t)}$", o, flags=re.MULTILINE) is not None,
-        lambda o, t: len(re.findall(f"^{re.escape(t)}$", o, flags=re.MULTILINE)),
+        lambda o, t: compiled_regex(f"^{re.escape(t)}$", re.MULTILINE).search(o) is not None,
+        lambda o, t: count_matches(compiled_regex(f"^{re.escape(t)}$", re.MULTILINE), o),
         "{expected} line '{text}' in output ('{output}')",
         "{expected} {n}+-{delta} lines '{text}' in output ('{output}')",
         "{expected} that the number of lines '{text}' in output is in [{min}:{max}] ('{output}')",
@@ -99,7 +103,7 @@ def assert_has_n_lines(
     for a difference in the number of lines (delta)
     or relative differebce in the number of lines"""
     assert output is not None, "Checking has_n_lines assertion on empty output (None)"
-    count = len(output.splitlines())
+    count = parsed_output(output, "n_lines", count_lines)
     _assert_number(
         count,
         n,
@@ -134,8 +138,8 @@ def assert_has_text_matching(
         min,
         max,
         negate,
-        lambda o, e: re.search(e, o) is not None,
-        lambda o, e: len(re.findall(e, o)),
+        lambda o, e: compiled_regex(e).search(o) is not None,
+        lambda o, e: count_matches(compiled_regex(e), o),
         "{expected} text matching expression '{text}' in output ('{output}')",
         "{expected} {n}+-{delta} (non-overlapping) matches for '{text}' in output ('{output}')",
         "{expected} that the number of (non-overlapping) matches for '{text}' in output is in [{min}:{max}] ('{output}')",
@@ -162,8 +166,8 @@ def assert_has_line_matching(
         min,
         max,
         negate,
-        lambda o, e: re.search(f"^{e}$", o, flags=re.MULTILINE) is not None,
-        lambda o, e: len(re.findall(f"^{e}$", o, flags=re.MULTILINE)),
+        lambda o, e: compiled_regex(f"^{e}$", re.MULTILINE).search(o) is not None,
+        lambda o, e: count_matches(compiled_regex(f"^{e}$", re.MULTILINE), o),
         "{expected} line matching expression '{text}' in output ('{output}')",
         "{expected} {n}+-{delta} lines matching for '{text}' in output ('{output}')",
         "{expected} that the number of lines matching for '{text}' in output is in [{min}:{max}] ('{output}')",
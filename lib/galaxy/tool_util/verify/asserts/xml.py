@@ -24,6 +24,7 @@ from ._types import (
     XmlBool,
     XmlRegex,
 )
+from ._util import parsed_output
 
 Path = Annotated[str, AssertionParameter("The Python xpath-like expression to find the target element.")]
 ElementExpression = Annotated[
@@ -59,7 +60,7 @@ All = Annotated[
 def assert_is_valid_xml(output: Output) -> None:
     """Asserts the output is a valid XML file (e.g. ``<is_valid_xml />``)."""
     try:
-        parse_xml_string(output)
+        parsed_output(output, "xml", parse_xml_string)
     except XMLSyntaxError as e:
         raise AssertionError(f"Expected valid XML, but could not parse output. {unicodify(e)}")
 
@@ -255,7 +256,7 @@ def assert_xml_element(
     all = asbool(all)
     # assert that path is in output (the specified number of times)
 
-    xml = parse_xml_string(output)
+    xml = parsed_output(output, "xml", parse_xml_string)
     asserts._util._assert_presence_number(
         xml,
         path,
@@ -1,4 +1,6 @@
 import contextlib
+import copy
+import hashlib
 import io
 import json
 import os
@@ -7,6 +9,7 @@ import shutil
 import sys
 import tarfile
 import tempfile
+import threading
 import time
 import urllib.parse
 import zipfile
@@ -18,9 +21,12 @@ from typing import (
     cast,
     Dict,
     Generator,
+    Hashable,
     List,
     NamedTuple,
     Optional,
+    Set,
+    Tuple,
     Union,
 )
 
@@ -59,7 +65,10 @@ from ._types import (
     ToolTestDescriptionDict,
 )
 from .asserts import verify_assertions
-from .wait import wait_on
+from .wait import (
+    MultiplexedWaiter,
+    wait_on,
+)
 
 log = getLogger(__name__)
 
@@ -73,6 +82,10 @@ DEFAULT_TOOL_TEST_WAIT: int = int(os.environ.get("GALAXY_TEST_DEFAULT_WAIT", 864
 CLEANUP_TEST_HISTORIES = "GALAXY_TEST_NO_CLEANUP" not in os.environ
 DEFAULT_TARGET_HISTORY = os.environ.get("GALAXY_TEST_HISTORY_ID", None)
 
+# Job states in which a job may still be picked up or run, see galaxy.model.Job.non_ready_states
+NON_READY_JOB_STATES = ["new", "resubmitted", "upload", "waiting", "queued", "running"]
+NON_READY_JOBS_LIMIT = 500
+
 DEFAULT_FTYPE = "auto"
 # This following default dbkey was traditionally hg17 before Galaxy 18.05,
 # restore this behavior by setting GALAXY_TEST_DEFAULT_DBKEY to hg17.
@@ -208,6 +221,13 @@ class GalaxyInteractorApi:
         self._target_galaxy_version = None
 
         self.uploads = {}
+        # Uploads by history and by checksum of their content and upload parameters,
+        # shared between tests staging identical test data in the same history.
+        self._shared_uploads: Dict[Tuple[str, str], Tuple[Dict[str, Any], str]] = {}
+        self._test_data_checksums: Dict[Tuple[str, Optional[str], str], str] = {}
+        self._tool_tests: Dict[Tuple[str, Optional[str]], List[ToolTestDescriptionDict]] = {}
+        self._uploads_lock = threading.Lock()
+        self._job_waiter = MultiplexedWaiter(self._poll_jobs)
 
     @property
     def target_galaxy_version(self):
@@ -237,11 +257,15 @@ class GalaxyInteractorApi:
         return response.json()
 
     def get_tool_tests(self, tool_id: str, tool_version: Optional[str] = None) -> List[ToolTestDescriptionDict]:
-        url = f"tools/{tool_id}/test_data"
-        params = {"tool_version": tool_version} if tool_version else None
-        response = self._get(url, data=params)
-        assert response.status_code == 200, f"Non 200 response from tool test API. [{response.content}]"
-        return response.json()
+        # Test definitions are fetched once per tool version, callers get copies they may modify.
+        key = (tool_id, tool_version)
+        if key not in self._tool_tests:
+            url = f"tools/{tool_id}/test_data"
+            params = {"tool_version": tool_version} if tool_version else None
+            response = self._get(url, data=params)
+            assert response.status_code == 200, f"Non 200 response from tool test API. [{response.content}]"
+            self._tool_tests[key] = response.json()
+        return copy.deepcopy(self._tool_tests[key])
 
     def verify_output_collection(
         self, output_collection_def, output_collection_id, history, tool_id, tool_version=None
@@ -364,7 +388,43 @@ class GalaxyInteractorApi:
             compare_expected_metadata_to_api_response(metadata, dataset)
 
     def wait_for_job(self, job_id: str, history_id: Optional[str] = None, maxseconds=DEFAULT_TOOL_TEST_WAIT) -> None:
-        self.wait_for(lambda: self.__job_ready(job_id, history_id), maxseconds=maxseconds)
+        if job_id is None:
+            raise ValueError("wait_for_job passed empty job_id")
+        self._job_waiter.wait((job_id, history_id), "tool test run", int(maxseconds))
+
+    def _poll_jobs(self, keys: List[Hashable]) -> Dict[Hashable, Any]:
+        """Check the state of all jobs waited on by any thread.
+
+        Jobs still waiting or running in a history are found with a single
+        request per history, only jobs that left these states are fetched
+        individually.
+        """
+        jobs_by_history: Dict[Optional[str], List[Hashable]] = {}
+        for key in keys:
+            jobs_by_history.setdefault(cast(Tuple[str, Optional[str]], key)[1], []).append(key)
+        results: Dict[Hashable, Any] = {}
+        for history_id, history_keys in jobs_by_history.items():
+            non_ready_job_ids = self.__non_ready_job_ids(history_id) if history_id is not None else None
+            for key in history_keys:
+                job_id = cast(Tuple[str, Optional[str]], key)[0]
+                if non_ready_job_ids is not None and job_id in non_ready_job_ids:
+                    continue
+                try:
+                    results[key] = self.__job_ready(job_id, history_id)
+                except Exception as e:
+                    results[key] = e
+        return results
+
+    def __non_ready_job_ids(self, history_id: str) -> Optional[Set[str]]:
+        params = {"history_id": history_id, "state": ",".join(NON_READY_JOB_STATES), "limit": NON_READY_JOBS_LIMIT}
+        response = self._get("jobs", data=params)
+        if response.status_code != 200:
+            return None
+        jobs = response.json()
+        if len(jobs) >= NON_READY_JOBS_LIMIT:
+            # Can't tell which jobs are missing from a truncated listing, check them all.
+            return None
+        return {job["id"] for job in jobs}
 
     def wait_for(self, func: Callable, what: str = "tool test run", **kwd) -> None:
         walltime_exceeded = int(kwd.get("maxseconds", DEFAULT_TOOL_TEST_WAIT))
@@ -520,6 +580,7 @@ class GalaxyInteractorApi:
         for name, value in test_data.get("metadata", {}).items():
             tool_input[f"files_metadata|{name}"] = value
 
+        shared_upload_key: Optional[Tuple[str, str]] = None
         composite_data = test_data["composite_data"]
         if composite_data:
             files = {}
@@ -560,8 +621,27 @@ class GalaxyInteractorApi:
                 file_name = self.test_data_path(tool_id, fname, tool_version=tool_version)
                 tool_input.update({"files_0|url_paste": f"file://{file_name}"})
             else:
-                file_content = self.test_data_download(tool_id, fname, is_output=False, tool_version=tool_version)
-                files = {"files_0|file_data": file_content}
+                # Identical test data staged with identical parameters is uploaded once per history.
+                checksum_key = (tool_id, tool_version, fname)
+                checksum = self._test_data_checksums.get(checksum_key)
+                shared_upload = None
+                if checksum is not None:
+                    shared_upload_key = (history_id, self.__upload_key(checksum, tool_input))
+                    with self._uploads_lock:
+                        shared_upload = self._shared_uploads.get(shared_upload_key)
+                if shared_upload is None:
+                    file_content = self.test_data_download(tool_id, fname, is_output=False, tool_version=tool_version)
+                    files = {"files_0|file_data": file_content}
+                    shared_upload_key = None
+                    if file_content is not None:
+                        checksum = self._test_data_checksums[checksum_key] = hashlib.sha1(file_content).hexdigest()
+                        shared_upload_key = (history_id, self.__upload_key(checksum, tool_input))
+                        with self._uploads_lock:
+                            shared_upload = self._shared_uploads.get(shared_upload_key)
+                if shared_upload_key is not None and shared_upload is not None:
+                    upload, job_id = shared_upload
+                    self.uploads[os.path.basename(fname)] = self.uploads[fname] = self.uploads[name] = upload
+                    return self.__upload_wait(shared_upload_key, job_id, history_id, maxseconds)
         submit_response_object = self.__submit_tool(
             history_id, "upload1", tool_input, extra_data={"type": "upload_dataset"}, files=files
         )
@@ -579,7 +659,29 @@ class GalaxyInteractorApi:
         ), f"Invalid response from server [{submit_response}], expecting jobs in response."
         jobs = submit_response["jobs"]
         assert len(jobs) > 0, f"Invalid response from server [{submit_response}], expecting a job."
-        return lambda: self.wait_for_job(jobs[0]["id"], history_id, maxseconds=maxseconds)
+        if shared_upload_key is None:
+            return lambda: self.wait_for_job(jobs[0]["id"], history_id, maxseconds=maxseconds)
+        with self._uploads_lock:
+            self._shared_uploads[shared_upload_key] = (self.uploads[name], jobs[0]["id"])
+        return self.__upload_wait(shared_upload_key, jobs[0]["id"], history_id, maxseconds)
+
+    def __upload_key(self, checksum: str, tool_input: Dict[str, Any]) -> str:
+        return f"{checksum}:{json.dumps(tool_input, sort_keys=True)}"
+
+    def __upload_wait(
+        self, shared_upload_key: Tuple[str, str], job_id: str, history_id: str, maxseconds: int
+    ) -> Callable[[], None]:
+        def wait() -> None:
+            try:
+                self.wait_for_job(job_id, history_id, maxseconds=maxseconds)
+            except Exception:
+                # Don't hand a failed upload to other tests, let them upload the data again.
+                with self._uploads_lock:
+                    if self._shared_uploads.get(shared_upload_key, (None, None))[1] == job_id:
+                        del self._shared_uploads[shared_upload_key]
+                raise
+
+        return wait
 
     def _ensure_valid_location_in(self, test_data: dict) -> Optional[str]:
         location: Optional[str] = test_data.get("location")
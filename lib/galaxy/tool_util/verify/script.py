@@ -3,11 +3,13 @@
 import argparse
 import concurrent.futures.thread
 import datetime as dt
+import hashlib
 import json
 import logging
 import os
 import sys
 import tempfile
+import threading
 from concurrent.futures import (
     thread,
     ThreadPoolExecutor,
@@ -19,6 +21,7 @@ from typing import (
     List,
     NamedTuple,
     Optional,
+    Tuple,
 )
 
 import yaml
@@ -161,6 +164,61 @@ class Results:
         return [t for t in self.test_results if t.get("data", {}).get("status") == status]
 
 
+class ResultsCache:
+    """Results of successful tests, reused while the tested tool is unchanged.
+
+    Results are keyed by test id and stored along with the tool hash reported
+    by the Galaxy server (covering the tool source, its test data and its
+    requirements and containers), a cached result is only used if the tool
+    still has the same hash.
+    """
+
+    def __init__(self, path: str, tool_hashes: Dict[Tuple[str, Optional[str]], str]) -> None:
+        self.path = path
+        self.tool_hashes = tool_hashes
+        self._results: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                self._results = json.load(f).get("tests", {})
+        self._lock = threading.Lock()
+
+    def get(self, test_reference: TestReference) -> Optional[Dict[str, Any]]:
+        tool_hash = self._tool_hash(test_reference)
+        cached = self._results.get(_test_id_for_reference(test_reference))
+        if tool_hash is None or cached is None or cached.get("tool_hash") != tool_hash:
+            return None
+        return cached["result"]
+
+    def register(self, test_reference: TestReference, result: Dict[str, Any]) -> None:
+        tool_hash = self._tool_hash(test_reference)
+        if tool_hash is None or result.get("data", {}).get("status") != "success":
+            return
+        with self._lock:
+            self._results[_test_id_for_reference(test_reference)] = {"tool_hash": tool_hash, "result": result}
+
+    def write(self) -> None:
+        with self._lock, open(self.path, "w") as f:
+            json.dump({"version": "0.1", "tests": self._results}, f)
+
+    def _tool_hash(self, test_reference: TestReference) -> Optional[str]:
+        return self.tool_hashes.get((test_reference.tool_id, test_reference.tool_version))
+
+
+def tool_hashes_from_summary(tests_summary: Dict[str, Dict[str, Any]]) -> Dict[Tuple[str, Optional[str]], str]:
+    tool_hashes = {}
+    for tool_id, tool_versions_dict in tests_summary.items():
+        for tool_version, summary in tool_versions_dict.items():
+            # Galaxy servers before tool hashes were reported don't allow caching results.
+            if "tool_hash" in summary:
+                tool_hashes[(tool_id, tool_version)] = summary["tool_hash"]
+    return tool_hashes
+
+
+def shard_for_tool(tool_id: str, shard_count: int) -> int:
+    """Assign all tests of a tool to the same of ``shard_count`` shards, independent of other tools."""
+    return int(hashlib.sha1(tool_id.encode("utf-8")).hexdigest(), 16) % shard_count
+
+
 def test_tools(
     galaxy_interactor: GalaxyInteractorApi,
     test_references: List[TestReference],
@@ -174,6 +232,7 @@ def test_tools(
     publish_history: bool = False,
     retries: int = 0,
     verify_kwds: Optional[Dict[str, Any]] = None,
+    results_cache: Optional[ResultsCache] = None,
 ) -> None:
     """Run through tool tests and write report."""
     verify_kwds = (verify_kwds or {}).copy()
@@ -214,6 +273,7 @@ def test_tools(
                     retries=retries,
                     verify_kwds=verify_kwds,
                     publish_history=publish_history,
+                    results_cache=results_cache,
                 )
         finally:
             # Always write report, even if test was cancelled.
@@ -223,6 +283,8 @@ def test_tools(
                 executor._threads.clear()  # type: ignore[attr-defined]
                 thread._threads_queues.clear()  # type: ignore[attr-defined]
             results.write()
+            if results_cache is not None:
+                results_cache.write()
             if log:
                 if results.test_json == "-":
                     destination = "standard output"
@@ -260,6 +322,7 @@ def _test_tool(
     retries: int,
     publish_history: bool,
     verify_kwds: Dict[str, Any],
+    results_cache: Optional[ResultsCache] = None,
 ) -> None:
     tool_id = test_reference.tool_id
     tool_version = test_reference.tool_version
@@ -271,6 +334,13 @@ def _test_tool(
 
     test_id = _test_id_for_reference(test_reference)
 
+    cached_result = results_cache.get(test_reference) if results_cache is not None else None
+    if cached_result is not None:
+        if log:
+            log.info("Test '%s' skipped, tool unchanged since it passed", test_id)
+        results.register_result(cached_result)
+        return
+
     def run_test() -> None:
         run_retries = retries
         job_data = None
@@ -306,13 +376,14 @@ def _test_tool(
                     run_retries -= 1
         finally:
             if job_data is not None:
-                results.register_result(
-                    {
-                        "id": test_id,
-                        "has_data": True,
-                        "data": job_data,
-                    }
-                )
+                result = {
+                    "id": test_id,
+                    "has_data": True,
+                    "data": job_data,
+                }
+                results.register_result(result)
+                if results_cache is not None:
+                    results_cache.register(test_reference, result)
             if job_exception is not None:
                 was_recorded = job_data is not None
                 test_exception = TestException(tool_id, job_exception, was_recorded)
@@ -330,6 +401,8 @@ def build_case_references(
     page_number: int = 0,
     test_filters: Optional[List[Callable[[TestReference], bool]]] = None,
     log: Optional[logging.Logger] = None,
+    shard_count: int = 1,
+    shard_index: int = 0,
 ) -> List[TestReference]:
     test_references: List[TestReference] = []
     if tool_id == ALL_TOOLS:
@@ -368,6 +441,15 @@ def build_case_references(
             )
         test_references = filtered_test_references
 
+    if shard_count > 1:
+        if not 0 <= shard_index < shard_count:
+            raise ValueError(f"Shard index {shard_index} is not within [0, {shard_count})")
+        test_references = [
+            test_reference
+            for test_reference in test_references
+            if shard_for_tool(test_reference.tool_id, shard_count) == shard_index
+        ]
+
     if page_size > 0:
         slice_start = page_size * page_number
         slice_end = page_size * (page_number + 1)
@@ -448,6 +530,8 @@ def run_tests(
         page_number=args.page_number,
         test_filters=test_filters,
         log=log,
+        shard_count=args.shard_count,
+        shard_index=args.shard_index,
     )
     log.debug(f"Built {len(test_references)} test references to executed.")
     verify_kwds = dict(
@@ -456,6 +540,10 @@ def run_tests(
         skip_with_reference_data=not args.with_reference_data,
         quiet=not verbose,
     )
+    results_cache = None
+    if args.results_cache:
+        tool_hashes = tool_hashes_from_summary(galaxy_interactor.get_tests_summary())
+        results_cache = ResultsCache(args.results_cache, tool_hashes)
     test_tools(
         galaxy_interactor,
         test_references,
@@ -468,6 +556,7 @@ def run_tests(
         no_history_cleanup=args.no_history_cleanup,
         publish_history=get_option("publish_history"),
         verify_kwds=verify_kwds,
+        results_cache=results_cache,
     )
     exceptions = results.test_exceptions
     if exceptions:
@@ -590,6 +679,20 @@ def arg_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "--page-number", default=0, type=int, help="If page size is used, run this 'page' of tests - starts with 0."
     )
+    parser.add_argument(
+        "--shard-count",
+        default=1,
+        type=int,
+        help="Split tests into this many shards, each tool's tests are assigned to the same shard on every runner.",
+    )
+    parser.add_argument(
+        "--shard-index", default=0, type=int, help="If shard count is used, run this shard - starts with 0."
+    )
+    parser.add_argument(
+        "--results-cache",
+        default=None,
+        help="JSON file caching results of successful tests, tests are skipped while their tool's hash is unchanged.",
+    )
     parser.add_argument(
         "--download-attempts",
         default=1,
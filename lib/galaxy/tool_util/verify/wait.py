@@ -1,14 +1,21 @@
 """Abstraction for waiting on API conditions to become true."""
 
+import threading
 import time
 from typing import (
+    Any,
     Callable,
+    Dict,
+    Hashable,
+    List,
     Optional,
     Union,
 )
 
 DEFAULT_POLLING_BACKOFF = 0
 DEFAULT_POLLING_DELTA = 0.25
+DEFAULT_POLLING_BACKOFF_FACTOR = 1.5
+DEFAULT_MAX_POLLING_DELTA = 5
 
 TIMEOUT_MESSAGE_TEMPLATE = "Timed out after {} seconds waiting on {}."
 timeout_type = Union[int, float]
@@ -43,6 +50,94 @@ def wait_on(
         delta += polling_backoff
 
 
+class _PendingWait:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Any = None
+        self.exception: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class MultiplexedWaiter:
+    """Wait on many conditions from many threads with a single polling loop.
+
+    ``poll`` is called with the keys of all pending waits and returns a dict
+    with a non-None value, or an exception to raise, for each key whose
+    condition has been met. The polling interval starts at ``delta`` and is
+    multiplied by ``backoff_factor`` up to ``max_delta`` after each round, it
+    is reset whenever a new wait starts so new conditions are checked promptly.
+    """
+
+    def __init__(
+        self,
+        poll: Callable[[List[Hashable]], Dict[Hashable, Any]],
+        delta: timeout_type = DEFAULT_POLLING_DELTA,
+        max_delta: timeout_type = DEFAULT_MAX_POLLING_DELTA,
+        backoff_factor: float = DEFAULT_POLLING_BACKOFF_FACTOR,
+    ):
+        self._poll = poll
+        self._delta = delta
+        self._max_delta = max(max_delta, delta)
+        self._backoff_factor = backoff_factor
+        self._pending: Dict[Hashable, _PendingWait] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def wait(self, key: Hashable, desc: str, timeout: timeout_type):
+        """Wait until ``poll`` reports a value for ``key`` and return it.
+
+        Throw a TimeoutAssertionError if no value is reported within ``timeout`` seconds.
+        """
+        start = time.monotonic()
+        with self._lock:
+            pending = self._pending.get(key)
+            if pending is None:
+                pending = self._pending[key] = _PendingWait()
+                self._wakeup.set()
+            pending.waiters += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="multiplexed_waiter", daemon=True)
+                self._thread.start()
+        if not pending.done.wait(timeout):
+            with self._lock:
+                pending.waiters -= 1
+                if not pending.waiters and self._pending.get(key) is pending:
+                    del self._pending[key]
+            raise TimeoutAssertionError(TIMEOUT_MESSAGE_TEMPLATE.format(time.monotonic() - start, desc))
+        if pending.exception is not None:
+            raise pending.exception
+        return pending.value
+
+    def _run(self) -> None:
+        delta = self._delta
+        while True:
+            self._wakeup.clear()
+            with self._lock:
+                keys = list(self._pending)
+                if not keys:
+                    self._thread = None
+                    return
+            try:
+                results = self._poll(keys)
+            except Exception as e:
+                results = {key: e for key in keys}
+            with self._lock:
+                for key, value in results.items():
+                    if value is None or key not in self._pending:
+                        continue
+                    pending = self._pending.pop(key)
+                    if isinstance(value, BaseException):
+                        pending.exception = value
+                    else:
+                        pending.value = value
+                    pending.done.set()
+            if self._wakeup.wait(delta):
+                delta = self._delta
+            else:
+                delta = min(delta * self._backoff_factor, self._max_delta)
+
+
 class TimeoutAssertionError(AssertionError):
     """Derivative of AssertionError indicating wait_on exceeded max time."""
 
@@ -172,6 +172,10 @@ from galaxy.util.compression_utils import get_fileobj_raw
 from galaxy.util.dictifiable import UsesDictVisibleKeys
 from galaxy.util.expressions import ExpressionContext
 from galaxy.util.form_builder import SelectField
+from galaxy.util.hash_util import (
+    md5_hash_file,
+    md5_hash_str,
+)
 from galaxy.util.json import (
     safe_loads,
     swap_inf_nan,
@@ -845,6 +849,7 @@ class Tool(UsesDictVisibleKeys):
         self._is_workflow_compatible = None
         self.__help = None
         self.__tests: Optional[str] = None
+        self.__test_hash: Optional[str] = None
         try:
             self.parse(tool_source, guid=guid, dynamic=dynamic)
         except Exception as e:
@@ -1347,6 +1352,48 @@ class Tool(UsesDictVisibleKeys):
             return [ToolTestDescription(d) for d in json.loads(self.__tests)]
         return None
 
+    @property
+    def test_hash(self) -> str:
+        """Hash of everything the outcome of this tool's tests depends on.
+
+        Covers the tool source, the content of the test data files and the
+        declared and resolved requirements and containers. It is computed once
+        per loaded tool, reloading the tool computes it again.
+        """
+        if self.__test_hash is None:
+            test_data = {}
+            for test in self.tests or []:
+                for filename in _test_data_filenames(test):
+                    if filename not in test_data:
+                        path = self.test_data_path(filename)
+                        test_data[filename] = md5_hash_file(path) if path else None
+            try:
+                dependencies = self.app.toolbox.dependency_manager.requirements_to_dependencies(
+                    self.requirements,
+                    installed_tool_dependencies=self.installed_tool_dependencies,
+                    tool_dir=self.tool_dir,
+                    tool_instance=self,
+                    include_containers=True,
+                )
+                resolved = [dependency.to_dict() for dependency in dependencies.values()]
+            except Exception:
+                log.exception("Failed to resolve dependencies of tool '%s' for its test hash", self.id)
+                resolved = None
+            self.__test_hash = md5_hash_str(
+                json.dumps(
+                    {
+                        "tool_source": self.tool_source.to_string(),
+                        "test_data": test_data,
+                        "requirements": self.requirements.to_dict(),
+                        "containers": [container.to_dict() for container in self.containers],
+                        "resolved_dependencies": resolved,
+                    },
+                    sort_keys=True,
+                    default=str,
+                )
+            )
+        return self.__test_hash
+
     @property
     def _repository_dir(self):
         """If tool shed installed tool, the base directory of the repository installed."""
@@ -4213,6 +4260,31 @@ def _rerun_remap_job_id(trans, incoming, tool_id: Optional[str]) -> Optional[int
     return rerun_remap_job_id
 
 
+def _test_data_filenames(test: ToolTestDescription) -> List[str]:
+    """Names of the test data files a tool test uploads or compares outputs against."""
+    filenames = []
+
+    def add_expected(filename, attributes):
+        if filename:
+            filenames.append(filename)
+        attributes = attributes or {}
+        for extra_file in attributes.get("extra_files") or []:
+            add_expected(extra_file.get("value"), extra_file.get("attributes"))
+        for nested in ("elements", "primary_datasets"):
+            for nested_filename, nested_attributes in (attributes.get(nested) or {}).values():
+                add_expected(nested_filename, nested_attributes)
+
+    for fname, extra in test.required_files:
+        filenames.append(fname)
+        filenames.extend(extra.get("composite_data") or [])
+    for output in test.outputs:
+        add_expected(output["value"], output["attributes"])
+    for output_collection in test.output_collections:
+        for element_filename, element_attributes in (output_collection.element_tests or {}).values():
+            add_expected(element_filename, element_attributes)
+    return filenames
+
+
 class TracksterConfig:
     """Trackster configuration encapsulation."""
 
@@ -135,6 +135,7 @@ class DefaultToolAction(ToolAction):
         current_user_roles=None,
         dataset_collection_elements=None,
         collection_info=None,
+        execution_cache: Optional[ToolExecutionCache] = None,
     ):
         """
         Collect any dataset inputs from incoming. Returns a mapping from
@@ -169,32 +170,57 @@ class DefaultToolAction(ToolAction):
 
                 input_name = prefixed_name
                 # Checked security of whole collection all at once if mapping over this input, else
-                # fetch dataset details for this input from the database.
+                # fetch dataset details for this input from the database. Jobs of the same batch
+                # share the results through the execution cache.
                 if collection_info and collection_info.is_mapped_over(input_name):
-                    action_tuples = collection_info.map_over_action_tuples(input_name)
-                    if not trans.user_is_admin and not trans.app.security_agent.can_access_datasets(
-                        current_user_roles, action_tuples
-                    ):
-                        raise ItemAccessibilityException(
-                            "User does not have permission to use a dataset provided for input."
-                        )
-                    for action, role_id in action_tuples:
+                    mapped_over_permissions = execution_cache.mapped_over_permissions if execution_cache else {}
+                    if input_name not in mapped_over_permissions:
+                        action_tuples = collection_info.map_over_action_tuples(input_name)
+                        if not trans.user_is_admin and not trans.app.security_agent.can_access_datasets(
+                            current_user_roles, action_tuples
+                        ):
+                            raise ItemAccessibilityException(
+                                "User does not have permission to use a dataset provided for input."
+                            )
+                        mapped_over_permissions[input_name] = frozenset(action_tuples)
+                    for action, role_id in mapped_over_permissions[input_name]:
                         record_permission(action, role_id)
                 else:
-                    if not trans.user_is_admin and not trans.app.security_agent.can_access_dataset(
-                        current_user_roles, data.dataset
-                    ):
-                        raise ItemAccessibilityException(
-                            f"User does not have permission to use dataset ({data.name}) provided for input."
-                        )
-                    permissions = trans.app.security_agent.get_permissions(data.dataset)
-                    for action, roles in permissions.items():
-                        for role in roles:
-                            record_permission(action.action, model.cached_id(role))
+                    dataset_permissions = execution_cache.dataset_permissions if execution_cache else {}
+                    dataset_id = data.dataset.id
+                    if dataset_id is None or dataset_id not in dataset_permissions:
+                        if not trans.user_is_admin and not trans.app.security_agent.can_access_dataset(
+                            current_user_roles, data.dataset
+                        ):
+                            raise ItemAccessibilityException(
+                                f"User does not have permission to use dataset ({data.name}) provided for input."
+                            )
+                        permissions = trans.app.security_agent.get_permissions(data.dataset)
+                        action_tuples = [
+                            (action.action, model.cached_id(role))
+                            for action, roles in permissions.items()
+                            for role in roles
+                        ]
+                        if dataset_id is not None:
+                            dataset_permissions[dataset_id] = action_tuples
+                    else:
+                        action_tuples = dataset_permissions[dataset_id]
+                    for action, role_id in action_tuples:
+                        record_permission(action, role_id)
                 return data
 
             if isinstance(input, DataToolParameter):
                 if isinstance(value, list):
+                    if not trans.user_is_admin:
+                        # resolve access to all datasets of a multiple input at once
+                        trans.app.security_agent.dataset_access_map(
+                            current_user_roles,
+                            [
+                                dataset_id
+                                for dataset_id in (getattr(getattr(v, "hda", v), "dataset_id", None) for v in value)
+                                if dataset_id is not None
+                            ],
+                        )
                     # If there are multiple inputs with the same name, they
                     # are stored as name1, name2, ...
                     for i, v in enumerate(value):
@@ -375,7 +401,9 @@ class DefaultToolAction(ToolAction):
     def _check_access(self, tool, trans):
         assert tool.allow_user_access(trans.user), f"User ({trans.user}) is not allowed to access this tool."
 
-    def _collect_inputs(self, tool, trans, incoming, history, current_user_roles, collection_info):
+    def _collect_inputs(
+        self, tool, trans, incoming, history, current_user_roles, collection_info, execution_cache=None
+    ):
         """Collect history as well as input datasets and collections."""
         # Set history.
         if not history:
@@ -392,6 +420,7 @@ class DefaultToolAction(ToolAction):
             history=history,
             current_user_roles=current_user_roles,
             collection_info=collection_info,
+            execution_cache=execution_cache,
         )
 
         preserved_tags = {}
@@ -440,6 +469,8 @@ class DefaultToolAction(ToolAction):
         incoming = incoming or {}
         self._check_access(tool, trans)
         app = trans.app
+        # Only callers passing their execution cache assign hids to the outputs of several jobs at once.
+        defer_history_additions = execution_cache is not None and execution_cache.defer_history_additions
         if execution_cache is None:
             execution_cache = ToolExecutionCache(trans)
         current_user_roles = execution_cache.current_user_roles
@@ -450,7 +481,9 @@ class DefaultToolAction(ToolAction):
             preserved_tags,
             preserved_hdca_tags,
             all_permissions,
-        ) = self._collect_inputs(tool, trans, incoming, history, current_user_roles, collection_info)
+        ) = self._collect_inputs(
+            tool, trans, incoming, history, current_user_roles, collection_info, execution_cache=execution_cache
+        )
         assert history  # tell type system we've set history and it is no longer optional
         # Build name for output datasets based on tool name and input names
         on_text = self._get_on_text(inp_data)
@@ -697,7 +730,8 @@ class DefaultToolAction(ToolAction):
             if name not in incoming and name not in child_dataset_names:
                 # don't add already existing datasets, i.e. async created
                 history.stage_addition(data)
-        history.add_pending_items(set_output_hid=set_output_hid)
+        if not (set_output_hid and defer_history_additions):
+            history.add_pending_items(set_output_hid=set_output_hid)
 
         log.info(add_datasets_timer)
         job_setup_timer = ExecutionTimer()
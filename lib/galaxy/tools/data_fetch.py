@@ -22,6 +22,10 @@ from galaxy.datatypes.upload_util import (
     handle_upload,
     UploadProblemException,
 )
+from galaxy.files.transfer import (
+    DEFAULT_TRANSFER_CONNECTIONS,
+    for_each_concurrently,
+)
 from galaxy.files.uris import (
     stream_to_file,
     stream_url_to_file,
@@ -34,7 +38,9 @@ from galaxy.util.bunch import Bunch
 from galaxy.util.compression_utils import CompressedFile
 from galaxy.util.hash_util import (
     HASH_NAMES,
-    verify_hash,
+    HashFunctionNameEnum,
+    memory_bound_hexdigests,
+    verify_hashes,
 )
 
 DESCRIPTION = """Data Import Script"""
@@ -254,14 +260,13 @@ def _fetch_target(upload_config: "UploadConfig", target):
             hash_value = item.get(hash_function)
             if hash_value:
                 hashes.append({"hash_function": hash_function, "hash_value": hash_value})
-        for hash_dict in hashes:
-            hash_function = hash_dict.get("hash_function")
-            hash_value = hash_dict.get("hash_value")
-            try:
-                _handle_hash_validation(upload_config, hash_function, hash_value, path)
-            except Exception as e:
-                error_message = str(e)
-                item["error_message"] = error_message
+        calculated_hashes: Dict[HashFunctionNameEnum, str] = {}
+        try:
+            # validate and calculate the configured hashes while reading the file once
+            calculated_hashes = _handle_hashes(upload_config, hashes, path)
+        except Exception as e:
+            error_message = str(e)
+            item["error_message"] = error_message
 
         dbkey = item.get("dbkey", "?")
         link_data_only = upload_config.link_data_only
@@ -365,6 +370,20 @@ def _fetch_target(upload_config: "UploadConfig", target):
 
             if len(transform) > 0:
                 source_dict["transform"] = transform
+
+            if upload_config.hash_functions:
+                if converted_path or in_place or transform:
+                    # content changed since it was read above, hash the final file
+                    calculated_hashes = memory_bound_hexdigests(upload_config.hash_functions, path=path)
+                hashes = [
+                    hash_dict
+                    for hash_dict in hashes
+                    if hash_dict.get("hash_function") not in upload_config.hash_functions
+                ]
+                for hash_function in upload_config.hash_functions:
+                    hashes.append(
+                        {"hash_function": hash_function.value, "hash_value": calculated_hashes[hash_function]}
+                    )
         elif not error_message:
             transform = []
             if to_posix_lines:
@@ -400,6 +419,7 @@ def _fetch_target(upload_config: "UploadConfig", target):
             return rval
 
     if expansion_error is None:
+        upload_config.prefetch_urls(_tree_leaves(items))
         elements = elements_tree_map(_resolve_item_capture_error, items)
         if is_collection and not upload_config.allow_failed_collections and len(failed_elements) > 0:
             element_error = "Failed to fetch collection element(s):\n"
@@ -447,6 +467,14 @@ def elements_tree_map(f, items):
     return new_items
 
 
+def _tree_leaves(items):
+    for item in items:
+        if "elements" in item:
+            yield from _tree_leaves(item["elements"])
+        else:
+            yield item
+
+
 def _directory_to_items(directory):
     items: List[Dict[str, Any]] = []
     dir_elements: Dict[str, Any] = {}
@@ -488,17 +516,18 @@ def _has_src_to_path(upload_config, item, is_dataset=False) -> Tuple[str, str]:
     if src == "url":
         url = item.get("url")
         try:
-            path = stream_url_to_file(url, file_sources=upload_config.file_sources, dir=upload_config.working_directory)
+            path = upload_config.fetch_url(item)
         except Exception as e:
             raise Exception(f"Failed to fetch url {url}. {str(e)}")
 
         if not is_dataset:
             # Actual target dataset will validate and put results in dict
             # that gets passed back to Galaxy.
-            for hash_function in HASH_NAMES:
-                hash_value = item.get(hash_function)
-                if hash_value:
-                    _handle_hash_validation(upload_config, hash_function, hash_value, path)
+            expected_hashes = {
+                hash_function: item[hash_function] for hash_function in HASH_NAMES if item.get(hash_function)
+            }
+            if expected_hashes and upload_config.validate_hashes:
+                verify_hashes(path, expected_hashes, what="upload")
         if name is None:
             name = url.split("/")[-1]
     elif src == "pasted":
@@ -513,9 +542,15 @@ def _has_src_to_path(upload_config, item, is_dataset=False) -> Tuple[str, str]:
     return name, path
 
 
-def _handle_hash_validation(upload_config, hash_function, hash_value, path):
+def _handle_hashes(upload_config, hashes, path) -> Dict[HashFunctionNameEnum, str]:
+    expected_hashes: Dict[HashFunctionNameEnum, str] = {}
     if upload_config.validate_hashes:
-        verify_hash(path, hash_func_name=hash_function, hash_value=hash_value, what="upload")
+        for hash_dict in hashes:
+            expected_hashes[HashFunctionNameEnum(hash_dict.get("hash_function"))] = hash_dict.get("hash_value")
+    hash_functions = upload_config.hash_functions if path else []
+    if not expected_hashes and not hash_functions:
+        return {}
+    return verify_hashes(path, expected_hashes, what="upload", extra_hash_func_names=hash_functions)
 
 
 def _arg_parser():
@@ -562,10 +597,12 @@ class UploadConfig:
         self.space_to_tab = request.get("space_to_tab", False)
         self.auto_decompress = request.get("auto_decompress", False)
         self.validate_hashes = request.get("validate_hashes", False)
+        self.hash_functions = [HashFunctionNameEnum(name) for name in request.get("hash_functions", [])]
         self.deferred = request.get("deferred", False)
         self.link_data_only = _link_data_only(request)
         self.file_sources_dict = file_sources_dict
         self._file_sources = None
+        self._prefetched_urls: Dict[int, Tuple[Optional[str], Optional[Exception]]] = {}
 
         self.__workdir = os.path.abspath(working_directory)
         self.__upload_count = 0
@@ -576,6 +613,33 @@ class UploadConfig:
             self._file_sources = get_file_sources(self.working_directory, file_sources_as_dict=self.file_sources_dict)
         return self._file_sources
 
+    def prefetch_urls(self, items):
+        """Download the URLs of ``items`` concurrently before the items are resolved one by one."""
+        url_items = [item for item in items if item.get("src") == "url" and not self.get_option(item, "deferred")]
+        file_sources = self.file_sources
+        workers = file_sources.transfer_connections if file_sources else DEFAULT_TRANSFER_CONNECTIONS
+        if workers <= 1 or len(url_items) <= 1:
+            return
+
+        def fetch(item) -> Tuple[Optional[str], Optional[Exception]]:
+            try:
+                return self._stream_url_to_file(item["url"]), None
+            except Exception as e:
+                return None, e
+
+        for item, result in zip(url_items, for_each_concurrently(fetch, url_items, workers, "data_fetch")):
+            self._prefetched_urls[id(item)] = result
+
+    def fetch_url(self, item) -> str:
+        """Return the path of the downloaded URL of ``item``, download it now if it wasn't prefetched."""
+        path, error = self._prefetched_urls.pop(id(item), (None, None))
+        if error is not None:
+            raise error
+        return path or self._stream_url_to_file(item["url"])
+
+    def _stream_url_to_file(self, url) -> str:
+        return stream_url_to_file(url, file_sources=self.file_sources, dir=self.working_directory)
+
     def get_option(self, item, key):
         """Return item[key] if specified otherwise use default from UploadConfig.
 
@@ -112,6 +112,8 @@ def execute(
             trans, tool, mapping_params, collection_info, invocation_step, completed_jobs=completed_jobs
         )
     execution_cache = ToolExecutionCache(trans)
+    # Assign hids to the outputs of all jobs with a single query instead of one per job.
+    execution_cache.defer_history_additions = len(mapping_params.param_combinations) > 1
 
     def execute_single_job(execution_slice: "ExecutionSlice", completed_job: Optional[model.Job], skip: bool = False):
         job_timer = tool.app.execution_timer_factory.get_timer(
@@ -182,6 +184,7 @@ def execute(
     has_remaining_jobs = False
     execution_slice = None
     job_datasets: Dict[str, List[model.DatasetInstance]] = {}  # job: list of dataset instances created by job
+    histories: List[model.History] = []
 
     for i, execution_slice in enumerate(execution_tracker.new_execution_slices()):
         if max_num_jobs is not None and jobs_executed >= max_num_jobs:
@@ -191,10 +194,12 @@ def execute(
             skip = execution_slice.param_combination.pop("__when_value__", None) is False
             execute_single_job(execution_slice, completed_jobs[i], skip=skip)
             history = execution_slice.history or history
+            if history not in histories:
+                histories.append(history)
             jobs_executed += 1
 
-    if execution_slice:
-        history.add_pending_items()
+    for output_history in histories:
+        output_history.add_pending_items()
     # Make sure collections, implicit jobs etc are flushed even if there are no precreated output datasets
     with transaction(trans.sa_session):
         trans.sa_session.commit()
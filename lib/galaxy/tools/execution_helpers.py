@@ -5,7 +5,13 @@ tool execution code, and tool action code.
 """
 
 import logging
-from typing import Collection
+from typing import (
+    Collection,
+    Dict,
+    FrozenSet,
+    List,
+    Tuple,
+)
 
 log = logging.getLogger(__name__)
 
@@ -20,6 +26,14 @@ class ToolExecutionCache:
         self.current_user_roles = trans.get_current_user_roles()
         self.chrom_info = {}
         self.cached_collection_elements = {}
+        # Access checked (action, role_id) pairs of inputs shared by the jobs of
+        # a batch - the datasets of mapped over collections by input name and
+        # other input datasets by dataset id.
+        self.mapped_over_permissions: Dict[str, FrozenSet[Tuple[str, int]]] = {}
+        self.dataset_permissions: Dict[int, List[Tuple[str, int]]] = {}
+        # If set, tool actions leave outputs staged in the history and the
+        # caller assigns hids to the outputs of all jobs at once.
+        self.defer_history_additions = False
 
     def get_chrom_info(self, tool_id, input_dbkey):
         genome_builds = self.trans.app.genome_builds
@@ -3,9 +3,13 @@ import logging
 import os
 import shlex
 import tempfile
-from functools import total_ordering
+from functools import (
+    lru_cache,
+    total_ordering,
+)
 from typing import (
     Any,
+    Callable,
     cast,
     Dict,
     Iterable,
@@ -112,12 +116,36 @@ class RawObjectWrapper(ToolParameterValueWrapper):
         return getattr(self.obj, key)
 
 
+# Types used to compare and order wrapped values of simple parameters.
+PARAMETER_CAST_TABLE: Dict[str, Callable[[Any], Any]] = {
+    "text": str,
+    "integer": int,
+    "float": float,
+    "boolean": bool,
+}
+
+
+# Parameter values whose param_dict string can be memoized.
+IMMUTABLE_PARAMETER_VALUE_TYPES = (str, int, float, bool, type(None))
+
+
+@lru_cache(maxsize=None)
+def _empty_string_for_optional_text(profile: Optional[float]) -> bool:
+    # Tools with old profile versions may treat an optional text parameter as `""`
+    return profile is None or Version(str(profile)) < Version("23.0")
+
+
 @total_ordering
 class InputValueWrapper(ToolParameterValueWrapper):
     """
     Wraps an input so that __str__ gives the "param_dict" representation.
     """
 
+    # ((type, value), to_param_dict_string result) of the last conversion of
+    # an immutable value, templates usually convert the same wrapper to a
+    # string many times.
+    _param_dict_string: Optional[Tuple[Tuple[type, Any], Union[str, List[str]]]] = None
+
     def __init__(
         self,
         input: "ToolParameter",
@@ -131,9 +159,8 @@ class InputValueWrapper(ToolParameterValueWrapper):
             and input.type == "text"
             and input.optional
             and input.optionality_inferred
-            and (profile is None or Version(str(profile)) < Version("23.0"))
+            and _empty_string_for_optional_text(profile)
         ):
-            # Tools with old profile versions may treat an optional text parameter as `""`
             value = ""
         self.value = value
         self._other_values: Dict[str, str] = other_values or {}
@@ -150,13 +177,7 @@ class InputValueWrapper(ToolParameterValueWrapper):
                 return str(self), other
             else:
                 return None, other
-        cast_table = {
-            "text": str,
-            "integer": int,
-            "float": float,
-            "boolean": bool,
-        }
-        return cast(Union[str, int, float, bool], cast_table.get(self.input.type, str)(self)), other
+        return cast(Union[str, int, float, bool], PARAMETER_CAST_TABLE.get(self.input.type, str)(self)), other
 
     def __eq__(self, other: Any) -> bool:
         casted_self, casted_other = self._get_cast_values(other)
@@ -165,15 +186,27 @@ class InputValueWrapper(ToolParameterValueWrapper):
     def __ne__(self, other: Any) -> bool:
         return not self == other
 
+    def _to_param_dict_string(self) -> Union[str, List[str]]:
+        value = self.value
+        if not isinstance(value, IMMUTABLE_PARAMETER_VALUE_TYPES):
+            # Values like lists may be changed in place, convert them every time.
+            return self.input.to_param_dict_string(value, self._other_values)
+        key = (type(value), value)
+        cached = self._param_dict_string
+        if cached is None or cached[0] != key:
+            cached = (key, self.input.to_param_dict_string(value, self._other_values))
+            self._param_dict_string = cached
+        return cached[1]
+
     def __str__(self) -> str:
-        to_param_dict_string = self.input.to_param_dict_string(self.value, self._other_values)
+        to_param_dict_string = self._to_param_dict_string()
         if isinstance(to_param_dict_string, list):
             return ",".join(to_param_dict_string)
         else:
             return to_param_dict_string
 
     def __iter__(self) -> Iterable[str]:
-        to_param_dict_string = self.input.to_param_dict_string(self.value, self._other_values)
+        to_param_dict_string = self._to_param_dict_string()
         if not isinstance(to_param_dict_string, list):
             return iter([to_param_dict_string])
         else:
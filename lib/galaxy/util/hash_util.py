@@ -11,6 +11,7 @@ from typing import (
     Any,
     Callable,
     Dict,
+    Iterable,
     List,
     Optional,
     Tuple,
@@ -82,6 +83,31 @@ def memory_bound_hexdigest(
         file.close()
 
 
+def memory_bound_hexdigests(
+    hash_func_names: Iterable[HashFunctionNameEnum],
+    path: Optional[str] = None,
+    file=None,
+) -> Dict[HashFunctionNameEnum, str]:
+    """
+    Compute the hexdigests of several hash functions in a single pass over the
+    content of a file.
+    """
+    hashers = {hash_func_name: HASH_NAME_MAP[hash_func_name]() for hash_func_name in hash_func_names}
+    if file is None:
+        assert path is not None
+        file = open(path, "rb")
+    else:
+        assert path is None, "Cannot specify path and path keyword arguments."
+
+    try:
+        for block in iter(lambda: file.read(BLOCK_SIZE), b""):
+            for hasher in hashers.values():
+                hasher.update(block)
+        return {hash_func_name: hasher.hexdigest() for hash_func_name, hasher in hashers.items()}
+    finally:
+        file.close()
+
+
 def md5_hash_file(path: StrPath) -> Optional[str]:
     """
     Return a md5 hashdigest for a file or None if path could not be read.
@@ -157,10 +183,33 @@ def verify_hash(path: str, hash_func_name: HashFunctionNameEnum, hash_value: str
     calculated_hash_value = memory_bound_hexdigest(hash_func_name=hash_func_name, path=path)
     if calculated_hash_value != hash_value:
         raise Exception(
-            f"Failed to validate {what} with [{hash_func_name}] - expected [{hash_value}] got [{calculated_hash_value}]"
+            f"Failed to validate {what} with [{hash_func_name.value}] - expected [{hash_value}] got [{calculated_hash_value}]"
         )
 
 
+def verify_hashes(
+    path: str,
+    hashes: Dict[HashFunctionNameEnum, str],
+    what: str = "path",
+    extra_hash_func_names: Iterable[HashFunctionNameEnum] = (),
+) -> Dict[HashFunctionNameEnum, str]:
+    """
+    Validate ``path`` against the expected ``hashes`` reading the file only once.
+
+    Hash functions listed in ``extra_hash_func_names`` are computed in the same
+    pass and all calculated hash values are returned.
+    """
+    hash_func_names = list(dict.fromkeys([*hashes.keys(), *extra_hash_func_names]))
+    calculated_hashes = memory_bound_hexdigests(hash_func_names, path=path)
+    for hash_func_name, hash_value in hashes.items():
+        calculated_hash_value = calculated_hashes[hash_func_name]
+        if calculated_hash_value != hash_value:
+            raise Exception(
+                f"Failed to validate {what} with [{hash_func_name.value}] - expected [{hash_value}] got [{calculated_hash_value}]"
+            )
+    return calculated_hashes
+
+
 __all__ = (
     "md5",
     "hashlib",
@@ -1,18 +1,32 @@
 """Entry point for the usage of Cheetah templating within Galaxy."""
 
+import hashlib
+import logging
+import os
+import tempfile
+import threading
 import traceback
+import types
+from collections import OrderedDict
 from lib2to3.refactor import RefactoringTool
+from typing import (
+    Optional,
+    Type,
+)
 
 from Cheetah.Compiler import Compiler
 from Cheetah.NameMapper import NotFound
 from Cheetah.Parser import ParseError
 from Cheetah.Template import Template
+from Cheetah.Version import Version as CheetahVersion
 from packaging.version import Version
 from past.translation import myfixes
 
 from galaxy.util.tree_dict import TreeDict
 from . import unicodify
 
+log = logging.getLogger(__name__)
+
 # Skip libpasteurize fixers, which make sure code is py2 and py3 compatible.
 # This is not needed, we only translate code on py3.
 myfixes = [f for f in myfixes if not f.startswith("libpasteurize")]
@@ -39,6 +53,127 @@ def create_compiler_class(module_code):
     return CustomCompilerClass
 
 
+class CompiledTemplateCache:
+    """Least recently used cache of compiled Cheetah template classes.
+
+    Templates are keyed by a digest of their text (and the Cheetah version),
+    so tool command lines and config files are only parsed and compiled once
+    per process for all jobs of a tool version. Unlike Cheetah's own
+    compilation cache this one is bounded, evicted templates can be garbage
+    collected because their modules are not registered in ``sys.modules``.
+
+    If ``cache_dir`` is set the Python code generated for each template is
+    also stored there, so that other processes and restarted servers skip
+    parsing the template.
+    """
+
+    # Cheetah's default, so that the generated code can be passed to
+    # create_compiler_class by fill_template.
+    class_name = "DynamicallyCompiledCheetahTemplate"
+
+    def __init__(self, max_size: int = 1000, cache_dir: Optional[str] = None):
+        self.max_size = max_size
+        self.cache_dir = cache_dir
+        self._classes: OrderedDict[str, Type[Template]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def configure(self, max_size: int, cache_dir: Optional[str] = None) -> None:
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        with self._lock:
+            self.max_size = max_size
+            self.cache_dir = cache_dir
+            self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._classes.clear()
+
+    def __len__(self) -> int:
+        return len(self._classes)
+
+    def get(self, template_text: str) -> Type[Template]:
+        """Return the compiled template class for ``template_text``."""
+        if self.max_size <= 0:
+            return Template.compile(source=template_text, compilerClass=Compiler)
+        key = hashlib.sha256(f"{CheetahVersion}\0{template_text}".encode()).hexdigest()
+        with self._lock:
+            klass = self._classes.get(key)
+            if klass is not None:
+                self._classes.move_to_end(key)
+                return klass
+        try:
+            klass = self._load(key, template_text)
+        except Exception:
+            # Let Cheetah raise (and report) parse errors of templates that
+            # may need to be translated from Python 2 by fill_template.
+            return Template.compile(
+                source=template_text, compilerClass=Compiler, cacheCompilationResults=False, useCache=False
+            )
+        with self._lock:
+            self._classes[key] = klass
+            self._evict()
+        return klass
+
+    def _evict(self) -> None:
+        while len(self._classes) > max(self.max_size, 0):
+            self._classes.popitem(last=False)
+
+    def _load(self, key: str, template_text: str) -> Type[Template]:
+        module_code = self._read(key)
+        if module_code is not None:
+            try:
+                return self._class_from_module_code(key, module_code)
+            except Exception:
+                log.warning("Ignoring invalid compiled Cheetah template %s in %s", key, self.cache_dir)
+        module_code = Template.compile(
+            source=template_text,
+            compilerClass=Compiler,
+            returnAClass=False,
+            cacheCompilationResults=False,
+            useCache=False,
+        ).decode("utf-8")
+        klass = self._class_from_module_code(key, module_code)
+        self._write(key, module_code)
+        return klass
+
+    def _class_from_module_code(self, key: str, module_code: str) -> Type[Template]:
+        module = types.ModuleType(f"cheetah_{key[:16]}")
+        exec(compile(module_code, f"<cheetah template {key[:16]}>", "exec"), module.__dict__)
+        klass = getattr(module, self.class_name)
+        # fill_template reads the generated code to work around NotFound errors
+        klass._CHEETAH_generatedModuleCode = module_code
+        return klass
+
+    def _path(self, key: str) -> Optional[str]:
+        return os.path.join(self.cache_dir, f"{key}.py") if self.cache_dir else None
+
+    def _read(self, key: str) -> Optional[str]:
+        path = self._path(key)
+        if path is None or not os.path.exists(path):
+            return None
+        try:
+            with open(path) as fh:
+                return fh.read()
+        except OSError:
+            return None
+
+    def _write(self, key: str, module_code: str) -> None:
+        path = self._path(key)
+        if path is None:
+            return
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w") as fh:
+                fh.write(module_code)
+            os.replace(tmp_path, path)
+        except OSError:
+            log.warning("Failed to write compiled Cheetah template to %s", path, exc_info=True)
+
+
+compiled_template_cache = CompiledTemplateCache()
+
+
 def fill_template(
     template_text,
     context=None,
@@ -62,7 +197,10 @@ def fill_template(
     if isinstance(python_template_version, str):
         python_template_version = Version(python_template_version)
     try:
-        klass = Template.compile(source=template_text, compilerClass=compiler_class)
+        if compiler_class is Compiler:
+            klass = compiled_template_cache.get(template_text)
+        else:
+            klass = Template.compile(source=template_text, compilerClass=compiler_class)
     except ParseError as e:
         # Might happen on invalid syntax within a cheetah statement, like `#if $smxsize <> 128.0`
         if first_exception is None:
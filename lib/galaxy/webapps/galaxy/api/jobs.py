@@ -43,6 +43,8 @@ from galaxy.schema.jobs import (
     JobErrorSummary,
     JobInputAssociation,
     JobInputSummary,
+    JobLifecyclePhaseSummary,
+    JobMetricSummary,
     JobOutputAssociation,
     ReportJobErrorPayload,
     SearchJobsPayload,
@@ -170,6 +172,49 @@ OffsetQueryParam: int = Query(
     description="Return jobs starting from this specified position. For example, if ``limit`` is set to 100 and ``offset`` to 200, jobs 200-299 will be returned.",
 )
 
+SummaryToolIdQueryParam: Optional[str] = Query(
+    default=None,
+    title="Tool ID",
+    description="Only summarize jobs of this tool.",
+)
+
+SummaryDestinationIdQueryParam: Optional[str] = Query(
+    default=None,
+    title="Destination ID",
+    description="Only summarize jobs that ran on this job destination.",
+)
+
+SummaryLimitQueryParam: int = Query(
+    default=10000,
+    ge=1,
+    title="Limit",
+    description="Maximum number of most recent jobs to summarize.",
+)
+
+SummaryPluginQueryParam: Optional[str] = Query(
+    default=None,
+    title="Plugin",
+    description="Only summarize metrics recorded by this job metrics plugin (e.g. ``core`` or ``cgroup``).",
+)
+
+SummaryMetricNameQueryParam: Optional[str] = Query(
+    default=None,
+    title="Metric name",
+    description="Only summarize metrics with this name (e.g. ``runtime_seconds``).",
+)
+
+SummaryByDestinationQueryParam: bool = Query(
+    default=True,
+    title="By destination",
+    description="Summarize each job destination separately instead of merging all destinations of a tool.",
+)
+
+SummaryQuantilesQueryParam: List[float] = Query(
+    default=[0.5, 0.95],
+    title="Quantiles",
+    description="Fractions between 0 and 1 of the quantiles to estimate.",
+)
+
 query_tags = [
     IndexQueryTag("user", "The user email of the user that executed the Job.", "u"),
     IndexQueryTag("tool_id", "The tool ID corresponding to the job.", "t"),
@@ -248,6 +293,68 @@ class FastAPIJobs:
         )
         return self.service.index(trans, payload)
 
+    @router.get(
+        "/api/jobs/lifecycle_summary",
+        name="lifecycle_summary",
+        summary="Return median and 95th percentile job lifecycle phase durations per tool and destination.",
+        require_admin=True,
+    )
+    def lifecycle_summary(
+        self,
+        tool_id: Optional[str] = SummaryToolIdQueryParam,
+        destination_id: Optional[str] = SummaryDestinationIdQueryParam,
+        date_range_min: Optional[Union[datetime, date]] = DateRangeMinQueryParam,
+        limit: int = SummaryLimitQueryParam,
+        trans: ProvidesUserContext = DependsOnTrans,
+    ) -> List[JobLifecyclePhaseSummary]:
+        """
+        Timings are only recorded while the ``job_lifecycle_tracing`` option is enabled.
+        """
+        summaries = self.service.job_manager.lifecycle_summary(
+            trans,
+            tool_id=tool_id,
+            destination_id=destination_id,
+            date_range_min=date_range_min,
+            limit=limit,
+        )
+        return [JobLifecyclePhaseSummary(**summary) for summary in summaries]
+
+    @router.get(
+        "/api/jobs/metrics_summary",
+        name="metrics_summary",
+        summary="Return counts, sums and quantiles of numeric job metrics per tool and destination.",
+        require_admin=True,
+    )
+    def metrics_summary(
+        self,
+        plugin: Optional[str] = SummaryPluginQueryParam,
+        metric_name: Optional[str] = SummaryMetricNameQueryParam,
+        tool_id: Optional[str] = SummaryToolIdQueryParam,
+        destination_id: Optional[str] = SummaryDestinationIdQueryParam,
+        date_range_min: Optional[Union[datetime, date]] = DateRangeMinQueryParam,
+        date_range_max: Optional[Union[datetime, date]] = DateRangeMaxQueryParam,
+        by_destination: bool = SummaryByDestinationQueryParam,
+        quantiles: List[float] = SummaryQuantilesQueryParam,
+        trans: ProvidesUserContext = DependsOnTrans,
+    ) -> List[JobMetricSummary]:
+        """
+        Served from the daily job metric rollups maintained while the ``enable_job_metric_rollups`` option is enabled.
+        """
+        if any(not 0 <= quantile <= 1 for quantile in quantiles):
+            raise exceptions.RequestParameterInvalidException("Quantiles must be between 0 and 1.")
+        summaries = self.service.job_manager.metrics_summary(
+            trans,
+            plugin=plugin,
+            metric_name=metric_name,
+            tool_id=tool_id,
+            destination_id=destination_id,
+            date_range_min=date_range_min,
+            date_range_max=date_range_max,
+            by_destination=by_destination,
+            quantiles=quantiles,
+        )
+        return [JobMetricSummary(**summary) for summary in summaries]
+
     @router.get(
         "/api/jobs/{job_id}/common_problems",
         name="check_common_problems",
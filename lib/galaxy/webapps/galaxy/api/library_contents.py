@@ -88,6 +88,12 @@ class LibraryContentsController(
                     subfolder.api_type = "folder"
                     rval.append(subfolder)
                     rval.extend(traverse(subfolder))
+            if not admin:
+                # resolve access to all datasets of the folder at once
+                trans.app.security_agent.dataset_access_map(
+                    current_user_roles,
+                    [ld.library_dataset_dataset_association.dataset_id for ld in folder.datasets],
+                )
             for ld in folder.datasets:
                 if not admin:
                     can_access = trans.app.security_agent.can_access_dataset(
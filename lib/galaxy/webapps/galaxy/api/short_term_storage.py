@@ -8,6 +8,7 @@ from galaxy.short_term_storage import (
     ShortTermStorageMonitor,
     ShortTermStorageServeCancelledInformation,
     ShortTermStorageServeCompletedInformation,
+    ShortTermStorageStatistics,
 )
 from galaxy.webapps.base.api import GalaxyFileResponse
 from . import (
@@ -22,6 +23,14 @@ router = Router(tags=["short_term_storage"])
 class FastAPIShortTermStorage:
     short_term_storage_monitor: ShortTermStorageMonitor = depends(ShortTermStorageMonitor)  # type: ignore[type-abstract]  # https://github.com/python/mypy/issues/4717
 
+    @router.get(
+        "/api/short_term_storage/statistics",
+        summary="Return the size of the short term storage and its usage counters.",
+        require_admin=True,
+    )
+    def statistics(self) -> ShortTermStorageStatistics:
+        return self.short_term_storage_monitor.statistics()
+
     @router.get(
         "/api/short_term_storage/{storage_request_id}/ready",
         summary="Determine if specified storage request ID is ready for download.",
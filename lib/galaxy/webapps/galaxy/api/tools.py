@@ -297,8 +297,9 @@ class ToolsController(BaseGalaxyAPIController, UsesVisualizationMixin):
         GET /api/tools/tests_summary
 
         Fetch summary information for each tool and version combination with tool tests
-        defined. This summary information currently includes tool name and a count of
-        the tests.
+        defined. This summary information currently includes tool name, a count of
+        the tests and a hash that changes whenever the tool, its test data or its
+        dependencies do.
 
         Fetch complete test data for each tool with /api/tools/{tool_id}/test_data?tool_version=<tool_version>
         """
@@ -313,6 +314,7 @@ class ToolsController(BaseGalaxyAPIController, UsesVisualizationMixin):
                     available_versions[tool.version] = {
                         "tool_name": tool.name,
                         "count": len(tests),
+                        "tool_hash": tool.test_hash,
                     }
         return test_counts_by_tool
 
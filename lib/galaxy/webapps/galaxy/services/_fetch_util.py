@@ -57,6 +57,7 @@ def validate_and_normalize_targets(trans, payload):
     purge_ftp_source = getattr(trans.app.config, "ftp_upload_purge", True) and not run_as_real_user
 
     payload["check_content"] = trans.app.config.check_upload_content
+    payload["hash_functions"] = [hash_function.value for hash_function in trans.app.config.upload_hash_functions]
 
     def check_src(item):
         validate_datatype_extension(datatypes_registry=trans.app.datatypes_registry, ext=item.get("ext"))
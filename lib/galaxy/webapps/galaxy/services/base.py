@@ -84,7 +84,7 @@ class ServiceBase:
         """
         Decodes all encoded IDs in the given list.
         """
-        return [self.decode_id(id) for id in ids]
+        return self.security.decode_ids(str(id) for id in ids)
 
     def encode_all_ids(self, rval, recursive: bool = False):
         """
@@ -193,3 +193,10 @@ def async_task_summary(async_result: AsyncResult) -> AsyncTaskResultSummary:
         name=name,
         queue=queue,
     )
+
+
+def reused_target_task_summary(short_term_storage_target: ShortTermStorageTarget) -> AsyncTaskResultSummary:
+    """Return the summary of the task generating a reused short term storage target."""
+    # Only targets with a recorded task are reused.
+    assert short_term_storage_target.task_summary is not None
+    return AsyncTaskResultSummary(**short_term_storage_target.task_summary)
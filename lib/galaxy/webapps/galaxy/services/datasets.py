@@ -27,6 +27,7 @@ from galaxy import (
     util,
     web,
 )
+from galaxy.celery.base_task import pending_tasks
 from galaxy.celery.tasks import compute_dataset_hash
 from galaxy.datatypes.binary import Binary
 from galaxy.datatypes.dataproviders.exceptions import NoProviderAvailable
@@ -503,7 +504,9 @@ class DatasetsService(ServiceBase, UsesVisualizationMixin):
             hash_function=payload.hash_function,
             user=trans.async_request_user,
         )
-        result = compute_dataset_hash.delay(request=request, task_user_id=getattr(trans.user, "id", None))
+        result = pending_tasks.submit(
+            compute_dataset_hash.si(request=request, task_user_id=getattr(trans.user, "id", None))
+        )
         return async_task_summary(result)
 
     def drs_dataset_instance(self, object_id: str) -> Tuple[int, DatasetSourceType]:
@@ -544,7 +547,7 @@ class DatasetsService(ServiceBase, UsesVisualizationMixin):
                 hash_function=hash_funciton,
                 user=None,
             )
-            compute_dataset_hash.delay(request=request, task_user_id=getattr(trans.user, "id", None))
+            pending_tasks.submit(compute_dataset_hash.si(request=request, task_user_id=getattr(trans.user, "id", None)))
             raise galaxy_exceptions.AcceptedRetryLater(
                 "required checksum task for DRS object response launched.", retry_after=60
             )
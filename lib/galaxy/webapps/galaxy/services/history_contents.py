@@ -12,6 +12,7 @@ from typing import (
     TYPE_CHECKING,
     Union,
 )
+from uuid import UUID
 
 from celery import chain
 from pydantic import (
@@ -24,8 +25,12 @@ from typing_extensions import (
 )
 
 from galaxy import exceptions
+from galaxy.celery.base_task import (
+    DatasetTaskBatcher,
+    pending_tasks,
+)
 from galaxy.celery.tasks import (
-    change_datatype,
+    change_datatype_batch,
     materialize as materialize_task,
     prepare_dataset_collection_download,
     prepare_history_content_download,
@@ -58,7 +63,9 @@ from galaxy.managers.jobs import (
     summarize_jobs_to_dict,
 )
 from galaxy.managers.library_datasets import LibraryDatasetsManager
+from galaxy.managers.tasks import AsyncTasksManager
 from galaxy.model import (
+    Dataset,
     History,
     HistoryDatasetAssociation,
     HistoryDatasetCollectionAssociation,
@@ -117,13 +124,18 @@ from galaxy.schema.tasks import (
     WriteHistoryContentTo,
 )
 from galaxy.security.idencoding import IdEncodingHelper
-from galaxy.short_term_storage import ShortTermStorageAllocator
+from galaxy.short_term_storage import (
+    ShortTermStorageAllocator,
+    ShortTermStorageTarget,
+    ShortTermStorageTargetSecurity,
+)
 from galaxy.util.zipstream import ZipstreamWrapper
 from galaxy.webapps.galaxy.services.base import (
     async_task_summary,
     ConsumesModelStores,
     ensure_celery_tasks_enabled,
     model_store_storage_target,
+    reused_target_task_summary,
     ServesExportStores,
     ServiceBase,
 )
@@ -278,6 +290,7 @@ class HistoriesContentsService(ServiceBase, ServesExportStores, ConsumesModelSto
         history_contents_filters: HistoryContentsFilters,
         short_term_storage_allocator: ShortTermStorageAllocator,
         genomes_manager: GenomesManager,
+        async_tasks_manager: AsyncTasksManager,
     ):
         super().__init__(security)
         self.history_manager = history_manager
@@ -295,6 +308,7 @@ class HistoriesContentsService(ServiceBase, ServesExportStores, ConsumesModelSto
         self.short_term_storage_allocator = short_term_storage_allocator
         self.genomes_manager = genomes_manager
         self.object_store = object_store
+        self.async_tasks_manager = async_tasks_manager
 
     def index(
         self,
@@ -485,9 +499,14 @@ class HistoriesContentsService(ServiceBase, ServesExportStores, ConsumesModelSto
         ensure_celery_tasks_enabled(trans.app.config)
         dataset_collection_instance = self.__get_accessible_collection(trans, id)
         archive_name = f"{dataset_collection_instance.hid}: {dataset_collection_instance.name}"
-        short_term_storage_target = self.short_term_storage_allocator.new_target(
-            filename=archive_name, mime_type="application/x-zip-compressed"
+        short_term_storage_target = self.__new_collection_download_target(
+            trans, archive_name, self.__collection_download_fingerprint(dataset_collection_instance)
         )
+        if short_term_storage_target.reused:
+            return AsyncFile(
+                storage_request_id=short_term_storage_target.request_id,
+                task=reused_target_task_summary(short_term_storage_target),
+            )
         request = PrepareDatasetCollectionDownload(
             short_term_storage_request_id=short_term_storage_target.request_id,
             history_dataset_collection_association_id=dataset_collection_instance.id,
@@ -495,13 +514,51 @@ class HistoriesContentsService(ServiceBase, ServesExportStores, ConsumesModelSto
         result = prepare_dataset_collection_download.delay(
             request=request, task_user_id=getattr(trans.user, "id", None)
         )
-        return AsyncFile(storage_request_id=short_term_storage_target.request_id, task=async_task_summary(result))
+        task_summary = async_task_summary(result)
+        self.short_term_storage_allocator.set_task_summary(short_term_storage_target, task_summary.model_dump())
+        return AsyncFile(storage_request_id=short_term_storage_target.request_id, task=task_summary)
+
+    def __new_collection_download_target(
+        self, trans, archive_name: str, fingerprint: Optional[str]
+    ) -> ShortTermStorageTarget:
+        while True:
+            short_term_storage_target = self.short_term_storage_allocator.new_target(
+                filename=archive_name,
+                mime_type="application/x-zip-compressed",
+                security=ShortTermStorageTargetSecurity(user_id=getattr(trans.user, "id", None)),
+                fingerprint=fingerprint,
+            )
+            if not short_term_storage_target.reused:
+                return short_term_storage_target
+            assert short_term_storage_target.task_summary is not None
+            task_id = UUID(short_term_storage_target.task_summary["id"])
+            # A task finishes after completing or cancelling its target, a target
+            # still pending once its task finished (e.g. the worker died) is never
+            # completed and must not be reused.
+            if not (
+                self.async_tasks_manager.is_ready(task_id)
+                and self.short_term_storage_allocator.invalidate(short_term_storage_target)
+            ):
+                return short_term_storage_target
+
+    def __collection_download_fingerprint(self, dataset_collection_instance) -> Optional[str]:
+        # The archive of a collection whose datasets are all ok only changes
+        # with the collection, identical requests can share it.
+        states, _ = dataset_collection_instance.collection.dataset_states_and_extensions_summary
+        if states != {Dataset.states.OK}:
+            return None
+        collection = dataset_collection_instance.collection
+        return (
+            f"collection_download:{dataset_collection_instance.id}:{dataset_collection_instance.update_time}:"
+            f"{collection.update_time}"
+        )
 
     def __stream_dataset_collection(self, trans, dataset_collection_instance):
         archive = hdcas.stream_dataset_collection(
             dataset_collection_instance=dataset_collection_instance,
             upstream_mod_zip=trans.app.config.upstream_mod_zip,
             upstream_gzip=trans.app.config.upstream_gzip,
+            prefetch_workers=trans.app.config.collection_download_prefetch_workers,
         )
         return archive
 
@@ -576,7 +633,7 @@ class HistoriesContentsService(ServiceBase, ServesExportStores, ConsumesModelSto
             validate_hashes=request.validate_hashes,
             user=trans.async_request_user,
         )
-        results = materialize_task.delay(request=task_request)
+        results = pending_tasks.submit(materialize_task.si(request=task_request))
         return async_task_summary(results)
 
     def update_permissions(
@@ -710,9 +767,14 @@ class HistoriesContentsService(ServiceBase, ServesExportStores, ConsumesModelSto
                 history,
                 filters,
             )
-        errors = self._apply_bulk_operation(contents, payload.operation, payload.params, trans)
+        task_batcher = DatasetTaskBatcher(
+            batch_size=trans.app.config.celery_task_batch_size,
+            queue=trans.app.config.celery_bulk_task_queue,
+        )
+        errors = self._apply_bulk_operation(contents, payload.operation, payload.params, trans, task_batcher)
         with transaction(trans.sa_session):
             trans.sa_session.commit()
+        task_batcher.submit()
         success_count = len(contents) - len(errors)
         return HistoryContentBulkOperationResult(success_count=success_count, errors=errors)
 
@@ -1163,6 +1225,12 @@ class HistoriesContentsService(ServiceBase, ServesExportStores, ConsumesModelSto
                         )
                     if (admin or can_access) and not subfolder.deleted:
                         rval.extend(traverse(subfolder))
+                if not admin:
+                    # resolve access to all datasets of the folder at once
+                    security_agent.dataset_access_map(
+                        current_user_roles,
+                        [ld.library_dataset_dataset_association.dataset_id for ld in folder.datasets],
+                    )
                 for ld in folder.datasets:
                     if not admin:
                         can_access = security_agent.can_access_dataset(
@@ -1340,10 +1408,11 @@ class HistoriesContentsService(ServiceBase, ServesExportStores, ConsumesModelSto
         operation: HistoryContentItemOperation,
         params: Optional[AnyBulkOperationParams],
         trans: ProvidesHistoryContext,
+        task_batcher: DatasetTaskBatcher,
     ) -> List[BulkOperationItemError]:
         errors: List[BulkOperationItemError] = []
         for item in contents:
-            error = self._apply_operation_to_item(operation, item, params, trans)
+            error = self._apply_operation_to_item(operation, item, params, trans, task_batcher)
             if error:
                 errors.append(error)
         return errors
@@ -1354,9 +1423,10 @@ class HistoriesContentsService(ServiceBase, ServesExportStores, ConsumesModelSto
         item: "HistoryItem",
         params: Optional[AnyBulkOperationParams],
         trans: ProvidesHistoryContext,
+        task_batcher: DatasetTaskBatcher,
     ) -> Optional[BulkOperationItemError]:
         try:
-            self.item_operator.apply(operation, item, params, trans)
+            self.item_operator.apply(operation, item, params, trans, task_batcher)
             return None
         except Exception as exc:
             return BulkOperationItemError(
@@ -1388,7 +1458,11 @@ class HistoriesContentsService(ServiceBase, ServesExportStores, ConsumesModelSto
 
 class ItemOperation(Protocol):
     def __call__(
-        self, item: "HistoryItem", params: Optional[AnyBulkOperationParams], trans: ProvidesHistoryContext
+        self,
+        item: "HistoryItem",
+        params: Optional[AnyBulkOperationParams],
+        trans: ProvidesHistoryContext,
+        task_batcher: DatasetTaskBatcher,
     ) -> None: ...
 
 
@@ -1406,17 +1480,23 @@ class HistoryItemOperator:
         self.dataset_collection_manager = dataset_collection_manager
         self.flush = False
         self._operation_map: Dict[HistoryContentItemOperation, ItemOperation] = {
-            HistoryContentItemOperation.hide: lambda item, params, trans: self._hide(item),
-            HistoryContentItemOperation.unhide: lambda item, params, trans: self._unhide(item),
-            HistoryContentItemOperation.delete: lambda item, params, trans: self._delete(item, trans),
-            HistoryContentItemOperation.undelete: lambda item, params, trans: self._undelete(item),
-            HistoryContentItemOperation.purge: lambda item, params, trans: self._purge(item, trans),
-            HistoryContentItemOperation.change_datatype: lambda item, params, trans: self._change_datatype(
-                item, params, trans
+            HistoryContentItemOperation.hide: lambda item, params, trans, tasks: self._hide(item),
+            HistoryContentItemOperation.unhide: lambda item, params, trans, tasks: self._unhide(item),
+            HistoryContentItemOperation.delete: lambda item, params, trans, tasks: self._delete(item, trans),
+            HistoryContentItemOperation.undelete: lambda item, params, trans, tasks: self._undelete(item),
+            HistoryContentItemOperation.purge: lambda item, params, trans, tasks: self._purge(item, trans, tasks),
+            HistoryContentItemOperation.change_datatype: lambda item, params, trans, tasks: self._change_datatype(
+                item, params, trans, tasks
+            ),
+            HistoryContentItemOperation.change_dbkey: lambda item, params, trans, tasks: self._change_dbkey(
+                item, params
+            ),
+            HistoryContentItemOperation.add_tags: lambda item, params, trans, tasks: self._add_tags(
+                trans, item, params
+            ),
+            HistoryContentItemOperation.remove_tags: lambda item, params, trans, tasks: self._remove_tags(
+                trans, item, params
             ),
-            HistoryContentItemOperation.change_dbkey: lambda item, params, trans: self._change_dbkey(item, params),
-            HistoryContentItemOperation.add_tags: lambda item, params, trans: self._add_tags(trans, item, params),
-            HistoryContentItemOperation.remove_tags: lambda item, params, trans: self._remove_tags(trans, item, params),
         }
 
     def apply(
@@ -1425,8 +1505,9 @@ class HistoryItemOperator:
         item: "HistoryItem",
         params: Optional[AnyBulkOperationParams],
         trans: ProvidesHistoryContext,
+        task_batcher: DatasetTaskBatcher,
     ):
-        self._operation_map[operation](item, params, trans)
+        self._operation_map[operation](item, params, trans, task_batcher)
 
     def _get_item_manager(self, item: "HistoryItem"):
         if isinstance(item, HistoryDatasetAssociation):
@@ -1457,46 +1538,50 @@ class HistoryItemOperator:
         # or when the item was purged as undelete will not trigger an update
         item.update()
 
-    def _purge(self, item: "HistoryItem", trans: ProvidesHistoryContext):
+    def _purge(self, item: "HistoryItem", trans: ProvidesHistoryContext, task_batcher: DatasetTaskBatcher):
         if getattr(item, "purged", False):
             # TODO: remove this `update` when we can properly track the operation results to notify the history
             item.update()
             return
         if isinstance(item, HistoryDatasetCollectionAssociation):
             return self.dataset_collection_manager.delete(trans, "history", item.id, recursive=True, purge=True)
-        self.hda_manager.purge(item, flush=True, user=trans.user)
+        self.hda_manager.purge(item, flush=True, user=trans.user, task_batcher=task_batcher)
 
     def _change_datatype(
-        self, item: "HistoryItem", params: ChangeDatatypeOperationParams, trans: ProvidesHistoryContext
+        self,
+        item: "HistoryItem",
+        params: ChangeDatatypeOperationParams,
+        trans: ProvidesHistoryContext,
+        task_batcher: DatasetTaskBatcher,
     ):
+        task_user_id = getattr(trans.user, "id", None)
         if isinstance(item, HistoryDatasetAssociation):
-            wrapped_task = self._change_item_datatype(item, params, trans)
-            with transaction(trans.sa_session):
-                trans.sa_session.commit()
-            if wrapped_task:
-                wrapped_task.delay()
+            if self._change_item_datatype(item, params, trans):
+                task_batcher.add(change_datatype_batch, item.id, datatype=params.datatype, task_user_id=task_user_id)
 
         elif isinstance(item, HistoryDatasetCollectionAssociation):
-            wrapped_tasks = []
+            collection_tasks = DatasetTaskBatcher(batch_size=task_batcher.batch_size, queue=task_batcher.queue)
             for dataset_instance in item.dataset_instances:
-                wrapped_task = self._change_item_datatype(dataset_instance, params, trans)
-                if wrapped_task:
-                    wrapped_tasks.append(wrapped_task)
+                if self._change_item_datatype(dataset_instance, params, trans):
+                    collection_tasks.add(
+                        change_datatype_batch, dataset_instance.id, datatype=params.datatype, task_user_id=task_user_id
+                    )
             with transaction(trans.sa_session):
                 trans.sa_session.commit()
             # chain these for sequential execution. chord would be nice, but requires a non-RPC backend.
-            chain(
-                *wrapped_tasks,
-                touch.si(
-                    item_id=item.id,
-                    model_class="HistoryDatasetCollectionAssociation",
-                    task_user_id=getattr(trans.user, "id", None),
-                ),
-            ).delay()
+            touch_task = touch.si(
+                item_id=item.id,
+                model_class="HistoryDatasetCollectionAssociation",
+                task_user_id=task_user_id,
+            )
+            if task_batcher.queue:
+                touch_task.set(queue=task_batcher.queue)
+            chain(*collection_tasks.signatures(), touch_task).delay()
 
     def _change_item_datatype(
         self, item: HistoryDatasetAssociation, params: ChangeDatatypeOperationParams, trans: ProvidesHistoryContext
-    ):
+    ) -> bool:
+        """Prepare ``item`` for a datatype change, return ``True`` if a task needs to be scheduled."""
         self.hda_manager.ensure_can_change_datatype(item)
         self.hda_manager.ensure_can_set_metadata(item)
         is_deferred = item.has_deferred_data
@@ -1507,10 +1592,8 @@ class HistoryItemOperator:
             else:
                 trans.app.datatypes_registry.change_datatype(item, params.datatype)
             item.state = item.dataset.states.DEFERRED
-        else:
-            return change_datatype.si(
-                dataset_id=item.id, datatype=params.datatype, task_user_id=getattr(trans.user, "id", None)
-            )
+            return False
+        return True
 
     def _change_dbkey(self, item: "HistoryItem", params: ChangeDbkeyOperationParams):
         if isinstance(item, HistoryDatasetAssociation):
@@ -1,11 +1,15 @@
 import logging
-from datetime import timedelta
+from datetime import (
+    datetime,
+    timedelta,
+)
 
 import sqlalchemy as sa
 from markupsafe import escape
 from sqlalchemy import and_
 
 import galaxy.model
+from galaxy.managers.job_metric_rollups import summarize_job_metric_rollups
 from galaxy.util import (
     restore_text,
     unicodify,
@@ -38,6 +42,15 @@ def int_to_octet(size):
         return f"{size * ((no_unit - len(units) + 1) * 1000.0):.0f} {units[-1]}"
 
 
+def int_parameter(kwd, name, default):
+    """Return the non-negative integer value of parameter ``name``, ``default`` if missing or invalid."""
+    try:
+        value = int(kwd.get(name, default))
+    except (TypeError, ValueError):
+        return default
+    return value if value >= 0 else default
+
+
 class Tools(BaseUIController):
     """
     Class defining functions used by reports to make requests to get
@@ -258,6 +271,39 @@ class Tools(BaseUIController):
             sort_by=sort_by,
         )
 
+    @web.expose
+    def tool_resource_usage(self, trans, **kwd):
+        """
+        Fill the template tool_resource_usage.mako with the number of jobs,
+        the mean, median, 95th percentile, maximum and total of a numeric job
+        metric per tool, read from the daily job metric rollups.
+        """
+        plugin = kwd.get("plugin", "core")
+        metric_name = kwd.get("metric_name", "runtime_seconds")
+        days = int_parameter(kwd, "days", 30)
+        user_cutoff = int_parameter(kwd, "user_cutoff", 60)
+        date_range_min = datetime.utcnow().date() - timedelta(days=days) if days else None
+
+        summaries = summarize_job_metric_rollups(
+            trans.sa_session,
+            plugin=plugin,
+            metric_name=metric_name,
+            date_range_min=date_range_min,
+            by_destination=False,
+        )
+        summaries.sort(key=lambda summary: summary["sum"], reverse=True)
+        if user_cutoff:
+            summaries = summaries[:user_cutoff]
+
+        return trans.fill_template(
+            "/webapps/reports/tool_resource_usage.mako",
+            summaries=summaries,
+            plugin=plugin,
+            metric_name=metric_name,
+            days=days,
+            user_cutoff=user_cutoff,
+        )
+
     @web.expose
     def tool_execution_time_per_month(self, trans, **kwd):
         """
@@ -0,0 +1,226 @@
+"""Skip re-evaluating workflow invocations whose inputs did not change.
+
+Every scheduling iteration of a ready invocation rebuilds its
+:class:`galaxy.workflow.run.WorkflowProgress` and walks all of its steps,
+which for large workflows waiting on slow jobs is almost always wasted work.
+When ``enable_incremental_workflow_scheduling`` is set, an iteration that
+ends with steps delayed only because their inputs are not ready records the
+frontier of the invocation: the states of the jobs, datasets, collections
+(with the number of their element datasets in each state) and invocation steps
+the delayed steps were waiting on. The next iteration compares those states
+with the database and only re-evaluates the invocation if one of them changed
+(or ``incremental_workflow_scheduling_full_pass_interval`` seconds passed), so
+an idle iteration costs a few queries proportional to the size of the frontier.
+
+Frontiers are kept in memory by the workflow handler, after a restart every
+invocation is evaluated once to rebuild it.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Iterable,
+    NamedTuple,
+    Optional,
+    Tuple,
+    TYPE_CHECKING,
+)
+
+from sqlalchemy import (
+    func,
+    select,
+)
+from sqlalchemy.orm import (
+    aliased,
+    object_session,
+)
+
+from galaxy import model
+
+if TYPE_CHECKING:
+    from galaxy.model import (
+        DatasetCollection,
+        WorkflowInvocation,
+        WorkflowStep,
+    )
+    from galaxy.model.scoped_session import galaxy_scoped_session
+
+log = logging.getLogger(__name__)
+
+DEFAULT_MAX_SIZE = 10000
+
+# The populated state of a collection and the number of its element datasets in each state.
+CollectionState = Tuple[Optional[str], FrozenSet[Tuple[Optional[str], int]]]
+
+
+class InvocationFrontier(NamedTuple):
+    job_states: Dict[int, Optional[str]]
+    dataset_states: Dict[int, Optional[str]]
+    collection_states: Dict[int, CollectionState]
+    step_actions: Dict[int, Any]
+    recorded_at: float
+
+    @property
+    def size(self) -> int:
+        return len(self.job_states) + len(self.dataset_states) + len(self.collection_states) + len(self.step_actions)
+
+
+def build_frontier(
+    workflow_invocation: "WorkflowInvocation",
+    delayed_steps: Iterable["WorkflowStep"],
+    outputs: Dict[int, Any],
+) -> InvocationFrontier:
+    """Collect what ``delayed_steps`` wait on from the objects loaded while evaluating them.
+
+    Only the states of collections are queried again, to count the states of their elements.
+    """
+    job_states: Dict[int, Optional[str]] = {}
+    dataset_states: Dict[int, Optional[str]] = {}
+    collections: Dict[int, DatasetCollection] = {}
+    step_actions: Dict[int, Any] = {}
+    step_invocations_by_step_id = workflow_invocation.step_invocations_by_step_id()
+    for step in delayed_steps:
+        invocation_step = step_invocations_by_step_id.get(step.id)
+        if invocation_step is not None and invocation_step.id is not None:
+            step_actions[invocation_step.id] = invocation_step.action
+        for connection in step.input_connections:
+            output_step_id = connection.output_step.id
+            upstream_invocation_step = step_invocations_by_step_id.get(output_step_id)
+            if upstream_invocation_step is not None and upstream_invocation_step.id is not None:
+                # e.g. a pause step waiting for review
+                step_actions[upstream_invocation_step.id] = upstream_invocation_step.action
+            if connection.non_data_connection:
+                if upstream_invocation_step is not None:
+                    for job in upstream_invocation_step.jobs:
+                        if job.id is not None:
+                            job_states[job.id] = job.state
+                continue
+            step_outputs = outputs.get(output_step_id)
+            if not isinstance(step_outputs, dict):
+                continue
+            replacement = step_outputs.get(connection.output_name)
+            if isinstance(replacement, model.HistoryDatasetAssociation):
+                dataset_states[replacement.dataset.id] = replacement.dataset.state
+            elif isinstance(replacement, model.HistoryDatasetCollectionAssociation):
+                collection = replacement.collection
+                if collection.id is not None:
+                    collections[collection.id] = collection
+    collection_states: Dict[int, CollectionState] = {}
+    if collections:
+        session = object_session(next(iter(collections.values())))
+        if session is not None:
+            collection_states = _collection_states(session, collections)
+    return InvocationFrontier(job_states, dataset_states, collection_states, step_actions, time.monotonic())
+
+
+def _collection_states(session: "galaxy_scoped_session", ids: Iterable[int]) -> Dict[int, CollectionState]:
+    """Return the populated state and element dataset state counts of the collections with ``ids``.
+
+    Steps may also wait on the states of the element datasets, e.g. tools
+    requiring terminal states or pending inputs. These are counted in the
+    database for all (nested) elements, so the frontier of a collection has
+    the same size however many elements it has.
+    """
+    ids = list(ids)
+    if not ids:
+        return {}
+    populated_states = dict(
+        session.execute(
+            select(model.DatasetCollection.id, model.DatasetCollection.populated_state).where(
+                model.DatasetCollection.id.in_(ids)
+            )
+        ).all()
+    )
+    dce = model.DatasetCollectionElement
+    element_tree = (
+        select(dce.dataset_collection_id.label("root_id"), dce.child_collection_id, dce.hda_id, dce.ldda_id)
+        .where(dce.dataset_collection_id.in_(ids))
+        .cte(name="element_tree", recursive=True)
+    )
+    parent = aliased(element_tree, name="parent")
+    child = aliased(dce, name="child")
+    element_tree = element_tree.union_all(
+        select(parent.c.root_id, child.child_collection_id, child.hda_id, child.ldda_id).where(
+            child.dataset_collection_id == parent.c.child_collection_id
+        )
+    )
+    hda = model.HistoryDatasetAssociation
+    ldda = model.LibraryDatasetDatasetAssociation
+    stmt = (
+        select(element_tree.c.root_id, model.Dataset.state, func.count())
+        .outerjoin(hda, hda.id == element_tree.c.hda_id)
+        .outerjoin(ldda, ldda.id == element_tree.c.ldda_id)
+        .join(model.Dataset, model.Dataset.id == func.coalesce(hda.dataset_id, ldda.dataset_id))
+        .group_by(element_tree.c.root_id, model.Dataset.state)
+    )
+    state_counts: Dict[int, set] = {id: set() for id in populated_states}
+    for root_id, state, count in session.execute(stmt):
+        state_counts[root_id].add((state, count))
+    return {id: (populated_state, frozenset(state_counts[id])) for id, populated_state in populated_states.items()}
+
+
+def _current_values(session: "galaxy_scoped_session", id_column, value_column, ids: Iterable[int]) -> Dict[int, Any]:
+    ids = list(ids)
+    if not ids:
+        return {}
+    return dict(session.execute(select(id_column, value_column).where(id_column.in_(ids))).all())
+
+
+def frontier_changed(session: "galaxy_scoped_session", frontier: InvocationFrontier) -> bool:
+    return (
+        _current_values(session, model.Job.id, model.Job.state, frontier.job_states) != frontier.job_states
+        or _current_values(session, model.Dataset.id, model.Dataset.state, frontier.dataset_states)
+        != frontier.dataset_states
+        or _collection_states(session, frontier.collection_states) != frontier.collection_states
+        or _current_values(
+            session, model.WorkflowInvocationStep.id, model.WorkflowInvocationStep.action, frontier.step_actions
+        )
+        != frontier.step_actions
+    )
+
+
+class InvocationFrontierCache:
+    """Frontiers of delayed invocations scheduled by this process, keyed by invocation id."""
+
+    def __init__(self, full_pass_interval: float = 300, max_size: int = DEFAULT_MAX_SIZE):
+        self.full_pass_interval = full_pass_interval
+        self.max_size = max_size
+        self._frontiers: OrderedDict[int, InvocationFrontier] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._frontiers)
+
+    def record(self, invocation_id: int, frontier: InvocationFrontier) -> None:
+        with self._lock:
+            self._frontiers[invocation_id] = frontier
+            self._frontiers.move_to_end(invocation_id)
+            while len(self._frontiers) > self.max_size:
+                self._frontiers.popitem(last=False)
+
+    def discard(self, invocation_id: Optional[int]) -> None:
+        with self._lock:
+            self._frontiers.pop(invocation_id, None)
+
+    def unchanged(self, session: "galaxy_scoped_session", invocation_id: Optional[int]) -> bool:
+        """Return ``True`` if the recorded frontier of the invocation is still current.
+
+        A frontier that changed or is older than ``full_pass_interval`` is
+        dropped, the caller is expected to evaluate the invocation and record
+        a new one.
+        """
+        with self._lock:
+            frontier = self._frontiers.get(invocation_id)
+        if frontier is None:
+            return False
+        if time.monotonic() - frontier.recorded_at < self.full_pass_interval and not frontier_changed(
+            session, frontier
+        ):
+            return True
+        self.discard(invocation_id)
+        return False
@@ -1,4 +1,5 @@
 import logging
+import time
 import uuid
 from typing import (
     Any,
@@ -40,6 +41,10 @@ from galaxy.tools.parameters.basic import raw_to_galaxy
 from galaxy.tools.parameters.wrapped import nested_key_to_path
 from galaxy.util import ExecutionTimer
 from galaxy.workflow import modules
+from galaxy.workflow.invocation_frontier import (
+    build_frontier,
+    InvocationFrontierCache,
+)
 from galaxy.workflow.run_request import (
     workflow_request_to_run_config,
     workflow_run_config_to_request,
@@ -184,7 +189,17 @@ class WorkflowInvoker:
         self.workflow_invocation = workflow_invocation
 
         module_injector = modules.WorkflowModuleInjector(trans)
+        # Only top level invocations are tracked, subworkflow invocations are
+        # evaluated as part of the parent invocation's steps.
+        self.frontier_cache: Optional[InvocationFrontierCache] = None
         if progress is None:
+            self.frontier_cache = getattr(
+                getattr(trans.app, "workflow_scheduling_manager", None), "invocation_frontiers", None
+            )
+            scheduling_deadline = None
+            maximum_scheduling_time = getattr(trans.app.config, "maximum_workflow_scheduling_time_per_iteration", -1)
+            if maximum_scheduling_time > 0:
+                scheduling_deadline = time.monotonic() + maximum_scheduling_time
             progress = WorkflowProgress(
                 self.workflow_invocation,
                 workflow_run_config.inputs,
@@ -196,6 +211,7 @@ class WorkflowInvoker:
                 copy_inputs_to_history=workflow_run_config.copy_inputs_to_history,
                 use_cached_job=workflow_run_config.use_cached_job,
                 replacement_dict=workflow_run_config.replacement_dict,
+                scheduling_deadline=scheduling_deadline,
             )
         self.progress = progress
 
@@ -222,14 +238,27 @@ class WorkflowInvoker:
                 )
             )
 
+        frontier_cache = self.frontier_cache
+        if frontier_cache is not None and frontier_cache.unchanged(self.trans.sa_session, workflow_invocation.id):
+            log.debug(f"Inputs of delayed steps of workflow invocation [{workflow_invocation.id}] unchanged, skipping")
+            return self.progress.outputs
+
         remaining_steps = self.progress.remaining_steps()
         delayed_steps = False
+        partially_scheduled = False
+        steps_waiting_for_inputs: List[WorkflowStep] = []
         max_jobs_per_iteration_reached = False
         for step, workflow_invocation_step in remaining_steps:
             max_jobs_to_schedule = self.progress.maximum_jobs_to_schedule_or_none
             if max_jobs_to_schedule is not None and max_jobs_to_schedule <= 0:
                 max_jobs_per_iteration_reached = True
                 break
+            if self.progress.scheduling_time_exhausted:
+                log.debug(
+                    f"Workflow invocation [{workflow_invocation.id}] exhausted its scheduling time for this iteration"
+                )
+                max_jobs_per_iteration_reached = True
+                break
             step_delayed = False
             step_timer = ExecutionTimer()
             try:
@@ -248,13 +277,14 @@ class WorkflowInvoker:
                 assert workflow_invocation_step
                 incomplete_or_none = self._invoke_step(workflow_invocation_step)
                 if incomplete_or_none is False:
-                    step_delayed = delayed_steps = True
+                    step_delayed = delayed_steps = partially_scheduled = True
                     workflow_invocation_step.state = "ready"
                     self.progress.mark_step_outputs_delayed(step, why="Not all jobs scheduled for state.")
                 else:
                     workflow_invocation_step.state = "scheduled"
             except modules.DelayedWorkflowEvaluation as de:
                 step_delayed = delayed_steps = True
+                steps_waiting_for_inputs.append(step)
                 self.progress.mark_step_outputs_delayed(step, why=de.why)
             except Exception as e:
                 log_function = log.exception
@@ -285,6 +315,19 @@ class WorkflowInvoker:
             state = model.WorkflowInvocation.states.SCHEDULED
         workflow_invocation.set_state(state)
 
+        if frontier_cache is not None:
+            if (
+                steps_waiting_for_inputs
+                and not partially_scheduled
+                and not max_jobs_per_iteration_reached
+                and not any(step.type == "subworkflow" for step in steps_waiting_for_inputs)
+            ):
+                frontier = build_frontier(workflow_invocation, steps_waiting_for_inputs, self.progress.outputs)
+                if frontier.size:
+                    frontier_cache.record(workflow_invocation.id, frontier)
+            else:
+                frontier_cache.discard(workflow_invocation.id)
+
         # All jobs ran successfully, so we can save now
         self.trans.sa_session.add(workflow_invocation)
 
@@ -372,6 +415,7 @@ class WorkflowProgress:
         replacement_dict: Optional[Dict[str, str]] = None,
         subworkflow_collection_info=None,
         when_values=None,
+        scheduling_deadline: Optional[float] = None,
     ) -> None:
         self.outputs: Dict[int, Any] = {}
         self.module_injector = module_injector
@@ -380,6 +424,9 @@ class WorkflowProgress:
         self.param_map = param_map
         self.jobs_per_scheduling_iteration = jobs_per_scheduling_iteration
         self.jobs_scheduled_this_iteration = 0
+        # time.monotonic() value after which no further steps should be
+        # scheduled in this scheduling iteration
+        self.scheduling_deadline = scheduling_deadline
         self.copy_inputs_to_history = copy_inputs_to_history
         self.use_cached_job = use_cached_job
         self.replacement_dict = replacement_dict or {}
@@ -395,6 +442,10 @@ class WorkflowProgress:
         else:
             return None
 
+    @property
+    def scheduling_time_exhausted(self) -> bool:
+        return self.scheduling_deadline is not None and time.monotonic() >= self.scheduling_deadline
+
     def record_executed_job_count(self, job_count: int) -> None:
         self.jobs_scheduled_this_iteration += job_count
 
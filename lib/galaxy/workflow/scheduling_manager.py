@@ -1,6 +1,16 @@
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from functools import partial
-from typing import Optional
+from itertools import zip_longest
+from typing import (
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 import galaxy.workflow.schedulers
 from galaxy import model
@@ -23,6 +33,7 @@ from galaxy.util.monitors import Monitors
 from galaxy.util.xml_macros import load
 from galaxy.web_stack.handlers import ConfiguresHandlers
 from galaxy.web_stack.message import WorkflowSchedulingMessage
+from galaxy.workflow.invocation_frontier import InvocationFrontierCache
 
 log = get_logger(__name__)
 
@@ -40,6 +51,41 @@ EXCEPTION_MESSAGE_DUPLICATE_SCHEDULERS = (
 EXCEPTION_MESSAGE_SERIALIZE = "Parallelization is not desired but handler assignment methods are non-deterministic. Set DB_PREASSIGN in workflow_schedulers_conf.xml."
 
 
+def round_robin_invocation_order(
+    invocations: Sequence[Tuple[int, Optional[int]]], user_last_served: Dict[Optional[int], int]
+) -> List[int]:
+    """Interleave the invocations of different users.
+
+    ``invocations`` are ``(invocation_id, user_id)`` pairs, oldest first. Each
+    round takes the oldest remaining invocation of every user, users whose
+    invocations were least recently attempted according to
+    ``user_last_served`` come first.
+    """
+    invocation_ids_by_user: Dict[Optional[int], List[int]] = {}
+    for invocation_id, user_id in invocations:
+        invocation_ids_by_user.setdefault(user_id, []).append(invocation_id)
+    # sorted is stable, users never served keep the order of their oldest invocation
+    users = sorted(invocation_ids_by_user, key=lambda user_id: user_last_served.get(user_id, -1))
+    ordered = []
+    for round_ids in zip_longest(*(invocation_ids_by_user[user_id] for user_id in users)):
+        ordered.extend(invocation_id for invocation_id in round_ids if invocation_id is not None)
+    return ordered
+
+
+def shard_invocation_order(
+    invocation_ids: Sequence[int], shard_keys: Dict[int, int], shard_count: int
+) -> List[List[int]]:
+    """Split ``invocation_ids`` into ``shard_count`` lists by ``shard_keys[invocation_id] % shard_count``.
+
+    Invocations with the same key always end up in the same shard, each shard
+    keeps the relative order of ``invocation_ids``.
+    """
+    shards: List[List[int]] = [[] for _ in range(shard_count)]
+    for invocation_id in invocation_ids:
+        shards[shard_keys[invocation_id] % shard_count].append(invocation_id)
+    return shards
+
+
 class WorkflowSchedulingManager(ConfiguresHandlers):
     """A workflow scheduling manager based loosely on pattern established by
     ``galaxy.manager.JobManager``. Only schedules workflows on handler
@@ -56,6 +102,7 @@ class WorkflowSchedulingManager(ConfiguresHandlers):
         # Passive workflow schedulers won't need to be monitored I guess.
 
         self.request_monitor = None
+        self.invocation_frontiers: Optional[InvocationFrontierCache] = None
 
         self.handlers = {}
         self.handler_assignment_methods_configured = False
@@ -68,6 +115,10 @@ class WorkflowSchedulingManager(ConfiguresHandlers):
 
         if self._is_workflow_handler():
             log.debug("Starting workflow schedulers")
+            if app.config.enable_incremental_workflow_scheduling:
+                self.invocation_frontiers = InvocationFrontierCache(
+                    full_pass_interval=app.config.incremental_workflow_scheduling_full_pass_interval
+                )
             self.__start_schedulers()
             if self.active_workflow_schedulers:
                 self.__start_request_monitor()
@@ -308,6 +359,22 @@ class WorkflowRequestMonitor(Monitors):
                 self_handler_tags=self_handler_tags,
                 handler_tags=self_handler_tags,
             )
+        # When each user's invocations were last attempted (a counter
+        # increasing with every attempt) and when each active invocation's
+        # last attempt finished, by scheduler id.
+        self._user_last_served: Dict[Optional[int], int] = {}
+        self._attempt_count = 0
+        self._last_attempt_finished: Dict[str, Dict[int, datetime]] = {}
+        self._attempt_lock = threading.Lock()
+        # With more than one worker, invocations are scheduled by single
+        # threaded executors so a history (or invocation) is always handled by
+        # the same thread, each with its own thread local database session.
+        self._workers: List[ThreadPoolExecutor] = []
+        if app.config.workflow_scheduling_workers > 1:
+            self._workers = [
+                ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"WorkflowRequestMonitor.worker_{i}")
+                for i in range(app.config.workflow_scheduling_workers)
+            ]
 
     def __monitor(self):
         to_monitor = self.workflow_scheduling_manager.active_workflow_schedulers
@@ -331,13 +398,70 @@ class WorkflowRequestMonitor(Monitors):
             self._monitor_sleep(self.app.config.workflow_monitor_sleep)
 
     def __schedule(self, workflow_scheduler_id, workflow_scheduler):
-        invocation_ids = self.__active_invocation_ids(workflow_scheduler_id)
+        active_invocations = self.__active_invocations(workflow_scheduler_id)
+        user_ids = {invocation_id: user_id for invocation_id, user_id, _, _ in active_invocations}
+        create_times = {invocation_id: create_time for invocation_id, _, create_time, _ in active_invocations}
+        if self.app.config.workflow_scheduling_order == "round_robin":
+            invocation_ids = round_robin_invocation_order(
+                [(invocation_id, user_id) for invocation_id, user_id, _, _ in active_invocations],
+                self._user_last_served,
+            )
+        else:
+            invocation_ids = [invocation_id for invocation_id, _, _, _ in active_invocations]
+        last_attempt_finished = self._last_attempt_finished.get(workflow_scheduler_id, {})
+        attempt_finished: Dict[int, datetime] = {}
+        self._last_attempt_finished[workflow_scheduler_id] = attempt_finished
+        schedule_invocations = partial(
+            self.__schedule_invocations,
+            workflow_scheduler,
+            user_ids=user_ids,
+            create_times=create_times,
+            last_attempt_finished=last_attempt_finished,
+            attempt_finished=attempt_finished,
+        )
+        if not self._workers:
+            schedule_invocations(invocation_ids)
+            return
+        if self.app.config.parallelize_workflow_scheduling_within_histories:
+            shard_keys = {invocation_id: invocation_id for invocation_id in invocation_ids}
+        else:
+            shard_keys = {invocation_id: history_id for invocation_id, _, _, history_id in active_invocations}
+        shards = shard_invocation_order(invocation_ids, shard_keys, len(self._workers))
+        futures = [worker.submit(schedule_invocations, shard) for worker, shard in zip(self._workers, shards) if shard]
+        for future in futures:
+            future.result()
+
+    def __schedule_invocations(
+        self, workflow_scheduler, invocation_ids, user_ids, create_times, last_attempt_finished, attempt_finished
+    ):
         for invocation_id in invocation_ids:
             log.debug("Attempting to schedule workflow invocation [%s]", invocation_id)
+            waiting_since = last_attempt_finished.get(invocation_id) or create_times[invocation_id]
+            if waiting_since is not None:
+                self.__record_queue_wait(invocation_id, waiting_since)
+            schedule_timer = self.app.execution_timer_factory.get_timer(
+                "internal.galaxy.workflows.scheduling_manager.schedule_invocation",
+                "Workflow invocation [${invocation_id}] scheduling attempt complete.",
+            )
             self.__attempt_schedule(invocation_id, workflow_scheduler)
+            log.debug(schedule_timer.to_str(invocation_id=invocation_id))
+            with self._attempt_lock:
+                attempt_finished[invocation_id] = datetime.utcnow()
+                self._attempt_count += 1
+                self._user_last_served[user_ids[invocation_id]] = self._attempt_count
             if not self.monitor_running:
                 return
 
+    def __record_queue_wait(self, invocation_id, waiting_since):
+        # Time since the invocation was created or since the end of its
+        # previous scheduling attempt.
+        queue_wait = (datetime.utcnow() - waiting_since).total_seconds()
+        log.debug("Workflow invocation [%s] waited %0.3f seconds to be scheduled", invocation_id, queue_wait)
+        if statsd_client := self.app.execution_timer_factory.galaxy_statsd_client:
+            statsd_client.timing(
+                "internal.galaxy.workflows.scheduling_manager.invocation_queue_wait", queue_wait * 1000.0
+            )
+
     def __attempt_materialize(self, workflow_invocation, session) -> bool:
         try:
             inputs_to_materialize = workflow_invocation.inputs_requiring_materialization()
@@ -414,9 +538,9 @@ class WorkflowRequestMonitor(Monitors):
         # A workflow was obtained and scheduled...
         return True
 
-    def __active_invocation_ids(self, scheduler_id):
+    def __active_invocations(self, scheduler_id):
         handler = self.app.config.server_name
-        return model.WorkflowInvocation.poll_active_workflow_ids(
+        return model.WorkflowInvocation.poll_active_workflows(
             self.app.model.engine,
             scheduler=scheduler_id,
             handler=handler,
@@ -427,3 +551,5 @@ class WorkflowRequestMonitor(Monitors):
 
     def shutdown(self):
         self.shutdown_monitor()
+        for worker in self._workers:
+            worker.shutdown(wait=False)
@@ -1,4 +1,5 @@
 import os
+import time
 
 from galaxy_test.base.populators import WorkflowPopulator
 from ._framework import PerformanceTestCase
@@ -15,6 +16,10 @@ GALAXY_TEST_PERFORMANCE_WORKFLOW_DEPTH_DEFAULT = 3
 GALAXY_TEST_PERFORMANCE_WORKFLOW_DEPTH = int(
     os.environ.get("GALAXY_TEST_PERFORMANCE_WORKFLOW_DEPTH", GALAXY_TEST_PERFORMANCE_WORKFLOW_DEPTH_DEFAULT)
 )
+GALAXY_TEST_PERFORMANCE_INVOCATIONS_DEFAULT = 8
+GALAXY_TEST_PERFORMANCE_INVOCATIONS = int(
+    os.environ.get("GALAXY_TEST_PERFORMANCE_INVOCATIONS", GALAXY_TEST_PERFORMANCE_INVOCATIONS_DEFAULT)
+)
 
 
 class TestWorkflowFrameworkPerformance(PerformanceTestCase):
@@ -33,6 +38,29 @@ class TestWorkflowFrameworkPerformance(PerformanceTestCase):
     def test_run_two_output(self):
         self._run_performance_workflow("two_output")
 
+    def test_run_concurrent_invocations(self):
+        # Compare the reported time with different values of
+        # GALAXY_CONFIG_OVERRIDE_WORKFLOW_SCHEDULING_WORKERS.
+        workflow_yaml = self.workflow_populator.scaling_workflow_yaml(
+            workflow_type="simple",
+            collection_size=GALAXY_TEST_PERFORMANCE_COLLECTION_SIZE,
+            workflow_depth=GALAXY_TEST_PERFORMANCE_WORKFLOW_DEPTH,
+        )
+        start = time.time()
+        run_summaries = [
+            self.workflow_populator.run_workflow(workflow_yaml, test_data={}, wait=False)
+            for _ in range(GALAXY_TEST_PERFORMANCE_INVOCATIONS)
+        ]
+        for run_summary in run_summaries:
+            self.workflow_populator.wait_for_workflow(
+                run_summary.workflow_id,
+                run_summary.invocation_id,
+                run_summary.history_id,
+                assert_ok=True,
+                timeout=GALAXY_TEST_PERFORMANCE_TIMEOUT,
+            )
+        print(f"Ran {len(run_summaries)} concurrent workflow invocations in {time.time() - start:.1f} seconds")
+
     def _run_performance_workflow(self, workflow_type):
         workflow_yaml = self.workflow_populator.scaling_workflow_yaml(
             workflow_type=workflow_type,
@@ -1,10 +1,18 @@
+import copy
 import logging
+import os
 import tempfile
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from time import strftime
 from typing import (
     Any,
     Dict,
     List,
     Optional,
+    Set,
+    Tuple,
 )
 
 from sqlalchemy import (
@@ -13,13 +21,18 @@ from sqlalchemy import (
 )
 
 from galaxy import util
-from galaxy.model.base import transaction
+from galaxy.exceptions import RequestParameterInvalidException
+from galaxy.model.base import (
+    REQUEST_ID,
+    transaction,
+)
 from galaxy.tool_shed.metadata.metadata_generator import (
     BaseMetadataGenerator,
     HandleResultT,
     InvalidFileT,
 )
 from galaxy.util import inflector
+from galaxy.util.path import safe_contains
 from galaxy.web.form_builder import SelectField
 from tool_shed.context import ProvidesRepositoriesContext
 from tool_shed.repository_types import util as rt_util
@@ -804,18 +817,39 @@ class RepositoryMetadataManager(ToolShedMetadataGenerator):
         metadata_dict = None
         ancestor_changeset_revision = None
         ancestor_metadata_dict = None
+        # Metadata only depends on the files of a changeset revision, so revisions with the same manifest
+        # (backouts, reverts, merges taking one side) reuse the metadata generated for the first of them
+        # instead of cloning the repository again.  Maps manifest nodes to the generated metadata_dict and
+        # the invalid_file_tups added while generating it.
+        generated_metadata: Dict[bytes, Tuple[Dict[str, Any], List[InvalidFileT]]] = {}
         for changeset in self.repository.get_changesets_for_setting_metadata(self.app):
-            work_dir = tempfile.mkdtemp(prefix="tmp-toolshed-ramorits")
+            work_dir = None
             ctx = repo[changeset]
-            log.debug("Cloning repository changeset revision: %s", str(ctx.rev()))
-            assert self.repository_clone_url
-            repository_clone_url = repository_clone_url or self.repository_clone_url
-            cloned_ok, error_message = hg_util.clone_repository(repository_clone_url, work_dir, str(ctx.rev()))
-            if cloned_ok:
-                log.debug("Generating metadata for changeset revision: %s", str(ctx.rev()))
+            manifest_node = ctx.manifestnode()
+            if manifest_node in generated_metadata:
+                log.debug("Reusing metadata generated for the manifest of changeset revision: %s", str(ctx.rev()))
+                metadata_dict, invalid_file_tups = generated_metadata[manifest_node]
                 self.set_changeset_revision(str(ctx))
-                self.set_repository_files_dir(work_dir)
-                self.generate_metadata_for_changeset_revision()
+                self.metadata_dict = copy.deepcopy(metadata_dict)
+                self.invalid_file_tups.extend(invalid_file_tups)
+                generated_ok = True
+            else:
+                work_dir = tempfile.mkdtemp(prefix="tmp-toolshed-ramorits")
+                log.debug("Cloning repository changeset revision: %s", str(ctx.rev()))
+                assert self.repository_clone_url
+                repository_clone_url = repository_clone_url or self.repository_clone_url
+                generated_ok, error_message = hg_util.clone_repository(repository_clone_url, work_dir, str(ctx.rev()))
+                if generated_ok:
+                    log.debug("Generating metadata for changeset revision: %s", str(ctx.rev()))
+                    self.set_changeset_revision(str(ctx))
+                    self.set_repository_files_dir(work_dir)
+                    invalid_file_tups_count = len(self.invalid_file_tups)
+                    self.generate_metadata_for_changeset_revision()
+                    generated_metadata[manifest_node] = (
+                        copy.deepcopy(self.metadata_dict),
+                        self.invalid_file_tups[invalid_file_tups_count:],
+                    )
+            if generated_ok:
                 if self.metadata_dict:
                     if metadata_changeset_revision is None and metadata_dict is None:
                         # We're at the first change set in the change log.
@@ -863,7 +897,8 @@ class RepositoryMetadataManager(ToolShedMetadataGenerator):
                         changeset_revisions.append(metadata_changeset_revision)
                         ancestor_changeset_revision = None
                         ancestor_metadata_dict = None
-            basic_util.remove_dir(work_dir)
+            if work_dir:
+                basic_util.remove_dir(work_dir)
         # Delete all repository_metadata records for this repository that do not have a changeset_revision
         # value in changeset_revisions.
         self._clean_repository_metadata(changeset_revisions)
@@ -919,30 +954,10 @@ class RepositoryMetadataManager(ToolShedMetadataGenerator):
         message = ""
         status = "done"
         if repository_ids := util.listify(kwd.get("repository_ids", None)):
-            successful_count = 0
-            unsuccessful_count = 0
-            for repository_id in repository_ids:
-                try:
-                    repository = repository_util.get_repository_in_tool_shed(self.app, repository_id)
-                    self.set_repository(repository)
-                    self.resetting_all_metadata_on_repository = True
-                    self.reset_all_metadata_on_repository_in_tool_shed()
-                    if self.invalid_file_tups:
-                        message = tool_util.generate_message_for_invalid_tools(
-                            self.app, self.invalid_file_tups, repository, None, as_html=False
-                        )
-                        log.debug(message)
-                        unsuccessful_count += 1
-                    else:
-                        log.debug(
-                            "Successfully reset metadata on repository %s owned by %s",
-                            repository.name,
-                            repository.user.username,
-                        )
-                        successful_count += 1
-                except Exception:
-                    log.exception("Error attempting to reset metadata on repository %s", str(repository.name))
-                    unsuccessful_count += 1
+            resetter = RepositoryMetadataResetter(self.trans, workers=self.app.config.reset_metadata_workers)
+            progress = resetter.reset(repository_ids)
+            successful_count = progress.successful_count
+            unsuccessful_count = progress.unsuccessful_count
             message = "Successfully reset metadata on %d %s.  " % (
                 successful_count,
                 inflector.cond_plural(successful_count, "repository"),
@@ -1048,6 +1063,7 @@ class RepositoryMetadataManager(ToolShedMetadataGenerator):
                 self.app, self.invalid_file_tups, self.repository, self.metadata_dict
             )
             status = "error"
+        self.app.repository_indexer.index_repository(repository_id)
         return message, status
 
     def set_repository_metadata_due_to_new_tip(self, host, content_alert_str=None, **kwd):
@@ -1056,6 +1072,217 @@ class RepositoryMetadataManager(ToolShedMetadataGenerator):
         return status, error_message
 
 
+class MetadataResetProgress:
+    """Progress of resetting all metadata on a set of repositories, updated from the resetting threads."""
+
+    def __init__(self, total: int):
+        self.total = total
+        self.start_time = strftime("%Y-%m-%d %H:%M:%S")
+        self.stop_time: Optional[str] = None
+        self.successful_count = 0
+        self.unsuccessful_count = 0
+        self.skipped_count = 0
+        self.repository_status: List[str] = []
+        self._running: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def skipped(self, count: int) -> None:
+        with self._lock:
+            self.skipped_count += count
+
+    def started(self, repository_id: str, name: str) -> None:
+        with self._lock:
+            self._running[repository_id] = name
+
+    def finished(self, repository_id: str, status: str, successful: bool) -> None:
+        with self._lock:
+            self._running.pop(repository_id, None)
+            self.repository_status.append(status)
+            if successful:
+                self.successful_count += 1
+            else:
+                self.unsuccessful_count += 1
+
+    def stopped(self) -> None:
+        self.stop_time = strftime("%Y-%m-%d %H:%M:%S")
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(
+                start_time=self.start_time,
+                stop_time=self.stop_time,
+                total=self.total,
+                successful_count=self.successful_count,
+                unsuccessful_count=self.unsuccessful_count,
+                skipped_count=self.skipped_count,
+                running=sorted(self._running.values()),
+                repository_status=list(self.repository_status),
+            )
+
+
+# Metadata resets currently running in this process, reported by metadata_reset_progress().
+_running_resets: List[MetadataResetProgress] = []
+_running_resets_lock = threading.Lock()
+
+
+def metadata_reset_progress() -> List[Dict[str, Any]]:
+    """Return the progress of all metadata resets currently running in this process."""
+    with _running_resets_lock:
+        return [progress.to_dict() for progress in _running_resets]
+
+
+def read_checkpoint_file(path: Optional[str]) -> Set[str]:
+    """Return the encoded repository ids listed in ``path``, one per line, ignoring comments."""
+    if not path or not os.path.exists(path):
+        return set()
+    with open(path) as f:
+        return {line.strip() for line in f if line.strip() and not line.startswith("#")}
+
+
+def resolve_checkpoint_file(checkpoint_dir: str, name: str) -> str:
+    """Return the path of the checkpoint file ``name`` in ``checkpoint_dir``.
+
+    Only plain relative names are accepted, absolute paths and paths referencing a parent
+    directory are rejected so clients can't write outside ``checkpoint_dir``.
+    """
+    if not name or os.path.isabs(name) or os.pardir in name.replace("\\", "/").split("/"):
+        raise RequestParameterInvalidException(f"Invalid checkpoint file name [{name}].")
+    path = os.path.join(checkpoint_dir, name)
+    if not safe_contains(checkpoint_dir, path):
+        raise RequestParameterInvalidException(f"Invalid checkpoint file name [{name}].")
+    return path
+
+
+class _ResetMetadataContext(ProvidesRepositoriesContext):
+    """The repositories context of a thread resetting metadata, loading the user with the thread's session."""
+
+    def __init__(self, app: ToolShedApp, user_id: Optional[int], repositories_hostname: str):
+        self._app = app
+        self._user = app.model.context.get(User, user_id) if user_id is not None else None
+        self._repositories_hostname = repositories_hostname
+
+    @property
+    def app(self) -> ToolShedApp:
+        return self._app
+
+    @property
+    def user(self) -> Optional[User]:
+        return self._user
+
+    @property
+    def repositories_hostname(self) -> str:
+        return self._repositories_hostname
+
+
+class RepositoryMetadataResetter:
+    """Reset all metadata on many repositories in the tool shed, ``workers`` repositories at a time.
+
+    Repositories of type tool_dependency_definition are reset before all other repositories, since other
+    repositories may depend on them.  With more than one worker each repository is reset in its own
+    database session scope with its own RepositoryMetadataManager.  If ``checkpoint_file`` is set, the
+    encoded ids of the repositories reset successfully are appended to it and repositories already listed
+    in it are skipped, so an interrupted reset continues where it stopped when run again with the same file.
+    """
+
+    def __init__(self, trans: ProvidesRepositoriesContext, workers: int = 1, checkpoint_file: Optional[str] = None):
+        self.trans = trans
+        self.app = trans.app
+        self.workers = workers
+        self.checkpoint_file = checkpoint_file
+        self._checkpoint_lock = threading.Lock()
+
+    def reset(self, repository_ids: List[str]) -> MetadataResetProgress:
+        """Reset all metadata on the repositories with the encoded ``repository_ids``."""
+        completed = read_checkpoint_file(self.checkpoint_file)
+        pending = [repository_id for repository_id in repository_ids if repository_id not in completed]
+        progress = MetadataResetProgress(len(repository_ids))
+        progress.skipped(len(repository_ids) - len(pending))
+        repositories = [repository_util.get_repository_in_tool_shed(self.app, id) for id in pending]
+        tool_dependency_definition_ids = [
+            id for id, repository in zip(pending, repositories) if repository.type == rt_util.TOOL_DEPENDENCY_DEFINITION
+        ]
+        other_ids = [id for id in pending if id not in tool_dependency_definition_ids]
+        user_id = self.trans.user.id if self.trans.user else None
+        repositories_hostname = self.trans.repositories_hostname
+        with _running_resets_lock:
+            _running_resets.append(progress)
+        try:
+            for ids in (tool_dependency_definition_ids, other_ids):
+                if self.workers <= 1 or len(ids) <= 1:
+                    for id in ids:
+                        self._reset_repository(self.trans, id, progress)
+                else:
+                    with ThreadPoolExecutor(
+                        max_workers=min(self.workers, len(ids)), thread_name_prefix="reset_metadata"
+                    ) as executor:
+                        list(
+                            executor.map(
+                                lambda id: self._reset_repository_in_thread(
+                                    user_id, repositories_hostname, id, progress
+                                ),
+                                ids,
+                            )
+                        )
+        finally:
+            progress.stopped()
+            with _running_resets_lock:
+                _running_resets.remove(progress)
+        return progress
+
+    def _reset_repository_in_thread(
+        self, user_id: Optional[int], repositories_hostname: str, repository_id: str, progress: MetadataResetProgress
+    ) -> None:
+        # Objects of the request's session must not be used from other threads, so every repository
+        # is reset in a new session scope with the user loaded again.
+        scoped_id = str(uuid.uuid4())
+        token = self.app.model.set_request_id(scoped_id)
+        try:
+            trans = _ResetMetadataContext(self.app, user_id, repositories_hostname)
+            self._reset_repository(trans, repository_id, progress)
+        finally:
+            self.app.model.unset_request_id(scoped_id)
+            REQUEST_ID.reset(token)
+
+    def _reset_repository(
+        self, trans: ProvidesRepositoriesContext, repository_id: str, progress: MetadataResetProgress
+    ) -> None:
+        repository = repository_util.get_repository_in_tool_shed(self.app, repository_id)
+        progress.started(repository_id, str(repository.name))
+        log.debug("Resetting metadata on repository %s", repository.name)
+        successful = False
+        try:
+            rmm = RepositoryMetadataManager(
+                trans,
+                repository=repository,
+                resetting_all_metadata_on_repository=True,
+                updating_installed_repository=False,
+                persist=False,
+            )
+            rmm.reset_all_metadata_on_repository_in_tool_shed()
+            if invalid_file_tups := rmm.get_invalid_file_tups():
+                message = tool_util.generate_message_for_invalid_tools(
+                    self.app, invalid_file_tups, repository, None, as_html=False
+                )
+            else:
+                message = (
+                    f"Successfully reset metadata on repository {repository.name} owned by {repository.user.username}"
+                )
+                successful = True
+                self._checkpoint(repository_id)
+        except Exception as e:
+            log.exception("Error attempting to reset metadata on repository %s", str(repository.name))
+            message = (
+                f"Error resetting metadata on repository {repository.name} owned by {repository.user.username}: {e}"
+            )
+        log.debug(message)
+        progress.finished(repository_id, f"{repository.name} : {message}", successful)
+
+    def _checkpoint(self, repository_id: str) -> None:
+        if self.checkpoint_file:
+            with self._checkpoint_lock, open(self.checkpoint_file, "a") as f:
+                f.write(f"{repository_id}\n")
+
+
 def _get_changeset_revisions_that_contain_tools(app: "ToolShedApp", repo, repository) -> List[str]:
     changeset_revisions_that_contain_tools = []
     for changeset in repo.changelog:
@@ -7,6 +7,7 @@ if TYPE_CHECKING:
     from tool_shed.repository_registry import RegistryInterface
     from tool_shed.repository_types.registry import Registry as RepositoryTypesRegistry
     from tool_shed.util.hgweb_config import HgWebConfigManager
+    from tool_shed.util.shed_index import RepositoryIndexerInterface
     from tool_shed.webapp.model import mapping
     from tool_shed.webapp.security import CommunityRBACAgent
 
@@ -18,3 +19,4 @@ class ToolShedApp(BasicSharedApp):
     hgweb_config_manager: "HgWebConfigManager"
     security_agent: "CommunityRBACAgent"
     model_cache: "ModelCache"
+    repository_indexer: "RepositoryIndexerInterface"
@@ -1,5 +1,9 @@
 import logging
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Protocol
 
 from mercurial import (
     hg,
@@ -27,6 +31,11 @@ from tool_shed.webapp.search.tool_search import schema as tool_schema
 
 log = logging.getLogger(__name__)
 
+DEFAULT_INDEX_WORKERS = 4
+# Wait this long after a repository changed before indexing it, so bursts of
+# changes to the same repository are indexed once.
+INDEX_DELAY = 2.0
+
 
 def _get_or_create_index(whoosh_index_dir):
     tool_index_dir = os.path.join(whoosh_index_dir, "tools")
@@ -37,128 +46,179 @@ def _get_or_create_index(whoosh_index_dir):
     return get_or_create_index(whoosh_index_dir, repo_schema), get_or_create_index(tool_index_dir, tool_schema)
 
 
-def build_index(whoosh_index_dir, file_path, hgweb_config_dir, hgweb_repo_prefix, dburi, **kwargs):
+def build_index(
+    whoosh_index_dir, file_path, hgweb_config_dir, hgweb_repo_prefix, dburi, workers=DEFAULT_INDEX_WORKERS, **kwargs
+):
     """
     Build two search indexes simultaneously
     One is for repositories and the other for tools.
 
+    Only repositories updated since they were last indexed are indexed again,
+    their tool XML is parsed by up to ``workers`` threads.
+
     Returns a tuple with number of repos and tools that were indexed.
     """
     model = ts_mapping.init(dburi, engine_options={}, create_tables=False)
     sa_session = model.session
     repo_index, tool_index = _get_or_create_index(whoosh_index_dir)
 
+    execution_timer = ExecutionTimer()
+    repos = []
+    with repo_index.searcher() as searcher:
+        for repo in get_repositories_for_indexing(sa_session):
+            indexed_document = searcher.document(id=unicodify(repo.id))
+            if indexed_document and indexed_document["full_last_updated"] == _full_last_updated(repo):
+                # We're done, since we sorted repos by update time
+                break
+            repos.append(_repo_fields(sa_session, repo, file_path, hgweb_config_dir, hgweb_repo_prefix))
+    repos_indexed, tools_indexed = _write_repos(repo_index, tool_index, _load_repo_contents(repos, workers))
+
+    log.info("Indexed repos: %s, tools: %s", repos_indexed, tools_indexed)
+    log.info("Toolbox index finished %s", execution_timer)
+    return repos_indexed, tools_indexed
+
+
+def index_repositories(
+    whoosh_index_dir, sa_session, repository_ids, file_path, hgweb_config_dir, hgweb_repo_prefix, **kwargs
+):
+    """
+    Update the search indexes for the repositories with the given ids only.
+
+    Repositories that should no longer be searchable (deleted, deprecated, ...)
+    are removed from the indexes. Returns a tuple with number of repos and
+    tools that were indexed.
+    """
+    repo_index, tool_index = _get_or_create_index(whoosh_index_dir)
+    repos = []
+    removed_repo_ids = []
+    for repository_id in repository_ids:
+        repo = sa_session.get(model.Repository, repository_id)
+        if repo is None or not _is_indexed(repo):
+            removed_repo_ids.append(unicodify(repository_id))
+        else:
+            repos.append(_repo_fields(sa_session, repo, file_path, hgweb_config_dir, hgweb_repo_prefix))
+    return _write_repos(repo_index, tool_index, _load_repo_contents(repos), removed_repo_ids)
+
+
+def _write_repos(repo_index, tool_index, repos, removed_repo_ids=()):
     repo_index_writer = AsyncWriter(repo_index)
     tool_index_writer = AsyncWriter(tool_index)
     repos_indexed = 0
     tools_indexed = 0
+    for repo_id in removed_repo_ids:
+        repo_index_writer.delete_by_term("id", repo_id)
+        tool_index_writer.delete_by_term("repo_id", repo_id)
+    for repo in repos:
+        tools_list = repo.pop("tools_list")
+        repo_id = repo["id"]
+        repo_index_writer.delete_by_term("id", repo_id)
+        repo_index_writer.add_document(**repo)
 
-    execution_timer = ExecutionTimer()
-    with repo_index.searcher() as searcher:
-        for repo in get_repos(sa_session, file_path, hgweb_config_dir, hgweb_repo_prefix, **kwargs):
-            tools_list = repo.pop("tools_list")
-            repo_id = repo["id"]
-            indexed_document = searcher.document(id=repo_id)
-            if indexed_document:
-                if indexed_document["full_last_updated"] == repo.get("full_last_updated"):
-                    # We're done, since we sorted repos by update time
-                    break
-                else:
-                    # Got an update, delete the previous document
-                    repo_index_writer.delete_by_term("id", repo_id)
-
-            repo_index_writer.add_document(**repo)
-
-            #  Tools get their own index
-            tool_index_writer.delete_by_term("repo_id", repo_id)
-            for tool in tools_list:
-                tool_contents = tool.copy()
-                tool_contents["repo_owner_username"] = repo.get("repo_owner_username")
-                tool_contents["repo_name"] = repo.get("name")
-                tool_contents["repo_id"] = repo_id
-                tool_index_writer.add_document(**tool_contents)
-                tools_indexed += 1
-
-            repos_indexed += 1
+        #  Tools get their own index
+        tool_index_writer.delete_by_term("repo_id", repo_id)
+        for tool in tools_list:
+            tool_contents = tool.copy()
+            tool_contents["repo_owner_username"] = repo.get("repo_owner_username")
+            tool_contents["repo_name"] = repo.get("name")
+            tool_contents["repo_id"] = repo_id
+            tool_index_writer.add_document(**tool_contents)
+            tools_indexed += 1
+
+        repos_indexed += 1
 
     tool_index_writer.commit()
     repo_index_writer.commit()
-
-    log.info("Indexed repos: %s, tools: %s", repos_indexed, tools_indexed)
-    log.info("Toolbox index finished %s", execution_timer)
     return repos_indexed, tools_indexed
 
 
-def get_repos(sa_session, file_path, hgweb_config_dir, hgweb_repo_prefix, **kwargs):
+def _repo_fields(sa_session, repo, file_path, hgweb_config_dir, hgweb_repo_prefix):
     """
-    Load repos from DB and included tools from .xml configs.
+    Collect the indexed fields of a repository stored in the database.
+
+    The returned dictionary also holds the paths of the repository's files,
+    that :func:`_load_repo_content` reads without accessing the database.
     """
     hgwcm = hgweb_config_manager
     hgwcm.hgweb_config_dir = hgweb_config_dir
-    for repo in get_repositories_for_indexing(sa_session):
-        category_names = []
-        for rca in get_repo_cat_associations(sa_session, repo.id):
-            category = sa_session.get(model.Category, rca.category.id)
-            category_names.append(category.name.lower())
-        categories = (",").join(category_names)
-        repo_id = repo.id
-        name = repo.name
-        description = repo.description
-        long_description = repo.long_description
-        homepage_url = repo.homepage_url
-        remote_repository_url = repo.remote_repository_url
-
-        times_downloaded = repo.times_downloaded or 0
-
-        repo_owner_username = ""
-        if repo.user_id is not None:
-            user = sa_session.get(model.User, repo.user_id)
-            repo_owner_username = user.username.lower()
-
-        last_updated = pretty_print_time_interval(repo.update_time)
-        full_last_updated = repo.update_time.strftime("%Y-%m-%d %I:%M %p")
-
-        # Load all changesets of the repo for lineage.
-        repo_path = os.path.join(
-            hgweb_config_dir, hgwcm.get_entry(os.path.join(hgweb_repo_prefix, repo.user.username, repo.name))
-        )
-        hg_repo = hg.repository(ui.ui(), repo_path.encode("utf-8"))
-        lineage = []
-        for changeset in hg_repo.changelog:
-            lineage.append(f"{unicodify(changeset)}:{unicodify(hg_repo[changeset])}")
-        repo_lineage = str(lineage)
-
-        #  Parse all the tools within repo for a separate index.
-        tools_list = []
-        path = os.path.join(file_path, *directory_hash_id(repo.id))
-        path = os.path.join(path, "repo_%d" % repo.id)
-        if os.path.exists(path):
-            tools_list.extend(load_one_dir(path))
-            for root, dirs, _files in os.walk(path):
-                if ".hg" in dirs:
-                    dirs.remove(".hg")
-                for dirname in dirs:
-                    tools_in_dir = load_one_dir(os.path.join(root, dirname))
-                    tools_list.extend(tools_in_dir)
-
-        yield (
-            dict(
-                id=unicodify(repo_id),
-                name=unicodify(name),
-                description=unicodify(description),
-                long_description=unicodify(long_description),
-                homepage_url=unicodify(homepage_url),
-                remote_repository_url=unicodify(remote_repository_url),
-                repo_owner_username=unicodify(repo_owner_username),
-                times_downloaded=unicodify(times_downloaded),
-                approved=unicodify("no"),
-                last_updated=unicodify(last_updated),
-                full_last_updated=unicodify(full_last_updated),
-                tools_list=tools_list,
-                repo_lineage=unicodify(repo_lineage),
-                categories=unicodify(categories),
-            )
-        )
+    category_names = []
+    for rca in get_repo_cat_associations(sa_session, repo.id):
+        category = sa_session.get(model.Category, rca.category.id)
+        category_names.append(category.name.lower())
+    categories = (",").join(category_names)
+
+    times_downloaded = repo.times_downloaded or 0
+
+    repo_owner_username = ""
+    if repo.user_id is not None:
+        user = sa_session.get(model.User, repo.user_id)
+        repo_owner_username = user.username.lower()
+
+    last_updated = pretty_print_time_interval(repo.update_time)
+
+    repo_path = os.path.join(
+        hgweb_config_dir, hgwcm.get_entry(os.path.join(hgweb_repo_prefix, repo.user.username, repo.name))
+    )
+    tools_path = os.path.join(file_path, *directory_hash_id(repo.id))
+    tools_path = os.path.join(tools_path, "repo_%d" % repo.id)
+
+    return dict(
+        id=unicodify(repo.id),
+        name=unicodify(repo.name),
+        description=unicodify(repo.description),
+        long_description=unicodify(repo.long_description),
+        homepage_url=unicodify(repo.homepage_url),
+        remote_repository_url=unicodify(repo.remote_repository_url),
+        repo_owner_username=unicodify(repo_owner_username),
+        times_downloaded=unicodify(times_downloaded),
+        approved=unicodify("no"),
+        last_updated=unicodify(last_updated),
+        full_last_updated=unicodify(_full_last_updated(repo)),
+        categories=unicodify(categories),
+        repo_path=repo_path,
+        tools_path=tools_path,
+    )
+
+
+def _load_repo_contents(repos, workers=DEFAULT_INDEX_WORKERS):
+    # Yield repositories in order as they are loaded, so they are written to the
+    # index while others are still being parsed.
+    if workers <= 1 or len(repos) <= 1:
+        yield from map(_load_repo_content, repos)
+        return
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="shed_index") as executor:
+        yield from executor.map(_load_repo_content, repos)
+
+
+def _load_repo_content(repo):
+    """
+    Add the lineage and the tools of a repository to the fields collected by :func:`_repo_fields`.
+    """
+    repo_path = repo.pop("repo_path")
+    tools_path = repo.pop("tools_path")
+
+    # Load all changesets of the repo for lineage.
+    hg_repo = hg.repository(ui.ui(), repo_path.encode("utf-8"))
+    lineage = []
+    for changeset in hg_repo.changelog:
+        lineage.append(f"{unicodify(changeset)}:{unicodify(hg_repo[changeset])}")
+    repo["repo_lineage"] = unicodify(str(lineage))
+
+    #  Parse all the tools within repo for a separate index.
+    tools_list = []
+    if os.path.exists(tools_path):
+        tools_list.extend(load_one_dir(tools_path))
+        for root, dirs, _files in os.walk(tools_path):
+            if ".hg" in dirs:
+                dirs.remove(".hg")
+            for dirname in dirs:
+                tools_in_dir = load_one_dir(os.path.join(root, dirname))
+                tools_list.extend(tools_in_dir)
+    repo["tools_list"] = tools_list
+    return repo
+
+
+def _full_last_updated(repo):
+    return repo.update_time.strftime("%Y-%m-%d %I:%M %p")
 
 
 def debug_handler(path, exc_info):
@@ -192,6 +252,10 @@ def load_one_dir(path):
     return tools_in_dir
 
 
+def _is_indexed(repo):
+    return not repo.deleted and not repo.deprecated and repo.type != "tool_dependency_definition"
+
+
 def get_repositories_for_indexing(session):
     # Do not index deleted, deprecated, or "tool_dependency_definition" type repositories.
     Repository = model.Repository
@@ -210,3 +274,89 @@ def get_repo_cat_associations(session, repository_id):
         model.RepositoryCategoryAssociation.repository_id == repository_id
     )
     return session.scalars(stmt)
+
+
+class RepositoryIndexerInterface(Protocol):
+    def index_repository(self, repository_id) -> None: ...
+
+    def shutdown(self) -> None: ...
+
+
+class NullRepositoryIndexer(RepositoryIndexerInterface):
+    """Used when search is disabled, changed repositories are not indexed."""
+
+    def index_repository(self, repository_id) -> None:
+        pass
+
+    def shutdown(self) -> None:
+        pass
+
+
+class RepositoryIndexer(RepositoryIndexerInterface):
+    """
+    Keep the search indexes up to date with repositories as they change.
+
+    Changed repositories are queued by :meth:`index_repository` and indexed
+    by a background thread, so requests changing repositories don't wait for
+    the tool XML of a repository to be parsed. The time between a change and
+    the updated index being committed is logged as the index's freshness.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._exit = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="repository_indexer", daemon=True)
+        self._thread.start()
+
+    def index_repository(self, repository_id) -> None:
+        with self._lock:
+            # Keep the time of the earliest change not yet indexed.
+            self._pending.setdefault(repository_id, time.time())
+        self._wakeup.set()
+
+    def shutdown(self) -> None:
+        self._exit.set()
+        self._wakeup.set()
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait()
+            # Wait for more changes to index them together, repositories still
+            # pending on shutdown are indexed right away.
+            exiting = self._exit.wait(INDEX_DELAY)
+            self._wakeup.clear()
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            if pending:
+                self._index(pending)
+            if exiting:
+                break
+
+    def _index(self, pending):
+        config = self.app.config
+        sa_session = self.app.model.session
+        try:
+            repos_indexed, tools_indexed = index_repositories(
+                config.whoosh_index_dir,
+                sa_session,
+                list(pending),
+                config.file_path,
+                config.hgweb_config_dir,
+                config.hgweb_repo_prefix,
+            )
+        except Exception:
+            log.exception("Failed to update search indexes for repositories %s", list(pending))
+            return
+        finally:
+            sa_session.remove()
+        lag = time.time() - min(pending.values())
+        log.info(
+            "Indexed changed repos: %s, tools: %s, at most %.1f seconds after the change",
+            repos_indexed,
+            tools_indexed,
+            lag,
+        )
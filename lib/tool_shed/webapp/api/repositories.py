@@ -2,7 +2,6 @@ import json
 import logging
 import os
 from io import StringIO
-from time import strftime
 from typing import (
     Callable,
     Dict,
@@ -49,7 +48,6 @@ from tool_shed.repository_types import util as rt_util
 from tool_shed.util import (
     metadata_util,
     repository_util,
-    tool_util,
 )
 from tool_shed.webapp import model
 from tool_shed_client.schema import (
@@ -368,52 +366,20 @@ class RepositoriesController(BaseShedAPIController):
         :param skip_file (optional):
             A local file name that contains the encoded repository ids associated with repositories to skip.
             This param can be used as an alternative to the above encoded_ids_to_skip.
-
+        :param checkpoint_file (optional):
+            The name of a file in the ``reset_metadata_checkpoint_dir`` directory to which the encoded ids of
+            repositories are appended as soon as their metadata has been reset.  Repositories listed in this
+            file are skipped, so a reset that was interrupted continues where it stopped when called again with
+            the same checkpoint_file.  This param is only available to admin users.
+
+        Up to ``reset_metadata_workers`` repositories are processed concurrently, the progress of running
+        resets is available from GET /api/repositories/reset_metadata_progress.
         """
-
-        def handle_repository(trans, repository, results):
-            log.debug(f"Resetting metadata on repository {repository.name}")
-            try:
-                rmm = repository_metadata_manager.RepositoryMetadataManager(
-                    trans,
-                    resetting_all_metadata_on_repository=True,
-                    updating_installed_repository=False,
-                    repository=repository,
-                    persist=False,
-                )
-                rmm.reset_all_metadata_on_repository_in_tool_shed()
-                rmm_invalid_file_tups = rmm.get_invalid_file_tups()
-                if rmm_invalid_file_tups:
-                    message = tool_util.generate_message_for_invalid_tools(
-                        self.app, rmm_invalid_file_tups, repository, None, as_html=False
-                    )
-                    results["unsuccessful_count"] += 1
-                else:
-                    message = f"Successfully reset metadata on repository {repository.name} owned by {repository.user.username}"
-                    results["successful_count"] += 1
-            except Exception as e:
-                message = (
-                    f"Error resetting metadata on repository {repository.name} owned by {repository.user.username}: {e}"
-                )
-                results["unsuccessful_count"] += 1
-            status = f"{repository.name} : {message}"
-            results["repository_status"].append(status)
-            return results
-
-        start_time = strftime("%Y-%m-%d %H:%M:%S")
-        results = dict(start_time=start_time, repository_status=[], successful_count=0, unsuccessful_count=0)
-        handled_repository_ids = []
         encoded_ids_to_skip = payload.get("encoded_ids_to_skip", [])
         skip_file = payload.get("skip_file", None)
-        if skip_file and os.path.exists(skip_file) and not encoded_ids_to_skip:
-            # Load the list of encoded_ids_to_skip from the skip_file.
+        if skip_file and not encoded_ids_to_skip:
             # Contents of file must be 1 encoded repository id per line.
-            lines = open(skip_file, "rb").readlines()
-            for line in lines:
-                if line.startswith("#"):
-                    # Skip comments.
-                    continue
-                encoded_ids_to_skip.append(line.rstrip("\n"))
+            encoded_ids_to_skip = repository_metadata_manager.read_checkpoint_file(skip_file)
         if trans.user_is_admin:
             my_writable = util.asbool(payload.get("my_writable", False))
         else:
@@ -424,18 +390,7 @@ class RepositoriesController(BaseShedAPIController):
             updating_installed_repository=False,
             persist=False,
         )
-        # First reset metadata on all repositories of type repository_dependency_definition.
-        for repository in rmm.get_repositories_for_setting_metadata(my_writable=my_writable, order=False):
-            encoded_id = trans.security.encode_id(repository.id)
-            if encoded_id in encoded_ids_to_skip:
-                log.debug(
-                    "Skipping repository with id %s because it is in encoded_ids_to_skip %s",
-                    repository.id,
-                    encoded_ids_to_skip,
-                )
-            elif repository.type == rt_util.TOOL_DEPENDENCY_DEFINITION and repository.id not in handled_repository_ids:
-                results = handle_repository(trans, repository, results)
-        # Now reset metadata on all remaining repositories.
+        repository_ids = []
         for repository in rmm.get_repositories_for_setting_metadata(my_writable=my_writable, order=False):
             encoded_id = trans.security.encode_id(repository.id)
             if encoded_id in encoded_ids_to_skip:
@@ -444,12 +399,35 @@ class RepositoriesController(BaseShedAPIController):
                     repository.id,
                     encoded_ids_to_skip,
                 )
-            elif repository.type != rt_util.TOOL_DEPENDENCY_DEFINITION and repository.id not in handled_repository_ids:
-                results = handle_repository(trans, repository, results)
-        stop_time = strftime("%Y-%m-%d %H:%M:%S")
-        results["stop_time"] = stop_time
+            else:
+                repository_ids.append(encoded_id)
+        checkpoint_file = None
+        if checkpoint_file_name := payload.get("checkpoint_file", None):
+            if not trans.user_is_admin:
+                raise InsufficientPermissionsException("Only administrators may use a checkpoint_file.")
+            checkpoint_dir = self.app.config.reset_metadata_checkpoint_dir
+            checkpoint_file = repository_metadata_manager.resolve_checkpoint_file(checkpoint_dir, checkpoint_file_name)
+            util.safe_makedirs(checkpoint_dir)
+        # Repositories of type tool_dependency_definition are reset first, followed by all other repositories.
+        resetter = repository_metadata_manager.RepositoryMetadataResetter(
+            trans,
+            workers=self.app.config.reset_metadata_workers,
+            checkpoint_file=checkpoint_file,
+        )
+        results = resetter.reset(repository_ids).to_dict()
         return json.dumps(results, sort_keys=True, indent=4)
 
+    @web.legacy_expose_api
+    def reset_metadata_progress(self, trans, **kwd):
+        """
+        GET /api/repositories/reset_metadata_progress
+
+        Returns the progress of the resets of metadata on repositories running in this Tool Shed process.
+        """
+        if not trans.user_is_admin:
+            raise InsufficientPermissionsException("You are not authorized to view metadata reset progress.")
+        return repository_metadata_manager.metadata_reset_progress()
+
     @web.legacy_expose_api
     def reset_metadata_on_repository(self, trans, payload, **kwd):
         """
@@ -424,6 +424,7 @@ class FastAPIRepositories:
         trans.sa_session.add(repository)
         with transaction(trans.sa_session):
             trans.sa_session.commit()
+        self.app.repository_indexer.index_repository(repository.id)
         return Response(status_code=status.HTTP_204_NO_CONTENT)
 
     @router.delete(
@@ -442,6 +443,7 @@ class FastAPIRepositories:
         trans.sa_session.add(repository)
         with transaction(trans.sa_session):
             trans.sa_session.commit()
+        self.app.repository_indexer.index_repository(repository.id)
         return Response(status_code=status.HTTP_204_NO_CONTENT)
 
     @router.delete(
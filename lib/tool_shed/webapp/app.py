@@ -33,6 +33,10 @@ from tool_shed.grids.repository_grid_filter_manager import RepositoryGridFilterM
 from tool_shed.managers.model_cache import ModelCache
 from tool_shed.structured_app import ToolShedApp
 from tool_shed.util.hgweb_config import hgweb_config_manager
+from tool_shed.util.shed_index import (
+    NullRepositoryIndexer,
+    RepositoryIndexer,
+)
 from tool_shed.webapp.model.migrations import verify_database
 from . import config
 
@@ -109,6 +113,12 @@ class UniverseApplication(ToolShedApp, SentryClientMixin, HaltableContainer):
             self.repository_registry = tool_shed.repository_registry.Registry(self)
         else:
             self.repository_registry = tool_shed.repository_registry.NullRepositoryRegistry(self)
+        # Keep the search indexes up to date with changed repositories.
+        if self.config.toolshed_search_on and self.config.toolshed_search_index_on_change:
+            self.repository_indexer = RepositoryIndexer(self)
+        else:
+            self.repository_indexer = NullRepositoryIndexer()
+        self.haltables.append(("repository indexer", self.repository_indexer.shutdown))
         # Configure Sentry client if configured
         self.configure_sentry_client()
         #  used for cachebusting -- refactor this into a *SINGLE* UniverseApplication base.
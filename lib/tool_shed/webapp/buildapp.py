@@ -174,6 +174,7 @@ def app_pair(global_conf, load_app_kwds=None, **kwargs):
                 "remove_repository_registry_entry": "POST",
                 "reset_metadata_on_repositories": "POST",
                 "reset_metadata_on_repository": "POST",
+                "reset_metadata_progress": "GET",
             },
             name_prefix="repository_",
             path_prefix="/api",
@@ -79,6 +79,7 @@ class ToolShedAppConfiguration(BaseAppConfiguration, CommonConfigurationMixin):
         # Where dataset files are stored
         self.file_path = self._in_root_dir(self.file_path)
         self.new_file_path = self._in_root_dir(self.new_file_path)
+        self.reset_metadata_checkpoint_dir = self._in_root_dir(self.reset_metadata_checkpoint_dir)
         self.cookie_path = kwargs.get("cookie_path")
         self.cookie_domain = kwargs.get("cookie_domain")
         self.enable_quotas = string_as_bool(kwargs.get("enable_quotas", False))
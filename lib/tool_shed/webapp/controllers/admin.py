@@ -197,6 +197,8 @@ class AdminController(BaseUIController, Admin):
                             trans.sa_session.commit()
                         # Update the repository registry.
                         trans.app.repository_registry.remove_entry(repository)
+                        # Remove the repository from the search indexes.
+                        trans.app.repository_indexer.index_repository(repository.id)
                         count += 1
                         deleted_repositories += f" {repository.name} "
             if count:
@@ -409,6 +411,8 @@ class AdminController(BaseUIController, Admin):
                         if not repository.deprecated:
                             # Update the repository registry.
                             trans.app.repository_registry.add_entry(repository)
+                        # Add the repository back to the search indexes.
+                        trans.app.repository_indexer.index_repository(repository.id)
                         count += 1
                         undeleted_repositories += f" {repository.name}"
             if count:
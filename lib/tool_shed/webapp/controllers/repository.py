@@ -781,6 +781,7 @@ class RepositoryController(BaseUIController, ratings_util.ItemRatings):
         trans.sa_session.add(repository)
         with transaction(trans.sa_session):
             trans.sa_session.commit()
+        trans.app.repository_indexer.index_repository(repository.id)
         if mark_deprecated:
             # Update the repository registry.
             trans.app.repository_registry.remove_entry(repository)
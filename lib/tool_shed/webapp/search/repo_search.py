@@ -20,6 +20,7 @@ from whoosh.query import (
 
 from galaxy import exceptions
 from galaxy.exceptions import ObjectNotFound
+from galaxy.util import ExecutionTimer
 from galaxy.util.search import parse_filters
 
 log = logging.getLogger(__name__)
@@ -130,9 +131,11 @@ class RepoSearch:
                     user_query = parser.parse(f"*{search_term_without_filters}*")
                     sortedby = ""
                 try:
+                    search_timer = ExecutionTimer()
                     hits = searcher.search_page(
                         user_query, page, pagelen=page_size, filter=allow_query, terms=True, sortedby=sortedby
                     )
+                    log.debug("repository search took %s", search_timer)
                     log.debug(f"total hits: {str(len(hits))}")
                     log.debug(f"scored hits: {str(hits.scored_length())}")
                 except ValueError:
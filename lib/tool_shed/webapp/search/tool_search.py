@@ -14,7 +14,10 @@ from whoosh.qparser import MultifieldParser
 
 from galaxy import exceptions
 from galaxy.exceptions import ObjectNotFound
-from galaxy.util import unicodify
+from galaxy.util import (
+    ExecutionTimer,
+    unicodify,
+)
 
 log = logging.getLogger(__name__)
 
@@ -64,11 +67,13 @@ class ToolSearch:
                 user_query = parser.parse(f"*{search_term}*")
 
                 try:
+                    search_timer = ExecutionTimer()
                     hits = searcher.search_page(user_query, page, pagelen=page_size, terms=True)
                 except ValueError:
                     raise ObjectNotFound("The requested page does not exist.")
 
                 log.debug(f"searching tools for: #{str(search_term)}")
+                log.debug("tool search took %s", search_timer)
                 log.debug(f"total hits: {str(len(hits))}")
                 log.debug(f"scored hits: {str(hits.scored_length())}")
                 results = {}
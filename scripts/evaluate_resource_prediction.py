@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+"""
+Evaluate job resource predictions offline on exported job metrics.
+
+The input is a tab separated file with the columns ``tool_id``, ``input_size``
+(total input size in bytes) and ``value`` (the observed usage, e.g. runtime in
+seconds or peak memory in bytes), in chronological order. It can be exported
+from the Galaxy database with psql, e.g. for peak memory:
+
+    \\copy (SELECT j.tool_id, coalesce(sum(d.file_size), 0), max(jmn.metric_value)
+            FROM job j
+            JOIN job_metric_numeric jmn ON jmn.job_id = j.id
+            LEFT JOIN job_to_input_dataset jtid ON jtid.job_id = j.id
+            LEFT JOIN history_dataset_association hda ON hda.id = jtid.dataset_id
+            LEFT JOIN dataset d ON d.id = hda.dataset_id
+            WHERE j.state = 'ok' AND jmn.plugin = 'cgroup'
+                  AND jmn.metric_name IN ('memory.peak', 'memory.max_usage_in_bytes')
+            GROUP BY j.id, j.tool_id ORDER BY j.id) TO 'memory.tsv'
+
+For every tool the first part of the jobs is used to fit a model and the
+remaining jobs are used to measure how often the predicted quantile covered the
+actual usage and how much was allocated on average relative to the usage. The
+same figures are reported for a size-independent baseline.
+
+Example
+-------
+
+% ./evaluate_resource_prediction.py --quantile 0.95 memory.tsv
+"""
+
+import argparse
+import csv
+import os
+import sys
+from collections import defaultdict
+
+galaxy_root = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.insert(1, os.path.join(galaxy_root, "lib"))
+
+from galaxy.jobs.resource_prediction import (
+    DEFAULT_MIN_SAMPLES,
+    evaluate,
+    ResourceSample,
+)
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Evaluate job resource predictions on exported job metrics")
+    parser.add_argument("samples", help="Tab separated file with tool_id, input_size and value columns")
+    parser.add_argument("-q", "--quantile", type=float, default=0.95, help="Quantile to predict")
+    parser.add_argument(
+        "-t", "--train-fraction", type=float, default=0.8, help="Fraction of each tool's jobs used for fitting"
+    )
+    parser.add_argument(
+        "-m", "--min-samples", type=int, default=DEFAULT_MIN_SAMPLES, help="Minimum number of jobs to fit a model"
+    )
+    return parser.parse_args()
+
+
+def read_samples(path):
+    samples_by_tool = defaultdict(list)
+    with open(path) as fh:
+        for row in csv.reader(fh, delimiter="\t"):
+            if not row or row[0] == "tool_id":
+                continue
+            tool_id, input_size, value = row[:3]
+            samples_by_tool[tool_id].append(ResourceSample(float(input_size or 0), float(value)))
+    return samples_by_tool
+
+
+def main():
+    args = parse_arguments()
+    results = list(
+        evaluate(
+            read_samples(args.samples),
+            quantile=args.quantile,
+            train_fraction=args.train_fraction,
+            min_samples=args.min_samples,
+        )
+    )
+    print("tool_id\ttest_jobs\tcoverage\tallocation_ratio\tbaseline_coverage\tbaseline_allocation_ratio")
+    for result in results:
+        print(
+            f"{result.tool_id}\t{result.test_count}\t{result.coverage:.3f}\t{result.allocation_ratio:.2f}\t"
+            f"{result.baseline_coverage:.3f}\t{result.baseline_allocation_ratio:.2f}"
+        )
+    if results:
+        test_count = sum(result.test_count for result in results)
+        coverage = sum(result.coverage * result.test_count for result in results) / test_count
+        baseline_coverage = sum(result.baseline_coverage * result.test_count for result in results) / test_count
+        ratio = sum(result.allocation_ratio * result.test_count for result in results) / test_count
+        baseline_ratio = sum(result.baseline_allocation_ratio * result.test_count for result in results) / test_count
+        print(f"all\t{test_count}\t{coverage:.3f}\t{ratio:.2f}\t{baseline_coverage:.3f}\t{baseline_ratio:.2f}")
+
+
+if __name__ == "__main__":
+    main()
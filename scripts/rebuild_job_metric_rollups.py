@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+"""
+Recompute the daily job metric rollups (see ``enable_job_metric_rollups``) from
+the numeric metrics of successful jobs, e.g. to backfill rollups for jobs that
+finished before rollups were enabled. Rollup rows of the covered days are
+replaced.
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime
+
+sys.path.insert(1, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, "lib")))
+
+import galaxy.config
+from galaxy.managers.job_metric_rollups import rebuild_job_metric_rollups
+from galaxy.model.mapping import init_models_from_config
+from galaxy.objectstore import build_object_store_from_config
+from galaxy.util.script import (
+    app_properties_from_args,
+    populate_config_args,
+)
+
+
+def parse_day(value):
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+parser = argparse.ArgumentParser(description=__doc__)
+parser.add_argument("--from", dest="date_range_min", type=parse_day, help="First day to rebuild (YYYY-MM-DD)")
+parser.add_argument("--to", dest="date_range_max", type=parse_day, help="Last day to rebuild (YYYY-MM-DD)")
+populate_config_args(parser)
+args = parser.parse_args()
+
+
+def init():
+    app_properties = app_properties_from_args(args)
+    config = galaxy.config.Configuration(**app_properties)
+    object_store = build_object_store_from_config(config)
+    return init_models_from_config(config, object_store=object_store)
+
+
+if __name__ == "__main__":
+    print("Loading Galaxy model...")
+    model = init()
+    aggregated = rebuild_job_metric_rollups(model.session, args.date_range_min, args.date_range_max)
+    print(f"Aggregated {aggregated} metric values into job metric rollups")
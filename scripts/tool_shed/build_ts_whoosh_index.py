@@ -22,7 +22,10 @@ from galaxy.util.script import (
     app_properties_from_args,
     populate_config_args,
 )
-from tool_shed.util.shed_index import build_index
+from tool_shed.util.shed_index import (
+    build_index,
+    DEFAULT_INDEX_WORKERS,
+)
 from tool_shed.webapp import config as ts_config
 
 log = logging.getLogger()
@@ -35,6 +38,13 @@ def parse_arguments():
     )
     populate_config_args(parser)
     parser.add_argument("-d", "--debug", action="store_true", default=False, help="Print extra info")
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=DEFAULT_INDEX_WORKERS,
+        help="Number of threads parsing repositories in parallel",
+    )
     args = parser.parse_args()
     app_properties = app_properties_from_args(args)
     config = ts_config.ToolShedAppConfiguration(**app_properties)
@@ -77,6 +77,7 @@
                     <div class="toolSectionBg">
                         <div class="toolTitle"><a target="galaxy_main" href="${h.url_for( controller='tools', action='tools_and_job_state' )}">States of Jobs per Tool</a></div>
                         <div class="toolTitle"><a target="galaxy_main" href="${h.url_for( controller='tools', action='tool_execution_time' )}">Execution Time per Tool</a></div>
+                        <div class="toolTitle"><a target="galaxy_main" href="${h.url_for( controller='tools', action='tool_resource_usage' )}">Resource Usage per Tool</a></div>
                     </div>
                 </div>
                 <div class="toolSectionPad"></div>
@@ -0,0 +1,62 @@
+<%inherit file="/base.mako"/>
+<%namespace file="/message.mako" import="render_msg" />
+
+
+<div class="report">
+<div class="reportBody">
+    <h3 align="center">Resource Usage per Tool</h3>
+    <h4 align="center">${plugin} / ${metric_name}
+    %if days:
+        over the last ${days} days
+    %endif
+    </h4>
+    <table align="center" width="70%" class="colored" cellpadding="5" cellspacing="5">
+        <tr>
+            <td>
+                <form method="post" controller="tools" action="tool_resource_usage">
+                    <p>
+                        Metric: <input type="textfield" value="${plugin}" size="10" name="plugin">
+                        <input type="textfield" value="${metric_name}" size="20" name="metric_name">
+                        </br>
+                        Last <input type="textfield" value="${days}" size="3" name="days"> days (0 = all).
+                        Top <input type="textfield" value="${user_cutoff}" size="3" name="user_cutoff"> shown (0 = all).
+                        </br>
+                        <button name="action" value="commit">Show my Data!</button>
+                    </p>
+                </form>
+            </td>
+        </tr>
+    </table>
+    <table align="center" width="70%" class="colored" cellpadding="5" cellspacing="5">
+        %if summaries:
+            <tr class="header">
+                <td>Tool</td>
+                <td>Jobs</td>
+                <td>Mean</td>
+                <td>Median</td>
+                <td>95th percentile</td>
+                <td>Max</td>
+                <td>Total</td>
+            </tr>
+            <% odd = False%>
+            %for summary in summaries:
+                %if odd:
+                    <tr class="odd_row">
+                %else:
+                    <tr class="tr">
+                %endif
+                <td>${summary["tool_id"]}</td>
+                <td>${summary["count"]}</td>
+                <td>${"%.2f" % summary["mean"]}</td>
+                <td>${"%.2f" % summary["quantiles"]["0.5"]}</td>
+                <td>${"%.2f" % summary["quantiles"]["0.95"]}</td>
+                <td>${"%.2f" % summary["max"]}</td>
+                <td>${"%.2f" % summary["sum"]}</td>
+                <% odd = not odd %>
+            %endfor
+        %else:
+            <tr><td>No job metric rollups recorded, the <code>enable_job_metric_rollups</code> option may be disabled.</td></tr>
+        %endif
+    </table>
+</div>
+</div>
@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+"""Compare per-dataset and batched submission of bulk dataset tasks.
+
+Uses a Celery application with an in-memory broker (or any broker given with
+``--broker``, e.g. ``sqla+sqlite:///broker.sqlite``) and reports, for a bulk
+operation over ``--datasets`` datasets, the time to enqueue the tasks, the
+number of broker messages created and the number of messages an interactive
+task submitted right after the bulk operation has to wait behind. Finally
+identical submissions are sent through the pending task registry to show
+deduplication:
+
+% ./test/manual/celery_task_batching_benchmark.py --datasets 50000 --batch-size 100
+"""
+
+import os
+import sys
+import time
+from argparse import ArgumentParser
+
+galaxy_root = os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir, os.path.pardir))
+sys.path[1:1] = [os.path.join(galaxy_root, "lib")]
+
+from celery import Celery
+
+from galaxy.celery.base_task import (
+    DatasetTaskBatcher,
+    PendingTaskRegistry,
+)
+
+DESCRIPTION = "Benchmark batched and deduplicated Celery task submission."
+INTERACTIVE_QUEUE = "galaxy.internal"
+BULK_QUEUE = "galaxy.bulk"
+
+
+def main(argv=None):
+    arg_parser = ArgumentParser(description=DESCRIPTION)
+    arg_parser.add_argument("--datasets", type=int, default=10000, help="number of datasets in the bulk operation")
+    arg_parser.add_argument("--batch-size", type=int, default=100, help="number of datasets per batched task")
+    arg_parser.add_argument("--duplicates", type=int, default=1000, help="number of identical submissions")
+    arg_parser.add_argument("--broker", default="memory://", help="broker url")
+    args = arg_parser.parse_args(argv)
+
+    celery_app = Celery(
+        "benchmark",
+        broker=args.broker,
+        backend="cache+memory://",
+        task_default_queue=INTERACTIVE_QUEUE,
+        task_create_missing_queues=True,
+    )
+
+    @celery_app.task(name="galaxy.change_datatype")
+    def change_datatype(dataset_id, datatype):
+        pass
+
+    @celery_app.task(name="galaxy.change_datatype_batch")
+    def change_datatype_batch(dataset_ids, datatype):
+        pass
+
+    @celery_app.task(name="galaxy.compute_dataset_hash")
+    def compute_dataset_hash(dataset_id):
+        pass
+
+    dataset_ids = range(args.datasets)
+
+    with celery_app.connection_for_write() as connection:
+        channel = connection.default_channel
+
+        def depth(queue):
+            return channel.queue_declare(queue=queue, passive=True).message_count
+
+        def reset():
+            for queue in (INTERACTIVE_QUEUE, BULK_QUEUE):
+                channel.queue_declare(queue=queue)
+                channel.queue_purge(queue)
+
+        reset()
+        start = time.perf_counter()
+        for dataset_id in dataset_ids:
+            change_datatype.si(dataset_id=dataset_id, datatype="txt").apply_async(connection=connection)
+        elapsed = time.perf_counter() - start
+        ahead = depth(INTERACTIVE_QUEUE)
+        report("per-dataset tasks, shared queue", elapsed, ahead, ahead)
+
+        reset()
+        start = time.perf_counter()
+        batcher = DatasetTaskBatcher(batch_size=args.batch_size, registry=PendingTaskRegistry())
+        for dataset_id in dataset_ids:
+            batcher.add(change_datatype_batch, dataset_id, datatype="txt")
+        batcher.submit()
+        elapsed = time.perf_counter() - start
+        ahead = depth(INTERACTIVE_QUEUE)
+        report("batched tasks, shared queue", elapsed, ahead, ahead)
+
+        reset()
+        start = time.perf_counter()
+        batcher = DatasetTaskBatcher(batch_size=args.batch_size, queue=BULK_QUEUE, registry=PendingTaskRegistry())
+        for dataset_id in dataset_ids:
+            batcher.add(change_datatype_batch, dataset_id, datatype="txt")
+        batcher.submit()
+        elapsed = time.perf_counter() - start
+        report("batched tasks, bulk lane", elapsed, depth(BULK_QUEUE), depth(INTERACTIVE_QUEUE))
+
+        reset()
+        registry = PendingTaskRegistry()
+        start = time.perf_counter()
+        for _ in range(args.duplicates):
+            registry.submit(compute_dataset_hash.si(dataset_id=1))
+        elapsed = time.perf_counter() - start
+        print(
+            f"{args.duplicates} identical submissions: {elapsed:.3f}s, {depth(INTERACTIVE_QUEUE)} message(s) enqueued"
+        )
+
+
+def report(label, elapsed, messages, ahead):
+    print(f"{label}: enqueued in {elapsed:.3f}s, {messages} messages, interactive task waits behind {ahead}")
+
+
+if __name__ == "__main__":
+    main()
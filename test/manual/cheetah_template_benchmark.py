@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+"""Benchmark compiling and rendering Cheetah templates.
+
+Builds a synthetic tool command line with ``--conditionals`` conditionals and a
+repeat over ``--repeat_items`` items and reports the time it takes to parse and
+compile the template, to look it up in the compiled template cache and to
+render it with ``fill_template``.
+
+% ./test/manual/cheetah_template_benchmark.py --conditionals 200 --repeat_items 100
+"""
+
+import os
+import sys
+import tempfile
+import time
+from argparse import ArgumentParser
+
+galaxy_root = os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir, os.path.pardir))
+sys.path[1:1] = [os.path.join(galaxy_root, "lib")]
+
+from galaxy.util.template import (
+    compiled_template_cache,
+    CompiledTemplateCache,
+    fill_template,
+)
+
+DESCRIPTION = "Script to benchmark Cheetah template compilation and rendering."
+
+
+def build_template(conditionals, repeat_items):
+    lines = ["tool"]
+    for i in range(conditionals):
+        lines.extend(
+            [
+                f"#if $param_{i} == 'a':",
+                f"    --option-{i} '$param_{i}'",
+                f"#elif $param_{i}:",
+                f"    --other-{i} '$param_{i}'",
+                "#end if",
+            ]
+        )
+    lines.extend(["#for item in $queries:", "    --query '$item'", "#end for"])
+    context = {f"param_{i}": "a" if i % 2 else "b" for i in range(conditionals)}
+    context["queries"] = list(range(repeat_items))
+    return "\n".join(lines), context
+
+
+def timed(func, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations
+
+
+def main(argv=None):
+    arg_parser = ArgumentParser(description=DESCRIPTION)
+    arg_parser.add_argument("--conditionals", type=int, default=200)
+    arg_parser.add_argument("--repeat_items", type=int, default=100)
+    arg_parser.add_argument("--iterations", type=int, default=20)
+    args = arg_parser.parse_args(argv)
+
+    template, context = build_template(args.conditionals, args.repeat_items)
+
+    def cold_compile():
+        CompiledTemplateCache().get(template)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        CompiledTemplateCache(cache_dir=cache_dir).get(template)
+
+        def load_from_disk():
+            CompiledTemplateCache(cache_dir=cache_dir).get(template)
+
+        disk = timed(load_from_disk, args.iterations)
+    cold = timed(cold_compile, args.iterations)
+    compiled_template_cache.get(template)
+    cached = timed(lambda: compiled_template_cache.get(template), args.iterations * 100)
+    render = timed(lambda: fill_template(template, context=context), args.iterations)
+    print(f"template with {len(template.splitlines())} lines")
+    print(f"  parse and compile: {cold * 1000:.2f} ms")
+    print(f"  load compiled code from disk: {disk * 1000:.2f} ms")
+    print(f"  cached lookup: {cached * 1000:.4f} ms")
+    print(f"  fill_template (cached): {render * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+"""Compare the ORM backed and the columnar structure of large nested collections.
+
+Creates a synthetic ``list:list:paired`` collection in a SQLite database and
+reports the time to build its structure, to match it against a second
+collection of the same shape, to multiply it and to slice (walk) both
+collections as done when mapping a tool over them:
+
+% ./test/manual/collection_structure_benchmark.py --outer 500 --inner 100
+"""
+
+import os
+import sys
+import tempfile
+import time
+from argparse import ArgumentParser
+
+galaxy_root = os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir, os.path.pardir))
+sys.path[1:1] = [os.path.join(galaxy_root, "lib")]
+
+from galaxy import model
+from galaxy.model import mapping
+from galaxy.model.base import transaction
+from galaxy.model.dataset_collections.structure import (
+    ColumnarTree,
+    Tree,
+)
+from galaxy.model.dataset_collections.type_description import COLLECTION_TYPE_DESCRIPTION_FACTORY
+
+DESCRIPTION = "Benchmark collection structure representations."
+COLLECTION_TYPE = "list:list:paired"
+
+
+def main(argv=None):
+    arg_parser = ArgumentParser(description=DESCRIPTION)
+    arg_parser.add_argument("--outer", type=int, default=200, help="number of elements of the outer list")
+    arg_parser.add_argument("--inner", type=int, default=100, help="number of elements of each inner list")
+    args = arg_parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        database = mapping.init(
+            directory, f"sqlite:///{os.path.join(directory, 'benchmark.sqlite')}", create_tables=True
+        )
+        session = database.session
+        hdca_ids = [_create_hdca(session, args.outer, args.inner) for _ in range(2)]
+        print(f"{COLLECTION_TYPE} with {args.outer * args.inner * 2} datasets")
+        collection_type_description = COLLECTION_TYPE_DESCRIPTION_FACTORY.for_collection_type(COLLECTION_TYPE)
+        for name, build in [("Tree", Tree.for_dataset_collection), ("ColumnarTree", ColumnarTree.load)]:
+            # Start every run with an empty identity map, as a new request would.
+            session.expunge_all()
+            hdcas = [session.get(model.HistoryDatasetCollectionAssociation, hdca_id) for hdca_id in hdca_ids]
+            structures, build_time = _timed(
+                lambda: [build(hdca.collection, collection_type_description) for hdca in hdcas]  # noqa: B023
+            )
+            structure, other_structure = structures
+            matches, match_time = _timed(lambda: structure.can_match(other_structure))  # noqa: B023
+            assert matches
+            _, multiply_time = _timed(lambda: structure.multiply(other_structure))  # noqa: B023
+            hdca_dict = {"input1": hdcas[0], "input2": hdcas[1]}
+            walked, walk_time = _timed(lambda: sum(1 for _ in structure.walk_collections(hdca_dict)))  # noqa: B023
+            print(
+                f"{name:>12}: build {build_time:.3f}s, can_match {match_time:.3f}s, "
+                f"multiply {multiply_time:.3f}s, walk {walk_time:.3f}s ({walked} slices)"
+            )
+
+
+def _timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def _create_hdca(session, outer, inner):
+    collection = model.DatasetCollection(collection_type=COLLECTION_TYPE, element_count=outer)
+    for outer_index in range(outer):
+        inner_collection = model.DatasetCollection(collection_type="list:paired", element_count=inner)
+        for inner_index in range(inner):
+            pair = model.DatasetCollection(collection_type="paired", element_count=2)
+            for pair_index, identifier in enumerate(["forward", "reverse"]):
+                hda = model.HistoryDatasetAssociation(create_dataset=True, sa_session=session)
+                model.DatasetCollectionElement(
+                    collection=pair, element=hda, element_index=pair_index, element_identifier=identifier
+                )
+            model.DatasetCollectionElement(
+                collection=inner_collection,
+                element=pair,
+                element_index=inner_index,
+                element_identifier=f"sample{inner_index}",
+            )
+        model.DatasetCollectionElement(
+            collection=collection,
+            element=inner_collection,
+            element_index=outer_index,
+            element_identifier=f"batch{outer_index}",
+        )
+    hdca = model.HistoryDatasetCollectionAssociation(collection=collection)
+    session.add(hdca)
+    with transaction(session):
+        session.commit()
+    return hdca.id
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python
+"""Measure file source download throughput with and without parallel transfers.
+
+Serves ``--files`` files of ``--size`` bytes from a local HTTP server that
+supports byte range requests, and from a filesystem-backed stand-in for an S3
+bucket. Both limit the bandwidth of each connection and add a fixed latency
+to each request, like a remote server would. Files are downloaded one after
+another over a single connection each and with the transfer engine using up
+to ``--connections`` connections per file and files in parallel:
+
+% ./test/manual/file_transfer_benchmark.py --files 8 --size 33554432 --connections 4
+"""
+
+import functools
+import io
+import os
+import sys
+import tempfile
+import threading
+import time
+from argparse import ArgumentParser
+from http.server import (
+    SimpleHTTPRequestHandler,
+    ThreadingHTTPServer,
+)
+
+galaxy_root = os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir, os.path.pardir))
+sys.path[1:1] = [os.path.join(galaxy_root, "lib")]
+
+from galaxy.files import ConfiguredFileSources
+from galaxy.files.plugins import FileSourcePluginsConfig
+from galaxy.files.transfer import (
+    for_each_concurrently,
+    ranged_download,
+)
+from galaxy.files.uris import stream_url_to_file
+from galaxy.util.config_parsers import parse_allowlist_ips
+
+DESCRIPTION = "Benchmark parallel file source transfers."
+CHUNK_SIZE = 64 * 1024
+
+
+class Throttle:
+    def __init__(self, bandwidth, latency):
+        self.bandwidth = bandwidth
+        self.latency = latency
+
+    def request(self):
+        time.sleep(self.latency)
+
+    def sent(self, size):
+        time.sleep(size / self.bandwidth)
+
+
+def range_request_handler(directory, throttle):
+    class RangeRequestHandler(SimpleHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def __init__(self, *args, **kwds):
+            super().__init__(*args, directory=directory, **kwds)
+
+        def do_GET(self):
+            throttle.request()
+            path = self.translate_path(self.path)
+            size = os.path.getsize(path)
+            start, end = 0, size
+            if range_header := self.headers.get("Range"):
+                first, last = range_header.split("=", 1)[1].split("-")
+                start, end = int(first), min(int(last) + 1, size)
+                self.send_response(206)
+                self.send_header("Content-Range", f"bytes {start}-{end - 1}/{size}")
+            else:
+                self.send_response(200)
+            self.send_header("Accept-Ranges", "bytes")
+            self.send_header("Content-Type", "application/octet-stream")
+            self.send_header("Content-Length", str(end - start))
+            self.end_headers()
+            with open(path, "rb") as f:
+                f.seek(start)
+                remaining = end - start
+                try:
+                    while remaining:
+                        chunk = f.read(min(CHUNK_SIZE, remaining))
+                        self.wfile.write(chunk)
+                        throttle.sent(len(chunk))
+                        remaining -= len(chunk)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+        def log_message(self, format, *args):
+            pass
+
+    return RangeRequestHandler
+
+
+class LocalS3FileSystem:
+    """Serves the ``s3fs`` calls used by the s3fs file source from a local directory."""
+
+    def __init__(self, directory, throttle):
+        self.directory = directory
+        self.throttle = throttle
+
+    def size(self, path):
+        self.throttle.request()
+        return os.path.getsize(os.path.join(self.directory, path))
+
+    def download(self, path, native_path):
+        self.throttle.request()
+        with open(os.path.join(self.directory, path), "rb") as src, open(native_path, "wb") as dest:
+            while chunk := src.read(CHUNK_SIZE):
+                dest.write(chunk)
+                self.throttle.sent(len(chunk))
+
+    def cat_file(self, path, start, end):
+        self.throttle.request()
+        with open(os.path.join(self.directory, path), "rb") as f:
+            f.seek(start)
+            content = f.read(end - start)
+        self.throttle.sent(len(content))
+        return content
+
+
+def main(argv=None):
+    arg_parser = ArgumentParser(description=DESCRIPTION)
+    arg_parser.add_argument("--files", type=int, default=8, help="number of files to download")
+    arg_parser.add_argument("--size", type=int, default=32 * 1024 * 1024, help="size of each file in bytes")
+    arg_parser.add_argument("--connections", type=int, default=4, help="connections per file and parallel files")
+    arg_parser.add_argument("--part-size", type=int, default=8 * 1024 * 1024, help="size of ranged parts")
+    arg_parser.add_argument("--bandwidth", type=float, default=50.0, help="MB/s per connection")
+    arg_parser.add_argument("--latency", type=float, default=0.02, help="seconds added to each request")
+    args = arg_parser.parse_args(argv)
+
+    throttle = Throttle(args.bandwidth * 1024 * 1024, args.latency)
+    with tempfile.TemporaryDirectory() as served, tempfile.TemporaryDirectory() as downloads:
+        names = []
+        for i in range(args.files):
+            name = f"file{i}"
+            with open(os.path.join(served, name), "wb") as f:
+                f.write(os.urandom(args.size))
+            names.append(name)
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), range_request_handler(served, throttle))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        urls = [f"http://127.0.0.1:{server.server_port}/{name}" for name in names]
+        total = args.files * args.size
+
+        for connections in (1, args.connections):
+            file_sources = ConfiguredFileSources(
+                FileSourcePluginsConfig(
+                    fetch_url_allowlist=parse_allowlist_ips(["127.0.0.1"]),
+                    transfer_connections=connections,
+                    transfer_part_size=args.part_size,
+                ),
+                load_stock_plugins=True,
+            )
+
+            def fetch(url, file_sources=file_sources):
+                return stream_url_to_file(url, file_sources=file_sources, dir=downloads)
+
+            run(
+                f"http, {connections} connection(s)",
+                lambda fetch=fetch, connections=connections: for_each_concurrently(fetch, urls, connections),
+                total,
+            )
+
+        fs = LocalS3FileSystem(served, throttle)
+        run("s3, 1 connection(s)", lambda: [fs.download(name, os.path.join(downloads, name)) for name in names], total)
+
+        def ranged(name):
+            # what S3FsFilesSource does with an s3fs file system
+            open_range = functools.partial(lambda path, start, end: io.BytesIO(fs.cat_file(path, start, end)), name)
+            ranged_download(
+                open_range,
+                fs.size(name),
+                os.path.join(downloads, name),
+                connections=args.connections,
+                part_size=args.part_size,
+            )
+
+        run(
+            f"s3, {args.connections} connection(s)",
+            lambda: for_each_concurrently(ranged, names, args.connections),
+            total,
+        )
+        server.shutdown()
+
+
+def run(label, func, total):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label}: {total / elapsed / 1024 / 1024:,.1f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
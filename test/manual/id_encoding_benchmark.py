@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+"""Measure how many database ids per second can be encoded and decoded.
+
+Compares encoding ids one by one with the uncached helper, one by one with
+the id cache and in batches, for cold (first page) and warm (repeated page)
+caches:
+
+% ./test/manual/id_encoding_benchmark.py --ids 100000 --page-size 1000
+"""
+
+import os
+import sys
+import time
+from argparse import ArgumentParser
+
+galaxy_root = os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir, os.path.pardir))
+sys.path[1:1] = [os.path.join(galaxy_root, "lib")]
+
+from galaxy.security.idencoding import IdEncodingHelper
+
+DESCRIPTION = "Benchmark id encoding and decoding."
+ID_SECRET = "benchmarksecret"
+
+
+def main(argv=None):
+    arg_parser = ArgumentParser(description=DESCRIPTION)
+    arg_parser.add_argument("--ids", type=int, default=100000, help="number of ids to encode")
+    arg_parser.add_argument("--page-size", type=int, default=1000, help="number of ids per batch")
+    args = arg_parser.parse_args(argv)
+
+    ids = list(range(1, args.ids + 1))
+    pages = [ids[start : start + args.page_size] for start in range(0, len(ids), args.page_size)]
+
+    uncached = IdEncodingHelper(id_secret=ID_SECRET, id_cache_size=0)
+    run("encode_id, no cache", lambda: [uncached.encode_id(i) for i in ids], len(ids))
+
+    for label, warm in (("cold", False), ("warm", True)):
+        helper = IdEncodingHelper(id_secret=ID_SECRET, id_cache_size=len(ids))
+        if warm:
+            helper.encode_ids(ids)
+        run(f"encode_id, {label} cache", lambda helper=helper: [helper.encode_id(i) for i in ids], len(ids))
+        helper = IdEncodingHelper(id_secret=ID_SECRET, id_cache_size=len(ids))
+        if warm:
+            helper.encode_ids(ids)
+        run(f"encode_ids, {label} cache", lambda helper=helper: [helper.encode_ids(page) for page in pages], len(ids))
+
+    encoded_pages = [uncached.encode_ids(page) for page in pages]
+    encoded_ids = [encoded_id for page in encoded_pages for encoded_id in page]
+    run("decode_id, no cache", lambda: [uncached.decode_id(i) for i in encoded_ids], len(ids))
+    helper = IdEncodingHelper(id_secret=ID_SECRET, id_cache_size=len(ids))
+    run("decode_ids, cold cache", lambda: [helper.decode_ids(page) for page in encoded_pages], len(ids))
+    run("decode_ids, warm cache", lambda: [helper.decode_ids(page) for page in encoded_pages], len(ids))
+
+
+def run(label, func, count):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label}: {count / elapsed:,.0f} ids/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+#!/usr/bin/env python
+"""Benchmark the job runner preparation workers (``prepare_workers``).
+
+Pushes a burst of ``--jobs`` jobs through the worker threads of a
+``BaseJobRunner`` for each ``--config`` (``nworkers:prepare_workers``) and
+reports the jobs submitted per second and the median and 95th percentile of the
+time from queueing a job to its submission.
+
+Jobs are spread over ``--tools`` tools with distinct command line templates,
+every ``--heavy_every``-th tool has ``--heavy_conditionals`` conditionals
+instead of ``--conditionals``. The compiled template cache starts empty for
+each configuration, as after a restart of the job handler. Preparing a job
+compiles (once per tool) and renders the Cheetah command line, which is CPU
+bound, writes it to the job directory and waits ``--prepare_io_ms`` for the
+database and object store round trips of a real ``JobWrapper.prepare()``.
+Submitting a job waits ``--submit_io_ms``, e.g. for ``qsub`` or the DRMAA
+library.
+
+The default configurations compare preparation workers with running the same
+number of threads as plain worker threads:
+
+% ./test/manual/job_preparation_workers_benchmark.py --jobs 1000 --tools 100
+% ./test/manual/job_preparation_workers_benchmark.py --prepare_io_ms 0 --submit_io_ms 0
+"""
+
+import contextlib
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from argparse import ArgumentParser
+
+galaxy_root = os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir, os.path.pardir))
+sys.path[1:1] = [os.path.join(galaxy_root, "lib")]
+
+from galaxy import model
+from galaxy.job_metrics.lifecycle import NULL_JOB_LIFECYCLE
+from galaxy.jobs.runners import BaseJobRunner
+from galaxy.util import StructuredExecutionTimer
+from galaxy.util.bunch import Bunch
+from galaxy.util.template import (
+    compiled_template_cache,
+    fill_template,
+)
+
+DESCRIPTION = "Script to benchmark job preparation workers of job runners."
+DEFAULT_CONFIGS = ["4:0", "8:0", "4:4"]
+
+
+def build_template(tool_index, conditionals):
+    lines = [f"tool_{tool_index}"]
+    for i in range(conditionals):
+        lines.extend(
+            [
+                f"#if $param_{i} == 'a':",
+                f"    --option-{i} '$param_{i}'",
+                "#else:",
+                f"    --other-{i} '$param_{i}'",
+                "#end if",
+            ]
+        )
+    context = {f"param_{i}": "a" if i % 2 else "b" for i in range(conditionals)}
+    return "\n".join(lines), context
+
+
+class BenchmarkJobWrapper:
+    def __init__(self, job_id, working_directory, template, context, prepare_io):
+        self.job_id = job_id
+        self.working_directory = working_directory
+        self.tool = Bunch(command=template, config_files=[])
+        self.context = context
+        self.prepare_io = prepare_io
+        self.prepared_ahead = False
+        self.lifecycle = NULL_JOB_LIFECYCLE
+        self._job_io = None
+        self.queued = time.perf_counter()
+        self.submitted = None
+
+    def get_id_tag(self):
+        return str(self.job_id)
+
+    def get_state(self):
+        return model.Job.states.QUEUED
+
+    def prepare(self):
+        command_line = fill_template(self.tool.command, context=self.context)
+        with open(os.path.join(self.working_directory, f"tool_script_{self.job_id}.sh"), "w") as f:
+            f.write(command_line)
+        time.sleep(self.prepare_io)
+
+    def fail(self, message, exception=False):
+        raise Exception(message)
+
+
+class BenchmarkJobRunner(BaseJobRunner):
+    runner_name = "BenchmarkRunner"
+
+    def __init__(self, app, nworkers, submit_io, job_count, **kwargs):
+        super().__init__(app, nworkers, **kwargs)
+        self.submit_io = submit_io
+        self.remaining = job_count
+        self.lock = threading.Lock()
+        self.done = threading.Event()
+
+    def queue_job(self, job_wrapper):
+        if job_wrapper.prepared_ahead:
+            job_wrapper.prepared_ahead = False
+        else:
+            job_wrapper.prepare()
+        time.sleep(self.submit_io)
+        job_wrapper.submitted = time.perf_counter()
+        with self.lock:
+            self.remaining -= 1
+            if not self.remaining:
+                self.done.set()
+
+
+def benchmark_app():
+    return Bunch(
+        config=Bunch(redact_email_in_job_name=False, monitor_thread_join_timeout=0),
+        model=Bunch(context=None, session=contextlib.nullcontext),
+        execution_timer_factory=Bunch(get_timer=StructuredExecutionTimer),
+    )
+
+
+def run(args, nworkers, prepare_workers, templates, working_directory):
+    compiled_template_cache.clear()
+    runner = BenchmarkJobRunner(
+        benchmark_app(),
+        nworkers,
+        submit_io=args.submit_io_ms / 1000,
+        job_count=args.jobs,
+        prepare_workers=prepare_workers,
+    )
+    runner.start()
+    job_wrappers = []
+    start = time.perf_counter()
+    for job_id in range(args.jobs):
+        template, context = templates[job_id % args.tools]
+        job_wrapper = BenchmarkJobWrapper(
+            job_id, working_directory, template, context, prepare_io=args.prepare_io_ms / 1000
+        )
+        job_wrappers.append(job_wrapper)
+        runner.mark_as_queued(job_wrapper)
+    runner.done.wait()
+    elapsed = time.perf_counter() - start
+    runner.shutdown()
+    waits = sorted(job_wrapper.submitted - job_wrapper.queued for job_wrapper in job_wrappers)
+    print(
+        f"nworkers {nworkers}, prepare_workers {prepare_workers}: {args.jobs / elapsed:.1f} jobs/s, "
+        f"queued to submitted p50 {statistics.median(waits):.3f}s, p95 {waits[int(len(waits) * 0.95)]:.3f}s"
+    )
+
+
+def main(argv=None):
+    arg_parser = ArgumentParser(description=DESCRIPTION)
+    arg_parser.add_argument(
+        "--config",
+        dest="configs",
+        action="append",
+        help="nworkers:prepare_workers of a runner to benchmark, may be repeated",
+    )
+    arg_parser.add_argument("--jobs", type=int, default=500)
+    arg_parser.add_argument("--tools", type=int, default=50)
+    arg_parser.add_argument("--conditionals", type=int, default=20)
+    arg_parser.add_argument("--heavy_conditionals", type=int, default=500)
+    arg_parser.add_argument("--heavy_every", type=int, default=10)
+    arg_parser.add_argument("--prepare_io_ms", type=float, default=20)
+    arg_parser.add_argument("--submit_io_ms", type=float, default=20)
+    args = arg_parser.parse_args(argv)
+
+    templates = [
+        build_template(i, args.heavy_conditionals if i % args.heavy_every == 0 else args.conditionals)
+        for i in range(args.tools)
+    ]
+    with tempfile.TemporaryDirectory() as working_directory:
+        for config in args.configs or DEFAULT_CONFIGS:
+            nworkers, prepare_workers = (int(value) for value in config.split(":", 1))
+            run(args, nworkers, prepare_workers, templates, working_directory)
+
+
+if __name__ == "__main__":
+    main()
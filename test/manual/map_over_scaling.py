@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+"""Benchmark job creation when mapping a tool over large collections.
+
+For each size given with ``--size`` a list with that many elements is
+uploaded, then ``--tool`` (as ``tool_id:data_input_name``) is mapped over it
+and the duration of the tool request - i.e. the time spent creating jobs,
+outputs and implicit collections - is reported. Jobs are not waited for.
+
+% ./test/manual/map_over_scaling.py --api_key <admin key> --size 100 --size 1000 --size 10000
+"""
+
+import os
+import sys
+import time
+from argparse import ArgumentParser
+
+from bioblend import galaxy
+
+galaxy_root = os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir, os.path.pardir))
+sys.path[1:1] = [os.path.join(galaxy_root, "lib"), os.path.join(galaxy_root, "test")]
+
+from galaxy_test.base.populators import (
+    GiDatasetCollectionPopulator,
+    GiDatasetPopulator,
+)
+
+DESCRIPTION = "Script to benchmark job creation for large collection map-overs."
+DEFAULT_SIZES = [100, 1000, 10000]
+
+
+def main(argv=None):
+    arg_parser = ArgumentParser(description=DESCRIPTION)
+    arg_parser.add_argument("--api_key", default="testmasterapikey")
+    arg_parser.add_argument("--host", default="http://localhost:8080/")
+    arg_parser.add_argument("--tool", default="cat1:input1", help="tool_id:data_input_name of the tool to map over")
+    arg_parser.add_argument("--size", dest="sizes", type=int, action="append", help="collection size, may be repeated")
+    args = arg_parser.parse_args(argv)
+
+    gi = galaxy.GalaxyInstance(args.host, key=args.api_key)
+    dataset_populator = GiDatasetPopulator(gi)
+    dataset_collection_populator = GiDatasetCollectionPopulator(gi)
+    tool_id, input_name = args.tool.split(":", 1)
+    for size in args.sizes or DEFAULT_SIZES:
+        history_id = dataset_populator.new_history(name=f"Map over benchmark for {size} elements")
+        hdca = dataset_collection_populator.create_list_in_history(
+            history_id, contents=[f"{i}\n" for i in range(size)], wait=True
+        ).json()["output_collections"][0]
+        inputs = {input_name: {"batch": True, "values": [{"src": "hdca", "id": hdca["id"]}]}}
+        start = time.time()
+        response = dataset_populator.run_tool_raw(tool_id, inputs, history_id)
+        elapsed = time.time() - start
+        response.raise_for_status()
+        job_count = len(response.json()["jobs"])
+        print(
+            f"{tool_id} over {size} elements: {job_count} jobs in {elapsed:.1f} seconds ({job_count / elapsed:.1f} jobs/s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+"""Measure how many waiting jobs per second a job handler can check against quotas.
+
+Creates users with user, group and default quotas in a fresh database and
+checks ``--jobs`` waiting jobs spread over these users the way a job handler
+iteration does, with the quota cache disabled, with the cache and per job
+lookups, and with the cache warmed by a single batched lookup per iteration:
+
+% ./test/manual/quota_handler_benchmark.py --users 500 --jobs 5000 --iterations 5
+"""
+
+import os
+import sys
+import tempfile
+import time
+from argparse import ArgumentParser
+
+galaxy_root = os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir, os.path.pardir))
+sys.path[1:1] = [os.path.join(galaxy_root, "lib")]
+
+from galaxy.model import mapping
+from galaxy.quota import DatabaseQuotaAgent
+
+DESCRIPTION = "Benchmark job handler quota checks."
+
+
+def main(argv=None):
+    arg_parser = ArgumentParser(description=DESCRIPTION)
+    arg_parser.add_argument("--users", type=int, default=500, help="number of users with waiting jobs")
+    arg_parser.add_argument("--jobs", type=int, default=5000, help="number of waiting jobs per handler iteration")
+    arg_parser.add_argument("--iterations", type=int, default=5, help="number of handler iterations")
+    arg_parser.add_argument("--database-connection", default=None, help="database url, defaults to a new sqlite file")
+    args = arg_parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        database_connection = args.database_connection or f"sqlite:///{tmpdir}/quota_benchmark.sqlite"
+        model = mapping.init(tmpdir, database_connection, create_tables=True)
+        jobs = setup(model, args.users, args.jobs)
+
+        def check_jobs(quota_agent, batched):
+            for _ in range(args.iterations):
+                if batched:
+                    quota_agent.get_quotas({job.user_id for job in jobs})
+                for job in jobs:
+                    quota_agent.is_over_quota(None, job, None)
+
+        count = args.jobs * args.iterations
+        run("no cache", lambda: check_jobs(DatabaseQuotaAgent(model, cache_ttl=0), False), count)
+        run("cache, per job lookups", lambda: check_jobs(DatabaseQuotaAgent(model), False), count)
+        run("cache, batched lookups", lambda: check_jobs(DatabaseQuotaAgent(model), True), count)
+
+
+def setup(model, user_count, job_count):
+    session = model.session
+    DatabaseQuotaAgent(model).set_default_quota(
+        model.DefaultQuotaAssociation.types.REGISTERED, model.Quota(name="default", amount=2**30)
+    )
+    groups = []
+    for i in range(10):
+        group = model.Group(name=f"group{i}")
+        session.add(model.GroupQuotaAssociation(group, model.Quota(name=f"group{i}", amount=2**20, operation="+")))
+        groups.append(group)
+    users = []
+    for i in range(user_count):
+        user = model.User(email=f"user{i}@example.com", password="password")
+        user.disk_usage = i * 2**20
+        session.add(model.UserGroupAssociation(user, groups[i % len(groups)]))
+        if i % 2:
+            session.add(model.UserQuotaAssociation(user, model.Quota(name=f"user{i}", amount=2**31, operation="=")))
+        users.append(user)
+    session.add_all(users)
+    session.commit()
+    jobs = []
+    for i in range(job_count):
+        job = model.Job()
+        job.user = users[i % user_count]
+        jobs.append(job)
+    return jobs
+
+
+def run(label, func, count):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label}: {count / elapsed:,.0f} jobs/s")
+
+
+if __name__ == "__main__":
+    main()
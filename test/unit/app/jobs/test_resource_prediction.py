@@ -0,0 +1,55 @@
+import random
+
+from galaxy.jobs.resource_prediction import (
+    evaluate,
+    ResourceModel,
+    ResourceSample,
+)
+
+
+def _linear_samples(count=200, seed=1):
+    # usage ~ 3 * input size with up to 50% multiplicative noise
+    rng = random.Random(seed)
+    samples = []
+    for _ in range(count):
+        size = 10 ** rng.uniform(3, 9)
+        samples.append(ResourceSample(size, 3 * size * rng.uniform(1.0, 1.5)))
+    return samples
+
+
+def test_fit_requires_min_samples():
+    assert ResourceModel.fit([ResourceSample(1, 1)] * 5, min_samples=10) is None
+    assert ResourceModel.fit([], min_samples=0) is None
+
+
+def test_fit_scales_with_input_size():
+    resource_model = ResourceModel.fit(_linear_samples())
+    assert resource_model is not None
+    assert abs(resource_model.slope - 1) < 0.05
+    for size in (1e4, 1e6, 1e8):
+        assert 3 * size <= resource_model.predict(size, 0.99) <= 3 * 1.6 * size
+        assert resource_model.predict(size, 0.5) < resource_model.predict(size, 0.99)
+
+
+def test_fit_without_sizes_reproduces_quantiles():
+    samples = [ResourceSample(0, value) for value in range(1, 101)]
+    resource_model = ResourceModel.fit(samples)
+    assert resource_model.slope == 0
+    assert abs(resource_model.predict(0, 0.5) - 50.5) < 5
+    assert abs(resource_model.predict(10**9, 1.0) - 100) < 1e-6
+
+
+def test_negative_slope_is_ignored():
+    samples = [ResourceSample(10**i, 10 ** (10 - i)) for i in range(1, 10)] * 3
+    resource_model = ResourceModel.fit(samples)
+    assert resource_model.slope == 0
+
+
+def test_evaluate():
+    results = list(evaluate({"cat1": _linear_samples(), "tiny": _linear_samples(5)}, quantile=0.95))
+    assert [result.tool_id for result in results] == ["cat1"]
+    result = results[0]
+    assert result.test_count == 40
+    assert result.coverage >= 0.85
+    # the size-independent baseline has to over-allocate massively to cover the same jobs
+    assert result.allocation_ratio < result.baseline_allocation_ratio
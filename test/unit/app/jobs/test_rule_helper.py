@@ -1,6 +1,7 @@
 import uuid
 
 from galaxy import model
+from galaxy.jobs.resource_prediction import JobResourcePredictor
 from galaxy.jobs.rule_helper import RuleHelper
 from galaxy.model import mapping
 from galaxy.model.base import transaction
@@ -151,6 +152,34 @@ def test_should_burst():
     assert not rule_helper.should_burst(["cluster1"], "6", job_states="queued")
 
 
+def test_predict_resource():
+    rule_helper = __rule_helper()
+    app = rule_helper.app
+    user = model.User(email=USER_EMAIL_1, password="pass1")
+    app.add(user)
+    for size in (1000, 2000, 4000, 8000):
+        dataset = model.Dataset()
+        dataset.file_size = size
+        hda = model.HistoryDatasetAssociation(dataset=dataset)
+        job = __new_job(user=user, tool_id="cat1", state="ok")
+        job.add_input_dataset("input1", hda)
+        job.add_metric("core", "runtime_seconds", size / 100)
+        job.add_metric("cgroup", "memory.peak", size * 1024**2)
+        app.add(dataset, hda, job)
+    with transaction(app.model.context):
+        app.model.context.commit()
+
+    new_job = __new_job(user=user, tool_id="cat1", state="new")
+    dataset = model.Dataset()
+    dataset.file_size = 16000
+    new_job.add_input_dataset("input1", model.HistoryDatasetAssociation(dataset=dataset))
+
+    # usage grows linearly with the input size, results are rounded up
+    assert rule_helper.predict_walltime_seconds(new_job, quantile=1.0) in (160, 161)
+    assert rule_helper.predict_memory_mb(new_job, quantile=1.0) in (16000, 16001)
+    assert rule_helper.predict_resource(__new_job(tool_id="cat2"), "runtime_seconds", default=42) == 42
+
+
 def __assert_same_hash(rule_helper, job1, job2, hash_by):
     job1_hash = rule_helper.job_hash(job1, hash_by=hash_by)
     job2_hash = rule_helper.job_hash(job2, hash_by=hash_by)
@@ -194,6 +223,7 @@ class MockApp:
     def __init__(self):
         self.config = bunch.Bunch()
         self.model = mapping.init("/tmp", "sqlite:///:memory:", create_tables=True)
+        self.job_resource_predictor = JobResourcePredictor(self.model.context, min_samples=3)
 
     def add(self, *args):
         for arg in args:
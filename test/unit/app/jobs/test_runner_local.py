@@ -1,6 +1,7 @@
 import os
 import threading
 import time
+from queue import Queue
 from typing import Optional
 
 import psutil
@@ -10,6 +11,7 @@ from galaxy import (
     model,
 )
 from galaxy.app_unittest_utils.tools_support import UsesTools
+from galaxy.job_metrics.lifecycle import NULL_JOB_LIFECYCLE
 from galaxy.jobs.runners import local
 from galaxy.util import bunch
 from galaxy.util.unittest import TestCase
@@ -74,6 +76,19 @@ class TestLocalJobRunner(TestCase, UsesTools):
         runner.queue_job(self.job_wrapper)
         assert os.path.exists(self.job_wrapper.mock_metadata_path)
 
+    def test_prepare_ahead(self):
+        runner = local.LocalJobRunner(self.app, 1, prepare_workers=1)
+        runner.work_queue = Queue()
+        runner.prepare_ahead(self.job_wrapper)
+        assert self.job_wrapper.prepare_called
+        assert runner.work_queue.get_nowait() == (runner.queue_job, self.job_wrapper)
+        # the submission worker does not prepare the job again
+        self.job_wrapper.prepare_called = False
+        runner.queue_job(self.job_wrapper)
+        assert not self.job_wrapper.prepare_called
+        assert not self.job_wrapper.prepared_ahead
+        assert self.job_wrapper.stdout.strip() == "HelloWorld"
+
     def test_stopping_job(self):
         self.job_wrapper.command_line = '''python -c "import time; time.sleep(15)"'''
         runner = local.LocalJobRunner(self.app, 1)
@@ -148,6 +163,8 @@ class MockJobWrapper:
         self.guest_ports = []
         self.metadata_strategy = "directory"
         self.remote_command_line = False
+        self.lifecycle = NULL_JOB_LIFECYCLE
+        self.prepared_ahead = False
 
         # Cruft for setting metadata externally, axe at some point.
         self.external_output_metadata: Optional[bunch.Bunch] = bunch.Bunch()
@@ -95,3 +95,24 @@ class TestHDCASerializer(HDCATestCase):
         self.log("should be able to use keys on their own")
         serialized = serializer.serialize_to_view(item, keys=only_keys)
         self.assertKeys(serialized, only_keys)
+
+
+def test_prefetch_dataset_files():
+    fetched = []
+    members = []
+    for i in range(10):
+        hda = mock.Mock()
+        hda.dataset.get_file_name.side_effect = lambda i=i: fetched.append(i)
+        members.append((f"element-{i}", hda))
+
+    prefetched = hdcas.prefetch_dataset_files(members, 3)
+    assert next(prefetched) == members[0]
+    # the first member and the members fetched ahead of it
+    assert 0 in fetched
+    assert len(fetched) <= 7
+    assert list(prefetched) == members[1:]
+    assert sorted(fetched) == list(range(10))
+
+    fetched.clear()
+    assert list(hdcas.prefetch_dataset_files(members, 1)) == members
+    assert fetched == []
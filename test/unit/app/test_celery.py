@@ -4,6 +4,14 @@ from galaxy.celery import (
     GalaxyCelery,
     TASKS_MODULES,
 )
+from galaxy.celery.base_task import (
+    DatasetTaskBatcher,
+    PendingTaskRegistry,
+)
+from galaxy.celery.tasks import (
+    change_datatype_batch,
+    purge_hda_batch,
+)
 from galaxy.config import GalaxyAppConfiguration
 
 
@@ -34,3 +42,63 @@ def test_galaxycelery_trim_module_name():
     assert gc.trim_module_name("galaxy.notcelery.tasks") == "galaxy.notcelery.tasks"
     assert gc.trim_module_name("galaxy.celery.tasks") == "galaxy"
     assert gc.trim_module_name("galaxy.celery.tasks.nextlevel") == "galaxy.nextlevel"
+
+
+def test_dataset_task_batcher_coalesces_and_chunks():
+    batcher = DatasetTaskBatcher(batch_size=2, queue="galaxy.bulk")
+    for dataset_id in [1, 2, 2, 3]:
+        batcher.add(change_datatype_batch, dataset_id, datatype="txt", task_user_id=7)
+    batcher.add(change_datatype_batch, 4, datatype="tabular", task_user_id=7)
+    batcher.add(purge_hda_batch, 5, task_user_id=7)
+    assert len(batcher) == 5
+    signatures = batcher.signatures()
+    assert [(s.task, s.kwargs["dataset_ids"]) for s in signatures] == [
+        ("galaxy.change_datatype_batch", [1, 2]),
+        ("galaxy.change_datatype_batch", [3]),
+        ("galaxy.change_datatype_batch", [4]),
+        ("galaxy.purge_hda_batch", [5]),
+    ]
+    assert signatures[2].kwargs["datatype"] == "tabular"
+    assert all(s.options["queue"] == "galaxy.bulk" for s in signatures)
+
+
+class MockResult:
+    def __init__(self):
+        self.finished = False
+
+    def ready(self):
+        return self.finished
+
+
+class MockSignature:
+    def __init__(self, **kwargs):
+        self.task = "galaxy.compute_dataset_hash"
+        self.args = ()
+        self.kwargs = kwargs
+        self.options = {}
+        self.submitted = 0
+
+    def apply_async(self, **options):
+        self.submitted += 1
+        return MockResult()
+
+
+def test_pending_task_registry_dedupes_pending_tasks():
+    registry = PendingTaskRegistry()
+    signature = MockSignature(dataset_id=1)
+    result = registry.submit(signature)
+    assert registry.submit(signature) is result
+    assert registry.submit(MockSignature(dataset_id=1)) is result
+    assert registry.submit(MockSignature(dataset_id=2)) is not result
+    assert signature.submitted == 1
+    result.finished = True
+    assert registry.submit(signature) is not result
+    assert signature.submitted == 2
+
+
+def test_pending_task_registry_expires_entries():
+    registry = PendingTaskRegistry(ttl=0)
+    signature = MockSignature(dataset_id=1)
+    registry.submit(signature)
+    registry.submit(signature)
+    assert signature.submitted == 2
@@ -170,3 +170,155 @@ def test_serve_non_existent_raises_object_not_found(tmpdir):
     assert not short_term_storage_target.path.exists()
     with pytest.raises(ObjectNotFound):
         manager.get_serve_info(short_term_storage_target)
+
+
+def test_fingerprint_reuses_target(tmpdir):
+    config = ShortTermStorageConfiguration(short_term_storage_directory=tmpdir)
+    manager = ShortTermStorageManager(config=config)
+    target = manager.new_target(TEST_FILENAME, TEST_MIME_TYPE, fingerprint="moo")
+    assert not target.reused
+    manager.set_task_summary(target, {"id": "1234", "ignored": False})
+
+    reused_target = manager.new_target(TEST_FILENAME, TEST_MIME_TYPE, fingerprint="moo")
+    assert reused_target.reused
+    assert reused_target.request_id == target.request_id
+    assert reused_target.task_summary == {"id": "1234", "ignored": False}
+
+    other_target = manager.new_target(TEST_FILENAME, TEST_MIME_TYPE, fingerprint="cow")
+    assert not other_target.reused
+    assert not manager.new_target(TEST_FILENAME, TEST_MIME_TYPE).reused
+    assert manager.statistics().counters == {"lookups": 3, "hits": 1, "misses": 2}
+
+
+def test_fingerprint_not_reused_by_other_requester(tmpdir):
+    config = ShortTermStorageConfiguration(short_term_storage_directory=tmpdir, maximum_user_storage_size=15)
+    manager = ShortTermStorageManager(config=config)
+    security = ShortTermStorageTargetSecurity(user_id=12)
+    target = manager.new_target(TEST_FILENAME, TEST_MIME_TYPE, security=security, fingerprint="moo")
+    manager.set_task_summary(target, {"id": "1234", "ignored": False})
+    target.path.write_text("0123456789")
+    manager.finalize(target)
+    assert manager.new_target(TEST_FILENAME, TEST_MIME_TYPE, security=security, fingerprint="moo").reused
+    for other_security in [
+        ShortTermStorageTargetSecurity(user_id=13),
+        ShortTermStorageTargetSecurity(session_id=12),
+    ]:
+        other_target = manager.new_target(TEST_FILENAME, TEST_MIME_TYPE, security=other_security, fingerprint="moo")
+        assert not other_target.reused
+    # evicting entries of user 12 leaves the entries of other requesters alone
+    other_target = manager.new_target(
+        TEST_FILENAME, TEST_MIME_TYPE, security=ShortTermStorageTargetSecurity(user_id=13), fingerprint="moo"
+    )
+    other_target.path.write_text("0123456789")
+    manager.finalize(other_target)
+    new_target = manager.new_target(TEST_FILENAME, TEST_MIME_TYPE, security=security)
+    new_target.path.write_text("0123456789")
+    manager.finalize(new_target)
+    assert not target.path.exists()
+    assert other_target.path.exists()
+
+
+def test_fingerprint_not_reused_if_cancelled(tmpdir):
+    config = ShortTermStorageConfiguration(short_term_storage_directory=tmpdir)
+    manager = ShortTermStorageManager(config=config)
+    target = manager.new_target(TEST_FILENAME, TEST_MIME_TYPE, fingerprint="moo")
+    manager.cancel(target, exception=MessageException("moo cow"))
+    assert not manager.new_target(TEST_FILENAME, TEST_MIME_TYPE, fingerprint="moo").reused
+
+
+def test_fingerprint_not_reused_without_task(tmpdir):
+    config = ShortTermStorageConfiguration(short_term_storage_directory=tmpdir)
+    manager = ShortTermStorageManager(config=config)
+    target = manager.new_target(TEST_FILENAME, TEST_MIME_TYPE, fingerprint="moo")
+    other_target = manager.new_target(TEST_FILENAME, TEST_MIME_TYPE, fingerprint="moo")
+    assert not other_target.reused
+    assert other_target.request_id != target.request_id
+
+
+def test_fingerprint_not_reused_if_invalidated(tmpdir):
+    config = ShortTermStorageConfiguration(short_term_storage_directory=tmpdir)
+    manager = ShortTermStorageManager(config=config)
+    target = manager.new_target(TEST_FILENAME, TEST_MIME_TYPE, fingerprint="moo")
+    manager.set_task_summary(target, {"id": "1234", "ignored": False})
+    reused_target = manager.new_target(TEST_FILENAME, TEST_MIME_TYPE, fingerprint="moo")
+    assert manager.invalidate(reused_target)
+    assert not manager.invalidate(reused_target)
+    assert not manager.new_target(TEST_FILENAME, TEST_MIME_TYPE, fingerprint="moo").reused
+
+
+def test_completed_target_not_invalidated(tmpdir):
+    config = ShortTermStorageConfiguration(short_term_storage_directory=tmpdir)
+    manager = ShortTermStorageManager(config=config)
+    target = manager.new_target(TEST_FILENAME, TEST_MIME_TYPE, fingerprint="moo")
+    manager.set_task_summary(target, {"id": "1234", "ignored": False})
+    target.path.write_text("moo")
+    manager.finalize(target)
+    assert not manager.invalidate(target)
+    assert manager.new_target(TEST_FILENAME, TEST_MIME_TYPE, fingerprint="moo").reused
+
+
+def test_maximum_user_storage_size(tmpdir):
+    config = ShortTermStorageConfiguration(short_term_storage_directory=tmpdir, maximum_user_storage_size=25)
+    manager = ShortTermStorageManager(config=config)
+    security = ShortTermStorageTargetSecurity(user_id=12)
+    other_security = ShortTermStorageTargetSecurity(user_id=13)
+    targets = []
+    for user_security in [security, other_security, security, security]:
+        target = manager.new_target(TEST_FILENAME, TEST_MIME_TYPE, security=user_security)
+        target.path.write_text("0123456789")
+        manager.finalize(target)
+        targets.append(target)
+    # the oldest file of user 12 is removed to stay within 25 bytes
+    assert [target.path.exists() for target in targets] == [False, True, True, True]
+    statistics = manager.statistics()
+    assert statistics.entries == 3
+    assert statistics.size == 30
+    assert statistics.counters["evictions"] == 1
+
+
+def test_maximum_storage_size(tmpdir):
+    config = ShortTermStorageConfiguration(short_term_storage_directory=tmpdir, maximum_storage_size=15)
+    manager = ShortTermStorageManager(config=config)
+    first_target = manager.new_target(TEST_FILENAME, TEST_MIME_TYPE)
+    first_target.path.write_text("0123456789")
+    manager.finalize(first_target)
+    second_target = manager.new_target(TEST_FILENAME, TEST_MIME_TYPE)
+    second_target.path.write_text("0123456789")
+    manager.finalize(second_target)
+    assert not first_target.path.exists()
+    assert second_target.path.exists()
+    with pytest.raises(ObjectNotFound):
+        manager.get_serve_info(first_target)
+
+
+def test_serve_counters(tmpdir):
+    config = ShortTermStorageConfiguration(short_term_storage_directory=tmpdir)
+    manager = ShortTermStorageManager(config=config)
+    target = manager.new_target(TEST_FILENAME, TEST_MIME_TYPE)
+    target.path.write_text("Moo Cow!!!")
+    manager.finalize(target)
+    manager.get_serve_info(target)
+    manager.get_serve_info(target)
+    counters = manager.statistics().counters
+    assert counters["served"] == 2
+    assert counters["bytes_served"] == 20
+
+
+def test_cleanup_scans_unindexed_entries_once(tmpdir):
+    config = ShortTermStorageConfiguration(
+        short_term_storage_directory=tmpdir,
+        maximum_storage_duration=TEST_SLEEP_DURATION * 4,
+    )
+    manager = ShortTermStorageManager(config=config)
+    target = manager.new_target(TEST_FILENAME, TEST_MIME_TYPE)
+    target.path.touch()
+    # simulate an entry created before the index existed, a new manager starts with an empty index
+    manager = ShortTermStorageManager(config=config)
+    assert manager.statistics().entries == 0
+    manager.cleanup()
+    assert target.path.exists()
+    assert manager.statistics().entries == 1
+    time.sleep(TEST_SLEEP_DURATION * 5)
+    # the entry was added to the index by the first cleanup and expires from there
+    manager.cleanup()
+    assert not target.path.exists()
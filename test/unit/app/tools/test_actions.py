@@ -3,6 +3,7 @@ from typing import (
     cast,
     Optional,
 )
+from unittest import mock
 
 from galaxy import model
 from galaxy.app_unittest_utils import tools_support
@@ -15,7 +16,14 @@ from galaxy.tools.actions import (
     DefaultToolAction,
     determine_output_format,
 )
-from galaxy.tools.execution_helpers import on_text_for_names
+from galaxy.tools.execute import (
+    execute,
+    MappingParameters,
+)
+from galaxy.tools.execution_helpers import (
+    on_text_for_names,
+    ToolExecutionCache,
+)
 from galaxy.util import XML
 from galaxy.util.unittest import TestCase
 
@@ -115,6 +123,44 @@ class TestDefaultToolAction(TestCase, tools_support.UsesTools):
         # Again this is a stupid way to ensure data parameters are wrapped.
         assert output["out1"].name == f"Output ({hda1.dataset.get_file_name()})"
 
+    def test_deferred_history_additions(self):
+        execution_cache = ToolExecutionCache(self.trans)
+        execution_cache.defer_history_additions = True
+        _, first_output = self._simple_execute(execution_cache=execution_cache)
+        _, second_output = self._simple_execute(execution_cache=execution_cache)
+        assert first_output["out1"].hid is None
+        self.history.add_pending_items()
+        assert second_output["out1"].hid == first_output["out1"].hid + 1
+
+    def test_batch_output_hids(self):
+        execution_tracker, hids_at_job_creation = self._batch_execute(["moo", "cow", "dog"])
+        # hids are assigned to the outputs of all jobs at once, in job order
+        assert hids_at_job_creation == [None, None, None]
+        hids = [job.output_datasets[0].dataset.hid for job in execution_tracker.successful_jobs]
+        assert hids == [1, 2, 3]
+        assert self.history.hid_counter == 4
+
+    def test_single_job_output_hid(self):
+        execution_tracker, hids_at_job_creation = self._batch_execute(["moo"])
+        assert hids_at_job_creation == [1]
+        assert execution_tracker.successful_jobs[0].output_datasets[0].dataset.hid == 1
+
+    def test_input_permissions_cached(self):
+        hda = self.__add_dataset()
+        execution_cache = ToolExecutionCache(self.trans)
+        security_agent = self.app.security_agent
+        with mock.patch.object(
+            security_agent, "get_permissions", wraps=security_agent.get_permissions
+        ) as get_permissions:
+            for _ in range(2):
+                self._simple_execute(
+                    contents=DATA_IN_LABEL_TOOL_CONTENTS,
+                    incoming=dict(repeat1=[dict(param1=hda)]),
+                    execution_cache=execution_cache,
+                )
+        assert get_permissions.call_count == 1
+        assert execution_cache.dataset_permissions == {hda.dataset.id: []}
+
     def test_inactive_user_job_create_failure(self):
         self.trans.user_is_active = False
         try:
@@ -134,7 +180,27 @@ class TestDefaultToolAction(TestCase, tools_support.UsesTools):
             session.commit()
         return hda
 
-    def _simple_execute(self, contents=None, incoming=None):
+    def _batch_execute(self, param1_values):
+        self._init_tool(tools_support.SIMPLE_TOOL_CONTENTS)
+        self.tool.tool_action = self.action
+        hids_at_job_creation = []
+
+        def job_callback(job):
+            hids_at_job_creation.append(job.output_datasets[0].dataset.hid)
+
+        mapping_params = MappingParameters({}, [dict(param1=value) for value in param1_values])
+        with mock.patch.object(self.app.job_manager, "enqueue"):
+            execution_tracker = execute(
+                self.trans,
+                self.tool,
+                mapping_params,
+                self.history,
+                job_callback=job_callback,
+                completed_jobs=dict.fromkeys(range(len(param1_values))),
+            )
+        return execution_tracker, hids_at_job_creation
+
+    def _simple_execute(self, contents=None, incoming=None, execution_cache=None):
         if contents is None:
             contents = tools_support.SIMPLE_TOOL_CONTENTS
         if incoming is None:
@@ -145,6 +211,7 @@ class TestDefaultToolAction(TestCase, tools_support.UsesTools):
             trans=self.trans,
             history=self.history,
             incoming=incoming,
+            execution_cache=execution_cache,
         )
         return job, out_data
 
@@ -187,6 +187,65 @@ def test_incorrect_sha1():
         )
 
 
+def test_hash_functions_calculated_with_validation():
+    with _execute_context() as execute_context:
+        request = {
+            "targets": [
+                {
+                    "destination": {
+                        "type": "hdas",
+                    },
+                    "elements": [
+                        {
+                            "src": "url",
+                            "url": URI_FOR_1_2_3,
+                            "hashes": [
+                                {
+                                    "hash_function": "SHA-1",
+                                    "hash_value": "65e9d53484d28eef5447bc06fe2d754d1090975a",
+                                }
+                            ],
+                        }
+                    ],
+                }
+            ],
+            "validate_hashes": True,
+            "hash_functions": ["MD5", "SHA-256"],
+        }
+        execute_context.execute_request(request)
+        output = _unnamed_output(execute_context)
+        hda_result = output["elements"][0]
+        assert hda_result["state"] == "ok"
+        assert hda_result["hashes"] == [
+            {"hash_function": "SHA-1", "hash_value": "65e9d53484d28eef5447bc06fe2d754d1090975a"},
+            {"hash_function": "MD5", "hash_value": "5ba48b6e5a7c4d4930fda256f411e55b"},
+            {
+                "hash_function": "SHA-256",
+                "hash_value": "7c8f5059290305cec8323d79521f0353c9ac308b60cb4c1976340d0ce4a121d5",
+            },
+        ]
+
+
+def test_hash_functions_calculated_after_conversion():
+    with _execute_context() as execute_context:
+        request = {
+            "targets": [
+                {
+                    "destination": {
+                        "type": "hdas",
+                    },
+                    "elements": [{"src": "url", "url": URI_FOR_1_2_3, "to_posix_lines": True}],
+                }
+            ],
+            "hash_functions": ["MD5"],
+        }
+        execute_context.execute_request(request)
+        output = _unnamed_output(execute_context)
+        hda_result = output["elements"][0]
+        # a trailing newline has been added to the content
+        assert hda_result["hashes"] == [{"hash_function": "MD5", "hash_value": "f2b33fb7b3d0eb95090a16060e6a24f9"}]
+
+
 @skip_if_github_down
 def test_deferred_uri_get():
     with _execute_context() as execute_context:
@@ -213,6 +272,34 @@ def test_deferred_uri_get():
         assert hda_result["ext"] == "bed"
 
 
+def test_multiple_uri_get():
+    contents = [b"1 2 3", b"4 5 6", b"7 8 9"]
+    with _execute_context() as execute_context:
+        request = {
+            "targets": [
+                {
+                    "destination": {
+                        "type": "hdas",
+                    },
+                    "elements": [
+                        {"src": "url", "url": f"base64://{b64encode(content).decode('utf-8')}", "name": f"{i}"}
+                        for i, content in enumerate(contents)
+                    ]
+                    + [{"src": "url", "url": "base64://a"}],
+                }
+            ]
+        }
+        execute_context.execute_request(request)
+        output = _unnamed_output(execute_context)
+        elements = output["elements"]
+        assert [element["name"] for element in elements[:3]] == ["0", "1", "2"]
+        for element, content in zip(elements, contents):
+            assert element["state"] == "ok"
+            with open(element["filename"], "rb") as f:
+                assert f.read() == content
+        assert "Failed to fetch url base64://a" in elements[3]["error_message"]
+
+
 def test_simple_list_path_get():
     with _execute_context() as execute_context:
         job_directory = execute_context.job_directory
@@ -0,0 +1,65 @@
+import os
+
+from galaxy.app_unittest_utils import tools_support
+from galaxy.util.unittest import TestCase
+
+TOOL_WITH_TESTS = """<tool id="test_hash_tool" name="Test Hash Tool" version="1.0">
+    <requirements>
+        <requirement type="package" version="${requirement_version}">samtools</requirement>
+    </requirements>
+    <command>cat '$input1' > '$out1'</command>
+    <inputs>
+        <param name="input1" type="data" format="txt" />
+    </inputs>
+    <outputs>
+        <data name="out1" format="txt" />
+    </outputs>
+    <tests>
+        <test>
+            <param name="input1" value="input.txt" />
+            <output name="out1" file="expected.txt" />
+        </test>
+    </tests>
+</tool>
+"""
+
+
+class TestToolTestHash(TestCase, tools_support.UsesTools):
+    def setUp(self):
+        super().setUp()
+        self.setup_app()
+        self.test_data_dir = os.path.join(self.test_directory, "test-data")
+        os.mkdir(self.test_data_dir)
+        self._write_test_data("input.txt", "input\n")
+        self._write_test_data("expected.txt", "input\n")
+
+    def tearDown(self):
+        self.tear_down_app()
+
+    def test_hash_computed_once_per_tool(self):
+        tool = self._hashed_tool()
+        test_hash = tool.test_hash
+        self._write_test_data("expected.txt", "changed\n")
+        assert tool.test_hash == test_hash
+
+    def test_hash_changes_with_test_data(self):
+        test_hash = self._hashed_tool().test_hash
+        assert self._hashed_tool().test_hash == test_hash
+        self._write_test_data("input.txt", "changed\n")
+        input_hash = self._hashed_tool().test_hash
+        assert input_hash != test_hash
+        self._write_test_data("expected.txt", "changed\n")
+        assert self._hashed_tool().test_hash != input_hash
+
+    def test_hash_changes_with_requirements(self):
+        test_hash = self._hashed_tool().test_hash
+        assert self._hashed_tool(requirement_version="1.10").test_hash != test_hash
+
+    def _hashed_tool(self, requirement_version="1.9"):
+        contents = TOOL_WITH_TESTS.replace("${requirement_version}", requirement_version)
+        self._init_tool(tool_contents=contents)
+        return self.tool
+
+    def _write_test_data(self, filename, contents):
+        with open(os.path.join(self.test_data_dir, filename), "w") as f:
+            f.write(contents)
@@ -203,6 +203,21 @@ def test_input_value_wrapper_input_value_wrapper_comparison(tool):
     assert wrapper < valuewrapper(tool, "5.1", "float")
 
 
+@with_mock_tool
+def test_input_value_wrapper_string_follows_value(tool):
+    wrapper = valuewrapper(tool, "foo", "text")
+    assert str(wrapper) == "foo"
+    wrapper.value = "bar"
+    assert str(wrapper) == "bar"
+    # values changed in place are converted again
+    value = ["a", "b"]
+    wrapper.value = value
+    before = str(wrapper)
+    value.append("c")
+    assert str(wrapper) != before
+    assert "c" in str(wrapper)
+
+
 def test_dataset_wrapper():
     dataset = cast(DatasetInstance, MockDataset())
     wrapper = DatasetFilenameWrapper(dataset)
@@ -0,0 +1,119 @@
+import pytest
+
+from galaxy import model
+from galaxy.model import mapping
+from galaxy.model.base import transaction
+from galaxy.model.dataset_collections import (
+    registry,
+    type_description,
+)
+from galaxy.model.dataset_collections.structure import (
+    ColumnarTree,
+    get_structure,
+    leaf,
+    Tree,
+    UninitializedTree,
+)
+
+TYPE_DESCRIPTION_FACTORY = type_description.CollectionTypeDescriptionFactory(registry.DatasetCollectionTypesRegistry())
+
+
+@pytest.fixture
+def session():
+    return mapping.init("/tmp", "sqlite:///:memory:", create_tables=True).session
+
+
+def _collection(session, collection_type, sizes):
+    """Create a collection with ``sizes[i]`` elements at nesting level ``i``, paired levels get 2 elements."""
+    rank_type = collection_type.split(":")[0]
+    child_type = collection_type[len(rank_type) + 1 :]
+    collection = model.DatasetCollection(collection_type=collection_type)
+    identifiers = ["forward", "reverse"] if rank_type == "paired" else [f"e{i}" for i in range(sizes[0])]
+    for index, identifier in enumerate(identifiers):
+        if child_type:
+            element = _collection(session, child_type, sizes[1:])
+        else:
+            element = model.HistoryDatasetAssociation(create_dataset=True, sa_session=session)
+        model.DatasetCollectionElement(
+            collection=collection, element=element, element_index=index, element_identifier=identifier
+        )
+    collection.element_count = len(identifiers)
+    return collection
+
+
+def _hdca(session, collection_type, sizes):
+    hdca = model.HistoryDatasetCollectionAssociation(collection=_collection(session, collection_type, sizes))
+    session.add(hdca)
+    with transaction(session):
+        session.commit()
+    return hdca
+
+
+def _trees(hdca):
+    collection_type_description = TYPE_DESCRIPTION_FACTORY.for_collection_type(hdca.collection.collection_type)
+    return (
+        ColumnarTree.load(hdca.collection, collection_type_description),
+        Tree.for_dataset_collection(hdca.collection, collection_type_description),
+    )
+
+
+def test_load_matches_tree(session):
+    hdca = _hdca(session, "list:list:paired", [3, 2])
+    columnar_tree, tree = _trees(hdca)
+    assert str(columnar_tree) == str(tree)
+    assert len(columnar_tree) == len(tree) == 12
+    assert columnar_tree.identifiers[0] == ["e0", "e1", "e2"]
+    assert list(columnar_tree.offsets[0]) == [0, 2, 4, 6]
+    assert columnar_tree.can_match(tree)
+    assert tree.can_match(columnar_tree)
+    assert isinstance(get_structure(hdca, columnar_tree.collection_type_description), ColumnarTree)
+
+
+def test_load_empty_subcollection(session):
+    hdca = _hdca(session, "list:list", [2, 0])
+    columnar_tree, tree = _trees(hdca)
+    assert str(columnar_tree) == str(tree)
+    assert len(columnar_tree) == 0
+
+
+def test_can_match(session):
+    columnar_tree, _ = _trees(_hdca(session, "list:list:paired", [3, 2]))
+    same_shape, _ = _trees(_hdca(session, "list:list:paired", [3, 2]))
+    other_shape, _ = _trees(_hdca(session, "list:list:paired", [2, 3]))
+    other_type, _ = _trees(_hdca(session, "list:list", [3, 2]))
+    assert columnar_tree.can_match(same_shape)
+    assert not columnar_tree.can_match(other_shape)
+    assert not columnar_tree.can_match(other_type)
+    # views of subcollections
+    assert columnar_tree.children[1][1].can_match(same_shape.children[2][1])
+    assert not columnar_tree.children[1][1].can_match(other_shape.children[0][1])
+
+
+def test_multiply(session):
+    columnar_tree, tree = _trees(_hdca(session, "list:list", [2, 3]))
+    other_columnar_tree, other_tree = _trees(_hdca(session, "list:paired", [2]))
+    assert str(columnar_tree.multiply(other_columnar_tree)) == str(tree.multiply(other_tree))
+    assert str(columnar_tree.multiply(other_tree)) == str(tree.multiply(other_tree))
+    assert str(leaf.multiply(columnar_tree)) == str(tree)
+    product = columnar_tree.multiply(other_columnar_tree)
+    assert product.collection_type_description.collection_type == "list:list:list:paired"
+    assert len(product) == 24
+
+    uninitialized = UninitializedTree(TYPE_DESCRIPTION_FACTORY.for_collection_type("paired"))
+    product = columnar_tree.multiply(uninitialized)
+    assert product.collection_type_description.collection_type == "list:list:paired"
+    assert product.children[0][1].children[0][1] is uninitialized
+    assert str(product) == str(tree.multiply(uninitialized))
+
+
+def test_walk_collections(session):
+    hdca = _hdca(session, "list:list:paired", [2, 2])
+    other_hdca = _hdca(session, "list:list:paired", [2, 2])
+    columnar_tree, tree = _trees(hdca)
+    hdca_dict = {"input1": hdca, "input2": other_hdca}
+    columnar_tree.when_values = tree.when_values = [True, False]
+    walked = list(columnar_tree.walk_collections(hdca_dict))
+    assert walked == list(tree.walk_collections(hdca_dict))
+    assert len(walked) == 8
+    assert walked[0][0]["input1"].element_identifier == "forward"
+    assert [when_value for _, when_value in walked] == [True] * 4 + [False] * 4
@@ -0,0 +1,58 @@
+from datetime import (
+    date,
+    datetime,
+)
+
+from galaxy import model as m
+from galaxy.managers.job_metric_rollups import (
+    rebuild_job_metric_rollups,
+    summarize_job_metric_rollups,
+)
+from . import have_same_elements
+
+
+def _add_job(session, state, update_time, runtimes):
+    job = m.Job()
+    job.state = state
+    job.tool_id = "cat1"
+    job.destination_id = "local"
+    for runtime in runtimes:
+        job.numeric_metrics.append(m.JobMetricNumeric("core", "runtime_seconds", runtime))
+    session.add(job)
+    session.flush()
+    job.update_time = update_time
+    session.commit()
+    return job
+
+
+def test_rebuild_job_metric_rollups(session):
+    _add_job(session, m.Job.states.OK, datetime(2024, 1, 2, 10), [1])
+    _add_job(session, m.Job.states.OK, datetime(2024, 1, 2, 23), [3])
+    _add_job(session, m.Job.states.OK, datetime(2024, 1, 3, 1), [5])
+    _add_job(session, m.Job.states.ERROR, datetime(2024, 1, 2, 11), [100])
+    # stale row of a rebuilt day is replaced
+    session.add(
+        m.JobMetricRollup(
+            day=date(2024, 1, 2),
+            tool_id="cat1",
+            destination_id="local",
+            plugin="core",
+            metric_name="runtime_seconds",
+            count=10,
+            total=10.0,
+        )
+    )
+    session.commit()
+
+    assert rebuild_job_metric_rollups(session, date(2024, 1, 2), date(2024, 1, 2)) == 2
+    rows = session.query(m.JobMetricRollup).all()
+    assert have_same_elements([(row.day, row.count, row.total) for row in rows], [(date(2024, 1, 2), 2, 4.0)])
+
+    assert rebuild_job_metric_rollups(session) == 3
+    (summary,) = summarize_job_metric_rollups(session, plugin="core", metric_name="runtime_seconds")
+    assert summary["tool_id"] == "cat1"
+    assert summary["destination_id"] == "local"
+    assert summary["count"] == 3
+    assert summary["sum"] == 9.0
+    assert summary["min"] == 1.0
+    assert summary["max"] == 5.0
@@ -76,6 +76,44 @@ def test_cannot_assign_private_roles(session, make_user_and_role, make_role):
     verify_user_associations(user, [], [private_role1, new_role])
 
 
+def test_effective_user_roles(
+    session, make_user_and_role, make_role, make_group, make_group_role_association, make_user_group_association
+):
+    user, private_role = make_user_and_role()
+    group = make_group()
+    group_role, other_role = make_role(), make_role()
+    make_group_role_association(group, group_role)
+    security_agent = GalaxyRBACAgent(session)
+
+    assert security_agent.get_user_role_ids(user) == {private_role.id}
+    make_user_group_association(user, group)
+    # the new association invalidates the effective roles cached for the user
+    assert security_agent.get_user_role_ids(user) == {private_role.id, group_role.id}
+    assert have_same_elements(security_agent.get_user_roles(user), user.all_roles())
+
+    # group role changes (including bulk statements) invalidate the effective roles of all users
+    security_agent.set_group_user_and_role_associations(group, role_ids=[group_role.id, other_role.id])
+    assert security_agent.get_user_role_ids(user) == {private_role.id, group_role.id, other_role.id}
+    security_agent.set_user_group_and_role_associations(user, group_ids=[])
+    assert security_agent.get_user_role_ids(user) == {private_role.id}
+    assert security_agent.get_user_roles(user) == [private_role]
+
+
+def test_effective_user_roles_invalidated_for_all_agents(
+    session, make_user_and_role, make_role, make_group, make_group_role_association, make_user_group_association
+):
+    user, private_role = make_user_and_role()
+    group = make_group()
+    group_role = make_role()
+    make_group_role_association(group, group_role)
+    security_agents = [GalaxyRBACAgent(session), GalaxyRBACAgent(session)]
+    for security_agent in security_agents:
+        assert security_agent.get_user_role_ids(user) == {private_role.id}
+    make_user_group_association(user, group)
+    for security_agent in security_agents:
+        assert security_agent.get_user_role_ids(user) == {private_role.id, group_role.id}
+
+
 class TestSetGroupUserAndRoleAssociations:
 
     def test_add_associations_to_existing_group(self, session, make_user_and_role, make_role, make_group):
@@ -1,3 +1,4 @@
+from galaxy.exceptions import MalformedId
 from galaxy.security import idencoding
 
 test_helper_1 = idencoding.IdEncodingHelper(id_secret="secu1")
@@ -139,3 +140,40 @@ def test_encode_decode_guid():
     encoded_key = test_helper_1.encode_guid(session_key)
     decoded_key = test_helper_1.decode_guid(encoded_key)
     assert session_key == decoded_key, f"{session_key} != {decoded_key}"
+
+
+def test_encode_decode_ids_batch():
+    ids = [1, 2, 123456789, 2, 10**15, "42"]
+    helper = idencoding.IdEncodingHelper(id_secret="secu1", id_cache_size=0)
+    encoded_ids = test_helper_1.encode_ids(ids)
+    assert encoded_ids == [helper.encode_id(i) for i in ids]
+    assert encoded_ids[1] == encoded_ids[3]
+    assert helper.decode_ids(encoded_ids) == [1, 2, 123456789, 2, 10**15, 42]
+
+    kind_encoded_ids = test_helper_1.encode_ids(ids, kind="k1")
+    assert kind_encoded_ids == [helper.encode_id(i, kind="k1") for i in ids]
+    assert kind_encoded_ids != encoded_ids
+
+
+def test_decode_ids_malformed():
+    encoded_ids = [test_helper_1.encode_id(1), "thisisnothex"]
+    threw_exception = False
+    try:
+        test_helper_1.decode_ids(encoded_ids)
+    except MalformedId:
+        threw_exception = True
+    assert threw_exception
+    threw_exception = False
+    try:
+        test_helper_1.decode_ids([test_helper_1.encode_id(1), test_helper_1.encode_id(1)[:-2]])
+    except MalformedId:
+        threw_exception = True
+    assert threw_exception
+
+
+def test_id_cache_is_bounded():
+    helper = idencoding.IdEncodingHelper(id_secret="secu1", id_cache_size=2)
+    helper.encode_ids([1, 2, 3])
+    assert len(helper._encoded_ids._data) == 2
+    assert helper.decode_id(helper.encode_id(1)) == 1
+    assert helper.encode_id(3) == test_helper_1.encode_id(3)
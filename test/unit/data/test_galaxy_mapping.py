@@ -6,6 +6,8 @@ from typing import List
 
 import pytest
 from sqlalchemy import (
+    delete,
+    event,
     inspect,
     select,
 )
@@ -21,7 +23,10 @@ from galaxy.model.orm.util import (
     add_object_to_object_session,
     get_object_session,
 )
-from galaxy.model.security import GalaxyRBACAgent
+from galaxy.model.security import (
+    DATASET_ACCESS_CACHE_KEY,
+    GalaxyRBACAgent,
+)
 from galaxy.model.unittest_utils.utils import random_email
 from galaxy.objectstore import QuotaSourceMap
 from galaxy.util.unittest import TestCase
@@ -213,6 +218,89 @@ class TestMappings(BaseModelTestCase):
         ]
         assert c4.dataset_elements == [dce1, dce2]
 
+    def test_collection_load_elements(self):
+        u = model.User(email=random_email(), password="password")
+        h1 = model.History(name="History 1", user=u)
+        outer = model.DatasetCollection(collection_type="list:list:paired")
+        for i in range(3):
+            inner = model.DatasetCollection(collection_type="list:paired")
+            for j in range(2):
+                pair = model.DatasetCollection(collection_type="paired")
+                for k, identifier in enumerate(["forward", "reverse"]):
+                    hda = model.HistoryDatasetAssociation(
+                        extension="txt", history=h1, create_dataset=True, sa_session=self.model.session
+                    )
+                    model.DatasetCollectionElement(
+                        collection=pair, element=hda, element_identifier=identifier, element_index=k
+                    )
+                model.DatasetCollectionElement(
+                    collection=inner, element=pair, element_identifier=f"pair{j}", element_index=j
+                )
+            model.DatasetCollectionElement(
+                collection=outer, element=inner, element_identifier=f"inner{i}", element_index=i
+            )
+        self.persist(outer)
+        outer_id = outer.id
+        expected_instances = [hda.id for hda in outer.dataset_instances]
+        self.expunge()
+
+        session = self.session()
+        outer = session.get(model.DatasetCollection, outer_id)
+        outer.load_elements()
+        statements = []
+
+        def count_statements(*args):
+            statements.append(args)
+
+        engine = self.model.engine
+        event.listen(engine, "before_cursor_execute", count_statements)
+        try:
+            assert [hda.id for hda in outer.dataset_instances] == expected_instances
+            assert [element.element_identifier for element in outer.elements] == ["inner0", "inner1", "inner2"]
+            inner = outer.elements[1].child_collection
+            assert inner.populated_optimized
+            pair = inner.elements[0].element_object
+            assert [element.element_identifier for element in pair.elements] == ["forward", "reverse"]
+            assert pair.elements[0].element_object.dataset.state == "new"
+            assert pair.elements[0].collection is pair
+        finally:
+            event.remove(engine, "before_cursor_execute", count_statements)
+        assert statements == []
+
+    def test_collection_load_elements_invalidated(self):
+        u = model.User(email=random_email(), password="password")
+        h1 = model.History(name="History 1", user=u)
+
+        def new_hda():
+            return model.HistoryDatasetAssociation(
+                extension="txt", history=h1, create_dataset=True, sa_session=self.model.session
+            )
+
+        collection = model.DatasetCollection(collection_type="list")
+        model.DatasetCollectionElement(
+            collection=collection, element=new_hda(), element_identifier="a", element_index=0
+        )
+        self.persist(collection)
+        collection_id = collection.id
+        self.expunge()
+
+        session = self.session()
+        collection = session.get(model.DatasetCollection, collection_id)
+        collection.load_elements()
+        assert collection._elements_loaded
+        hda = new_hda()
+        model.DatasetCollectionElement(collection=collection, element=hda, element_identifier="b", element_index=1)
+        # preloaded elements are no longer used once elements change
+        assert not collection._elements_loaded
+        session.flush()
+        assert [instance.id for instance in collection.dataset_instances][-1] == hda.id
+        collection.load_elements()
+        assert collection._elements_loaded
+        # ... or once the collection is expired
+        session.commit()
+        assert not collection._elements_loaded
+        assert len(collection.dataset_elements) == 2
+
     def test_history_audit(self):
         u = model.User(email=random_email(), password="password")
         h1 = model.History(name="HistoryAuditHistory", user=u)
@@ -540,6 +628,57 @@ class TestMappings(BaseModelTestCase):
         )
         assert not security_agent.can_access_dataset(u_other.all_roles(), d1.dataset)
 
+    def test_dataset_access_map(self):
+        security_agent = GalaxyRBACAgent(self.model.session)
+        u_from, u_to, u_other = self._three_users("dataset_access_map")
+
+        h = model.History(name="History for Access Map", user=u_from)
+        public, shared, private = (
+            model.HistoryDatasetAssociation(
+                extension="txt", history=h, create_dataset=True, sa_session=self.model.session
+            )
+            for _ in range(3)
+        )
+        self.persist(h, public, shared, private)
+        security_agent.privately_share_dataset(shared.dataset, [u_from, u_to])
+        self._make_private(security_agent, u_from, private)
+        dataset_ids = [public.dataset.id, shared.dataset.id, private.dataset.id]
+
+        assert security_agent.dataset_access_map(u_from.all_roles(), dataset_ids) == dict.fromkeys(dataset_ids, True)
+        assert security_agent.dataset_access_map(u_to.all_roles(), dataset_ids) == {
+            public.dataset.id: True,
+            shared.dataset.id: True,
+            private.dataset.id: False,
+        }
+        assert security_agent.dataset_access_map(u_other.all_roles(), dataset_ids) == {
+            public.dataset.id: True,
+            shared.dataset.id: False,
+            private.dataset.id: False,
+        }
+        for hda in (public, shared, private):
+            can_access = security_agent.dataset_access_map(u_other.all_roles(), [hda.dataset.id])[hda.dataset.id]
+            assert security_agent.can_access_dataset(u_other.all_roles(), hda.dataset) == can_access
+
+        # changing permissions invalidates the cached access map
+        security_agent.make_dataset_public(private.dataset)
+        assert security_agent.dataset_access_map(u_other.all_roles(), [private.dataset.id]) == {
+            private.dataset.id: True
+        }
+
+        # the cached access map ends with the transaction
+        session = self.session()
+        security_agent.dataset_access_map(u_other.all_roles(), dataset_ids)
+        assert DATASET_ACCESS_CACHE_KEY in session.info
+        session.commit()
+        assert DATASET_ACCESS_CACHE_KEY not in session.info
+        # ... and with permission changes that bypass the unit of work
+        assert security_agent.dataset_access_map(u_other.all_roles(), [shared.dataset.id]) == {shared.dataset.id: False}
+        session.execute(
+            delete(model.DatasetPermissions).where(model.DatasetPermissions.dataset_id == shared.dataset.id)
+        )
+        assert security_agent.dataset_access_map(u_other.all_roles(), [shared.dataset.id]) == {shared.dataset.id: True}
+        session.rollback()
+
     def test_can_manage_privately_shared_dataset(self):
         security_agent = GalaxyRBACAgent(self.model.session)
         u_from, u_to, u_other = self._three_users("can_manage_dataset")
@@ -1,5 +1,7 @@
 import uuid
 
+from sqlalchemy import text
+
 from galaxy import model
 from galaxy.model.unittest_utils.utils import random_email
 from galaxy.objectstore import (
@@ -425,6 +427,69 @@ class TestQuota(BaseModelTestCase):
 
         self._assert_user_quota_is(u, 52, label1)
 
+    def test_get_quotas(self):
+        model = self.model
+        u1 = model.User(email="batched_quota1@example.com", password="password")
+        u2 = model.User(email="batched_quota2@example.com", password="password")
+        u3 = model.User(email="batched_quota3@example.com", password="password")
+        self.persist(u1, u2, u3)
+        self._add_user_quota(u1, model.Quota(name="batched user quota", amount=40, operation="="))
+        self._add_group_quota(u2, model.Quota(name="batched group quota", amount=50, operation="="))
+        self._add_group_quota(u3, model.Quota(name="batched group unlimited", amount=-1, operation="="))
+
+        quotas = self.quota_agent.get_quotas([u1.id, u2.id, u3.id])
+        assert quotas == {u1.id: 40, u2.id: 50, u3.id: None}
+        for user in (u1, u2, u3):
+            assert self.quota_agent.get_quota(user) == quotas[user.id]
+
+    def test_quota_cache_invalidation(self):
+        model = self.model
+        u = model.User(email="cached_quota@example.com", password="password")
+        self.persist(u)
+        quota = model.Quota(name="cached user quota", amount=10, operation="=")
+        self._add_user_quota(u, quota)
+        self._assert_user_quota_is(u, 10)
+
+        # changes bypassing the session are only seen once the cache is invalidated
+        engine = self.model.session.get_bind()
+        with engine.begin() as conn:
+            conn.execute(text("UPDATE quota SET bytes = 15 WHERE id = :id"), {"id": quota.id})
+        assert self.quota_agent.get_quota(u) == 10
+        self.quota_agent.invalidate_quota_cache([u.id])
+        self._assert_user_quota_is(u, 15)
+
+        # committed changes to quotas and their associations invalidate the cache
+        quota.bytes = 25
+        self.persist(quota)
+        self._assert_user_quota_is(u, 25)
+        self._add_group_quota(u, model.Quota(name="cached group quota add", amount=5, operation="+"))
+        self._assert_user_quota_is(u, 30)
+
+    def test_quota_cache_invalidated_for_all_agents(self):
+        other_quota_agent = DatabaseQuotaAgent(self.model)
+        u = model.User(email="shared_cached_quota@example.com", password="password")
+        self.persist(u)
+        quota = model.Quota(name="shared cached user quota", amount=10, operation="=")
+        self._add_user_quota(u, quota)
+        assert self.quota_agent.get_quota(u) == 10
+        assert other_quota_agent.get_quota(u) == 10
+        quota.bytes = 20
+        self.persist(quota)
+        assert self.quota_agent.get_quota(u) == 20
+        assert other_quota_agent.get_quota(u) == 20
+
+    def test_quota_cache_disabled(self):
+        quota_agent = DatabaseQuotaAgent(self.model, cache_ttl=0)
+        u = model.User(email="uncached_quota@example.com", password="password")
+        self.persist(u)
+        quota = model.Quota(name="uncached user quota", amount=10, operation="=")
+        self._add_user_quota(u, quota)
+        assert quota_agent.get_quota(u) == 10
+        engine = self.model.session.get_bind()
+        with engine.begin() as conn:
+            conn.execute(text("UPDATE quota SET bytes = 15 WHERE id = :id"), {"id": quota.id})
+        assert quota_agent.get_quota(u) == 15
+
     def _add_group_quota(self, user, quota):
         group = model.Group()
         uga = model.UserGroupAssociation(user, group)
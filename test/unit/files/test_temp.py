@@ -1,9 +1,11 @@
+import os
 import tempfile
 from typing import List
 
 import pytest
 
 from galaxy.exceptions import RequestParameterInvalidException
+from galaxy.files.listings_cache import listings_cache
 from galaxy.files.plugins import FileSourcePluginsConfig
 from galaxy.files.sources.temp import TempFilesSource
 from galaxy.files.unittest_utils import (
@@ -130,6 +132,12 @@ def test_search(temp_file_source: TempFilesSource):
     assert len(result) == 1
     assert result[0]["name"] == "e"
 
+    # Search is case insensitive.
+    result, count = temp_file_source.list("/", recursive=recursive, query="DIR")
+    assert count == 1
+    assert len(result) == 1
+    assert result[0]["name"] == "dir1"
+
 
 def test_query_with_empty_string(temp_file_source: TempFilesSource):
     recursive = False
@@ -183,6 +191,45 @@ def test_sorting_not_supported_raises(temp_file_source: TempFilesSource):
     assert "Server-side sorting is not supported by this file source" in str(exc_info.value)
 
 
+def test_recursive_pagination_and_search(temp_file_source: TempFilesSource):
+    all_entries, count = temp_file_source.list("/", recursive=True)
+    assert count == 8
+
+    result, count = temp_file_source.list("/", recursive=True, limit=3, offset=2)
+    assert count == 8
+    assert result == all_entries[2:5]
+
+    result, count = temp_file_source.list("/", recursive=True, query="d")
+    assert count == 2
+    assert sorted(entry["name"] for entry in result) == ["d", "dir1"]
+
+    result, count = temp_file_source.list("/", recursive=True, query="d", limit=1, offset=1)
+    assert count == 2
+    assert len(result) == 1
+
+
+def test_listings_cache():
+    file_sources = _configured_file_sources(listings_expiry_time=60)
+    file_source = file_sources.get_file_source_path(ROOT_URI).file_source
+    user_context = user_context_fixture()
+    listings_cache.clear()
+    TempFilesSource.cache_listings = True
+    try:
+        assert_list_names(file_source, "/", recursive=False, expected_names=["a", "b", "c", "dir1"])
+        with open(os.path.join(file_sources.test_root, "g"), "w") as f:
+            f.write("g")
+        # the listing is cached per user
+        assert_list_names(file_source, "/", recursive=False, expected_names=["a", "b", "c", "dir1"])
+        result, count = file_source.list("/", recursive=False, user_context=user_context)
+        assert count == 5
+
+        # writing through the file source drops its cached listings
+        _upload_to(file_source, "/h", content="h", user_context=user_context)
+        assert_list_names(file_source, "/", recursive=False, expected_names=["a", "b", "c", "dir1", "g", "h"])
+    finally:
+        TempFilesSource.cache_listings = False
+
+
 def _populate_test_scenario(file_source: TempFilesSource):
     """Create a directory structure in the file source."""
     user_context = user_context_fixture()
@@ -209,10 +256,10 @@ def assert_list_names(file_source: TempFilesSource, uri: str, recursive: bool, e
     return result
 
 
-def _configured_file_sources() -> TestConfiguredFileSources:
+def _configured_file_sources(listings_expiry_time=None) -> TestConfiguredFileSources:
     tmp, root = setup_root()
-    file_sources_config = FileSourcePluginsConfig()
-    plugin = TEMP_PLUGIN
+    file_sources_config = FileSourcePluginsConfig(listings_expiry_time=listings_expiry_time)
+    plugin = dict(TEMP_PLUGIN)
     plugin["root_path"] = root
     file_sources = TestConfiguredFileSources(file_sources_config, conf_dict={TEMP_PLUGIN["id"]: plugin}, test_root=root)
     _populate_test_scenario(file_sources.get_file_source_path(ROOT_URI).file_source)
@@ -0,0 +1,120 @@
+import errno
+import io
+import os
+
+import pytest
+
+from galaxy.files import transfer
+from galaxy.files.transfer import (
+    for_each_concurrently,
+    IncompleteTransferError,
+    ranged_download,
+)
+
+CONTENT = bytes(range(256)) * 1000
+PART_SIZE = 10000
+
+
+class InterruptedStream(io.BytesIO):
+    def __init__(self, content: bytes, fail_after: int):
+        super().__init__(content)
+        self._fail_after = fail_after
+
+    def read(self, size=-1):
+        if self.tell() >= self._fail_after:
+            raise ConnectionResetError("connection reset by peer")
+        return super().read(min(size, self._fail_after - self.tell()))
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(transfer, "RETRY_BACKOFF", 0)
+
+
+def test_ranged_download(tmp_path):
+    opened = []
+
+    def open_range(start, end):
+        opened.append((start, end))
+        return io.BytesIO(CONTENT[start:end])
+
+    path = str(tmp_path / "download")
+    ranged_download(open_range, len(CONTENT), path, connections=4, part_size=PART_SIZE)
+    with open(path, "rb") as f:
+        assert f.read() == CONTENT
+    starts = range(0, len(CONTENT), PART_SIZE)
+    assert sorted(opened) == [(start, min(start + PART_SIZE, len(CONTENT))) for start in starts]
+
+
+def test_ranged_download_uses_first_part(tmp_path):
+    opened = []
+
+    def open_range(start, end):
+        opened.append(start)
+        return io.BytesIO(CONTENT[start:end])
+
+    path = str(tmp_path / "download")
+    ranged_download(open_range, len(CONTENT), path, part_size=PART_SIZE, first_part=io.BytesIO(CONTENT))
+    with open(path, "rb") as f:
+        assert f.read() == CONTENT
+    assert 0 not in opened
+
+
+def test_ranged_download_resumes_interrupted_parts(tmp_path):
+    opened = []
+
+    def open_range(start, end):
+        opened.append(start)
+        # the first connection for each part breaks half way
+        fail_after = (end - start) // 2 if start % PART_SIZE == 0 else end - start
+        return InterruptedStream(CONTENT[start:end], fail_after)
+
+    path = str(tmp_path / "download")
+    ranged_download(open_range, len(CONTENT), path, connections=4, part_size=PART_SIZE)
+    with open(path, "rb") as f:
+        assert f.read() == CONTENT
+    # each part is requested again from where it was interrupted
+    assert len(opened) == 2 * len(range(0, len(CONTENT), PART_SIZE))
+    assert PART_SIZE // 2 in opened
+
+
+def test_ranged_download_gives_up_after_retries(tmp_path):
+    opened = []
+
+    def open_range(start, end):
+        opened.append(start)
+        return io.BytesIO(b"")
+
+    with pytest.raises(IncompleteTransferError):
+        ranged_download(open_range, 10, str(tmp_path / "download"), retries=2)
+    assert opened == [0, 0, 0]
+
+
+def test_ranged_download_does_not_retry_other_errors(tmp_path):
+    opened = []
+
+    def open_range(start, end):
+        opened.append(start)
+        raise OSError(errno.ENOSPC, "No space left on device")
+
+    with pytest.raises(OSError):
+        ranged_download(open_range, 10, str(tmp_path / "download"), retries=2)
+    assert opened == [0]
+
+
+def test_ranged_download_empty_file(tmp_path):
+    path = str(tmp_path / "download")
+    ranged_download(lambda start, end: io.BytesIO(b""), 0, path)
+    assert os.path.getsize(path) == 0
+
+
+def test_for_each_concurrently():
+    assert for_each_concurrently(lambda i: i * 2, range(10), 4) == list(range(0, 20, 2))
+
+    def fail_on_three(i):
+        if i == 3:
+            raise ValueError("three")
+        return i
+
+    with pytest.raises(ValueError, match="three"):
+        for_each_concurrently(fail_on_three, range(10), 4)
@@ -0,0 +1,84 @@
+from galaxy.job_metrics import JobMetrics
+from galaxy.job_metrics.lifecycle import (
+    DESTINATION,
+    DESTINATION_QUEUE,
+    job_lifecycle_spans,
+    LIFECYCLE_PLUGIN,
+    NULL_JOB_LIFECYCLE,
+    percentile,
+    PREPARE,
+    summarize_phases,
+)
+
+
+class MockHasMetrics:
+    def __init__(self):
+        self.metrics = []
+
+    def add_metric(self, plugin, metric_name, metric_value):
+        self.metrics.append((plugin, metric_name, metric_value))
+
+
+def test_spans_accumulate_and_flush():
+    spans = job_lifecycle_spans(True)
+    with spans.span(PREPARE):
+        pass
+    spans.add(PREPARE, 2.0)
+    spans.add(DESTINATION, 10.0)
+    assert spans.durations[PREPARE] >= 2.0
+    has_metrics = MockHasMetrics()
+    spans.flush(has_metrics, runtime_seconds=4)
+    flushed = {name: value for (plugin, name, value) in has_metrics.metrics}
+    assert all(plugin == LIFECYCLE_PLUGIN for (plugin, _, _) in has_metrics.metrics)
+    assert flushed[DESTINATION] == 10.0
+    assert flushed[DESTINATION_QUEUE] == 6.0
+    assert spans.durations == {}
+
+
+def test_marks():
+    spans = job_lifecycle_spans(True)
+    spans.mark("dispatched", at=0)
+    spans.add_since("runner_wait", "dispatched")
+    assert spans.durations["runner_wait"] > 0
+    # marks are consumed, a second call does not add anything
+    before = spans.durations["runner_wait"]
+    spans.add_since("runner_wait", "dispatched")
+    assert spans.durations["runner_wait"] == before
+
+
+def test_disabled_spans_are_noops():
+    spans = job_lifecycle_spans(False)
+    assert spans is NULL_JOB_LIFECYCLE
+    with spans.span(PREPARE):
+        pass
+    spans.add(PREPARE, 1.0)
+    spans.mark("dispatched")
+    has_metrics = MockHasMetrics()
+    spans.flush(has_metrics)
+    assert has_metrics.metrics == []
+    assert spans.durations == {}
+
+
+def test_percentile():
+    assert percentile([1.0], 0.95) == 1.0
+    assert percentile([1.0, 2.0, 3.0], 0.5) == 2.0
+    assert percentile([0.0, 10.0], 0.95) == 9.5
+
+
+def test_summarize_phases():
+    rows = [("cat1", "local", PREPARE, value) for value in range(1, 101)]
+    rows.append(("cat1", "slurm", PREPARE, 5))
+    summaries = summarize_phases(rows)
+    assert len(summaries) == 2
+    local = summaries[0]
+    assert local["destination_id"] == "local"
+    assert local["count"] == 100
+    assert local["total"] == 5050
+    assert local["p50"] == 50.5
+    assert abs(local["p95"] - 95.05) < 1e-9
+
+
+def test_format():
+    title, value = JobMetrics().format(LIFECYCLE_PLUGIN, PREPARE, 1.5)
+    assert title == "Galaxy: Job Preparation"
+    assert value == "1.500 seconds"
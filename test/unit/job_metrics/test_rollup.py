@@ -0,0 +1,67 @@
+from galaxy.job_metrics.rollup import (
+    bucket_for,
+    bucket_midpoint,
+    merge_rollups,
+    MetricRollup,
+    rollup_values,
+    ZERO_BUCKET,
+)
+
+
+def test_buckets():
+    assert bucket_for(0) == ZERO_BUCKET
+    assert bucket_for(-1) == ZERO_BUCKET
+    assert bucket_for(1) == "0"
+    assert bucket_for(2) == "4"
+    assert bucket_for(0.5) == "-4"
+    for value in (0.01, 1.0, 3.0, 1000.0, 1e12):
+        midpoint = bucket_midpoint(bucket_for(value))
+        assert abs(midpoint - value) / value < 0.1
+
+
+def test_rollup_statistics():
+    rollup = rollup_values(range(1, 101))
+    assert rollup.count == 100
+    assert rollup.total == 5050
+    assert rollup.minimum == 1
+    assert rollup.maximum == 100
+    assert rollup.mean == 50.5
+    assert abs(rollup.quantile(0.5) - 50) / 50 < 0.1
+    assert abs(rollup.quantile(0.95) - 95) / 95 < 0.1
+    assert rollup.quantile(0) == 1
+    assert rollup.quantile(1) == 100
+
+
+def test_quantiles_are_clamped():
+    rollup = rollup_values([10.0, 10.0])
+    assert rollup.quantile(0.5) == 10.0
+
+
+def test_merge_equals_rollup_of_all_values():
+    values = [0, 0.3, 1.5, 7, 22, 22, 640, 5000]
+    merged = merge_rollups([rollup_values(values[:3]), MetricRollup(), rollup_values(values[3:])])
+    direct = rollup_values(values)
+    assert merged.to_dict((0.5, 0.9)) == direct.to_dict((0.5, 0.9))
+
+
+def test_restore_from_stored_columns():
+    rollup = rollup_values([1, 2, 3])
+    restored = MetricRollup(rollup.count, rollup.total, rollup.minimum, rollup.maximum, rollup.histogram)
+    restored.add(4)
+    assert rollup.count == 3
+    assert restored.count == 4
+    assert restored.maximum == 4
+
+
+def test_empty_rollup():
+    rollup = MetricRollup()
+    assert rollup.mean is None
+    assert rollup.quantile(0.5) is None
+    assert rollup.to_dict((0.5,)) == {
+        "count": 0,
+        "sum": 0.0,
+        "min": None,
+        "max": None,
+        "mean": None,
+        "quantiles": {"0.5": None},
+    }
@@ -29,6 +29,7 @@ from tool_shed.test.base.populators import (
 )
 from tool_shed.util.hgweb_config import hgweb_config_manager
 from tool_shed.util.repository_util import create_repository
+from tool_shed.util.shed_index import NullRepositoryIndexer
 from tool_shed.webapp.model import (
     Category,
     mapping,
@@ -50,6 +51,7 @@ class TestToolShedConfig:
     smtp_server: Optional[str] = None
     hgweb_repo_prefix = "repos/"
     config_hg_for_dev = False
+    reset_metadata_workers = 1
 
     def __init__(self, temp_directory):
         files_path = os.path.join(temp_directory, "files")
@@ -83,6 +85,7 @@ class TestToolShedApp(ToolShedApp):
         self.security = IdEncodingHelper(id_secret=self.config.id_secret)
         self.repository_registry = tool_shed.repository_registry.Registry(self)
         self.model_cache = ModelCache(os.path.join(temp_directory, "model_cache"))
+        self.repository_indexer = NullRepositoryIndexer()
 
     @property
     def security_agent(self):
@@ -1,3 +1,8 @@
+import os
+
+import pytest
+
+from galaxy.exceptions import RequestParameterInvalidException
 from tool_shed.context import ProvidesRepositoriesContext
 from tool_shed.metadata import repository_metadata_manager
 from tool_shed.webapp.model import Repository
@@ -57,3 +62,64 @@ def test_reset_dm_with_uninstallable_revisions(
     repo_path = new_repository.repo_path(app=shed_app)
     rmm.reset_all_metadata_on_repository_in_tool_shed(repository_clone_url=repo_path)
     assert len(new_repository.downloadable_revisions) == 2
+
+
+def test_resetter_resumes_from_checkpoint(
+    provides_repositories: ProvidesRepositoriesContext, new_repository: Repository, tmp_path, monkeypatch
+):
+    shed_app = provides_repositories.app
+    upload_directories_to_repository(provides_repositories, new_repository, "column_maker")
+    monkeypatch.setattr(
+        repository_metadata_manager.common_util,
+        "generate_clone_url_for",
+        lambda trans, repository: repository.repo_path(app=shed_app),
+    )
+    encoded_id = shed_app.security.encode_id(new_repository.id)
+    checkpoint_file = str(tmp_path / "checkpoint")
+    resetter = repository_metadata_manager.RepositoryMetadataResetter(
+        provides_repositories, checkpoint_file=checkpoint_file
+    )
+    progress = resetter.reset([encoded_id])
+    assert progress.successful_count == 1
+    assert progress.to_dict()["running"] == []
+    assert repository_metadata_manager.read_checkpoint_file(checkpoint_file) == {encoded_id}
+    assert len(new_repository.downloadable_revisions) == 3
+    progress = resetter.reset([encoded_id])
+    assert progress.skipped_count == 1
+    assert progress.successful_count == 0
+    assert repository_metadata_manager.metadata_reset_progress() == []
+
+
+def test_resetter_does_not_checkpoint_invalid_tools(
+    provides_repositories: ProvidesRepositoriesContext, new_repository: Repository, tmp_path, monkeypatch
+):
+    shed_app = provides_repositories.app
+    upload_directories_to_repository(provides_repositories, new_repository, "column_maker")
+    monkeypatch.setattr(
+        repository_metadata_manager.common_util,
+        "generate_clone_url_for",
+        lambda trans, repository: repository.repo_path(app=shed_app),
+    )
+    monkeypatch.setattr(
+        repository_metadata_manager.RepositoryMetadataManager,
+        "get_invalid_file_tups",
+        lambda self: [("column_maker.xml", "Invalid tool")],
+    )
+    encoded_id = shed_app.security.encode_id(new_repository.id)
+    checkpoint_file = str(tmp_path / "checkpoint")
+    resetter = repository_metadata_manager.RepositoryMetadataResetter(
+        provides_repositories, checkpoint_file=checkpoint_file
+    )
+    progress = resetter.reset([encoded_id])
+    assert progress.unsuccessful_count == 1
+    # repositories with invalid tools are reset again when the reset is resumed
+    assert repository_metadata_manager.read_checkpoint_file(checkpoint_file) == set()
+
+
+def test_resolve_checkpoint_file(tmp_path):
+    checkpoint_dir = str(tmp_path)
+    path = repository_metadata_manager.resolve_checkpoint_file(checkpoint_dir, "reset_2024")
+    assert path == os.path.join(checkpoint_dir, "reset_2024")
+    for name in ("", "/etc/passwd", "../outside", "sub/../../outside"):
+        with pytest.raises(RequestParameterInvalidException):
+            repository_metadata_manager.resolve_checkpoint_file(checkpoint_dir, name)
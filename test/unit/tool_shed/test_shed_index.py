@@ -9,7 +9,14 @@ import pytest
 import requests
 from whoosh import index
 
-from tool_shed.util.shed_index import build_index
+import tool_shed.webapp.model.mapping as ts_mapping
+from galaxy.util.bunch import Bunch
+from tool_shed.util.shed_index import (
+    build_index,
+    index_repositories,
+    RepositoryIndexer,
+)
+from tool_shed.webapp import model
 
 URL = "https://github.com/mvdbeek/toolshed-test-data/blob/master/toolshed_community_files.tgz?raw=true"
 
@@ -82,3 +89,72 @@ def test_build_index(whoosh_index_dir, community_file_structure):
     )
     assert repos_indexed == 1
     assert tools_indexed == 1
+
+
+def test_index_repositories(whoosh_index_dir, community_file_structure):
+    sa_session = ts_mapping.init(community_file_structure.dburi, engine_options={}, create_tables=False).session
+    repos_indexed, tools_indexed = index_repositories(
+        whoosh_index_dir,
+        sa_session,
+        [1],
+        community_file_structure.file_path,
+        community_file_structure.hgweb_config_dir,
+        community_file_structure.hgweb_repo_prefix,
+    )
+    assert repos_indexed == 1
+    assert tools_indexed == 1
+    idx = index.open_dir(whoosh_index_dir)
+    assert idx.doc_count() == 1
+    # indexing a repository again replaces its documents
+    index_repositories(
+        whoosh_index_dir,
+        sa_session,
+        [1],
+        community_file_structure.file_path,
+        community_file_structure.hgweb_config_dir,
+        community_file_structure.hgweb_repo_prefix,
+    )
+    idx = index.open_dir(whoosh_index_dir)
+    assert idx.doc_count() == 1
+    # repositories that no longer exist are removed from the index
+    repos_indexed, tools_indexed = index_repositories(
+        whoosh_index_dir,
+        sa_session,
+        [2],
+        community_file_structure.file_path,
+        community_file_structure.hgweb_config_dir,
+        community_file_structure.hgweb_repo_prefix,
+    )
+    assert repos_indexed == 0
+    idx = index.open_dir(whoosh_index_dir)
+    assert idx.doc_count() == 1
+
+
+def test_repository_indexer(whoosh_index_dir, community_file_structure):
+    model_mapping = ts_mapping.init(community_file_structure.dburi, engine_options={}, create_tables=False)
+    app = Bunch(
+        config=Bunch(
+            whoosh_index_dir=whoosh_index_dir,
+            file_path=community_file_structure.file_path,
+            hgweb_config_dir=community_file_structure.hgweb_config_dir,
+            hgweb_repo_prefix=community_file_structure.hgweb_repo_prefix,
+        ),
+        model=model_mapping,
+    )
+
+    def index_changed_repository(deprecated):
+        session = model_mapping.session
+        session.get(model.Repository, 1).deprecated = deprecated
+        session.commit()
+        indexer = RepositoryIndexer(app)
+        indexer.index_repository(1)
+        # repositories still pending are indexed on shutdown
+        indexer.shutdown()
+        return index.open_dir(whoosh_index_dir).doc_count()
+
+    try:
+        assert index_changed_repository(deprecated=False) == 1
+        # deprecated repositories are removed from the index
+        assert index_changed_repository(deprecated=True) == 0
+    finally:
+        index_changed_repository(deprecated=False)
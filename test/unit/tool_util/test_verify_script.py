@@ -19,6 +19,7 @@ from galaxy.tool_util.verify.script import (
     arg_parser,
     build_case_references,
     Results,
+    ResultsCache,
     test_tools as run,
     TestReference,
 )
@@ -359,6 +360,46 @@ def test_build_references() -> None:
     assert test_reference.test_index == 2
 
 
+def test_build_references_sharded() -> None:
+    interactor = cast(GalaxyInteractorApi, MockGalaxyInteractor())
+    test_references = build_case_references(interactor)
+    shards = [build_case_references(interactor, shard_count=3, shard_index=i) for i in range(3)]
+    assert sorted(r for shard in shards for r in shard) == sorted(test_references)
+    # all tests of a tool end up in the same shard
+    assert sorted(len(shard) for shard in shards) == [0, 0, 6]
+    assert shards == [build_case_references(interactor, shard_count=3, shard_index=i) for i in range(3)]
+
+
+def test_test_tools_results_cache() -> None:
+    interactor = MockGalaxyInteractor()
+    f = NamedTemporaryFile()
+    cache_file = NamedTemporaryFile(suffix=".json")
+    test_references = [
+        TestReference("cat1", "0.1.0", 0),
+        TestReference("cat1", "0.2.0", 0),
+    ]
+
+    def run_cached(tool_hashes):
+        results = Results("my suite", f.name)
+        results_cache = ResultsCache(cache_file.name, tool_hashes)
+        with mock.patch(VT_PATH) as mock_verify:
+
+            def side_effect(*args, register_job_data, **kwd):
+                register_job_data({"status": "success"})
+
+            mock_verify.side_effect = side_effect
+            run(cast(GalaxyInteractorApi, interactor), test_references, results, results_cache=results_cache)
+        assert len(results.test_results) == 2
+        return len(mock_verify.call_args_list)
+
+    os.unlink(cache_file.name)
+    tool_hashes = {("cat1", "0.1.0"): "a", ("cat1", "0.2.0"): "b"}
+    assert run_cached(tool_hashes) == 2
+    assert run_cached(tool_hashes) == 0
+    # only the tests of the changed tool run again
+    assert run_cached({**tool_hashes, ("cat1", "0.2.0"): "c"}) == 1
+
+
 def assert_results_not_written(results: Results) -> None:
     assert os.stat(results.test_json).st_size == 0
 
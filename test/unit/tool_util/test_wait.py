@@ -1,4 +1,7 @@
+import threading
+
 from galaxy.tool_util.verify.wait import (
+    MultiplexedWaiter,
     TimeoutAssertionError,
     wait_on,
 )
@@ -90,3 +93,39 @@ def test_timeout_backoff():
     assert sleeper.sleeps[1] == 3  # delta of 2 + 1 backoff
     assert sleeper.sleeps[2] == 4  # delta of 2 + 2 backoff
     assert exception_called
+
+
+def test_multiplexed_waiter():
+    polls = []
+    ready = {"a": 1, "b": ValueError("b failed")}
+
+    def poll(keys):
+        polls.append(sorted(keys))
+        return {key: ready[key] for key in keys if key in ready}
+
+    waiter = MultiplexedWaiter(poll, delta=0.01)
+    results = {}
+
+    def wait(key):
+        try:
+            results[key] = waiter.wait(key, key, 5)
+        except Exception as e:
+            results[key] = e
+
+    threads = [threading.Thread(target=wait, args=(key,)) for key in ["a", "a", "b"]]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results["a"] == 1
+    assert isinstance(results["b"], ValueError)
+    # keys are polled together, never once per waiting thread
+    assert all(len(keys) == len(set(keys)) for keys in polls)
+
+    exception_called = False
+    try:
+        waiter.wait("never", "never met condition", 0.05)
+    except TimeoutAssertionError as e:
+        assert "never met condition" in str(e)
+        exception_called = True
+    assert exception_called
@@ -3,6 +3,7 @@ import os
 import shutil
 import tempfile
 from typing import Tuple
+from unittest import mock
 
 try:
     import h5py
@@ -11,6 +12,7 @@ except ImportError:
 
 from galaxy.tool_util.parser.xml import __parse_assert_list_from_elem
 from galaxy.tool_util.verify import asserts
+from galaxy.tool_util.verify.asserts._util import count_lines
 from galaxy.util import parse_xml_string
 
 TABULAR_ASSERTION = """
@@ -1321,6 +1323,30 @@ if h5py is not None:
         assert len(a) == 1
 
 
+XML_MULTIPLE_ASSERTIONS = """
+    <assert_contents>
+        <is_valid_xml/>
+        <has_n_elements_with_path path="./elem/more" n="3"/>
+        <attribute_is path="./elem" attribute="name" text="foo"/>
+        <element_text_is path="./elem/more" text="BAR"/>
+    </assert_contents>
+"""
+
+
+def test_xml_parsed_once_per_output():
+    """test assertions checked against the same output share the parsed XML"""
+    with mock.patch("galaxy.tool_util.verify.asserts.xml.parse_xml_string", wraps=parse_xml_string) as parse:
+        a = run_assertions(XML_MULTIPLE_ASSERTIONS, VALID_XML)
+        assert len(a) == 0
+        # the assertion list itself is parsed by run_assertions with the unpatched function
+        assert parse.call_count == 1
+
+
+def test_count_lines():
+    for output in ["", "a", "a\n", "\n\n", "a\r\nb\rc\x85d", "a\nb\n"]:
+        assert count_lines(output) == len(output.splitlines())
+
+
 def run_assertions(assertion_xml: str, data, decompress=False) -> Tuple:
     assertion = parse_xml_string(assertion_xml)
     assertion_description = __parse_assert_list_from_elem(assertion)
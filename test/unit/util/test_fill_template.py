@@ -3,7 +3,10 @@ import sys
 import pytest
 from Cheetah.NameMapper import NotFound
 
-from galaxy.util.template import fill_template
+from galaxy.util.template import (
+    CompiledTemplateCache,
+    fill_template,
+)
 
 # In Python 3.12 calling `locals()`` inside a comprehension now includes
 # variables from outside the comprehension, see
@@ -99,3 +102,34 @@ def test_fix_template_two_to_three():
 def test_fix_template_invalid_cheetah():
     template_str = fill_template(INVALID_CHEETAH_SYNTAX, python_template_version="2", retry=1)
     assert template_str == "1 is 1\n"
+
+
+def test_compiled_template_cache_evicts_least_recently_used():
+    cache = CompiledTemplateCache(max_size=2)
+    first = cache.get("first $a")
+    cache.get("second $a")
+    assert cache.get("first $a") is first
+    cache.get("third $a")
+    assert len(cache) == 2
+    assert cache.get("first $a") is first
+    assert str(cache.get("second $a")(searchList=[{"a": 1}])) == "second 1"
+
+
+def test_compiled_template_cache_persistence(tmp_path):
+    cache = CompiledTemplateCache(cache_dir=str(tmp_path))
+    klass = cache.get(SIMPLE_TEMPLATE)
+    assert len(list(tmp_path.iterdir())) == 1
+    restarted = CompiledTemplateCache(cache_dir=str(tmp_path))
+    restarted_klass = restarted.get(SIMPLE_TEMPLATE)
+    assert restarted_klass is not klass
+    assert str(restarted_klass(searchList=[{"a_list": [1, 2]}])) == FILLED_SIMPLE_TEMPLATE
+    assert restarted_klass._CHEETAH_generatedModuleCode == klass._CHEETAH_generatedModuleCode
+
+
+def test_compiled_template_cache_ignores_invalid_files(tmp_path):
+    cache = CompiledTemplateCache(cache_dir=str(tmp_path))
+    cache.get(SIMPLE_TEMPLATE)
+    for path in tmp_path.iterdir():
+        path.write_text("not python (")
+    restarted = CompiledTemplateCache(cache_dir=str(tmp_path))
+    assert str(restarted.get(SIMPLE_TEMPLATE)(searchList=[{"a_list": [1]}])) == "    echo 1\n"
@@ -13,10 +13,16 @@ class MockShortTermStorageAllocator(ShortTermStorageAllocator):
         self.expected_filename = expected_filename
         self.expected_mime_type = expected_mime_type
 
-    def new_target(self, filename, mime_type, duration=None, security=None):
+    def new_target(self, filename, mime_type, duration=None, security=None, fingerprint=None):
         assert filename == self.expected_filename
         assert mime_type == self.expected_mime_type
 
+    def set_task_summary(self, target, task_summary):
+        pass
+
+    def invalidate(self, target):
+        return False
+
 
 @pytest.mark.parametrize(
     "file_name, model_store_format, expected",
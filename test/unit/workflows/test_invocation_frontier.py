@@ -0,0 +1,107 @@
+from galaxy import model
+from galaxy.model.base import transaction
+from galaxy.workflow.invocation_frontier import (
+    build_frontier,
+    InvocationFrontierCache,
+)
+from .workflow_support import (
+    MockApp,
+    yaml_to_model,
+)
+
+TEST_WORKFLOW_YAML = """
+steps:
+  - type: "data_input"
+    tool_inputs: {"name": "input1"}
+  - type: "tool"
+    tool_id: "cat1"
+    inputs:
+      "input1":
+        connections:
+        - "@output_step": 0
+          output_name: "output"
+"""
+
+
+def _setup():
+    app = MockApp()
+    session = app.model.context
+    dataset = model.Dataset(state=model.Dataset.states.QUEUED)
+    hda = model.HistoryDatasetAssociation(dataset=dataset, sa_session=session)
+    session.add(hda)
+    with transaction(session):
+        session.commit()
+    invocation = model.WorkflowInvocation()
+    invocation.workflow = yaml_to_model(TEST_WORKFLOW_YAML)
+    input_step, tool_step = invocation.workflow.steps
+    frontier = build_frontier(invocation, [tool_step], {input_step.id: {"output": hda}})
+    return session, dataset, frontier
+
+
+def test_build_frontier():
+    _, dataset, frontier = _setup()
+    assert frontier.dataset_states == {dataset.id: model.Dataset.states.QUEUED}
+    assert frontier.size == 1
+
+
+def test_build_frontier_collection_element_states():
+    app = MockApp()
+    session = app.model.context
+    dataset = model.Dataset(state=model.Dataset.states.QUEUED)
+    hda = model.HistoryDatasetAssociation(dataset=dataset, sa_session=session)
+    collection = model.DatasetCollection(collection_type="list", populated=True)
+    model.DatasetCollectionElement(collection=collection, element=hda, element_index=0, element_identifier="el1")
+    hdca = model.HistoryDatasetCollectionAssociation(collection=collection)
+    session.add(hdca)
+    with transaction(session):
+        session.commit()
+    invocation = model.WorkflowInvocation()
+    invocation.workflow = yaml_to_model(TEST_WORKFLOW_YAML)
+    input_step, tool_step = invocation.workflow.steps
+    frontier = build_frontier(invocation, [tool_step], {input_step.id: {"output": hdca}})
+    assert frontier.collection_states == {
+        collection.id: (collection.populated_state, frozenset([(model.Dataset.states.QUEUED, 1)]))
+    }
+    assert frontier.dataset_states == {}
+    assert frontier.size == 1
+
+    cache = InvocationFrontierCache()
+    cache.record(1, frontier)
+    assert cache.unchanged(session, 1)
+    dataset.state = model.Dataset.states.OK
+    with transaction(session):
+        session.commit()
+    assert not cache.unchanged(session, 1)
+
+
+def test_frontier_cache_detects_changes():
+    session, dataset, frontier = _setup()
+    cache = InvocationFrontierCache()
+    assert not cache.unchanged(session, 1)
+    cache.record(1, frontier)
+    assert cache.unchanged(session, 1)
+    assert cache.unchanged(session, 1)
+
+    dataset.state = model.Dataset.states.OK
+    with transaction(session):
+        session.commit()
+    assert not cache.unchanged(session, 1)
+    # changed frontiers are dropped until the invocation is evaluated again
+    assert len(cache) == 0
+
+
+def test_frontier_cache_full_pass_interval():
+    session, _, frontier = _setup()
+    cache = InvocationFrontierCache(full_pass_interval=0)
+    cache.record(1, frontier)
+    assert not cache.unchanged(session, 1)
+
+
+def test_frontier_cache_max_size():
+    _, _, frontier = _setup()
+    cache = InvocationFrontierCache(max_size=2)
+    for invocation_id in range(3):
+        cache.record(invocation_id, frontier)
+    assert len(cache) == 2
+    cache.discard(2)
+    assert len(cache) == 1
@@ -0,0 +1,26 @@
+from galaxy.workflow.scheduling_manager import (
+    round_robin_invocation_order,
+    shard_invocation_order,
+)
+
+
+def test_round_robin_invocation_order():
+    invocations = [(1, 10), (2, 10), (3, 10), (4, 20), (5, None), (6, 20)]
+    assert round_robin_invocation_order(invocations, {}) == [1, 4, 5, 2, 6, 3]
+
+
+def test_round_robin_invocation_order_least_recently_served_first():
+    invocations = [(1, 10), (2, 10), (3, 20), (4, 30)]
+    user_last_served = {10: 3, 20: 1}
+    assert round_robin_invocation_order(invocations, user_last_served) == [4, 3, 1, 2]
+
+
+def test_round_robin_invocation_order_empty():
+    assert round_robin_invocation_order([], {10: 1}) == []
+
+
+def test_shard_invocation_order():
+    invocation_ids = [5, 1, 4, 2, 3]
+    history_ids = {1: 10, 2: 11, 3: 10, 4: 12, 5: 11}
+    assert shard_invocation_order(invocation_ids, history_ids, 2) == [[1, 4, 3], [5, 2]]
+    assert shard_invocation_order(invocation_ids, history_ids, 1) == [invocation_ids]
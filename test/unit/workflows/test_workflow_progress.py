@@ -1,3 +1,4 @@
+import time
 from typing import cast
 
 from galaxy import model
@@ -114,6 +115,17 @@ class TestWorkflowProgress(TestCase):
             workflow_invocation_step.workflow_step = self._step(index)
             return workflow_invocation_step
 
+    def test_scheduling_time_exhausted(self):
+        mock_injector: ModuleInjector = cast(ModuleInjector, MockModuleInjector(self.progress))
+        progress = WorkflowProgress(self.invocation, self.inputs_by_step_id, mock_injector, {})
+        assert not progress.scheduling_time_exhausted
+        progress = WorkflowProgress(
+            self.invocation, self.inputs_by_step_id, mock_injector, {}, scheduling_deadline=time.monotonic() + 60
+        )
+        assert not progress.scheduling_time_exhausted
+        progress.scheduling_deadline = time.monotonic() - 1
+        assert progress.scheduling_time_exhausted
+
     def test_connect_data_input(self):
         self._setup_workflow(TEST_WORKFLOW_YAML)
         hda = model.HistoryDatasetAssociation()